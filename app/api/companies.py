@@ -11,7 +11,7 @@ from app.core.org_restrictions import require_organization_access, ensure_organi
 from app.models.base import User, Company, Organization
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyInDB, CompanyResponse, CompanyErrorResponse
 from app.schemas.base import BulkImportResponse
-from app.services.excel_service import CompanyExcelService, ExcelService
+from app.services.excel_service import CompanyExcelService, ExcelService, IMPORT_FILE_EXTENSIONS
 import logging
 import os
 import uuid
@@ -267,98 +267,71 @@ async def import_companies_excel(
     org_id = require_current_organization_id()
     
     # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
+    if not file.filename or not file.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only Excel files (.xlsx, .xls) are allowed"
+            detail="Only Excel or CSV files (.xlsx, .xls, .csv) are allowed"
         )
     
     try:
-        # Parse Excel file
-        records = await ExcelService.parse_excel_file(file, CompanyExcelService.REQUIRED_COLUMNS, "Company Import Template")
-        
-        if not records:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No data found in Excel file"
-            )
-        
+        total_processed = 0
         created_count = 0
         updated_count = 0
         errors = []
         
-        for i, record in enumerate(records, 1):
-            try:
-                # Map Excel columns to model fields (using normalized column names)
-                company_data = {
-                    "name": str(record.get("name", "")).strip(),
-                    "address1": str(record.get("address_line_1", "")).strip(),
-                    "address2": str(record.get("address_line_2", "")).strip() or None,
-                    "city": str(record.get("city", "")).strip(),
-                    "state": str(record.get("state", "")).strip(),
-                    "pin_code": str(record.get("pin_code", "")).strip(),
-                    "state_code": str(record.get("state_code", "")).strip(),
-                    "contact_number": str(record.get("contact_number", "")).strip(),
-                    "email": str(record.get("email", "")).strip() or None,
-                    "gst_number": str(record.get("gst_number", "")).strip() or None,
-                    "pan_number": str(record.get("pan_number", "")).strip() or None,
-                    "registration_number": str(record.get("registration_number", "")).strip() or None,
-                    "business_type": str(record.get("business_type", "")).strip() or None,
-                    "industry": str(record.get("industry", "")).strip() or None,
-                    "website": str(record.get("website", "")).strip() or None,
-                }
+        # The upload is streamed in validated batches, each committed before the next one is read;
+        # rows with invalid cells are reported and skipped
+        for validation in CompanyExcelService.iter_import_batches(file, "Company Import Template"):
+            total_processed += validation.total
+            errors.extend(validation.messages)
+            for company_data in validation.records():
+                i = company_data.pop("_row")
+                try:
+                    # Check if company already exists for this organization
+                    existing_company = db.query(Company).filter(
+                        Company.name == company_data["name"],
+                        Company.organization_id == org_id
+                    ).first()
                 
-                # Validate required fields
-                required_fields = ["name", "address1", "city", "state", "pin_code", "state_code", "contact_number"]
-                for field in required_fields:
-                    if not company_data[field]:
-                        errors.append(f"Row {i}: {field.replace('_', ' ').title()} is required")
-                        continue
-                
-                if errors and errors[-1].startswith(f"Row {i}:"):
-                    continue
-                
-                # Check if company already exists for this organization
-                existing_company = db.query(Company).filter(
-                    Company.name == company_data["name"],
-                    Company.organization_id == org_id
-                ).first()
-                
-                if existing_company:
-                    # Update existing company
-                    for field, value in company_data.items():
-                        setattr(existing_company, field, value)
-                    updated_count += 1
-                    logger.info(f"Updated company: {company_data['name']}")
-                else:
-                    # Create new company
-                    new_company = Company(
-                        organization_id=org_id,
-                        **company_data
-                    )
-                    db.add(new_company)
-                    created_count += 1
-                    logger.info(f"Created company: {company_data['name']}")
+                    if existing_company:
+                        # Update existing company
+                        for field, value in company_data.items():
+                            setattr(existing_company, field, value)
+                        updated_count += 1
+                        logger.info(f"Updated company: {company_data['name']}")
+                    else:
+                        # Create new company
+                        new_company = Company(
+                            organization_id=org_id,
+                            **company_data
+                        )
+                        db.add(new_company)
+                        created_count += 1
+                        logger.info(f"Created company: {company_data['name']}")
                     
-                    # Mark organization as having completed company details if this is the first company
-                    if created_count == 1:
-                        org = db.query(Organization).filter(Organization.id == org_id).first()
-                        if org:
-                            org.company_details_completed = True
+                        # Mark organization as having completed company details if this is the first company
+                        if created_count == 1:
+                            org = db.query(Organization).filter(Organization.id == org_id).first()
+                            if org:
+                                org.company_details_completed = True
                     
-            except Exception as e:
-                errors.append(f"Row {i}: Error processing record - {str(e)}")
-                continue
+                except Exception as e:
+                    errors.append(f"Row {i}: Error processing record - {str(e)}")
+                    continue
+            db.commit()
         
-        # Commit all changes
-        db.commit()
+        if not total_processed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No data found in Excel file"
+            )
         
         logger.info(f"Companies import completed by {current_user.email}: "
                    f"{created_count} created, {updated_count} updated, {len(errors)} errors")
         
         return BulkImportResponse(
             message=f"Import completed successfully. {created_count} companies created, {updated_count} updated.",
-            total_processed=len(records),
+            total_processed=total_processed,
             created=created_count,
             updated=updated_count,
             errors=errors
@@ -13,7 +13,7 @@ Provides REST API endpoints for customer analytics and insights including:
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.api.v1.auth import get_current_active_user
 from app.core.org_restrictions import ensure_organization_context
 from app.models.base import User, Customer, CustomerSegment
@@ -40,7 +40,7 @@ async def get_customer_analytics(
     customer_id: int,
     include_recent_interactions: bool = Query(True, description="Include recent interactions in response"),
     recent_interactions_limit: int = Query(5, ge=1, le=20, description="Number of recent interactions to include"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -107,7 +107,7 @@ async def get_segment_analytics(
     segment_name: str,
     include_timeline: bool = Query(True, description="Include activity timeline"),
     timeline_days: int = Query(30, ge=7, le=365, description="Number of days for timeline"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -165,7 +165,7 @@ async def get_segment_analytics(
 
 @router.get("/organization/summary", response_model=OrganizationAnalyticsSummary)
 async def get_organization_analytics_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -204,7 +204,7 @@ async def get_organization_analytics_summary(
 
 @router.get("/dashboard/metrics", response_model=DashboardMetrics)
 async def get_dashboard_metrics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -297,7 +297,7 @@ async def get_dashboard_metrics(
 
 @router.get("/segments", response_model=List[str])
 async def list_available_segments(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -8,7 +8,8 @@ from app.core.tenant import TenantQueryMixin
 from app.core.org_restrictions import ensure_organization_context
 from app.models.base import User, Customer, CustomerFile
 from app.schemas.base import CustomerCreate, CustomerUpdate, CustomerInDB, BulkImportResponse, CustomerFileResponse
-from app.services.excel_service import CustomerExcelService, ExcelService
+from app.services.excel_service import CustomerExcelService, ExcelService, IMPORT_FILE_EXTENSIONS
+from app.services.master_import_service import MasterImportService
 import logging
 import os
 import uuid
@@ -250,88 +251,40 @@ async def import_customers_excel(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User must belong to an organization to import customers")
     
     # Validate file type
-    if not file.filename or not file.filename.endswith(('.xlsx', '.xls')):
+    if not file.filename or not file.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only Excel files (.xlsx, .xls) are allowed"
+            detail="Only Excel or CSV files (.xlsx, .xls, .csv) are allowed"
         )
     
     try:
-        # Parse Excel file
-        records = await ExcelService.parse_excel_file(file, CustomerExcelService.REQUIRED_COLUMNS, "Customer Import Template")
-        
-        if not records:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No data found in Excel file"
-            )
-        
+        total_processed = 0
         created_count = 0
         updated_count = 0
         errors = []
         
-        for i, record in enumerate(records, 1):
-            try:
-                # Map Excel columns to model fields (using normalized column names)
-                customer_data = {
-                    "name": str(record.get("name", "")).strip(),
-                    "contact_number": str(record.get("contact_number", "")).strip(),
-                    "email": str(record.get("email", "")).strip() or None,
-                    "address1": str(record.get("address_line_1", "")).strip(),
-                    "address2": str(record.get("address_line_2", "")).strip() or None,
-                    "city": str(record.get("city", "")).strip(),
-                    "state": str(record.get("state", "")).strip(),
-                    "pin_code": str(record.get("pin_code", "")).strip(),
-                    "state_code": str(record.get("state_code", "")).strip(),
-                    "gst_number": str(record.get("gst_number", "")).strip() or None,
-                    "pan_number": str(record.get("pan_number", "")).strip() or None,
-                }
-                
-                # Validate required fields
-                required_fields = ["name", "contact_number", "address1", "city", "state", "pin_code", "state_code"]
-                for field in required_fields:
-                    if not customer_data[field]:
-                        errors.append(f"Row {i}: {field.replace('_', ' ').title()} is required")
-                        continue
-                
-                if errors and errors[-1].startswith(f"Row {i}:"):
-                    continue
-                
-                # Check if customer already exists
-                existing_customer = db.query(Customer).filter(
-                    Customer.name == customer_data["name"],
-                    Customer.organization_id == org_id
-                ).first()
-                
-                if existing_customer:
-                    # Update existing customer
-                    for field, value in customer_data.items():
-                        setattr(existing_customer, field, value)
-                    updated_count += 1
-                    logger.info(f"Updated customer: {customer_data['name']}")
-                else:
-                    # Create new customer
-                    new_customer = Customer(
-                        organization_id=org_id,
-                        **customer_data
-                    )
-                    db.add(new_customer)
-                    created_count += 1
-                    logger.info(f"Created customer: {customer_data['name']}")
-                    
-            except Exception as e:
-                errors.append(f"Row {i}: Error processing record - {str(e)}")
-                continue
+        # The upload is streamed in validated batches, each committed before the next one is read;
+        # rows with invalid cells are reported and skipped, the others create or update masters by name
+        for validation in CustomerExcelService.iter_import_batches(file, "Customer Import Template"):
+            total_processed += validation.total
+            batch = MasterImportService.import_parties(db, org_id, Customer, validation)
+            created_count += batch.created
+            updated_count += batch.updated
+            errors.extend(batch.errors)
+            db.commit()
         
-        # Commit all changes
-        db.commit()
+        if not total_processed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No data found in Excel file"
+            )
         
         logger.info(f"Customers import completed by {current_user.email}: "
                    f"{created_count} created, {updated_count} updated, {len(errors)} errors")
         
         return BulkImportResponse(
             message=f"Import completed successfully. {created_count} customers created, {updated_count} updated.",
-            total_processed=len(records),
+            total_processed=total_processed,
             created=created_count,
             updated=updated_count,
             errors=errors
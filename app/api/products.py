@@ -8,7 +8,8 @@ from app.core.tenant import TenantQueryMixin, require_current_organization_id, v
 from app.core.org_restrictions import require_organization_access, ensure_organization_context
 from app.models.base import User, Product, Stock, ProductFile, Organization, Company
 from app.schemas.base import ProductCreate, ProductUpdate, ProductInDB, ProductResponse, BulkImportResponse, ProductFileResponse
-from app.services.excel_service import ProductExcelService, ExcelService
+from app.services.excel_service import ProductExcelService, ExcelService, IMPORT_FILE_EXTENSIONS
+from app.services.master_import_service import MasterImportService
 import logging
 import os
 import uuid
@@ -250,126 +251,37 @@ async def import_products_excel(
     validate_company_setup_for_operations(db, org_id)
     
     # Validate file type
-    if not file.filename or not file.filename.endswith(('.xlsx', '.xls')):
+    if not file.filename or not file.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only Excel files (.xlsx, .xls) are allowed"
+            detail="Only Excel or CSV files (.xlsx, .xls, .csv) are allowed"
         )
     
     try:
-        # Parse Excel file
-        records = await ExcelService.parse_excel_file(file, ProductExcelService.REQUIRED_COLUMNS, "Product Import Template")
-        
-        if not records:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No data found in Excel file"
-            )
-        
+        total_processed = 0
         created_count = 0
         updated_count = 0
         created_stocks = 0
         updated_stocks = 0
         errors = []
         
-        for i, record in enumerate(records, 1):
-            try:
-                # Map Excel columns to model fields
-                product_data = {
-                    "name": str(record.get("product_name", "")).strip(),  # Map product_name to name for DB
-                    "hsn_code": str(record.get("hsn_code", "")).strip(),
-                    "part_number": str(record.get("part_number", "")).strip(),
-                    "unit": str(record.get("unit", "")).strip(),
-                    "unit_price": float(record.get("unit_price", 0)),
-                    "gst_rate": float(record.get("gst_rate", 0)),
-                    "is_gst_inclusive": str(record.get("is_gst_inclusive", "")).upper() in ["TRUE", "YES", "1"],
-                    "reorder_level": int(float(record.get("reorder_level", 0))),
-                    "description": str(record.get("description", "")).strip(),
-                    "is_manufactured": str(record.get("is_manufactured", "")).upper() in ["TRUE", "YES", "1"],
-                }
-                
-                # Validate required fields
-                if not product_data["name"]:
-                    errors.append(f"Row {i}: Product Name is required")
-                    continue
-                    
-                if not product_data["unit"]:
-                    errors.append(f"Row {i}: Unit is required")
-                    continue
-                
-                # Check if product already exists
-                existing_product = db.query(Product).filter(
-                    Product.name == product_data["name"],
-                    Product.organization_id == org_id
-                ).first()
-                
-                product = None
-                if existing_product:
-                    # Update existing product
-                    for field, value in product_data.items():
-                        setattr(existing_product, field, value)
-                    updated_count += 1
-                    product = existing_product
-                    logger.info(f"Updated product: {product_data['name']}")
-                else:
-                    # Create new product
-                    new_product = Product(
-                        organization_id=org_id,
-                        **product_data
-                    )
-                    db.add(new_product)
-                    db.flush()  # Get the new product ID
-                    created_count += 1
-                    product = new_product
-                    logger.info(f"Created product: {product_data['name']}")
-                
-                # Handle stock creation/update for the product
-                # Check for optional initial stock quantity in Excel
-                initial_quantity = record.get("initial_quantity", None)
-                initial_location_raw = record.get("initial_location", "")
-                initial_location = str(initial_location_raw).strip() if initial_location_raw and str(initial_location_raw).strip() != 'nan' else ""
-                
-                # Only create/update stock if initial_quantity is provided or if it's a new product
-                if initial_quantity is not None or not existing_product:
-                    quantity = float(initial_quantity) if initial_quantity is not None else 0.0
-                    
-                    # Check if stock entry exists for this product
-                    existing_stock = db.query(Stock).filter(
-                        Stock.product_id == product.id,
-                        Stock.organization_id == org_id
-                    ).first()
-                    
-                    if existing_stock:
-                        # Update existing stock only if initial_quantity was provided
-                        if initial_quantity is not None:
-                            setattr(existing_stock, "quantity", quantity)
-                            existing_stock.unit = product_data["unit"]
-                            if initial_location:
-                                setattr(existing_stock, "location", initial_location)
-                            updated_stocks += 1
-                            logger.info(f"Updated stock for product: {product_data['name']}")
-                    else:
-                        # Create new stock entry
-                        new_stock = Stock(
-                            organization_id=org_id,
-                            product_id=product.id,
-                            quantity=quantity,
-                            unit=product_data["unit"],
-                            location=initial_location or "Default"
-                        )
-                        db.add(new_stock)
-                        created_stocks += 1
-                        logger.info(f"Created stock entry for product: {product_data['name']} with quantity: {quantity}")
-                    
-            except (ValueError, TypeError) as e:
-                errors.append(f"Row {i}: Invalid data format - {str(e)}")
-                continue
-            except Exception as e:
-                errors.append(f"Row {i}: Error processing record - {str(e)}")
-                continue
+        # The upload is streamed in validated batches, each committed before the next one is read;
+        # rows with invalid cells are reported and skipped, the others create or update masters by name
+        for validation in ProductExcelService.iter_import_batches(file, "Product Import Template"):
+            total_processed += validation.total
+            batch = MasterImportService.import_products(db, org_id, validation)
+            created_count += batch.created
+            updated_count += batch.updated
+            created_stocks += batch.created_stocks
+            updated_stocks += batch.updated_stocks
+            errors.extend(batch.errors)
+            db.commit()
         
-        # Commit all changes
-        db.commit()
+        if not total_processed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No data found in Excel file"
+            )
         
         logger.info(f"Products import completed by {current_user.email}: "
                    f"{created_count} created, {updated_count} updated, "
@@ -391,7 +303,7 @@ async def import_products_excel(
         
         return BulkImportResponse(
             message=message,
-            total_processed=len(records),
+            total_processed=total_processed,
             created=created_count,
             updated=updated_count,
             errors=errors
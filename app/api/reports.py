@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
-from app.core.database import get_db
-from app.api.v1.auth import get_current_active_user
+from app.core.database import get_read_db, get_async_db
+from app.api.v1.auth import get_current_active_user, get_current_active_principal
+from app.core.auth_cache import AuthenticatedPrincipal
 from app.models.base import User, Product, Stock, Vendor, Customer
 from app.models.vouchers import (
     PurchaseVoucher, SalesVoucher, PurchaseOrder, SalesOrder,
@@ -13,67 +17,47 @@ from app.core.tenant import require_current_organization_id, TenantQueryMixin
 from app.core.permissions import PermissionChecker, Permission
 from app.core.org_restrictions import ensure_organization_context
 from app.schemas.ledger import (
-    LedgerFilters, CompleteLedgerResponse, OutstandingLedgerResponse
+    LedgerFilters, CompleteLedgerResponse, CompleteLedgerPage, OutstandingLedgerResponse,
+    AgeingReportResponse
+)
+from app.services.ledger_service import LedgerService, LEDGER_PAGE_SIZE, LEDGER_MAX_PAGE_SIZE
+from app.services.account_resolver import resolve_accounts, account_name
+from app.services.dashboard_counter_service import DashboardCounterService
+from app.services.voucher_report_service import (
+    VoucherReportService, ReportFilters, REPORT_PAGE_SIZE, REPORT_MAX_PAGE_SIZE, REPORT_GROUPINGS
 )
-from app.services.ledger_service import LedgerService
 from app.services.excel_service import ExcelService, ReportsExcelService
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+REPORT_GROUP_BY_PATTERN = f"^({'|'.join(REPORT_GROUPINGS)})$"
+
 @router.get("/dashboard-stats")
 async def get_dashboard_statistics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedPrincipal = Depends(get_current_active_principal)
 ):
     """Get dashboard statistics"""
     try:
         org_id = require_current_organization_id()
         
-        # Count masters
-        vendors_count = TenantQueryMixin.filter_by_tenant(
-            db.query(Vendor), Vendor, org_id
-        ).filter(Vendor.is_active == True).count()
-        
-        customers_count = TenantQueryMixin.filter_by_tenant(
-            db.query(Customer), Customer, org_id
-        ).filter(Customer.is_active == True).count()
-        
-        products_count = TenantQueryMixin.filter_by_tenant(
-            db.query(Product), Product, org_id
-        ).filter(Product.is_active == True).count()
-        
-        # Count vouchers
-        purchase_vouchers_count = TenantQueryMixin.filter_by_tenant(
-            db.query(PurchaseVoucher), PurchaseVoucher, org_id
-        ).count()
-        
-        sales_vouchers_count = TenantQueryMixin.filter_by_tenant(
-            db.query(SalesVoucher), SalesVoucher, org_id
-        ).count()
-        
-        # Low stock items
-        low_stock_query = TenantQueryMixin.filter_by_tenant(
-            db.query(Stock), Stock, org_id
-        ).join(Product).filter(
-            Stock.quantity <= Product.reorder_level,
-            Product.is_active == True
-        )
-        low_stock_count = low_stock_query.count()
+        # Single-row read of the counters maintained on flush (see dashboard_counter_service)
+        counts = await DashboardCounterService.get_counts_async(db, org_id)
         
         return {
             "masters": {
-                "vendors": vendors_count,
-                "customers": customers_count,
-                "products": products_count
+                "vendors": counts["vendors"],
+                "customers": counts["customers"],
+                "products": counts["products"]
             },
             "vouchers": {
-                "purchase_vouchers": purchase_vouchers_count,
-                "sales_vouchers": sales_vouchers_count
+                "purchase_vouchers": counts["purchase_vouchers"],
+                "sales_vouchers": counts["sales_vouchers"]
             },
             "inventory": {
-                "low_stock_items": low_stock_count
+                "low_stock_items": counts["low_stock_items"]
             }
         }
         
@@ -84,56 +68,47 @@ async def get_dashboard_statistics(
             detail="Failed to get dashboard statistics"
         )
 
+def _voucher_report(
+    db: Session,
+    kind: str,
+    filters: ReportFilters,
+    skip: int,
+    limit: int,
+    group_by: Optional[str]
+) -> Dict[str, Any]:
+    """Summary, one page of vouchers and optional groups of a sales or purchase report"""
+    summary = VoucherReportService.summary(db, kind, filters)
+    report = {
+        "vouchers": VoucherReportService.vouchers(db, kind, filters, skip=skip, limit=limit),
+        "summary": summary,
+        "pagination": {
+            "skip": skip,
+            "limit": limit,
+            "total": summary["total_vouchers"],
+            "has_more": skip + limit < summary["total_vouchers"]
+        }
+    }
+    if group_by:
+        report["group_by"] = group_by
+        report["groups"] = VoucherReportService.groups(db, kind, filters, group_by)
+    return report
+
 @router.get("/sales-report")
 async def get_sales_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     customer_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(REPORT_PAGE_SIZE, ge=1, le=REPORT_MAX_PAGE_SIZE),
+    group_by: Optional[str] = Query(None, pattern=REPORT_GROUP_BY_PATTERN),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get sales report"""
+    """Get sales report: totals over all matching vouchers, one page of vouchers and optional groups"""
     try:
         org_id = require_current_organization_id()
-        
-        query = TenantQueryMixin.filter_by_tenant(
-            db.query(SalesVoucher), SalesVoucher, org_id
-        ).join(Customer)
-        
-        if start_date:
-            query = query.filter(SalesVoucher.date >= start_date)
-        if end_date:
-            query = query.filter(SalesVoucher.date <= end_date)
-        if customer_id:
-            query = query.filter(SalesVoucher.customer_id == customer_id)
-        
-        sales_vouchers = query.all()
-        
-        total_sales = sum(voucher.total_amount for voucher in sales_vouchers)
-        total_gst = sum(
-            voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount 
-            for voucher in sales_vouchers
-        )
-        
-        return {
-            "vouchers": [
-                {
-                    "id": voucher.id,
-                    "voucher_number": voucher.voucher_number,
-                    "date": voucher.date,
-                    "customer_name": voucher.customer.name,
-                    "total_amount": voucher.total_amount,
-                    "gst_amount": voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount,
-                    "status": voucher.status
-                }
-                for voucher in sales_vouchers
-            ],
-            "summary": {
-                "total_vouchers": len(sales_vouchers),
-                "total_sales": total_sales,
-                "total_gst": total_gst
-            }
-        }
+        filters = ReportFilters(org_id, start_date, end_date, customer_id)
+        return _voucher_report(db, "sales", filters, skip, limit, group_by)
         
     except Exception as e:
         logger.error(f"Error getting sales report: {e}")
@@ -147,51 +122,17 @@ async def get_purchase_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     vendor_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(REPORT_PAGE_SIZE, ge=1, le=REPORT_MAX_PAGE_SIZE),
+    group_by: Optional[str] = Query(None, pattern=REPORT_GROUP_BY_PATTERN),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get purchase report"""
+    """Get purchase report: totals over all matching vouchers, one page of vouchers and optional groups"""
     try:
         org_id = require_current_organization_id()
-        
-        query = TenantQueryMixin.filter_by_tenant(
-            db.query(PurchaseVoucher), PurchaseVoucher, org_id
-        ).join(Vendor)
-        
-        if start_date:
-            query = query.filter(PurchaseVoucher.date >= start_date)
-        if end_date:
-            query = query.filter(PurchaseVoucher.date <= end_date)
-        if vendor_id:
-            query = query.filter(PurchaseVoucher.vendor_id == vendor_id)
-        
-        purchase_vouchers = query.all()
-        
-        total_purchases = sum(voucher.total_amount for voucher in purchase_vouchers)
-        total_gst = sum(
-            voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount 
-            for voucher in purchase_vouchers
-        )
-        
-        return {
-            "vouchers": [
-                {
-                    "id": voucher.id,
-                    "voucher_number": voucher.voucher_number,
-                    "date": voucher.date,
-                    "vendor_name": voucher.vendor.name,
-                    "total_amount": voucher.total_amount,
-                    "gst_amount": voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount,
-                    "status": voucher.status
-                }
-                for voucher in purchase_vouchers
-            ],
-            "summary": {
-                "total_vouchers": len(purchase_vouchers),
-                "total_purchases": total_purchases,
-                "total_gst": total_gst
-            }
-        }
+        filters = ReportFilters(org_id, start_date, end_date, vendor_id)
+        return _voucher_report(db, "purchase", filters, skip, limit, group_by)
         
     except Exception as e:
         logger.error(f"Error getting purchase report: {e}")
@@ -203,7 +144,7 @@ async def get_purchase_report(
 @router.get("/inventory-report")
 async def get_inventory_report(
     low_stock_only: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get inventory report"""
@@ -258,7 +199,7 @@ async def get_inventory_report(
 @router.get("/pending-orders")
 async def get_pending_orders(
     order_type: str = "all",  # all, purchase, sales
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get pending orders report"""
@@ -271,6 +212,7 @@ async def get_pending_orders(
             purchase_orders = TenantQueryMixin.filter_by_tenant(
                 db.query(PurchaseOrder), PurchaseOrder, org_id
             ).filter(PurchaseOrder.status.in_(["draft", "pending"])).all()
+            vendors = resolve_accounts(db, (("vendor", order.vendor_id) for order in purchase_orders))
             
             for order in purchase_orders:
                 pending_orders.append({
@@ -278,7 +220,7 @@ async def get_pending_orders(
                     "type": "Purchase Order",
                     "number": order.voucher_number,
                     "date": order.date,
-                    "party": order.vendor.name if order.vendor else "Unknown",
+                    "party": account_name(vendors, "vendor", order.vendor_id, "Unknown"),
                     "amount": order.total_amount,
                     "status": order.status
                 })
@@ -287,6 +229,7 @@ async def get_pending_orders(
             sales_orders = TenantQueryMixin.filter_by_tenant(
                 db.query(SalesOrder), SalesOrder, org_id
             ).filter(SalesOrder.status.in_(["draft", "pending"])).all()
+            customers = resolve_accounts(db, (("customer", order.customer_id) for order in sales_orders))
             
             for order in sales_orders:
                 pending_orders.append({
@@ -294,7 +237,7 @@ async def get_pending_orders(
                     "type": "Sales Order",
                     "number": order.voucher_number,
                     "date": order.date,
-                    "party": order.customer.name if order.customer else "Unknown",
+                    "party": account_name(customers, "customer", order.customer_id, "Unknown"),
                     "amount": order.total_amount,
                     "status": order.status
                 })
@@ -346,7 +289,7 @@ async def get_complete_ledger(
     account_type: Optional[str] = "all",
     account_id: Optional[int] = None,
     voucher_type: Optional[str] = "all",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -395,6 +338,128 @@ async def get_complete_ledger(
         )
 
 
+@router.get("/complete-ledger/page", response_model=CompleteLedgerPage)
+async def get_complete_ledger_page(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_type: Optional[str] = "all",
+    account_id: Optional[int] = None,
+    voucher_type: Optional[str] = "all",
+    cursor: Optional[str] = None,
+    limit: int = Query(LEDGER_PAGE_SIZE, ge=1, le=LEDGER_MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get one page of the complete ledger using keyset pagination.
+    
+    **Access Control**: Super Admin, Admin, and Standard User (with access)
+    
+    **Parameters**: same filters as /complete-ledger, plus
+    - **cursor**: next_cursor from the previous page (omit for the first page)
+    - **limit**: Transactions per page
+    
+    **Returns**: Transactions ordered by date, voucher type and id, the balance each account
+    carried into the page, and the cursor for the next page
+    """
+    try:
+        # Check access permissions
+        _check_ledger_access(current_user)
+        
+        # Get organization context
+        org_id = ensure_organization_context(current_user)
+        
+        # Prepare filters
+        filters = LedgerFilters(
+            start_date=start_date,
+            end_date=end_date,
+            account_type=account_type,
+            account_id=account_id,
+            voucher_type=voucher_type
+        )
+        
+        try:
+            return LedgerService.get_complete_ledger_page(db, org_id, filters, cursor=cursor, limit=limit)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating complete ledger page: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate complete ledger report"
+        )
+
+
+def _ledger_ndjson(transactions, lines_per_chunk: int = 200):
+    """Serialize ledger transactions as newline-delimited JSON, a few hundred lines per chunk"""
+    lines = []
+    try:
+        for transaction in transactions:
+            lines.append(transaction.model_dump_json())
+            if len(lines) >= lines_per_chunk:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+    except Exception as e:
+        # Headers are already sent; log and end the stream early
+        logger.error(f"Error streaming complete ledger: {e}")
+        raise
+
+
+@router.get("/complete-ledger/stream")
+async def stream_complete_ledger(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_type: Optional[str] = "all",
+    account_id: Optional[int] = None,
+    voucher_type: Optional[str] = "all",
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream the complete ledger as NDJSON (one transaction with its running balance per line).
+    
+    Rows are fetched from the database in batches while the response is written, so memory
+    stays flat however many years of ledger are requested.
+    
+    **Access Control**: Super Admin, Admin, and Standard User (with access)
+    """
+    try:
+        # Check access permissions
+        _check_ledger_access(current_user)
+        
+        # Get organization context
+        org_id = ensure_organization_context(current_user)
+        
+        # Prepare filters
+        filters = LedgerFilters(
+            start_date=start_date,
+            end_date=end_date,
+            account_type=account_type,
+            account_id=account_id,
+            voucher_type=voucher_type
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating complete ledger stream: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate complete ledger report"
+        )
+    
+    logger.info(f"Complete ledger stream started for user {current_user.email}, org {org_id}")
+    return StreamingResponse(
+        _ledger_ndjson(LedgerService.iter_transactions(db, org_id, filters)),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get("/outstanding-ledger", response_model=OutstandingLedgerResponse)
 async def get_outstanding_ledger(
     start_date: Optional[date] = None,
@@ -402,7 +467,7 @@ async def get_outstanding_ledger(
     account_type: Optional[str] = "all",
     account_id: Optional[int] = None,
     voucher_type: Optional[str] = "all",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -455,13 +520,58 @@ async def get_outstanding_ledger(
         )
 
 
+@router.get("/ageing-report", response_model=AgeingReportResponse)
+async def get_ageing_report(
+    as_of_date: Optional[date] = None,
+    account_type: Optional[str] = "all",
+    account_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get receivables/payables ageing in 0-30, 31-60, 61-90 and 90+ day buckets.
+    
+    **Access Control**: Super Admin, Admin, and Standard User (with access)
+    
+    **Parameters**:
+    - **as_of_date**: Date ages are measured from (YYYY-MM-DD, default today)
+    - **account_type**: Type of account ("vendor", "customer", "all")
+    - **account_id**: Specific vendor or customer ID to filter by
+    
+    **Returns**: Open amounts per account, matched first-in first-out against receipts and payments
+    """
+    try:
+        # Check access permissions
+        _check_ledger_access(current_user)
+        
+        # Get organization context
+        org_id = ensure_organization_context(current_user)
+        
+        # Prepare filters
+        filters = LedgerFilters(account_type=account_type, account_id=account_id)
+        
+        ageing_response = LedgerService.get_ageing_report(db, org_id, filters, as_of_date)
+        
+        logger.info(f"Ageing report generated for user {current_user.email}, org {org_id}")
+        return ageing_response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating ageing report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate ageing report"
+        )
+
+
 # Export endpoints
 @router.get("/sales-report/export/excel")
 async def export_sales_report_excel(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     customer_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export sales report to Excel"""
@@ -475,47 +585,15 @@ async def export_sales_report_excel(
         
         org_id = require_current_organization_id()
         
-        # Get sales data using the same logic as the sales report endpoint
-        query = TenantQueryMixin.filter_by_tenant(
-            db.query(SalesVoucher), SalesVoucher, org_id
-        ).join(Customer)
-        
-        if start_date:
-            query = query.filter(SalesVoucher.date >= start_date)
-        if end_date:
-            query = query.filter(SalesVoucher.date <= end_date)
-        if customer_id:
-            query = query.filter(SalesVoucher.customer_id == customer_id)
-        
-        sales_vouchers = query.all()
-        
-        total_sales = sum(voucher.total_amount for voucher in sales_vouchers)
-        total_gst = sum(
-            voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount 
-            for voucher in sales_vouchers
-        )
-        
-        sales_data = {
-            "vouchers": [
-                {
-                    "voucher_number": voucher.voucher_number,
-                    "date": voucher.date,
-                    "customer_name": voucher.customer.name,
-                    "total_amount": voucher.total_amount,
-                    "gst_amount": voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount,
-                    "status": voucher.status
-                }
-                for voucher in sales_vouchers
-            ],
-            "summary": {
-                "total_vouchers": len(sales_vouchers),
-                "total_sales": total_sales,
-                "total_gst": total_gst
-            }
-        }
+        # Same filters as the sales report endpoint, without pagination
+        filters = ReportFilters(org_id, start_date, end_date, customer_id)
+        summary = VoucherReportService.summary(db, "sales", filters)
         
-        excel_data = ReportsExcelService.export_sales_report(sales_data)
-        return ExcelService.create_streaming_response(excel_data, "sales_report.xlsx")
+        # Rows go from a server-side cursor straight into a write-only workbook
+        return ExcelService.create_chunked_response(
+            ReportsExcelService.stream_sales_report(VoucherReportService.iter_vouchers(db, "sales", filters), summary),
+            "sales_report.xlsx"
+        )
         
     except HTTPException:
         raise
@@ -532,7 +610,7 @@ async def export_purchase_report_excel(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     vendor_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export purchase report to Excel"""
@@ -546,47 +624,17 @@ async def export_purchase_report_excel(
         
         org_id = require_current_organization_id()
         
-        # Get purchase data using the same logic as the purchase report endpoint
-        query = TenantQueryMixin.filter_by_tenant(
-            db.query(PurchaseVoucher), PurchaseVoucher, org_id
-        ).join(Vendor)
-        
-        if start_date:
-            query = query.filter(PurchaseVoucher.date >= start_date)
-        if end_date:
-            query = query.filter(PurchaseVoucher.date <= end_date)
-        if vendor_id:
-            query = query.filter(PurchaseVoucher.vendor_id == vendor_id)
-        
-        purchase_vouchers = query.all()
-        
-        total_purchases = sum(voucher.total_amount for voucher in purchase_vouchers)
-        total_gst = sum(
-            voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount 
-            for voucher in purchase_vouchers
-        )
+        # Same filters as the purchase report endpoint, without pagination
+        filters = ReportFilters(org_id, start_date, end_date, vendor_id)
+        summary = VoucherReportService.summary(db, "purchase", filters)
         
-        purchase_data = {
-            "vouchers": [
-                {
-                    "voucher_number": voucher.voucher_number,
-                    "date": voucher.date,
-                    "vendor_name": voucher.vendor.name,
-                    "total_amount": voucher.total_amount,
-                    "gst_amount": voucher.cgst_amount + voucher.sgst_amount + voucher.igst_amount,
-                    "status": voucher.status
-                }
-                for voucher in purchase_vouchers
-            ],
-            "summary": {
-                "total_vouchers": len(purchase_vouchers),
-                "total_purchases": total_purchases,
-                "total_gst": total_gst
-            }
-        }
-        
-        excel_data = ReportsExcelService.export_purchase_report(purchase_data)
-        return ExcelService.create_streaming_response(excel_data, "purchase_report.xlsx")
+        # Rows go from a server-side cursor straight into a write-only workbook
+        return ExcelService.create_chunked_response(
+            ReportsExcelService.stream_purchase_report(
+                VoucherReportService.iter_vouchers(db, "purchase", filters), summary
+            ),
+            "purchase_report.xlsx"
+        )
         
     except HTTPException:
         raise
@@ -601,7 +649,7 @@ async def export_purchase_report_excel(
 @router.get("/inventory-report/export/excel")
 async def export_inventory_report_excel(
     include_zero_stock: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export inventory report to Excel"""
@@ -663,7 +711,7 @@ async def export_inventory_report_excel(
 @router.get("/pending-orders/export/excel")
 async def export_pending_orders_excel(
     order_type: str = "all",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export pending orders report to Excel"""
@@ -684,13 +732,14 @@ async def export_pending_orders_excel(
             purchase_orders = TenantQueryMixin.filter_by_tenant(
                 db.query(PurchaseOrder), PurchaseOrder, org_id
             ).filter(PurchaseOrder.status.in_(["pending", "partial"])).join(Vendor).all()
+            vendors = resolve_accounts(db, (("vendor", order.vendor_id) for order in purchase_orders))
             
             orders.extend([
                 {
                     "order_number": order.order_number,
                     "order_type": "Purchase Order",
                     "date": order.date,
-                    "party_name": order.vendor.name,
+                    "party_name": account_name(vendors, "vendor", order.vendor_id),
                     "total_amount": order.total_amount,
                     "status": order.status,
                     "days_pending": (datetime.now().date() - order.date).days
@@ -703,13 +752,14 @@ async def export_pending_orders_excel(
             sales_orders = TenantQueryMixin.filter_by_tenant(
                 db.query(SalesOrder), SalesOrder, org_id
             ).filter(SalesOrder.status.in_(["pending", "partial"])).join(Customer).all()
+            customers = resolve_accounts(db, (("customer", order.customer_id) for order in sales_orders))
             
             orders.extend([
                 {
                     "order_number": order.order_number,
                     "order_type": "Sales Order",
                     "date": order.date,
-                    "party_name": order.customer.name,
+                    "party_name": account_name(customers, "customer", order.customer_id),
                     "total_amount": order.total_amount,
                     "status": order.status,
                     "days_pending": (datetime.now().date() - order.date).days
@@ -747,7 +797,7 @@ async def export_complete_ledger_excel(
     account_type: str = "all",
     account_id: Optional[int] = None,
     voucher_type: str = "all",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export complete ledger to Excel"""
@@ -774,11 +824,11 @@ async def export_complete_ledger_excel(
             voucher_type=voucher_type
         )
         
-        # Generate complete ledger
-        ledger_response = LedgerService.get_complete_ledger(db, org_id, filters)
-        
-        excel_data = ReportsExcelService.export_ledger_report(ledger_response.dict(), "complete")
-        return ExcelService.create_streaming_response(excel_data, "complete_ledger_report.xlsx")
+        # Stream transactions in batches into a write-only workbook instead of building the whole ledger
+        return ExcelService.create_chunked_response(
+            ReportsExcelService.stream_complete_ledger(LedgerService.iter_transactions(db, org_id, filters)),
+            "complete_ledger_report.xlsx"
+        )
         
     except HTTPException:
         raise
@@ -790,6 +840,47 @@ async def export_complete_ledger_excel(
         )
 
 
+@router.get("/ageing-report/export/excel")
+async def export_ageing_report_excel(
+    as_of_date: Optional[date] = None,
+    account_type: str = "all",
+    account_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Export ageing report to Excel"""
+    try:
+        # Check access permissions
+        _check_ledger_access(current_user)
+        
+        # Check if user has permission to export reports
+        if not PermissionChecker.has_permission(current_user, Permission.VIEW_USERS):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions to export reports"
+            )
+        
+        # Get organization context
+        org_id = ensure_organization_context(current_user)
+        
+        filters = LedgerFilters(account_type=account_type, account_id=account_id)
+        ageing_response = LedgerService.get_ageing_report(db, org_id, filters, as_of_date)
+        
+        excel_data = ReportsExcelService.export_ageing_report(ageing_response.model_dump())
+        return ExcelService.create_streaming_response(
+            excel_data, f"ageing_report_{ageing_response.as_of_date.isoformat()}.xlsx"
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting ageing report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to export ageing report"
+        )
+
+
 @router.get("/outstanding-ledger/export/excel")
 async def export_outstanding_ledger_excel(
     start_date: Optional[date] = None,
@@ -797,7 +888,7 @@ async def export_outstanding_ledger_excel(
     account_type: str = "all",
     account_id: Optional[int] = None,
     voucher_type: str = "all",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export outstanding ledger to Excel"""
@@ -0,0 +1,63 @@
+# app/api/router_manifest.py
+
+"""
+Routers included by app.main, in registration order.
+
+Order matters: static path routers must come before routers with dynamic
+paths under the same prefix (e.g. BOM and manufacturing under /api/v1).
+"""
+
+from app.core.lazy_router import RouterEntry
+
+ROUTER_MANIFEST = [
+    # ENHANCED V1 API ROUTERS
+    RouterEntry("app.api.v1.auth", "/api/v1/auth", ["authentication-v1"]),
+    RouterEntry("app.api.v1.admin", "/api/v1/admin", ["admin-v1"]),
+    RouterEntry("app.api.v1.reset", "/api/v1/reset", ["reset-v1"]),
+    RouterEntry("app.api.v1.app_users", "/api/v1/app-users", ["app-user-management"]),
+    RouterEntry("app.api.v1.admin_setup", "/api/v1/admin-setup", ["admin-setup-v1"]),
+    RouterEntry("app.api.v1.login", "/api/v1/login", ["login-v1"]),
+    RouterEntry("app.api.v1.master_auth", "/api/v1/master-auth", ["master-auth-v1"]),
+    RouterEntry("app.api.v1.otp", "/api/v1/otp", ["otp-v1"]),
+    RouterEntry("app.api.v1.password", "/api/v1/password", ["password-v1"]),
+    RouterEntry("app.api.v1.user", "/api/v1/user", ["v1-user"]),
+    # PDF Extraction API (PyMuPDF)
+    RouterEntry("app.api.v1.pdf_extraction", "/api/v1/pdf-extraction", ["pdf-extraction"]),
+    # Service CRM RBAC API
+    RouterEntry("app.api.v1.rbac", "/api/v1/rbac", ["service-crm-rbac"]),
+
+    # LEGACY API ROUTERS (business modules)
+    RouterEntry("app.api.platform", "/api/v1/platform", ["platform"]),
+    RouterEntry("app.api.v1.organizations", "/api/v1/organizations", ["organizations"]),
+    RouterEntry("app.api.users", "/api/v1/users", ["users"]),
+    RouterEntry("app.api.routes.admin", "/api/admin", ["admin-legacy"]),
+    RouterEntry("app.api.companies", "/api/v1/companies", ["companies"]),
+    RouterEntry("app.api.vendors", "/api/v1/vendors", ["vendors"]),
+    RouterEntry("app.api.customers", "/api/v1/customers", ["customers"]),
+    RouterEntry("app.api.products", "/api/v1/products", ["products"]),
+
+    # Company branding and PDF audit endpoints (static)
+    RouterEntry("app.api.v1.company_branding", "/api/v1/company", ["company-branding"]),
+    RouterEntry("app.api.v1.company_branding", "/api/v1/audit", ["audit"]),
+
+    RouterEntry("app.api.v1.vouchers", "/api/v1"),
+    RouterEntry("app.api.reports", "/api/v1/reports", ["reports"]),
+    RouterEntry("app.api.v1.exports", "/api/v1/exports", ["exports"]),
+    RouterEntry("app.api.v1.imports", "/api/v1/imports", ["imports"]),
+    RouterEntry("app.api.settings", "/api/v1/settings", ["settings"]),
+    RouterEntry("app.api.pincode", "/api/v1/pincode", ["pincode"]),
+    RouterEntry("app.api.customer_analytics", "/api/v1/analytics", ["customer-analytics"]),
+    RouterEntry("app.api.notifications", "/api/v1/notifications", ["notifications"]),
+
+    # Include static path routers BEFORE dynamic ones to prevent conflicts
+    RouterEntry("app.api.v1.stock", "/api/v1/stock", ["stock"]),
+    RouterEntry("app.api.v1.sla", "/api/v1/sla", ["sla"]),
+    RouterEntry("app.api.v1.dispatch", "/api/v1/dispatch", ["dispatch"]),
+    RouterEntry("app.api.v1.feedback", "/api/v1/feedback", ["feedback-closure"]),
+    RouterEntry("app.api.v1.inventory", "/api/v1/inventory", ["inventory-management"]),
+    RouterEntry("app.api.v1.service_analytics", "/api/v1/service-analytics", ["service-analytics"]),
+
+    # Include dynamic path routers LAST
+    RouterEntry("app.api.v1.bom", "/api/v1", ["bom"]),
+    RouterEntry("app.api.v1.manufacturing", "/api/v1", ["manufacturing"]),
+]
@@ -2,19 +2,21 @@
 Enhanced admin endpoints (API v1) with comprehensive permission checking and audit logging
 """
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import secrets
 import string
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, read_router
 from app.api.v1.auth import get_current_active_user, get_current_super_admin, get_current_admin_user
 from app.core.permissions import (
     PermissionChecker, Permission, require_super_admin, require_org_admin, 
     require_password_reset_permission
 )
 from app.core.audit import AuditLogger, get_client_ip, get_user_agent
+from app.core.pool_metrics import get_pool_stats, render_prometheus
 from app.models.base import User, Organization
 from app.schemas.user import (
     UserCreate, UserUpdate, UserInDB, AdminPasswordResetRequest, 
@@ -652,4 +654,28 @@ async def setup_organization_admin(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to setup organization admin"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/pool-stats")
+async def get_database_pool_stats(
+    current_user: User = Depends(get_current_super_admin)
+):
+    """Database connection pool telemetry: checkout wait, checked-out, overflow, invalidations (super admin only)"""
+    return {"pools": get_pool_stats()}
+
+
+@router.get("/pool-stats/prometheus", response_class=PlainTextResponse)
+async def get_database_pool_stats_prometheus(
+    current_user: User = Depends(get_current_super_admin)
+):
+    """Database connection pool telemetry in Prometheus text format (super admin only)"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/read-replica-status")
+async def get_read_replica_status(
+    current_user: User = Depends(get_current_super_admin)
+):
+    """Read replica routing: availability, last measured lag, replica vs primary sessions (super admin only)"""
+    return read_router.status()
@@ -11,8 +11,10 @@ from app.core.security import (
     get_password_hash,
     oauth2_scheme,
     verify_token,
-    get_current_user as core_get_current_user
+    get_current_user as core_get_current_user,
+    get_current_principal as core_get_current_principal
 )
+from app.core.auth_cache import AuthenticatedPrincipal
 from app.core.audit import create_audit_log
 from app.models.base import User, PlatformUser
 from app.schemas.user import UserResponse, Token, EmailLogin, LoginResponse, PlatformUserInDB
@@ -157,6 +159,12 @@ def get_current_active_user(current_user: User = Depends(core_get_current_user))
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+def get_current_active_principal(current_user: AuthenticatedPrincipal = Depends(core_get_current_principal)):
+    """Cached, read-only variant of get_current_active_user for hot read routes"""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
 def get_current_admin_user(current_user: User = Depends(get_current_active_user)):
     if current_user.role not in ["admin", "org_admin", "super_admin"]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
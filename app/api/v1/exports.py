@@ -0,0 +1,166 @@
+# app/api/v1/exports.py
+
+"""
+Background Excel exports.
+
+POST /exports/{kind} queues an export and returns its job id at once; clients poll
+GET /exports/{job_id} for progress and fetch GET /exports/{job_id}/download when
+the job is completed. Files are kept for EXPORT_JOB_TTL_MINUTES. A job is only
+visible to users of its organization who may submit that kind of export.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+
+from app.api.v1.auth import get_current_active_user
+from app.core.permissions import PermissionChecker, Permission
+from app.core.tenant import require_current_organization_id
+from app.models.base import User
+from app.schemas.export_job import ExportJobResponse
+from app.services.export_job_service import (
+    get_export_job_manager, ExportJob, ExportJobLimitError, EXPORT_KINDS, JOB_COMPLETED
+)
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Kinds gated like their inline /reports/*/export/excel endpoints
+REPORT_EXPORT_KINDS = ("sales-report", "purchase-report", "complete-ledger")
+
+
+def _timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+
+def _job_response(job: ExportJob) -> ExportJobResponse:
+    return ExportJobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        params=job.params,
+        rows_written=job.rows_written,
+        rows_total=job.rows_total,
+        progress=job.progress,
+        filename=job.filename,
+        file_size=job.file_size,
+        error=job.error,
+        created_at=_timestamp(job.created_at),
+        started_at=_timestamp(job.started_at),
+        finished_at=_timestamp(job.finished_at),
+        expires_at=_timestamp(job.expires_at),
+        download_url=f"/api/v1/exports/{job.id}/download" if job.status == JOB_COMPLETED else None,
+    )
+
+
+
+
+def _check_export_access(kind: str, current_user: User) -> None:
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export '{kind}'. Available exports: {', '.join(EXPORT_KINDS)}"
+        )
+    if kind in REPORT_EXPORT_KINDS and not PermissionChecker.has_permission(current_user, Permission.VIEW_USERS):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to export reports"
+        )
+    if kind == "complete-ledger":
+        from app.api.reports import _check_ledger_access
+        _check_ledger_access(current_user)
+
+
+def _may_export(kind: str, current_user: User) -> bool:
+    try:
+        _check_export_access(kind, current_user)
+    except HTTPException:
+        return False
+    return True
+
+
+def _get_job(job_id: str, current_user: User) -> ExportJob:
+    """Get an export job of the current organization that the user may export themselves"""
+    job = get_export_job_manager().get(job_id, require_current_organization_id())
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    _check_export_access(job.kind, current_user)
+    return job
+
+
+@router.post("/{kind}", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_export(
+    kind: str,
+    params: Optional[Dict[str, Any]] = Body(default=None),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Queue a background export; the body holds the same filters as the inline export endpoint"""
+    _check_export_access(kind, current_user)
+    org_id = require_current_organization_id()
+    try:
+        job = get_export_job_manager().submit(kind, org_id, current_user.id, params)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False)
+        )
+    except ExportJobLimitError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+    logger.info(f"Export {kind} job {job.id} submitted by {current_user.email}")
+    return _job_response(job)
+
+
+@router.get("", response_model=List[ExportJobResponse])
+async def list_exports(
+    current_user: User = Depends(get_current_active_user)
+):
+    """List the organization's export jobs of the kinds the user may export, newest first"""
+    jobs = get_export_job_manager().list(require_current_organization_id())
+    return [_job_response(job) for job in jobs if _may_export(job.kind, current_user)]
+
+
+@router.get("/{job_id}", response_model=ExportJobResponse)
+async def get_export(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the status and progress of an export job"""
+    return _job_response(_get_job(job_id, current_user))
+
+
+@router.get("/{job_id}/download")
+async def download_export(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download the file of a completed export job"""
+    job = _get_job(job_id, current_user)
+    if job.status != JOB_COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job is {job.status}" + (f": {job.error}" if job.error else "")
+        )
+    path = get_export_job_manager().file_path(job)
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Export file has expired")
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=job.filename
+    )
+
+
+@router.delete("/{job_id}")
+async def delete_export(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Cancel an active export job, or delete a finished one and its file"""
+    job = _get_job(job_id, current_user)
+    get_export_job_manager().cancel(job.id, job.organization_id)
+    return {"message": "Export job cancelled" if job.status in ("queued", "running") else "Export job deleted"}
@@ -0,0 +1,157 @@
+# app/api/v1/imports.py
+
+"""
+Background Excel/CSV imports.
+
+POST /imports/{kind} stores the upload and queues its import, returning the job id at
+once; clients poll GET /imports/{job_id} for the rows processed so far, the totals and
+the row errors of every committed chunk. A failed job can be resumed from its last
+committed chunk with POST /imports/{job_id}/resume.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.api.v1.auth import get_current_active_user
+from app.core.database import get_db
+from app.core.tenant import require_current_organization_id, validate_company_setup_for_operations
+from app.models.base import ImportJob, User
+from app.schemas.import_job import ImportJobResponse
+from app.services.import_job_service import (
+    get_import_job_manager, ImportJobError, ImportJobLimitError, IMPORT_KINDS, ACTIVE_STATUSES, JOB_COMPLETED
+)
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive values; they are stored in UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _job_response(job: ImportJob) -> ImportJobResponse:
+    if job.status == JOB_COMPLETED:
+        progress = 1.0
+    elif job.rows_total:
+        progress = min(job.rows_processed / job.rows_total, 1.0)
+    else:
+        progress = None
+    return ImportJobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        params=job.params or {},
+        filename=job.filename,
+        chunk_size=job.chunk_size,
+        rows_processed=job.rows_processed,
+        rows_total=job.rows_total,
+        progress=progress,
+        counts=job.counts or {},
+        error_count=job.error_count,
+        errors=job.errors or [],
+        warnings=job.warnings or [],
+        error=job.error,
+        attempts=job.attempts,
+        created_at=_timestamp(job.created_at),
+        started_at=_timestamp(job.started_at),
+        heartbeat_at=_timestamp(job.heartbeat_at),
+        finished_at=_timestamp(job.finished_at),
+    )
+
+
+def _get_job(job_id: str) -> ImportJob:
+    job = get_import_job_manager().get(job_id, require_current_organization_id())
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
+
+
+@router.post("/{kind}", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_import(
+    kind: str,
+    file: UploadFile = File(...),
+    mode: Optional[str] = Form(None, description="Stock imports only: 'add' or 'replace' (default)"),
+    chunk_size: Optional[int] = Form(None, description="Sheet rows committed per chunk"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Queue a background import of an Excel or CSV file in the template's format"""
+    if kind not in IMPORT_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown import '{kind}'. Available imports: {', '.join(IMPORT_KINDS)}"
+        )
+    org_id = require_current_organization_id()
+    if IMPORT_KINDS[kind].requires_company:
+        # Validate company setup is completed before allowing inventory operations
+        validate_company_setup_for_operations(db, org_id)
+
+    params = {"mode": mode} if mode is not None else {}
+    try:
+        # Copying the upload to storage is blocking file I/O
+        job = await asyncio.to_thread(
+            get_import_job_manager().submit, kind, org_id, current_user.id, file, params, chunk_size
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False)
+        )
+    except ImportJobLimitError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    except ImportJobError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    logger.info(f"Import {kind} job {job.id} submitted by {current_user.email}")
+    return _job_response(job)
+
+
+@router.get("", response_model=List[ImportJobResponse])
+async def list_imports(
+    current_user: User = Depends(get_current_active_user)
+):
+    """List the organization's recent import jobs, newest first"""
+    return [_job_response(job) for job in get_import_job_manager().list(require_current_organization_id())]
+
+
+@router.get("/{job_id}", response_model=ImportJobResponse)
+async def get_import(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the status, progress and row errors of an import job"""
+    return _job_response(_get_job(job_id))
+
+
+@router.post("/{job_id}/resume", response_model=ImportJobResponse)
+async def resume_import(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Queue a failed import job again; it continues after its last committed chunk"""
+    job = _get_job(job_id)
+    try:
+        job = get_import_job_manager().resume(job.id, job.organization_id)
+    except ImportJobError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return _job_response(job)
+
+
+@router.delete("/{job_id}")
+async def delete_import(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Cancel an active import job (committed chunks stay imported), or delete a finished one"""
+    job = _get_job(job_id)
+    get_import_job_manager().cancel(job.id, job.organization_id)
+    return {"message": "Import job cancelled" if job.status in ACTIVE_STATUSES else "Import job deleted"}
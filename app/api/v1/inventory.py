@@ -14,7 +14,7 @@ from app.core.org_restrictions import require_current_organization_id
 from app.core.rbac_dependencies import check_service_permission
 from app.models.base import (
     User, Stock, Product, Organization, InventoryTransaction, 
-    JobParts, InventoryAlert, InstallationJob
+    JobParts, InventoryAlert, InstallationJob, StockMovement
 )
 from app.schemas.inventory import (
     InventoryTransactionCreate, InventoryTransactionUpdate, InventoryTransactionResponse,
@@ -23,8 +23,11 @@ from app.schemas.inventory import (
     InventoryUsageReport, InventoryValueReport, LowStockReport,
     BulkJobPartsAssignment, BulkInventoryAdjustment, BulkInventoryResponse,
     InventoryFilter, InventoryListResponse, TransactionType, JobPartsStatus,
-    AlertType, AlertStatus, AlertPriority
+    AlertType, AlertStatus, AlertPriority,
+    StockMovementResponse, StockLocationBalance, ProductStockBalances,
+    StockReconciliationItem, StockReconciliationResponse
 )
+from app.services.stock_ledger_service import StockLedgerService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -50,50 +53,40 @@ class InventoryService:
     @staticmethod
     def update_stock_level(db: Session, organization_id: int, product_id: int, 
                           new_quantity: float, location: Optional[str] = None):
-        """Update stock level for a product"""
+        """Set the stock level of a product, recording the difference in the stock ledger"""
+        StockLedgerService.set_quantity(db, organization_id, product_id, new_quantity, location=location)
+        db.commit()
+        
         query = db.query(Stock).filter(
             Stock.organization_id == organization_id,
             Stock.product_id == product_id
         )
-        if location:
+        if location is not None:
             query = query.filter(Stock.location == location)
-        
-        stock_record = query.first()
-        if stock_record:
-            stock_record.quantity = new_quantity
-        else:
-            # Create new stock record if it doesn't exist
-            product = db.query(Product).filter(Product.id == product_id).first()
-            if product:
-                stock_record = Stock(
-                    organization_id=organization_id,
-                    product_id=product_id,
-                    quantity=new_quantity,
-                    unit=product.unit,
-                    location=location
-                )
-                db.add(stock_record)
-        
-        db.commit()
-        return stock_record
+        return query.order_by(Stock.id).first()
     
     @staticmethod
     def create_inventory_transaction(db: Session, organization_id: int, user_id: int,
                                    transaction_data: InventoryTransactionCreate) -> InventoryTransaction:
-        """Create an inventory transaction and update stock"""
-        current_stock = InventoryService.get_current_stock(
-            db, organization_id, transaction_data.product_id, transaction_data.location
-        )
+        """Create an inventory transaction and move its quantity in the stock ledger"""
+        if transaction_data.transaction_type == TransactionType.ISSUE:
+            quantity_change = -abs(transaction_data.quantity)  # Ensure negative for issues
+        else:  # RECEIPT, ADJUSTMENT, TRANSFER
+            quantity_change = transaction_data.quantity
         
-        # Calculate new stock level
-        if transaction_data.transaction_type in [TransactionType.RECEIPT]:
-            new_stock = current_stock + transaction_data.quantity
-        elif transaction_data.transaction_type in [TransactionType.ISSUE]:
-            new_stock = current_stock - abs(transaction_data.quantity)  # Ensure negative for issues
-            if new_stock < 0:
-                raise ValueError(f"Insufficient stock. Current: {current_stock}, Requested: {abs(transaction_data.quantity)}")
-        else:  # ADJUSTMENT
-            new_stock = current_stock + transaction_data.quantity
+        # The balance changes in one atomic UPDATE that locks the stock entry until commit, so
+        # concurrent issues cannot read the same level and overwrite each other; issues may not
+        # take it below zero (raises InsufficientStockError, a ValueError)
+        movement = StockLedgerService.apply_movement(
+            db, organization_id, transaction_data.product_id, quantity_change,
+            transaction_data.transaction_type.value,
+            location=transaction_data.location,
+            unit=transaction_data.unit,
+            allow_negative=transaction_data.transaction_type != TransactionType.ISSUE,
+            notes=transaction_data.notes,
+            user_id=user_id
+        )
+        new_stock = movement.balance_after
         
         # Create transaction record
         transaction = InventoryTransaction(
@@ -109,18 +102,17 @@ class InventoryService:
             notes=transaction_data.notes,
             unit_cost=transaction_data.unit_cost,
             total_cost=transaction_data.total_cost,
-            stock_before=current_stock,
+            stock_before=new_stock - quantity_change,
             stock_after=new_stock,
             transaction_date=transaction_data.transaction_date,
             created_by_id=user_id
         )
         
         db.add(transaction)
-        
-        # Update stock level
-        InventoryService.update_stock_level(
-            db, organization_id, transaction_data.product_id, new_stock, transaction_data.location
-        )
+        # Get the transaction ID before the movement is written
+        db.flush([transaction])
+        movement.reference_type = "inventory_transaction"
+        movement.reference_id = transaction.id
         
         # Check for low stock alerts
         InventoryService.check_and_create_alerts(db, organization_id, transaction_data.product_id, new_stock)
@@ -274,6 +266,105 @@ async def create_inventory_transaction(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+# Stock Ledger Endpoints
+@router.get("/movements", response_model=List[StockMovementResponse])
+async def get_stock_movements(
+    skip: int = 0,
+    limit: int = 100,
+    product_id: Optional[int] = None,
+    location: Optional[str] = None,
+    movement_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get stock movements from the ledger, newest first"""
+    organization_id = require_current_organization_id(current_user)
+    
+    # Check permissions
+    check_service_permission(
+        user=current_user, 
+        module="inventory", 
+        action="read",
+        db=db
+    )
+    
+    query = db.query(StockMovement).filter(StockMovement.organization_id == organization_id)
+    if product_id:
+        query = query.filter(StockMovement.product_id == product_id)
+    if location is not None:
+        query = query.filter(StockMovement.location == location)
+    if movement_type:
+        query = query.filter(StockMovement.movement_type == movement_type)
+    
+    return query.order_by(desc(StockMovement.id)).offset(skip).limit(limit).all()
+
+
+@router.get("/products/{product_id}/balances", response_model=ProductStockBalances)
+async def get_product_stock_balances(
+    product_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a product's stock balance at each location"""
+    organization_id = require_current_organization_id(current_user)
+    
+    # Check permissions
+    check_service_permission(
+        user=current_user, 
+        module="inventory", 
+        action="read",
+        db=db
+    )
+    
+    product = db.query(Product).filter(
+        Product.id == product_id,
+        Product.organization_id == organization_id
+    ).first()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    entries = StockLedgerService.balances(db, organization_id, product_id)
+    return ProductStockBalances(
+        product_id=product.id,
+        product_name=product.name,
+        total_quantity=sum(entry.quantity for entry in entries),
+        locations=[
+            StockLocationBalance(
+                stock_id=entry.id,
+                location=entry.location,
+                quantity=entry.quantity,
+                unit=entry.unit,
+                last_updated=entry.last_updated
+            )
+            for entry in entries
+        ]
+    )
+
+
+@router.get("/reconciliation", response_model=StockReconciliationResponse)
+async def get_stock_reconciliation(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Check that every stock balance equals the sum of its movements"""
+    organization_id = require_current_organization_id(current_user)
+    
+    # Check permissions
+    check_service_permission(
+        user=current_user, 
+        module="inventory_reports", 
+        action="read",
+        db=db
+    )
+    
+    mismatches = StockLedgerService.reconcile(db, organization_id)
+    return StockReconciliationResponse(
+        checked_at=datetime.utcnow(),
+        in_balance=not mismatches,
+        mismatches=[StockReconciliationItem(**mismatch) for mismatch in mismatches]
+    )
+
+
 # Job Parts Endpoints
 @router.get("/job-parts", response_model=List[JobPartsResponse])
 async def get_job_parts(
@@ -10,7 +10,7 @@ from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.base import User, InstallationJob, Customer
 from app.services.service_analytics_service import ServiceAnalyticsService, get_service_analytics_service
 from app.schemas.service_analytics import (
@@ -40,7 +40,7 @@ async def get_analytics_dashboard(
     end_date: Optional[date] = Query(None, description="Custom end date"),
     technician_id: Optional[int] = Query(None, description="Filter by technician"),
     customer_id: Optional[int] = Query(None, description="Filter by customer"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read),
     _: int = Depends(require_same_organization)
 ):
@@ -73,7 +73,7 @@ async def get_job_completion_metrics(
     end_date: Optional[date] = Query(None, description="Custom end date"),
     technician_id: Optional[int] = Query(None, description="Filter by technician"),
     customer_id: Optional[int] = Query(None, description="Filter by customer"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read),
     _: int = Depends(require_same_organization)
 ):
@@ -105,7 +105,7 @@ async def get_technician_performance_metrics(
     period: ReportPeriod = Query(ReportPeriod.MONTH, description="Report period"),
     start_date: Optional[date] = Query(None, description="Custom start date"),
     end_date: Optional[date] = Query(None, description="Custom end date"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_manage),  # Managers only
     _: int = Depends(require_same_organization)
 ):
@@ -137,7 +137,7 @@ async def get_customer_satisfaction_metrics(
     end_date: Optional[date] = Query(None, description="Custom end date"),
     technician_id: Optional[int] = Query(None, description="Filter by technician"),
     customer_id: Optional[int] = Query(None, description="Filter by customer"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read),
     _: int = Depends(require_same_organization)
 ):
@@ -171,7 +171,7 @@ async def get_job_volume_metrics(
     end_date: Optional[date] = Query(None, description="Custom end date"),
     technician_id: Optional[int] = Query(None, description="Filter by technician"),
     customer_id: Optional[int] = Query(None, description="Filter by customer"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read),
     _: int = Depends(require_same_organization)
 ):
@@ -205,7 +205,7 @@ async def get_sla_compliance_metrics(
     end_date: Optional[date] = Query(None, description="Custom end date"),
     technician_id: Optional[int] = Query(None, description="Filter by technician"),
     customer_id: Optional[int] = Query(None, description="Filter by customer"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_manage),  # Managers only
     _: int = Depends(require_same_organization)
 ):
@@ -236,7 +236,7 @@ async def get_sla_compliance_metrics(
 async def get_report_configurations(
     organization_id: int = Path(..., description="Organization ID"),
     active_only: bool = Query(True, description="Filter by active configurations"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read),
     _: int = Depends(require_same_organization)
 ):
@@ -309,7 +309,7 @@ async def export_analytics_data(
 @router.get("/organizations/{organization_id}/analytics/technicians")
 async def get_available_technicians(
     organization_id: int = Path(..., description="Organization ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read),
     _: int = Depends(require_same_organization)
 ):
@@ -343,7 +343,7 @@ async def get_available_technicians(
 @router.get("/organizations/{organization_id}/analytics/customers")
 async def get_available_customers(
     organization_id: int = Path(..., description="Organization ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read),
     _: int = Depends(require_same_organization)
 ):
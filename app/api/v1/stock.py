@@ -17,7 +17,9 @@ from app.schemas.stock import (
 )
 from app.schemas.base import ProductCreate
 from app.utils.excel_import import StockExcelImporter
-from app.services.excel_service import StockExcelService, ExcelService
+from app.services.excel_service import StockExcelService, ExcelService, IMPORT_FILE_EXTENSIONS
+from app.services.stock_import_service import StockImportService
+from app.services.stock_ledger_service import StockLedgerService, InsufficientStockError
 from datetime import datetime
 from typing import List, Optional  # Add Optional here
 import logging
@@ -342,8 +344,17 @@ async def update_stock(
         db.add(stock)
     else:
         # Update existing stock
-        for field, value in stock_update.dict(exclude_unset=True).items():
+        changes = stock_update.dict(exclude_unset=True)
+        quantity = changes.pop("quantity", None)
+        for field, value in changes.items():
             setattr(stock, field, value)
+        if quantity is not None:
+            db.flush()
+            # The difference is recorded in the stock movement ledger while the entry is locked
+            StockLedgerService.set_quantity(
+                db, stock.organization_id, product_id, quantity,
+                location=stock.location, user_id=current_user.id
+            )
     
     db.commit()
     db.refresh(stock)
@@ -369,41 +380,32 @@ async def adjust_stock(
             detail="Access denied. You do not have permission to manage stock information."
         )
         
-    stock = db.query(Stock).filter(Stock.product_id == product_id).first()
+    org_id = require_current_organization_id(current_user)
     
-    if not stock:
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Product not found"
-            )
-        
-        previous_quantity = 0.0
-        new_quantity = max(0, adjustment.quantity_change)
-        
-        stock = Stock(
-            product_id=product_id,
-            quantity=new_quantity,
-            unit=product.unit,
-            location=""
+    try:
+        # Applied as one atomic UPDATE and recorded in the stock movement ledger, so concurrent
+        # adjustments cannot overwrite each other or take the balance below zero
+        movement = StockLedgerService.apply_movement(
+            db, org_id, product_id, adjustment.quantity_change, "adjustment",
+            notes=adjustment.reason, user_id=current_user.id
         )
-        db.add(stock)
-    else:
-        # Adjust existing stock
-        previous_quantity = stock.quantity
-        new_quantity = stock.quantity + adjustment.quantity_change
-        
-        if new_quantity < 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Insufficient stock for this adjustment. Current: {previous_quantity}, Requested change: {adjustment.quantity_change}"
-            )
-        stock.quantity = new_quantity
+    except InsufficientStockError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient stock for this adjustment. Current: {e.available}, Requested change: {adjustment.quantity_change}"
+        )
+    except ValueError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    new_quantity = movement.balance_after
+    previous_quantity = new_quantity - adjustment.quantity_change
     
     try:
         db.commit()
-        db.refresh(stock)
         
         logger.info(f"Stock adjusted for product ID {product_id}: {adjustment.quantity_change:+.2f} - {adjustment.reason} by {current_user.email}")
         
@@ -475,224 +477,29 @@ async def bulk_import_stock(
         )
     
     # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
+    if not file.filename or not file.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only Excel files (.xlsx, .xls) are allowed"
+            detail="Only Excel or CSV files (.xlsx, .xls, .csv) are allowed"
         )
     
     try:
-        # Parse Excel file using existing service
-        records = await ExcelService.parse_excel_file(file, StockExcelService.REQUIRED_COLUMNS, "Stock Import Template")
+        # The upload is streamed in validated batches; product resolution and stock upserts run as
+        # set-based statements and each batch is committed before the next one is read
+        batches = StockExcelService.iter_import_batches(file, "Stock Import Template")
+        result = StockImportService.import_batches(db, org_id, batches, mode)
         
-        if not records:
+        if not result.total_processed:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No data found in Excel file"
             )
         
-        created_products = 0
-        created_stocks = 0
-        updated_stocks = 0
-        skipped_records = 0
-        detailed_errors = []
-        warnings = []
-        simple_errors = []
-        
-        for i, record in enumerate(records, 1):
-            try:
-                # Extract product and stock data with enhanced validation
-                product_name = str(record.get("product_name", "")).strip()
-                unit = str(record.get("unit", "")).strip()
-                
-                # Enhanced validation for required fields
-                if not product_name:
-                    detailed_errors.append(BulkImportError(
-                        row=i,
-                        field="product_name",
-                        value="",
-                        error="Product Name is required and cannot be empty",
-                        error_code="REQUIRED_FIELD_MISSING"
-                    ))
-                    simple_errors.append(f"Row {i}: Product Name is required and cannot be empty")
-                    skipped_records += 1
-                    continue
-                    
-                if not unit:
-                    detailed_errors.append(BulkImportError(
-                        row=i,
-                        field="unit",
-                        value="",
-                        error="Unit is required and cannot be empty",
-                        error_code="REQUIRED_FIELD_MISSING"
-                    ))
-                    simple_errors.append(f"Row {i}: Unit is required and cannot be empty")
-                    skipped_records += 1
-                    continue
-                
-                # Enhanced quantity validation
-                try:
-                    quantity = float(record.get("quantity", 0))
-                    if quantity < 0:
-                        detailed_errors.append(BulkImportError(
-                            row=i,
-                            field="quantity",
-                            value=str(record.get("quantity")),
-                            error="Quantity cannot be negative",
-                            error_code="INVALID_VALUE"
-                        ))
-                        simple_errors.append(f"Row {i}: Quantity cannot be negative")
-                        skipped_records += 1
-                        continue
-                except (ValueError, TypeError):
-                    detailed_errors.append(BulkImportError(
-                        row=i,
-                        field="quantity",
-                        value=str(record.get("quantity")),
-                        error=f"Invalid quantity value: {record.get('quantity')}",
-                        error_code="INVALID_DATA_TYPE"
-                    ))
-                    simple_errors.append(f"Row {i}: Invalid data format - could not convert string to float: '{record.get('quantity')}'")
-                    skipped_records += 1
-                    continue
-                
-                # Log record details for debugging
-                logger.debug(f"Processing row {i}: product_name={product_name}, unit={unit}, quantity={quantity}")
-                
-                # Check if product exists by name
-                product = db.query(Product).filter(
-                    Product.name == product_name,
-                    Product.organization_id == org_id
-                ).first()
-                
-                if not product:
-                    # Create new product if not exists with enhanced validation
-                    try:
-                        # Validate and clean optional fields
-                        def to_optional(value):
-                            if value is None:
-                                return None
-                            val_str = str(value).strip().lower()
-                            if val_str in ['', 'none', 'null', 'na', 'nan']:
-                                return None
-                            return str(value).strip()
-                        
-                        hsn_code = to_optional(record.get("hsn_code"))
-                        part_number = to_optional(record.get("part_number"))
-                        
-                        # Validate numeric fields
-                        try:
-                            unit_price = float(record.get("unit_price", 0))
-                            if unit_price < 0:
-                                warnings.append(f"Row {i}: Unit price is negative for '{product_name}', setting to 0")
-                                unit_price = 0.0
-                        except (ValueError, TypeError):
-                            unit_price = 0.0
-                            warnings.append(f"Row {i}: Invalid unit price for '{product_name}', setting to 0")
-                        
-                        try:
-                            gst_rate = float(record.get("gst_rate", 18.0))
-                            if gst_rate < 0 or gst_rate > 100:
-                                warnings.append(f"Row {i}: Invalid GST rate for '{product_name}', setting to 18%")
-                                gst_rate = 18.0
-                        except (ValueError, TypeError):
-                            gst_rate = 18.0
-                            warnings.append(f"Row {i}: Invalid GST rate for '{product_name}', setting to 18%")
-                        
-                        try:
-                            reorder_level = int(float(record.get("reorder_level", 10)))
-                            if reorder_level < 0:
-                                reorder_level = 10
-                                warnings.append(f"Row {i}: Invalid reorder level for '{product_name}', setting to 10")
-                        except (ValueError, TypeError):
-                            reorder_level = 10
-                            warnings.append(f"Row {i}: Invalid reorder level for '{product_name}', setting to 10")
-                        
-                        product_data = {
-                            "name": product_name,
-                            "hsn_code": hsn_code,
-                            "part_number": part_number,
-                            "unit": unit.upper(),
-                            "unit_price": unit_price,
-                            "gst_rate": gst_rate,
-                            "reorder_level": reorder_level,
-                            "is_active": True
-                        }
-                        
-                        new_product = Product(
-                            organization_id=org_id,
-                            **product_data
-                        )
-                        db.add(new_product)
-                        db.flush()  # Get the new product ID
-                        product = new_product
-                        created_products += 1
-                        logger.info(f"Created new product: {product_name}")
-                        
-                    except Exception as e:
-                        detailed_errors.append(BulkImportError(
-                            row=i,
-                            field="product_creation",
-                            value=product_name,
-                            error=f"Failed to create product: {str(e)}",
-                            error_code="PRODUCT_CREATION_FAILED"
-                        ))
-                        simple_errors.append(f"Row {i}: Invalid product data - {str(e)}")
-                        logger.error(f"Row {i}: Failed to create product - {str(e)}")
-                        skipped_records += 1
-                        continue
-                
-                # Handle stock with enhanced validation
-                stock = db.query(Stock).filter(
-                    Stock.product_id == product.id,
-                    Stock.organization_id == org_id
-                ).first()
-                
-                location = str(record.get("location", "")).strip() or ""
-                
-                if not stock:
-                    # Create new stock entry
-                    new_stock = Stock(
-                        organization_id=org_id,
-                        product_id=product.id,
-                        quantity=quantity,
-                        unit=unit.upper(),
-                        location=location
-                    )
-                    db.add(new_stock)
-                    created_stocks += 1
-                    logger.info(f"Created stock entry for: {product_name}")
-                else:
-                    # Update existing stock based on mode
-                    old_quantity = stock.quantity
-                    if mode == 'add':
-                        new_quantity = old_quantity + quantity
-                    else:  # replace
-                        new_quantity = quantity
-                    
-                    stock.quantity = new_quantity
-                    stock.unit = unit.upper()
-                    stock.location = location
-                    updated_stocks += 1
-                    
-                    if old_quantity != new_quantity:
-                        warnings.append(f"Row {i}: Updated stock for '{product_name}' from {old_quantity} to {new_quantity} (mode: {mode})")
-                    
-                    logger.info(f"Updated stock for: {product_name} (mode: {mode})")
-                    
-            except Exception as e:
-                detailed_errors.append(BulkImportError(
-                    row=i,
-                    error=f"Error processing record: {str(e)}",
-                    error_code="PROCESSING_ERROR"
-                ))
-                simple_errors.append(f"Row {i}: Error processing record - {str(e)}")
-                logger.error(f"Row {i}: Error processing record - {str(e)}")
-                skipped_records += 1
-                continue
-        
-        # Commit all changes
-        db.commit()
+        created_products = result.created_products
+        created_stocks = result.created_stocks
+        updated_stocks = result.updated_stocks
+        skipped_records = result.skipped
+        detailed_errors = result.detailed_errors
         
         end_time = datetime.utcnow()
         processing_time = (end_time - start_time).total_seconds()
@@ -717,13 +524,13 @@ async def bulk_import_stock(
         
         return BulkImportResponse(
             message=message,
-            total_processed=len(records),
+            total_processed=result.total_processed,
             created=created_stocks,
             updated=updated_stocks,
             skipped=skipped_records,
-            errors=simple_errors,
+            errors=result.errors,
             detailed_errors=detailed_errors,
-            warnings=warnings,
+            warnings=result.warnings,
             processing_time_seconds=processing_time
         )
         
@@ -744,7 +551,7 @@ async def import_stock_excel(
     current_user: User = Depends(get_current_active_user)
 ):
     """Import stock entries from Excel file - alias for bulk import"""
-    return await bulk_import_stock(file, db, current_user)
+    return await bulk_import_stock(file=file, mode="replace", organization_id=None, db=db, current_user=current_user)
 
 @router.get("/template/excel")
 async def download_stock_template():
@@ -5,10 +5,11 @@ from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.core.database import get_db
 from app.api.v1.auth import get_current_active_user
-from app.models.base import User, Stock
+from app.models.base import User
 from app.models.vouchers import GoodsReceiptNote, GoodsReceiptNoteItem, PurchaseOrderItem
 from app.schemas.vouchers import GRNCreate, GRNInDB, GRNUpdate
 from app.services.email_service import send_voucher_email
+from app.services.stock_ledger_service import StockLedgerService
 from app.services.voucher_service import VoucherNumberService
 import logging
 
@@ -104,20 +105,12 @@ async def create_goods_receipt_note(
             
             total_amount += item.accepted_quantity * item.unit_price
             
-            # Update stock
-            stock = db.query(Stock).filter(
-                Stock.product_id == item.product_id,
-                Stock.organization_id == current_user.organization_id
-            ).first()
-            if not stock:
-                stock = Stock(
-                    product_id=item.product_id,
-                    organization_id=current_user.organization_id,
-                    quantity=0,
-                    unit=item.unit
-                )
-                db.add(stock)
-            stock.quantity += item.accepted_quantity
+            # Update stock through the movement ledger (one atomic UPDATE per item)
+            StockLedgerService.apply_movement(
+                db, current_user.organization_id, item.product_id, item.accepted_quantity, "receipt",
+                unit=item.unit, reference_type="goods_receipt_note", reference_id=db_invoice.id,
+                user_id=current_user.id
+            )
             
             # Update PO item if po_item_id provided
             if item.po_item_id:
@@ -203,12 +196,12 @@ async def update_goods_receipt_note(
             ).all()
             
             for old_item in old_items:
-                stock = db.query(Stock).filter(
-                    Stock.product_id == old_item.product_id,
-                    Stock.organization_id == current_user.organization_id
-                ).first()
-                if stock:
-                    stock.quantity -= old_item.accepted_quantity
+                # Reverse the receipt in the movement ledger
+                StockLedgerService.apply_movement(
+                    db, current_user.organization_id, old_item.product_id, -old_item.accepted_quantity, "receipt",
+                    allow_negative=True, create=False, reference_type="goods_receipt_note", reference_id=invoice_id,
+                    notes="Goods receipt note updated", user_id=current_user.id
+                )
                 
                 # Revert PO item if po_item_id
                 if old_item.po_item_id:
@@ -233,20 +226,12 @@ async def update_goods_receipt_note(
                 
                 total_amount += item.accepted_quantity * item.unit_price
                 
-                # Update stock
-                stock = db.query(Stock).filter(
-                    Stock.product_id == item.product_id,
-                    Stock.organization_id == current_user.organization_id
-                ).first()
-                if not stock:
-                    stock = Stock(
-                        product_id=item.product_id,
-                        organization_id=current_user.organization_id,
-                        quantity=0,
-                        unit=item.unit
-                    )
-                    db.add(stock)
-                stock.quantity += item.accepted_quantity
+                # Update stock through the movement ledger (one atomic UPDATE per item)
+                StockLedgerService.apply_movement(
+                    db, current_user.organization_id, item.product_id, item.accepted_quantity, "receipt",
+                    unit=item.unit, reference_type="goods_receipt_note", reference_id=invoice_id,
+                    user_id=current_user.id
+                )
                 
                 # Update PO item if po_item_id
                 if item.po_item_id:
@@ -296,12 +281,12 @@ async def delete_goods_receipt_note(
         ).all()
         
         for old_item in old_items:
-            stock = db.query(Stock).filter(
-                Stock.product_id == old_item.product_id,
-                Stock.organization_id == current_user.organization_id
-            ).first()
-            if stock:
-                stock.quantity -= old_item.accepted_quantity
+            # Reverse the receipt in the movement ledger
+            StockLedgerService.apply_movement(
+                db, current_user.organization_id, old_item.product_id, -old_item.accepted_quantity, "receipt",
+                allow_negative=True, create=False, reference_type="goods_receipt_note", reference_id=invoice_id,
+                notes="Goods receipt note deleted", user_id=current_user.id
+            )
             
             # Revert PO item if po_item_id
             if old_item.po_item_id:
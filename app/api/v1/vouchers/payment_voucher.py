@@ -2,10 +2,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.core.database import get_db
-from app.api.v1.auth import get_current_active_user
+from app.core.database import get_db, get_async_db
+from app.api.v1.auth import get_current_active_user, get_current_active_principal
+from app.core.auth_cache import AuthenticatedPrincipal
 from app.models.base import User
 from app.models.vouchers import PaymentVoucher
 from app.schemas.vouchers import PaymentVoucherCreate, PaymentVoucherInDB, PaymentVoucherUpdate
@@ -23,16 +25,16 @@ async def get_payment_vouchers(
     status: Optional[str] = Query(None, description="Optional filter by voucher status (e.g., 'draft', 'approved')"),
     sort: str = Query("desc", description="Sort order: 'asc' or 'desc' (default 'desc' for latest first)"),
     sortBy: str = Query("created_at", description="Field to sort by (default 'created_at')"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedPrincipal = Depends(get_current_active_principal)
 ):
     """Get all payment vouchers with enhanced sorting and pagination"""
-    query = db.query(PaymentVoucher).filter(
+    query = select(PaymentVoucher).where(
         PaymentVoucher.organization_id == current_user.organization_id
     )
     
     if status:
-        query = query.filter(PaymentVoucher.status == status)
+        query = query.where(PaymentVoucher.status == status)
     
     # Enhanced sorting - latest first by default
     if hasattr(PaymentVoucher, sortBy):
@@ -45,7 +47,8 @@ async def get_payment_vouchers(
         # Default to created_at desc if invalid sortBy field
         query = query.order_by(PaymentVoucher.created_at.desc())
     
-    vouchers = query.offset(skip).limit(limit).all()
+    result = await db.execute(query.offset(skip).limit(limit))
+    vouchers = result.scalars().all()
     return vouchers
 
 @router.get("/next-number", response_model=str)
@@ -1,12 +1,15 @@
 # app/api/v1/vouchers/purchase_voucher.py
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
-from app.core.database import get_db
-from app.api.v1.auth import get_current_active_user
+from app.core.database import get_db, get_async_db
+from app.api.v1.auth import get_current_active_user, get_current_active_principal
+from app.core.auth_cache import AuthenticatedPrincipal
 from app.models.base import User
-from app.models.vouchers import PurchaseVoucher, PurchaseOrder, GoodsReceiptNote, PurchaseOrderItem, GoodsReceiptNoteItem
+from app.models.vouchers import PurchaseVoucher, PurchaseOrder, GoodsReceiptNote, PurchaseOrderItem, GoodsReceiptNoteItem, PurchaseVoucherItem
 from app.schemas.vouchers import PurchaseVoucherCreate, PurchaseVoucherInDB, PurchaseVoucherUpdate
 from app.services.email_service import send_voucher_email
 from app.services.voucher_service import VoucherNumberService
@@ -23,16 +26,19 @@ async def get_purchase_vouchers(
     status: Optional[str] = Query(None, description="Optional filter by voucher status (e.g., 'draft', 'approved')"),
     sort: str = Query("desc", description="Sort order: 'asc' or 'desc' (default 'desc' for latest first)"),
     sortBy: str = Query("created_at", description="Field to sort by (default 'created_at')"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedPrincipal = Depends(get_current_active_principal)
 ):
     """Get all purchase vouchers with enhanced sorting and pagination"""
-    query = db.query(PurchaseVoucher).options(joinedload(PurchaseVoucher.vendor)).filter(
+    query = select(PurchaseVoucher).options(
+        joinedload(PurchaseVoucher.vendor),
+        selectinload(PurchaseVoucher.items).joinedload(PurchaseVoucherItem.product)
+    ).where(
         PurchaseVoucher.organization_id == current_user.organization_id
     )
     
     if status:
-        query = query.filter(PurchaseVoucher.status == status)
+        query = query.where(PurchaseVoucher.status == status)
     
     # Enhanced sorting - latest first by default
     if hasattr(PurchaseVoucher, sortBy):
@@ -45,7 +51,8 @@ async def get_purchase_vouchers(
         # Default to created_at desc if invalid sortBy field
         query = query.order_by(PurchaseVoucher.created_at.desc())
     
-    invoices = query.offset(skip).limit(limit).all()
+    result = await db.execute(query.offset(skip).limit(limit))
+    invoices = result.scalars().all()
     return invoices
 
 @router.get("/next-number", response_model=str)
@@ -12,7 +12,8 @@ from app.core.tenant import TenantQueryFilter
 from app.core.org_restrictions import require_organization_access, ensure_organization_context
 from app.models.base import User, Vendor, VendorFile
 from app.schemas.base import VendorCreate, VendorUpdate, VendorInDB, BulkImportResponse, VendorFileResponse
-from app.services.excel_service import VendorExcelService, ExcelService
+from app.services.excel_service import VendorExcelService, ExcelService, IMPORT_FILE_EXTENSIONS
+from app.services.master_import_service import MasterImportService
 import logging
 import os
 import uuid
@@ -241,71 +242,35 @@ async def import_vendors_excel(
     """Import vendors from Excel file"""
     org_id = require_current_organization_id(current_user)
     # Validate file type
-    if not file.filename or not file.filename.endswith(('.xlsx', '.xls')):
+    if not file.filename or not file.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only Excel files (.xlsx, .xls) are allowed"
+            detail="Only Excel or CSV files (.xlsx, .xls, .csv) are allowed"
         )
     try:
-        records = await ExcelService.parse_excel_file(file, VendorExcelService.REQUIRED_COLUMNS, "Vendor Import Template")
-        if not records:
+        total_processed = 0
+        created_count = 0
+        updated_count = 0
+        errors = []
+        # The upload is streamed in validated batches, each committed before the next one is read;
+        # rows with invalid cells are reported and skipped, the others create or update masters by name
+        for validation in VendorExcelService.iter_import_batches(file, "Vendor Import Template"):
+            total_processed += validation.total
+            batch = MasterImportService.import_parties(db, org_id, Vendor, validation)
+            created_count += batch.created
+            updated_count += batch.updated
+            errors.extend(batch.errors)
+            db.commit()
+        if not total_processed:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No data found in Excel file"
             )
-        created_count = 0
-        updated_count = 0
-        errors = []
-        for i, record in enumerate(records, 1):
-            try:
-                vendor_data = {
-                    "name": record.get("name", "").strip(),
-                    "contact_number": record.get("contact_number", "").strip(),
-                    "email": record.get("email", "").strip() or None,
-                    "address1": record.get("address_line_1", "").strip(),
-                    "address2": record.get("address_line_2", "").strip() or None,
-                    "city": record.get("city", "").strip(),
-                    "state": record.get("state", "").strip(),
-                    "pin_code": record.get("pin_code", "").strip(),
-                    "state_code": record.get("state_code", "").strip(),
-                    "gst_number": record.get("gst_number", "").strip() or None,
-                    "pan_number": record.get("pan_number", "").strip() or None,
-                }
-                # Validate required fields
-                required_fields = ["name", "contact_number", "address1", "city", "state", "pin_code", "state_code"]
-                for field in required_fields:
-                    if not vendor_data[field]:
-                        errors.append(f"Row {i}: {field.replace('_', ' ').title()} is required")
-                        break
-                if errors and errors[-1].startswith(f"Row {i}:"):
-                    continue
-                # Check if vendor already exists
-                existing_vendor = db.query(Vendor).filter(
-                    Vendor.name == vendor_data["name"],
-                    Vendor.organization_id == org_id
-                ).first()
-                if existing_vendor:
-                    for field, value in vendor_data.items():
-                        setattr(existing_vendor, field, value)
-                    updated_count += 1
-                    logger.info(f"Updated vendor: {vendor_data['name']}")
-                else:
-                    new_vendor = Vendor(
-                        organization_id=org_id,
-                        **vendor_data
-                    )
-                    db.add(new_vendor)
-                    created_count += 1
-                    logger.info(f"Created vendor: {vendor_data['name']}")
-            except Exception as e:
-                errors.append(f"Row {i}: Error processing record - {str(e)}")
-                continue
-        db.commit()
         logger.info(f"Vendors import completed by {current_user.email}: "
                    f"{created_count} created, {updated_count} updated, {len(errors)} errors")
         return BulkImportResponse(
             message=f"Import completed successfully. {created_count} vendors created, {updated_count} updated.",
-            total_processed=len(records),
+            total_processed=total_processed,
             created=created_count,
             updated=updated_count,
             errors=errors
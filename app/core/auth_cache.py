@@ -0,0 +1,237 @@
+# app/core/auth_cache.py
+
+"""
+Authenticated principal cache.
+
+Holds a lightweight, immutable snapshot of the authenticated user so that hot
+read-only routes can authorize a bearer token without querying the users table
+on every request. Entries are keyed by (user_type, email, token iat), bounded by
+an LRU limit and a TTL, and invalidated whenever a security-relevant column of a
+User/PlatformUser is committed (password, role, activation, organization, ...).
+Bulk `Query.update()` / `Query.delete()` on those models clear the whole cache
+on commit, since the affected emails are not known.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.base import User, PlatformUser
+import logging
+
+logger = logging.getLogger(__name__)
+
+PrincipalKey = Tuple[str, str, Optional[int]]
+
+# Columns whose change must evict cached principals for that user
+SECURITY_ATTRIBUTES = (
+    "email",
+    "hashed_password",
+    "role",
+    "is_active",
+    "is_super_admin",
+    "organization_id",
+    "must_change_password",
+    "force_password_reset",
+    "has_stock_access",
+)
+
+
+@dataclass(frozen=True)
+class AuthenticatedPrincipal:
+    """Immutable snapshot of an authenticated user"""
+
+    id: int
+    email: str
+    user_type: str
+    organization_id: Optional[int]
+    role: Optional[str]
+    is_active: bool
+    is_super_admin: bool
+    must_change_password: bool
+    force_password_reset: bool
+    has_stock_access: bool
+
+    @classmethod
+    def from_user(cls, user, user_type: str = "organization") -> "AuthenticatedPrincipal":
+        """Build a snapshot from a User or PlatformUser row"""
+        is_platform = isinstance(user, PlatformUser)
+        return cls(
+            id=user.id,
+            email=user.email,
+            user_type="platform" if is_platform else user_type,
+            organization_id=None if is_platform else user.organization_id,
+            role=user.role,
+            is_active=bool(user.is_active),
+            is_super_admin=bool(getattr(user, "is_super_admin", is_platform and user.role == "super_admin")),
+            must_change_password=bool(getattr(user, "must_change_password", False)),
+            force_password_reset=bool(user.force_password_reset),
+            has_stock_access=bool(getattr(user, "has_stock_access", True)),
+        )
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU cache of AuthenticatedPrincipal snapshots"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, AuthenticatedPrincipal]]" = OrderedDict()
+        self._keys_by_email: Dict[str, Set[PrincipalKey]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: PrincipalKey) -> Optional[AuthenticatedPrincipal]:
+        """Return the cached principal for key, or None when absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def put(self, key: PrincipalKey, principal: AuthenticatedPrincipal) -> None:
+        """Store a principal, evicting the least recently used entry when full"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + self.ttl_seconds, principal)
+            self._keys_by_email.setdefault(key[1].lower(), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_email(self, email: str) -> int:
+        """Drop every cached principal for an email; returns the number removed"""
+        with self._lock:
+            keys = self._keys_by_email.pop(email.lower(), set())
+            for key in keys:
+                self._entries.pop(key, None)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached principal(s) for {email}")
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_email.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        email_keys = self._keys_by_email.get(key[1].lower())
+        if email_keys is not None:
+            email_keys.discard(key)
+            if not email_keys:
+                del self._keys_by_email[key[1].lower()]
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(email: Optional[str]) -> None:
+    """Evict cached principals for a user (call after committing a user mutation)"""
+    if email:
+        principal_cache.invalidate_email(email)
+
+
+# ------------------------------------------------------------------------------
+# Invalidation hooks: collect emails of users whose security attributes changed
+# during a flush (or note a bulk write to the users tables) and evict them once
+# the transaction commits.
+# ------------------------------------------------------------------------------
+
+_PENDING_KEY = "principal_cache_pending_emails"
+_CLEAR_KEY = "principal_cache_clear_pending"
+
+
+def _changed_security_emails(obj) -> Set[str]:
+    state = inspect(obj)
+    emails: Set[str] = set()
+    for attr in SECURITY_ATTRIBUTES:
+        if attr not in state.attrs:
+            continue
+        history = state.attrs[attr].history
+        if history.has_changes():
+            if obj.email:
+                emails.add(obj.email)
+            if attr == "email":
+                emails.update(e for e in history.deleted if e)
+    return emails
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_user_changes(session, flush_context, instances):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.dirty:
+        if isinstance(obj, (User, PlatformUser)):
+            pending.update(_changed_security_emails(obj))
+    for obj in session.deleted:
+        if isinstance(obj, (User, PlatformUser)) and obj.email:
+            pending.add(obj.email)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_user_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, (User, PlatformUser)):
+        orm_execute_state.session.info[_CLEAR_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_CLEAR_KEY, False):
+        principal_cache.clear()
+        logger.debug("Cleared cached principals after a bulk user write")
+        return
+    for email in pending or ():
+        invalidate_principal(email)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_users(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_CLEAR_KEY, None)
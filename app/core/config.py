@@ -18,6 +18,30 @@ class Settings(BaseSettings):
     # JWT Token Expiry: minimum 120 minutes (2 hours), maximum 300 minutes (5 hours)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 180  # Default 3 hours, within required range
     
+    # JWT verification: signature backend ("jose" or "pyjwt" from requirements-optional.txt) and
+    # number of validated tokens whose claims are cached until expiry (0 disables)
+    JWT_BACKEND: str = "jose"
+    JWT_CLAIMS_CACHE_MAX_ENTRIES: int = 4096
+    
+    # Authenticated principal cache (per worker); set either value to 0 to disable
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Fraction of requests whose authentication is traced (0 = off, 1 = every request)
+    AUTH_TRACE_SAMPLE_RATE: float = 0.0
+    
+    @field_validator("AUTH_TRACE_SAMPLE_RATE", mode="before")
+    @classmethod
+    def validate_auth_trace_sample_rate(cls, v: float) -> float:
+        """Validate auth trace sample rate is a fraction between 0 and 1"""
+        try:
+            v = float(v)
+        except (TypeError, ValueError):
+            raise ValueError("AUTH_TRACE_SAMPLE_RATE must be a number")
+        if not 0.0 <= v <= 1.0:
+            raise ValueError("AUTH_TRACE_SAMPLE_RATE must be between 0 and 1")
+        return v
+    
     @field_validator("ACCESS_TOKEN_EXPIRE_MINUTES", mode="before")
     @classmethod
     def validate_token_expiry(cls, v: int) -> int:
@@ -42,6 +66,22 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_KEY: Optional[str] = None
     SUPABASE_JWT_SECRET: Optional[str] = None
     
+    # Connection pool overrides; unset values come from the ENVIRONMENT pool profile in EnvironmentConfig.
+    # Each worker can open up to pool size + overflow connections for the sync engine plus the async one
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[int] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_ASYNC_POOL_SIZE: Optional[int] = None
+    DB_ASYNC_MAX_OVERFLOW: Optional[int] = None
+    
+    # Read replica for reporting/analytics routes (get_read_db); unset routes all reads to the primary
+    READ_REPLICA_DATABASE_URL: Optional[str] = None
+    # Replicas lagging further behind than this are skipped in favour of the primary
+    READ_REPLICA_MAX_LAG_SECONDS: float = 30.0
+    # How often replica health and lag are re-checked
+    READ_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    
     # Email Settings (Required for OTP)
     SMTP_HOST: str = "smtp.gmail.com"  # Changed back to SMTP_HOST to match .env
     SMTP_PORT: int = 587
@@ -90,15 +130,60 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
     
+    # Automatically scope SELECTs of tenant-owned models to the current organization context.
+    # A second layer only: routes still filter on organization_id explicitly
+    TENANT_QUERY_AUTO_FILTER: bool = True
+    
+    # Serve current outstanding balances from the account_balances projection instead of scanning vouchers
+    LEDGER_BALANCE_PROJECTION_ENABLED: bool = True
+    
+    # Hours between background runs that snapshot month-end ledger balances (0 disables the job)
+    LEDGER_SNAPSHOT_INTERVAL_HOURS: float = 6.0
+    
+    # Hours between background recounts of the materialized dashboard counters (0 disables the job)
+    DASHBOARD_COUNTER_RECOMPUTE_INTERVAL_HOURS: float = 24.0
+    
+    # Hours between background checks that every stock balance equals the sum of its movements (0 disables the job)
+    STOCK_RECONCILE_INTERVAL_HOURS: float = 24.0
+
+    # Background Excel export jobs: worker threads per API process (0 disables them), active
+    # (queued or running) jobs allowed per organization, and how long finished files are kept
+    EXPORT_JOB_WORKERS: int = 2
+    EXPORT_JOB_MAX_ACTIVE_PER_ORG: int = 2
+    EXPORT_JOB_TTL_MINUTES: int = 60
+    # Export files are written to this directory under UPLOAD_FOLDER
+    EXPORT_JOB_STORAGE_DIR: str = "exports"
+    # "memory" (in-process queue) or "redis" (jobs and queue in REDIS_URL, shared by all API processes)
+    EXPORT_JOB_BACKEND: str = "memory"
+
+    # Background import jobs: worker threads per API process (0 disables them), active (queued or
+    # running) jobs allowed per organization, and sheet rows committed per chunk unless a job asks otherwise
+    IMPORT_JOB_WORKERS: int = 1
+    IMPORT_JOB_MAX_ACTIVE_PER_ORG: int = 2
+    IMPORT_JOB_CHUNK_SIZE: int = 1000
+    # A running job whose worker has not committed a chunk for this long is resumed by another worker,
+    # at most IMPORT_JOB_MAX_ATTEMPTS times in all
+    IMPORT_JOB_STALE_MINUTES: int = 10
+    IMPORT_JOB_MAX_ATTEMPTS: int = 3
+    # Row errors and warnings kept per job (the rest are only counted)
+    IMPORT_JOB_MAX_MESSAGES: int = 1000
+    # Uploads are kept in this directory under UPLOAD_FOLDER until their job ends
+    IMPORT_JOB_STORAGE_DIR: str = "imports"
+
+    # Per-request SQL profiling (query counts, DB time, N+1 detection); adds overhead, keep off in production
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5
+    
+    # Import API router modules on first request instead of at startup (faster worker boot)
+    LAZY_ROUTER_LOADING: bool = False
+    
     @property
     def jwt_secret(self) -> str:
         """
         Get JWT secret for token operations.
         Uses SUPABASE_JWT_SECRET if available, otherwise falls back to SECRET_KEY.
         """
-        value = self.SUPABASE_JWT_SECRET or self.SECRET_KEY
-        print(f"DEBUG: Loaded jwt_secret = {value}")  # Debug print for troubleshooting
-        return value
+        return self.SUPABASE_JWT_SECRET or self.SECRET_KEY
     
     model_config = ConfigDict(
         env_file=".env",
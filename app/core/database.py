@@ -1,6 +1,11 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
+from app.core.tenant_config import EnvironmentConfig
+from app.core.pool_metrics import instrument_engine
+from app.core.read_replica import ReadReplicaRouter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,21 +15,28 @@ database_url = settings.DATABASE_URL or "sqlite:///./tritiq_erp.db"
 if not database_url:
     raise ValueError("DATABASE_URL is required in .env file for database connection. Please configure it to connect to the main server.")
 
+# Connection pool sizing: EnvironmentConfig defaults, overridden by DB_POOL_* settings
+pool_config = EnvironmentConfig.get_database_pool_config()
+
 # Database engine configuration
 engine_kwargs = {
     "pool_pre_ping": True,
-    "pool_recycle": 300,
+    "pool_recycle": pool_config["pool_recycle"],
     "echo": settings.DEBUG
 }
 
 # PostgreSQL/Supabase specific configuration
 if database_url.startswith("postgresql://") or database_url.startswith("postgres://"):
     engine_kwargs.update({
-        "pool_size": 10,
-        "max_overflow": 20,
-        "pool_timeout": 30,
+        "pool_size": pool_config["pool_size"],
+        "max_overflow": pool_config["max_overflow"],
+        "pool_timeout": pool_config["pool_timeout"],
     })
-    logger.info("Using PostgreSQL/Supabase database configuration")
+    logger.info(
+        f"Using PostgreSQL/Supabase database configuration "
+        f"(pool_size={pool_config['pool_size']}, max_overflow={pool_config['max_overflow']}, "
+        f"pool_timeout={pool_config['pool_timeout']}s)"
+    )
 elif database_url.startswith("sqlite://"):
     # SQLite specific configuration
     engine_kwargs.update({
@@ -34,10 +46,77 @@ elif database_url.startswith("sqlite://"):
 
 # Database engine
 engine = create_engine(database_url, **engine_kwargs)
+instrument_engine(engine, "primary")
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for reporting and analytics, sized like the primary
+replica_database_url = settings.READ_REPLICA_DATABASE_URL
+replica_engine = None
+ReplicaSessionLocal = None
+if replica_database_url:
+    replica_engine_kwargs = {
+        "pool_pre_ping": True,
+        "pool_recycle": pool_config["pool_recycle"],
+        "echo": settings.DEBUG
+    }
+    if replica_database_url.startswith("sqlite://"):
+        replica_engine_kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        replica_engine_kwargs.update({
+            "pool_size": pool_config["pool_size"],
+            "max_overflow": pool_config["max_overflow"],
+            "pool_timeout": pool_config["pool_timeout"],
+        })
+    replica_engine = create_engine(replica_database_url, **replica_engine_kwargs)
+    instrument_engine(replica_engine, "replica")
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    logger.info("Read replica configured for reporting sessions")
+
+# Routes get_read_db sessions to the replica while it is healthy and within the lag limit
+read_router = ReadReplicaRouter(
+    SessionLocal,
+    ReplicaSessionLocal,
+    max_lag_seconds=settings.READ_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.READ_REPLICA_CHECK_INTERVAL_SECONDS
+)
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (asyncpg / aiosqlite)"""
+    if url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url[len("postgres://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url[len("postgresql+psycopg2://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+# Async database engine for `async def` routes, sharing the sync engine's tuning with a pool of its own size
+async_database_url = get_async_database_url(database_url)
+async_engine_kwargs = {
+    key: value for key, value in engine_kwargs.items() if key != "connect_args"
+}
+if "pool_size" in async_engine_kwargs:
+    async_pool_config = EnvironmentConfig.get_async_database_pool_config()
+    async_engine_kwargs.update({
+        "pool_size": async_pool_config["pool_size"],
+        "max_overflow": async_pool_config["max_overflow"],
+    })
+
+async_engine = create_async_engine(async_database_url, **async_engine_kwargs)
+instrument_engine(async_engine.sync_engine, "primary_async")
+
+# Async session factory; expire_on_commit=False so results stay usable after commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -53,6 +132,31 @@ def get_db():
     finally:
         db.close()
 
+# Read-only dependency for reporting/analytics routes; uses the read replica when available
+def get_read_db():
+    db = read_router.session()
+    try:
+        yield db
+    except Exception as e:
+        logger.error(f"Read database session error: {e}")
+        db.rollback()
+        replica_down = isinstance(e, OperationalError) or (isinstance(e, DBAPIError) and e.connection_invalidated)
+        if replica_down and db.info.get("database_role") == "replica":
+            read_router.report_failure(e)
+        raise
+    finally:
+        db.close()
+
+# Async dependency for routes that must not block the event loop
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session error: {e}")
+            await db.rollback()
+            raise
+
 # Enhanced context manager for database transactions
 class DatabaseTransaction:
     """Context manager for database transactions with automatic rollback on error"""
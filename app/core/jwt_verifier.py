@@ -0,0 +1,152 @@
+# app/core/jwt_verifier.py
+
+"""
+JWT verifier with a decoded-claims LRU.
+
+A browser session presents the same bearer token on every request, so the
+verifier remembers the claims of tokens it has already validated (keyed by a
+digest of the token, never the token itself) until the token's `exp`. Memory is
+bounded by an LRU limit, and the signing backend can be switched from
+python-jose to PyJWT (if installed) without changing callers.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jose import jwt as jose_jwt, exceptions as jose_exceptions
+from app.core.config import settings
+import logging
+
+# Make PyJWT optional - python-jose remains the default backend
+try:
+    import jwt as pyjwt
+    PYJWT_AVAILABLE = True
+except ImportError:
+    pyjwt = None
+    PYJWT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+JWT_BACKENDS = ("jose", "pyjwt")
+
+
+class InvalidTokenError(Exception):
+    """Raised by a backend when a token fails signature or claim validation"""
+    pass
+
+
+def _jose_decode(token: str, secret: str, algorithms: List[str]) -> Dict[str, Any]:
+    try:
+        return jose_jwt.decode(token, secret, algorithms=algorithms)
+    except jose_exceptions.JWTError as e:
+        raise InvalidTokenError(str(e)) from e
+
+
+def _pyjwt_decode(token: str, secret: str, algorithms: List[str]) -> Dict[str, Any]:
+    try:
+        # python-jose does not require `sub` to be a string, `iat` in the past etc.; match its defaults
+        return pyjwt.decode(token, secret, algorithms=algorithms, options={"verify_iat": False, "verify_sub": False})
+    except pyjwt.PyJWTError as e:
+        raise InvalidTokenError(str(e)) from e
+
+
+class JWTVerifier:
+    """Validates JWTs and caches the claims of valid tokens until they expire"""
+
+    def __init__(
+        self,
+        secret_provider: Callable[[], str],
+        algorithms: List[str],
+        max_entries: int = 4096,
+        backend: str = "jose",
+        clock: Callable[[], float] = time.time
+    ):
+        self._secret_provider = secret_provider
+        self.algorithms = list(algorithms)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._secret: Optional[str] = None
+        self.metrics = {"hits": 0, "misses": 0, "failures": 0, "evictions": 0, "expired": 0}
+        self.set_backend(backend)
+
+    def set_backend(self, backend: str) -> None:
+        """Select the signature backend ("jose" or "pyjwt")"""
+        if backend not in JWT_BACKENDS:
+            raise ValueError(f"Unknown JWT backend '{backend}', expected one of {JWT_BACKENDS}")
+        if backend == "pyjwt" and not PYJWT_AVAILABLE:
+            logger.warning("PyJWT is not installed - falling back to python-jose JWT backend")
+            backend = "jose"
+        self.backend = backend
+        self._decode = _pyjwt_decode if backend == "pyjwt" else _jose_decode
+        self.clear()
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Return the claims of a valid token.
+
+        Raises:
+            InvalidTokenError: If the signature or a registered claim is invalid
+        """
+        secret = self._secret_provider()
+        key = hashlib.blake2b(token.encode(), digest_size=20).digest()
+        now = self._clock()
+
+        with self._lock:
+            if secret != self._secret:
+                # Signing key rotated: claims validated with the old key are no longer trusted
+                self._entries.clear()
+                self._secret = secret
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.metrics["hits"] += 1
+                    return dict(claims)
+                del self._entries[key]
+                self.metrics["expired"] += 1
+            self.metrics["misses"] += 1
+
+        try:
+            claims = self._decode(token, secret, self.algorithms)
+        except InvalidTokenError:
+            with self._lock:
+                self.metrics["failures"] += 1
+            raise
+
+        expires_at = claims.get("exp")
+        # Tokens without an expiry are verified every time rather than cached indefinitely
+        if self.max_entries > 0 and isinstance(expires_at, (int, float)):
+            with self._lock:
+                self._entries[key] = (float(expires_at), claims)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.metrics["evictions"] += 1
+        return dict(claims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                **self.metrics,
+            }
+
+
+jwt_verifier = JWTVerifier(
+    secret_provider=lambda: settings.jwt_secret,
+    algorithms=[settings.ALGORITHM],
+    max_entries=settings.JWT_CLAIMS_CACHE_MAX_ENTRIES,
+    backend=settings.JWT_BACKEND
+)
@@ -0,0 +1,136 @@
+# app/core/lazy_router.py
+
+"""
+Router registration from a manifest, with optional on-demand imports.
+
+In eager mode every manifest entry is imported and included at startup, as
+before. In lazy mode each entry is registered as a placeholder route that
+imports its module (and with it pandas, openpyxl, PyMuPDF, ...) on the first
+request under its prefix, then dispatches to the real routes in the same
+position in the routing table, so route precedence is unchanged.
+"""
+
+import importlib
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouterEntry:
+    """One `app.include_router(...)` call: module path, router attribute, prefix and tags"""
+    module: str
+    prefix: str
+    tags: List[str] = field(default_factory=list)
+    attribute: str = "router"
+
+    def load_router(self) -> APIRouter:
+        return getattr(importlib.import_module(self.module), self.attribute)
+
+
+class LazyRouterMount(BaseRoute):
+    """Placeholder route that imports and includes its router on first match"""
+
+    def __init__(self, app: FastAPI, entry: RouterEntry):
+        self.app = app
+        self.entry = entry
+        self._routes: Optional[List[BaseRoute]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._routes is not None
+
+    def load(self) -> List[BaseRoute]:
+        if self._routes is None:
+            with self._lock:
+                if self._routes is None:
+                    try:
+                        router = self.entry.load_router()
+                    except Exception as e:
+                        logger.error(f"Failed to lazily import router {self.entry.module}: {e}")
+                        raise
+                    # Include into a holder so routes get the prefix/tags and the app's dependency overrides
+                    holder = APIRouter(dependency_overrides_provider=self.app)
+                    holder.include_router(router, prefix=self.entry.prefix, tags=list(self.entry.tags))
+                    self._routes = list(holder.routes)
+                    logger.info(f"Lazily loaded router {self.entry.module} at prefix: {self.entry.prefix or '/'}")
+        return self._routes
+
+    def _in_prefix(self, path: str) -> bool:
+        prefix = self.entry.prefix
+        return not prefix or path == prefix or path.startswith(prefix + "/")
+
+    def _match_child(self, scope: Scope) -> Tuple[Match, Scope, Optional[BaseRoute]]:
+        partial: Optional[Tuple[Scope, BaseRoute]] = None
+        for route in self.load():
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return match, child_scope, route
+            if match == Match.PARTIAL and partial is None:
+                partial = (child_scope, route)
+        if partial is not None:
+            return Match.PARTIAL, partial[0], partial[1]
+        return Match.NONE, {}, None
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket") or not self._in_prefix(scope["path"]):
+            return Match.NONE, {}
+        match, child_scope, _ = self._match_child(scope)
+        return match, child_scope
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        _, _, route = self._match_child(scope)
+        await route.handle(scope, receive, send)
+
+    def url_path_for(self, __name: str, **path_params):
+        for route in self.load():
+            try:
+                return route.url_path_for(__name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(__name, path_params)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "pending"
+        return f"{self.__class__.__name__}(module={self.entry.module!r}, prefix={self.entry.prefix!r}, {state})"
+
+
+def materialize_lazy_routers(app: FastAPI) -> None:
+    """Import every pending router and splice its routes into place (needed for OpenAPI generation)"""
+    routes: List[BaseRoute] = []
+    for route in app.router.routes:
+        if isinstance(route, LazyRouterMount):
+            routes.extend(route.load())
+        else:
+            routes.append(route)
+    app.router.routes[:] = routes
+
+
+def include_manifest(app: FastAPI, manifest: Sequence[RouterEntry], lazy: bool = False) -> None:
+    """Include every router in the manifest, in order, either eagerly or on first request"""
+    for entry in manifest:
+        if lazy:
+            app.router.routes.append(LazyRouterMount(app, entry))
+            logger.info(f"Router {entry.module} registered for lazy loading at prefix: {entry.prefix or '/'}")
+        else:
+            app.include_router(entry.load_router(), prefix=entry.prefix, tags=list(entry.tags))
+            logger.info(f"Router {entry.module} included successfully at prefix: {entry.prefix or '/'}")
+
+    if lazy:
+        # The schema is built from APIRoutes, so /docs and /openapi.json load everything once
+        build_openapi = app.openapi
+
+        def openapi():
+            if app.openapi_schema is None:
+                materialize_lazy_routers(app)
+            return build_openapi()
+
+        app.openapi = openapi
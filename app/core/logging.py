@@ -1,8 +1,11 @@
 import logging
+import random
 import sys
+import time
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from app.core.config import settings
 
 def setup_logging() -> logging.Logger:
@@ -127,5 +130,61 @@ def log_email_operation(operation: str, recipient: str, success: bool = True, er
     else:
         logger.error(message)
 
+class AuthTrace:
+    """Timing and cache data for one sampled authentication"""
+    
+    __slots__ = ("source", "timings_ms", "cache", "outcome", "user_type")
+    
+    def __init__(self, source: str):
+        self.source = source
+        self.timings_ms: Dict[str, float] = {}
+        self.cache: Optional[str] = None  # "hit", "miss" or None when no cache is consulted
+        self.outcome = "ok"
+        self.user_type: Optional[str] = None
+    
+    @contextmanager
+    def span(self, name: str):
+        """Record the wall time of the enclosed block as `<name>_ms`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings_ms[name] = round((time.perf_counter() - started) * 1000, 3)
+    
+    def as_dict(self) -> dict:
+        data = {"source": self.source, "outcome": self.outcome, "cache": self.cache, "user_type": self.user_type}
+        data.update({f"{name}_ms": value for name, value in self.timings_ms.items()})
+        data["total_ms"] = round(sum(self.timings_ms.values()), 3)
+        return data
+
+def start_auth_trace(source: str) -> Optional[AuthTrace]:
+    """
+    Start an auth trace for this request if it is sampled.
+    
+    Sampling is controlled by AUTH_TRACE_SAMPLE_RATE (0 disables tracing, 1 traces
+    every request). Returns None for unsampled requests so callers pay nothing.
+    """
+    rate = settings.AUTH_TRACE_SAMPLE_RATE
+    if rate <= 0 or (rate < 1 and random.random() >= rate):
+        return None
+    return AuthTrace(source)
+
+def auth_trace_span(trace: Optional[AuthTrace], name: str):
+    """Timing span on a possibly-unsampled trace"""
+    if trace is None:
+        return nullcontext()
+    return trace.span(name)
+
+def log_auth_trace(trace: Optional[AuthTrace]):
+    """Emit a sampled auth trace as a structured log record"""
+    if trace is None:
+        return
+    data = trace.as_dict()
+    logger = get_logger("auth_trace")
+    logger.info(
+        "Auth Trace: " + " ".join(f"{key}={value}" for key, value in data.items()),
+        extra={"auth_trace": data}
+    )
+
 # Initialize logging when module is imported
 app_logger = setup_logging()
\ No newline at end of file
@@ -0,0 +1,219 @@
+# app/core/pool_metrics.py
+
+"""
+Connection pool telemetry.
+
+Engines registered with `instrument_engine` record how long each checkout
+waited for a connection, how many connections are checked out, overflow usage,
+checkout timeouts and invalidations. Snapshots are served as JSON by the admin
+API and in Prometheus text exposition format, so latency spikes can be told
+apart from pool starvation.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.engine import Engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """Counters and checkout wait histogram for one engine's pool"""
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_sum = 0.0
+        self.checkout_wait_max = 0.0
+        self.bucket_counts = [0] * len(CHECKOUT_WAIT_BUCKETS)
+        self.connections_created = 0
+        self.in_use = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+    def record_checkout(self, wait: float) -> None:
+        pool_state = self.pool_state()
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_sum += wait
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+            for index, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+                if wait <= bound:
+                    self.bucket_counts[index] += 1
+                    break
+            self.peak_checked_out = max(self.peak_checked_out, pool_state["checked_out"])
+            self.peak_overflow = max(self.peak_overflow, pool_state["overflow"])
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+    def pool_state(self) -> Dict[str, Optional[int]]:
+        """Current gauges; pools without a fixed size (e.g. SQLite memory) only report checked-out"""
+        pool = self.engine.pool
+        if hasattr(pool, "checkedout"):
+            return {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                # QueuePool counts overflow from -pool_size until the pool is full
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": getattr(pool, "_max_overflow", None),
+            }
+        return {"size": None, "checked_in": None, "checked_out": self.in_use, "overflow": 0, "max_overflow": None}
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool_state = self.pool_state()
+        with self._lock:
+            return {
+                "pool": self.name,
+                "pool_class": type(self.engine.pool).__name__,
+                **pool_state,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_avg_ms": round(self.checkout_wait_sum / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+                "checkout_wait_buckets": {
+                    str(bound): count for bound, count in zip(CHECKOUT_WAIT_BUCKETS, self.bucket_counts)
+                },
+                "checkout_wait_sum_seconds": self.checkout_wait_sum,
+                "connections_created": self.connections_created,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+            }
+
+
+# Registered pools by name
+pool_metrics_registry: Dict[str, PoolMetrics] = {}
+
+
+def _instrument_pool(pool, metrics: PoolMetrics) -> None:
+    """Time Pool.connect, which blocks while the pool is exhausted, up to pool_timeout"""
+    if getattr(pool, "_pool_metrics", None) is metrics:
+        return
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            connection = connect()
+        except sa_exc.TimeoutError:
+            metrics.record_timeout(time.perf_counter() - started)
+            raise
+        metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    pool.connect = timed_connect
+    pool._pool_metrics = metrics
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """
+    Attach pool telemetry to an engine (pass `AsyncEngine.sync_engine` for async engines).
+
+    Pool event listeners registered on the engine survive `engine.dispose()`;
+    the checkout timer is re-attached to the recreated pool.
+    """
+    existing = pool_metrics_registry.get(name)
+    if existing is not None and existing.engine is engine:
+        return existing
+
+    metrics = PoolMetrics(name, engine)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        with metrics._lock:
+            metrics.connections_created += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with metrics._lock:
+            metrics.in_use += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with metrics._lock:
+            metrics.in_use = max(metrics.in_use - 1, 0)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        with metrics._lock:
+            metrics.invalidations += 1
+        logger.warning(f"Database connection invalidated in pool '{name}': {exception}")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        with metrics._lock:
+            metrics.soft_invalidations += 1
+
+    @event.listens_for(engine, "engine_disposed")
+    def on_engine_disposed(disposed_engine):
+        _instrument_pool(disposed_engine.pool, metrics)
+
+    _instrument_pool(engine.pool, metrics)
+    pool_metrics_registry[name] = metrics
+    return metrics
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """Snapshots of every instrumented pool"""
+    return [metrics.snapshot() for metrics in pool_metrics_registry.values()]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(registry: Optional[Dict[str, PoolMetrics]] = None) -> str:
+    """Render pool metrics in Prometheus text exposition format (version 0.0.4)"""
+    registry = pool_metrics_registry if registry is None else registry
+    snapshots = [metrics.snapshot() for metrics in registry.values()]
+    lines: List[str] = []
+
+    def family(metric: str, metric_type: str, help_text: str, key: str) -> None:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for snap in snapshots:
+            value = snap[key]
+            if value is not None:
+                lines.append(f'{metric}{{pool="{_escape_label(snap["pool"])}"}} {value}')
+
+    family("db_pool_size", "gauge", "Configured number of persistent connections.", "size")
+    family("db_pool_checked_in", "gauge", "Idle connections available in the pool.", "checked_in")
+    family("db_pool_checked_out", "gauge", "Connections currently checked out.", "checked_out")
+    family("db_pool_overflow", "gauge", "Overflow connections currently open beyond pool_size.", "overflow")
+    family("db_pool_peak_checked_out", "gauge", "Highest checked-out count seen at checkout.", "peak_checked_out")
+    family("db_pool_connections_created_total", "counter", "New DBAPI connections opened.", "connections_created")
+    family("db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up after pool_timeout.", "checkout_timeouts")
+    family("db_pool_invalidations_total", "counter", "Connections invalidated (e.g. disconnects).", "invalidations")
+    family("db_pool_soft_invalidations_total", "counter", "Connections soft-invalidated for recycling.", "soft_invalidations")
+
+    metric = "db_pool_checkout_wait_seconds"
+    lines.append(f"# HELP {metric} Time spent waiting for a connection from the pool.")
+    lines.append(f"# TYPE {metric} histogram")
+    for snap in snapshots:
+        label = _escape_label(snap["pool"])
+        cumulative = 0
+        for bound, count in snap["checkout_wait_buckets"].items():
+            cumulative += count
+            lines.append(f'{metric}_bucket{{pool="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{pool="{label}",le="+Inf"}} {snap["checkouts"]}')
+        lines.append(f'{metric}_sum{{pool="{label}"}} {snap["checkout_wait_sum_seconds"]}')
+        lines.append(f'{metric}_count{{pool="{label}"}} {snap["checkouts"]}')
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,237 @@
+# app/core/query_profiler.py
+
+"""
+Statement-level query profiler with N+1 detection.
+
+Engine-wide `before_cursor_execute` / `after_cursor_execute` listeners record
+every statement executed while a QueryProfile is active in the current context:
+query count, DB time and a fingerprint per statement. A fingerprint executed
+N_PLUS_ONE_THRESHOLD or more times in one request is flagged as an N+1 pattern,
+with the first application frame that issued it.
+
+Profiling is opt-in:
+  - QueryProfilerMiddleware (QUERY_PROFILER_ENABLED) profiles every request,
+    logs a summary and adds X-DB-Query-Count / X-DB-Time-Ms response headers
+  - `query_budget()` profiles a block of code and fails a test when it runs
+    more queries than allowed or contains an N+1 pattern
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.logging import get_logger
+
+profiler_logger = get_logger("query_profiler")
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("current_query_profile", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+_POSTCOMPILE = re.compile(r"\(?\[POSTCOMPILE_\w+\]\)?")
+_WHITESPACE = re.compile(r"\s+")
+
+_THIS_FILE = os.path.abspath(__file__)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(_THIS_FILE))) + os.sep
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so executions differing only in values compare equal"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _POSTCOMPILE.sub("(?)", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _statement_origin() -> Optional[str]:
+    """First project frame outside installed packages and this module (file:line in function)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(_PROJECT_ROOT)
+            and filename != _THIS_FILE
+            and "site-packages" not in filename
+        ):
+            return f"{filename[len(_PROJECT_ROOT):]}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class StatementStats:
+    """Executions of one statement fingerprint"""
+    __slots__ = ("fingerprint", "count", "total_ms", "origin")
+
+    def __init__(self, statement_fingerprint: str, origin: Optional[str]):
+        self.fingerprint = statement_fingerprint
+        self.count = 0
+        self.total_ms = 0.0
+        self.origin = origin
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "origin": self.origin,
+        }
+
+
+class QueryProfile:
+    """Queries recorded for one request (or one `query_budget` block)"""
+
+    def __init__(self, label: str = "", n_plus_one_threshold: Optional[int] = None):
+        self.label = label
+        self.n_plus_one_threshold = n_plus_one_threshold or settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self.statements: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = StatementStats(key, _statement_origin())
+            stats.count += 1
+            stats.total_ms += duration_ms
+            self.query_count += 1
+            self.db_time_ms += duration_ms
+
+    def repeated(self) -> List[StatementStats]:
+        """Statements executed more than once, most frequent first"""
+        return sorted((s for s in self.statements.values() if s.count > 1), key=lambda s: s.count, reverse=True)
+
+    def n_plus_one(self) -> List[StatementStats]:
+        """SELECTs repeated at least n_plus_one_threshold times (one query per row of an earlier result)"""
+        return [
+            s for s in self.repeated()
+            if s.count >= self.n_plus_one_threshold and s.fingerprint.upper().startswith("SELECT")
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "queries": self.query_count,
+            "db_time_ms": round(self.db_time_ms, 3),
+            "distinct_statements": len(self.statements),
+            "repeated": [s.as_dict() for s in self.repeated()],
+            "n_plus_one": [s.as_dict() for s in self.n_plus_one()],
+        }
+
+    def report(self) -> str:
+        lines = [f"{self.label or 'profile'}: {self.query_count} queries, {self.db_time_ms:.2f} ms DB time"]
+        flagged = {id(s) for s in self.n_plus_one()}
+        for stats in self.repeated():
+            marker = "N+1 " if id(stats) in flagged else ""
+            lines.append(f"  {marker}x{stats.count} ({stats.total_ms:.2f} ms) at {stats.origin}: {stats.fingerprint[:200]}")
+        return "\n".join(lines)
+
+
+_listeners_installed = False
+_install_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("query_profiler_start")
+    if not starts:
+        return
+    profile.record(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+
+def install_query_profiler() -> None:
+    """Register the engine-wide cursor listeners (idempotent); they are no-ops without an active profile"""
+    global _listeners_installed
+    with _install_lock:
+        if not _listeners_installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            _listeners_installed = True
+
+
+@contextmanager
+def profile_queries(label: str = "", n_plus_one_threshold: Optional[int] = None):
+    """Record the queries executed in this block (and in threads/tasks started from it)"""
+    install_query_profiler()
+    profile = QueryProfile(label, n_plus_one_threshold)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by query_budget when a block issues too many queries or an N+1 pattern"""
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, allow_n_plus_one: bool = False, n_plus_one_threshold: Optional[int] = None):
+    """
+    Fail (e.g. a test) when the block runs more than `max_queries` statements.
+
+    Example:
+        with query_budget(3):
+            client.get("/api/v1/reports/pending-orders")
+    """
+    with profile_queries(f"query budget {max_queries}", n_plus_one_threshold) as profile:
+        yield profile
+    if profile.query_count > max_queries:
+        raise QueryBudgetExceeded(f"Query budget exceeded ({profile.query_count} > {max_queries})\n{profile.report()}")
+    if not allow_n_plus_one and profile.n_plus_one():
+        raise QueryBudgetExceeded(f"N+1 query pattern detected\n{profile.report()}")
+
+
+class QueryProfilerMiddleware:
+    """Pure ASGI middleware that profiles the queries of every HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+        install_query_profiler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope.get('method', '')} {scope['path']}"
+        with profile_queries(label) as profile:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(profile.query_count).encode()))
+                    headers.append((b"x-db-time-ms", f"{profile.db_time_ms:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                summary = profile.summary()
+                if summary["n_plus_one"]:
+                    profiler_logger.warning(f"N+1 queries in {profile.report()}", extra={"query_profile": summary})
+                else:
+                    profiler_logger.info(
+                        f"{label}: {summary['queries']} queries, {summary['db_time_ms']} ms DB time",
+                        extra={"query_profile": summary}
+                    )
@@ -0,0 +1,148 @@
+# app/core/read_replica.py
+
+"""
+Read-replica routing for reporting and analytics sessions.
+
+`ReadReplicaRouter` hands out sessions bound to the replica while it is
+reachable and its replication lag is within `max_lag_seconds`, and falls back
+to the primary otherwise. Lag is probed at most once per `check_interval`
+seconds and shared by all requests, so routing adds no query per request.
+
+Routes opt in with the `get_read_db` dependency (app.core.database); writes
+keep using `get_db`.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+# Seconds the replica is behind the primary; 0 when it has replayed everything it received
+_POSTGRES_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def measure_replica_lag(connection: Connection) -> float:
+    """Replication lag in seconds; databases without streaming replication (e.g. SQLite) report 0"""
+    if connection.dialect.name == "postgresql":
+        return float(connection.execute(_POSTGRES_LAG_SQL).scalar() or 0)
+    connection.execute(text("SELECT 1"))
+    return 0.0
+
+
+class ReadReplicaRouter:
+    """Choose between replica and primary session factories based on replica health"""
+
+    def __init__(
+        self,
+        primary_factory: Callable[[], Session],
+        replica_factory: Optional[Callable[[], Session]] = None,
+        max_lag_seconds: float = 30.0,
+        check_interval: float = 5.0,
+        lag_probe: Callable[[Connection], float] = measure_replica_lag,
+    ):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._lag: Optional[float] = None
+        self._available = False
+        self._last_error: Optional[str] = None
+        self.replica_sessions = 0
+        self.primary_sessions = 0
+        self.fallbacks = 0
+
+    @property
+    def configured(self) -> bool:
+        return self.replica_factory is not None
+
+    def _probe(self) -> None:
+        """Measure lag on a short-lived replica connection and update availability"""
+        session = self.replica_factory()
+        try:
+            lag = self.lag_probe(session.connection())
+            error = None
+        except Exception as e:
+            lag, error = None, str(e)
+        finally:
+            session.close()
+
+        available = lag is not None and lag <= self.max_lag_seconds
+        if available != self._available or self._checked_at is None:
+            if available:
+                logger.info(f"Read replica available (lag {lag:.1f}s)")
+            elif error is not None:
+                logger.warning(f"Read replica unreachable, routing reads to primary: {error}")
+            else:
+                logger.warning(
+                    f"Read replica lag {lag:.1f}s exceeds {self.max_lag_seconds}s, routing reads to primary"
+                )
+        self._lag = lag
+        self._available = available
+        self._last_error = error
+        self._checked_at = time.monotonic()
+
+    def replica_available(self) -> bool:
+        """Cached health check; at most one probe per check_interval across all threads"""
+        if not self.configured:
+            return False
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._available
+        with self._lock:
+            if self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval:
+                self._probe()
+            return self._available
+
+    def report_failure(self, error: Exception) -> None:
+        """Take the replica out of rotation until the next health check after a connection error"""
+        if not self.configured:
+            return
+        with self._lock:
+            if self._available:
+                logger.warning(f"Read replica failed during a request, routing reads to primary: {error}")
+            self._available = False
+            self._last_error = str(error)
+            self._checked_at = time.monotonic()
+
+    def session(self) -> Session:
+        """Replica session when healthy, otherwise a primary session; `session.info["database_role"]` tells which"""
+        if self.replica_available():
+            db = self.replica_factory()
+            db.info["database_role"] = REPLICA
+            self.replica_sessions += 1
+            return db
+        if self.configured:
+            self.fallbacks += 1
+        db = self.primary_factory()
+        db.info["database_role"] = PRIMARY
+        self.primary_sessions += 1
+        return db
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "configured": self.configured,
+            "available": self._available if self.configured else False,
+            "lag_seconds": None if self._lag is None else round(self._lag, 3),
+            "max_lag_seconds": self.max_lag_seconds,
+            "last_error": self._last_error,
+            "seconds_since_check": None if self._checked_at is None else round(time.monotonic() - self._checked_at, 3),
+            "replica_sessions": self.replica_sessions,
+            "primary_sessions": self.primary_sessions,
+            "fallbacks": self.fallbacks,
+        }
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional
-from jose import jwt, exceptions
+from jose import jwt
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
@@ -11,6 +11,12 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.base import User, PlatformUser
+from app.core.auth_cache import AuthenticatedPrincipal, principal_cache
+from app.core.jwt_verifier import jwt_verifier, InvalidTokenError
+from app.core.logging import start_auth_trace, auth_trace_span, log_auth_trace
+import logging
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
@@ -32,6 +38,7 @@ def create_access_token(
 
     to_encode = {
         "exp": expire,
+        "iat": datetime.now(timezone.utc),
         "sub": str(subject),
         "organization_id": organization_id,
         "user_role": user_role,
@@ -47,22 +54,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def decode_token_claims(token: str) -> Optional[dict]:
+    """Decode and validate a JWT, returning its claims or None if invalid"""
+    try:
+        return jwt_verifier.decode(token)
+    except InvalidTokenError as e:
+        logger.debug(f"JWT decode error: {e}")
+        return None
+
 def verify_token(token: str) -> tuple[Union[str, None], Union[int, None], Union[str, None], Union[str, None]]:
     """Verify token and return email, organization_id, user_role, and user_type"""
-    try:
-        print("DEBUG: Token to decode (security.py):", token)
-        payload = jwt.decode(
-            token, settings.jwt_secret, algorithms=[settings.ALGORITHM]
-        )
-        print("DEBUG: Decoded payload (security.py):", payload)
-        email = payload.get("sub")
-        organization_id = payload.get("organization_id")
-        user_role = payload.get("user_role")
-        user_type = payload.get("user_type", "organization")  # Default to organization for backward compatibility
-        return email, organization_id, user_role, user_type
-    except exceptions.JWTError as e:
-        print("JWT decode error (security.py):", str(e))
+    payload = decode_token_claims(token)
+    if payload is None:
         return None, None, None, None
+    email = payload.get("sub")
+    organization_id = payload.get("organization_id")
+    user_role = payload.get("user_role")
+    user_type = payload.get("user_type", "organization")  # Default to organization for backward compatibility
+    return email, organization_id, user_role, user_type
 
 def check_password_strength(password: str) -> tuple[bool, str]:
     """Check password strength and return validation result"""
@@ -89,6 +98,15 @@ def is_super_admin_email(email: str) -> bool:
     super_admin_emails = getattr(settings, 'SUPER_ADMIN_EMAILS', [])
     return email.lower() in [e.lower() for e in super_admin_emails]
 
+def _principal_cache_key(email: str, user_type: str, payload: dict) -> tuple:
+    """Cache key for a token's principal: (user_type, email, token iat)"""
+    return (user_type, email, payload.get("iat"))
+
+def _load_user(db: Session, email: str, user_type: str):
+    if user_type == "platform":
+        return db.query(PlatformUser).filter(PlatformUser.email == email).first()
+    return db.query(User).filter(User.email == email).first()
+
 # Dependency for FastAPI routes
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
@@ -96,20 +114,75 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    print("DEBUG: get_current_user (security.py) called")
-    email, organization_id, user_role, user_type = verify_token(token)
-    if not email:
-        print("DEBUG: Invalid email in token (security.py), raising credentials_exception")
-        raise credentials_exception
-
-    if user_type == "platform":
-        user = db.query(PlatformUser).filter(PlatformUser.email == email).first()
-    else:
-        user = db.query(User).filter(User.email == email).first()
-
-    if not user:
-        print("DEBUG: User not found in DB (security.py), raising credentials_exception")
-        raise credentials_exception
-
-    print("DEBUG: Authenticated user (security.py):", user.email)
-    return user
\ No newline at end of file
+    trace = start_auth_trace("get_current_user")
+    try:
+        with auth_trace_span(trace, "decode"):
+            payload = decode_token_claims(token)
+        email = payload.get("sub") if payload else None
+        if not email:
+            if trace:
+                trace.outcome = "invalid_token"
+            raise credentials_exception
+        user_type = payload.get("user_type", "organization")
+        if trace:
+            trace.user_type = user_type
+
+        with auth_trace_span(trace, "user_lookup"):
+            user = _load_user(db, email, user_type)
+
+        if not user:
+            if trace:
+                trace.outcome = "user_not_found"
+            raise credentials_exception
+
+        # The full row is loaded anyway; refresh the principal snapshot for read-only routes
+        principal_cache.put(
+            _principal_cache_key(email, user_type, payload),
+            AuthenticatedPrincipal.from_user(user, user_type)
+        )
+        return user
+    finally:
+        log_auth_trace(trace)
+
+def get_current_principal(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> AuthenticatedPrincipal:
+    """
+    Resolve the bearer token to a cached, immutable principal snapshot.
+
+    Use this instead of get_current_user on read-only routes that only need the
+    user's id, organization, role or flags: cache hits skip the users query
+    entirely (the injected session never checks out a connection).
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    trace = start_auth_trace("get_current_principal")
+    try:
+        with auth_trace_span(trace, "decode"):
+            payload = decode_token_claims(token)
+        email = payload.get("sub") if payload else None
+        if not email:
+            if trace:
+                trace.outcome = "invalid_token"
+            raise credentials_exception
+        user_type = payload.get("user_type", "organization")
+        if trace:
+            trace.user_type = user_type
+
+        key = _principal_cache_key(email, user_type, payload)
+        principal = principal_cache.get(key)
+        if trace:
+            trace.cache = "miss" if principal is None else "hit"
+        if principal is None:
+            with auth_trace_span(trace, "user_lookup"):
+                user = _load_user(db, email, user_type)
+            if not user:
+                if trace:
+                    trace.outcome = "user_not_found"
+                raise credentials_exception
+            principal = AuthenticatedPrincipal.from_user(user, user_type)
+            principal_cache.put(key, principal)
+        return principal
+    finally:
+        log_auth_trace(trace)
@@ -7,16 +7,15 @@
 """
 Multi-tenant context and middleware for strict tenant isolation
 """
-from typing import Optional, Any, Type, TypeVar, List
+from typing import Optional, Any, Dict, Sequence, Type, TypeVar, List
 from contextvars import ContextVar
 from fastapi import Request, HTTPException, Depends, status
-from sqlalchemy.orm import Session, Query
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, Query, Mapper, ORMExecuteState, with_loader_criteria
+from sqlalchemy import and_, event, inspect as sa_inspect
 from app.core.database import get_db
 from app.models.base import Organization, User, Company
-from starlette.responses import Response
 from app.core.config import settings as config_settings
-from app.core.security import oauth2_scheme, verify_token  # Added import for JWT auth
+from app.core.security import oauth2_scheme, verify_token, decode_token_claims  # Added import for JWT auth
 import logging
 
 logger = logging.getLogger(__name__)
@@ -68,6 +67,70 @@ class TenantContext:
             return True
         return user.organization_id == organization_id
 
+# Execution option that disables automatic tenant criteria for one statement,
+# e.g. db.query(Product).execution_options(skip_tenant_filter=True)
+SKIP_TENANT_FILTER = "skip_tenant_filter"
+
+# Per-mapper answer to "is this model tenant-owned?", computed once per model
+_tenant_scoped_mappers: Dict[Mapper, bool] = {}
+
+def is_tenant_scoped(model: Any) -> bool:
+    """
+    Whether SELECTs for a model are automatically scoped to the current organization.
+    
+    Tenant-owned models are those with a NOT NULL organization_id column; models
+    whose organization_id is nullable (User, AuditLog) also hold platform rows and
+    are not scoped. A model can override this with `__tenant_scoped__ = True/False`.
+    """
+    mapper = model if isinstance(model, Mapper) else sa_inspect(model, raiseerr=False)
+    if not isinstance(mapper, Mapper):
+        return False
+    scoped = _tenant_scoped_mappers.get(mapper)
+    if scoped is None:
+        override = getattr(mapper.class_, "__tenant_scoped__", None)
+        if override is not None:
+            scoped = bool(override)
+        else:
+            column = mapper.columns.get("organization_id")
+            scoped = column is not None and not column.nullable
+        _tenant_scoped_mappers[mapper] = scoped
+    return scoped
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_tenant_criteria(execute_state: ORMExecuteState) -> None:
+    """
+    Add `organization_id = :org` for every tenant-owned entity selected while an
+    organization context is set.
+    
+    The criterion is a lambda, so the organization id is extracted as a bound
+    parameter and the compiled statement is cached across tenants. Lazy and
+    column loads are skipped: they are reached through rows already scoped.
+    """
+    if (
+        not config_settings.TENANT_QUERY_AUTO_FILTER
+        or not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get(SKIP_TENANT_FILTER, False)
+    ):
+        return
+    
+    org_id = _current_organization_id.get()
+    if org_id is None:
+        return
+    
+    options = [
+        with_loader_criteria(
+            mapper.class_,
+            lambda cls: cls.organization_id == org_id,
+            include_aliases=True
+        )
+        for mapper in execute_state.all_mappers
+        if is_tenant_scoped(mapper)
+    ]
+    if options:
+        execute_state.statement = execute_state.statement.options(*options)
+
 class TenantQueryFilter:
     """Enhanced query filter for strict organization-level data isolation"""
     
@@ -173,96 +236,137 @@ class TenantQueryMixin:
         query = db.query(model)
         return TenantQueryFilter.apply_organization_filter(query, model, user=user)
 
+class PathPrefixTrie:
+    """
+    Segment trie of excluded paths, built once at startup.
+    
+    `add(path)` excludes a path and everything below it; `add(path, exact=True)`
+    excludes only that path. `matches()` walks one node per path segment instead
+    of scanning a list of strings per request.
+    """
+    
+    _PREFIX = "__prefix__"
+    _EXACT = "__exact__"
+    
+    def __init__(self, prefixes: Sequence[str] = (), exact_paths: Sequence[str] = ()):
+        self._root: Dict[str, Any] = {}
+        for prefix in prefixes:
+            self.add(prefix)
+        for path in exact_paths:
+            self.add(path, exact=True)
+    
+    @staticmethod
+    def _segments(path: str) -> List[str]:
+        return [segment for segment in path.split("/") if segment]
+    
+    def add(self, path: str, exact: bool = False) -> None:
+        node = self._root
+        for segment in self._segments(path):
+            node = node.setdefault(segment, {})
+        node[self._EXACT if exact else self._PREFIX] = True
+    
+    def matches(self, path: str) -> bool:
+        node = self._root
+        if self._PREFIX in node:
+            return True
+        for segment in self._segments(path):
+            node = node.get(segment)
+            if node is None:
+                return False
+            if self._PREFIX in node:
+                return True
+        return self._EXACT in node
+
+# Paths served without tenant context (authentication and app-level/super admin endpoints)
+TENANT_EXCLUDED_PREFIXES = [
+    "/api/v1/auth",
+]
+TENANT_EXCLUDED_PATHS = [
+    "/api/users/me",
+    "/organizations/app-statistics",
+    "/api/v1/organizations/app-statistics",
+    "/organizations/org-statistics",
+    "/api/v1/organizations/org-statistics",
+    "/organizations/license/create",
+    "/api/v1/organizations/license/create",
+    "/organizations/factory-default",
+    "/api/v1/organizations/factory-default",
+    "/organizations/reset-data",
+    "/api/v1/organizations/reset-data",
+    # Add more as needed
+]
+
 class TenantMiddleware:
-    """Enhanced middleware to extract and set tenant context from requests"""
+    """
+    Pure ASGI middleware that sets the organization context for each request.
+    
+    The organization comes from the bearer token's `organization_id` claim
+    (decoded through the shared JWT verifier, so repeat tokens are a cache hit
+    and no database query is made). Platform tokens without an organization may
+    select one with the X-Organization-ID header or an /api/v1/org/{org_id}/
+    path. Requests without an organization pass through with no context; routes
+    that need one reject them via require_current_organization_id().
+    """
     
-    def __init__(self, app):
+    def __init__(
+        self,
+        app,
+        excluded_prefixes: Sequence[str] = TENANT_EXCLUDED_PREFIXES,
+        excluded_paths: Sequence[str] = TENANT_EXCLUDED_PATHS
+    ):
         self.app = app
+        self.excluded = PathPrefixTrie(excluded_prefixes, excluded_paths)
     
     async def __call__(self, scope, receive, send):
-        if scope["type"] == "http":
-            request = Request(scope, receive)
-            
-            # Allow OPTIONS requests to pass through without tenant processing
-            # This is crucial for CORS preflight requests
-            if request.method == "OPTIONS":
-                await self.app(scope, receive, send)
-                return
-            
-            # Skip tenant extraction for auth endpoints and app-level/super admin endpoints
-            if request.url.path.startswith("/api/v1/auth/"):
-                logger.debug(f"Skipping tenant extraction for auth path: {request.url.path}")
-                await self.app(scope, receive, send)
-                return
-            
-            excluded_paths = [
-                "/api/users/me",
-                "/organizations/app-statistics",
-                "/api/v1/organizations/app-statistics",
-                "/organizations/org-statistics",
-                "/api/v1/organizations/org-statistics",
-                "/organizations/license/create",
-                "/api/v1/organizations/license/create",
-                "/organizations/factory-default",
-                "/api/v1/organizations/factory-default",
-                "/organizations/reset-data",
-                "/api/v1/organizations/reset-data",
-                # Add more as needed
-            ]
-            if request.url.path in excluded_paths:
-                logger.debug(f"Skipping tenant extraction for app-level path: {request.url.path}")
-                await self.app(scope, receive, send)
-                return
-            
-            # Extract organization context from various sources for non-OPTIONS requests
-            org_id = self._extract_organization_id(request)
-            
-            if org_id:
-                TenantContext.set_organization_id(org_id)
-                logger.debug(f"Middleware set organization context: {org_id}")
-                await self.app(scope, receive, send)
-            else:
-                # Instead of raising exception, return a 404 response with CORS headers
-                origin = request.headers.get("origin")
-                response = Response("Not Found", status_code=404)
-                if origin and (origin in config_settings.BACKEND_CORS_ORIGINS or '*' in config_settings.BACKEND_CORS_ORIGINS):
-                    response.headers["Access-Control-Allow-Origin"] = origin
-                    response.headers["Access-Control-Allow-Credentials"] = "true"
-                    response.headers["Access-Control-Allow-Methods"] = "*"
-                    response.headers["Access-Control-Allow-Headers"] = "*"
-                await response(scope, receive, send)
-                return
+        # Allow OPTIONS requests to pass through without tenant processing
+        # This is crucial for CORS preflight requests
+        if (
+            scope["type"] not in ("http", "websocket")
+            or scope.get("method") == "OPTIONS"
+            or self.excluded.matches(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
         
-        # Clear context after request
-        TenantContext.clear()
-
-    
-    def _extract_organization_id(self, request: Request) -> Optional[int]:
-        """Extract organization ID from request headers, subdomain, or path"""
+        org_id = self._extract_organization_id(scope)
+        if org_id is None:
+            await self.app(scope, receive, send)
+            return
+        
+        context_token = _current_organization_id.set(org_id)
         try:
-            # Method 1: From custom header
-            org_header = request.headers.get("X-Organization-ID")
-            if org_header and org_header.isdigit():
-                return int(org_header)
-            
-            # Method 2: From subdomain-based extraction (e.g., tenant1.api.example.com)
-            host = request.headers.get("host", "")
-            if "." in host:
-                subdomain = host.split(".")[0]
-                if subdomain and subdomain not in ["www", "api", "admin"]:
-                    # Look up organization by subdomain
-                    # Note: This would require database access in middleware
-                    # For now, we'll handle this in the authentication dependency
-                    pass
-            
-            # Method 3: From path parameter (e.g., /api/v1/org/{org_id}/...)
-            path_parts = request.url.path.split("/")
-            if len(path_parts) >= 5 and path_parts[3] == "org":
-                if path_parts[4].isdigit():
-                    return int(path_parts[4])
-                    
-        except Exception as e:
-            logger.warning(f"Error extracting organization ID: {e}")
+            await self.app(scope, receive, send)
+        finally:
+            # Clear context after request
+            _current_organization_id.reset(context_token)
+    
+    def _extract_organization_id(self, scope) -> Optional[int]:
+        """Extract organization ID from JWT claims, X-Organization-ID header, or path"""
+        authorization = None
+        org_header = None
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                authorization = value
+            elif name == b"x-organization-id":
+                org_header = value
+        
+        # Method 1: From the verified bearer token (organization users are bound to their organization)
+        if authorization is not None and authorization[:7].lower() == b"bearer ":
+            claims = decode_token_claims(authorization[7:].decode("latin-1").strip())
+            if claims is not None and claims.get("organization_id") is not None:
+                try:
+                    return int(claims["organization_id"])
+                except (TypeError, ValueError):
+                    logger.warning("Ignoring non-integer organization_id claim")
+        
+        # Method 2: From custom header
+        if org_header is not None and org_header.isdigit():
+            return int(org_header)
+        
+        # Method 3: From path parameter (e.g., /api/v1/org/{org_id}/...)
+        path_parts = scope["path"].split("/")
+        if len(path_parts) >= 5 and path_parts[3] == "org" and path_parts[4].isdigit():
+            return int(path_parts[4])
         
         return None
 
@@ -188,15 +188,42 @@ class EnvironmentConfig:
         """Check if emails should be sent in current environment"""
         return not cls.is_testing() and bool(settings.SMTP_USERNAME)
     
+    # Connection pool profiles of the sync engine by ENVIRONMENT; environments without an entry
+    # (production and development included) use "default", the long-standing 10/20/30s/300s sizing
+    DATABASE_POOL_PROFILES = {
+        "default": {"pool_size": 10, "max_overflow": 20, "pool_timeout": 30, "pool_recycle": 300},
+        "testing": {"pool_size": 2, "max_overflow": 5, "pool_timeout": 30, "pool_recycle": 300},
+    }
+    # The async engine (async routes only) gets its own, smaller pool on top of the sync one
+    ASYNC_DATABASE_POOL_DEFAULTS = {"pool_size": 5, "max_overflow": 5}
+    
+    @classmethod
+    def get_database_pool_config(cls) -> Dict[str, int]:
+        """Get connection pool settings for environment, with DB_POOL_* settings taking precedence"""
+        profile = cls.DATABASE_POOL_PROFILES.get(
+            settings.ENVIRONMENT.lower(), cls.DATABASE_POOL_PROFILES["default"]
+        )
+        overrides = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        }
+        return {key: value if overrides[key] is None else overrides[key] for key, value in profile.items()}
+    
+    @classmethod
+    def get_async_database_pool_config(cls) -> Dict[str, int]:
+        """Get connection pool settings of the async engine; timeout and recycle follow the sync engine"""
+        config = cls.get_database_pool_config()
+        overrides = {"pool_size": settings.DB_ASYNC_POOL_SIZE, "max_overflow": settings.DB_ASYNC_MAX_OVERFLOW}
+        for key, value in cls.ASYNC_DATABASE_POOL_DEFAULTS.items():
+            config[key] = value if overrides[key] is None else overrides[key]
+        return config
+    
     @classmethod
     def get_database_pool_size(cls) -> int:
         """Get appropriate database pool size for environment"""
-        if cls.is_production():
-            return 20
-        elif cls.is_development():
-            return 5
-        else:
-            return 2
+        return cls.get_database_pool_config()["pool_size"]
 
 # Validation rules for organization data
 ORGANIZATION_VALIDATION = {
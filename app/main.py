@@ -1,5 +1,6 @@
 # app/main.py
 
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
@@ -7,71 +8,20 @@ from fastapi.routing import APIRoute
 from app.core.config import settings as config_settings
 from app.core.database import create_tables, SessionLocal
 from app.core.tenant import TenantMiddleware
+from app.core.query_profiler import QueryProfilerMiddleware
 from app.core.seed_super_admin import seed_super_admin
-from app.api import users, companies, vendors, customers, products, reports, platform, settings, pincode, customer_analytics, notifications
-from app.api.v1 import stock as v1_stock
-from app.api.v1.vouchers import router as v1_vouchers_router  # Updated import
-from app.api.routes import admin
+from app.services.account_balance_service import AccountBalanceService
+from app.services.ledger_snapshot_service import run_snapshot_job
+from app.services.dashboard_counter_service import run_recompute_job
+from app.services.stock_ledger_service import run_reconcile_job
+from app.api.router_manifest import ROUTER_MANIFEST
+from app.core.lazy_router import include_manifest, LazyRouterMount
 import logging
 
 # Configure logging at the top
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import enhanced v1 routers
-from app.api.v1 import auth as v1_auth, admin as v1_admin, reset as v1_reset, app_users as v1_app_users
-# Added missing v1 imports
-from app.api.v1 import admin_setup as v1_admin_setup, login as v1_login, master_auth as v1_master_auth, otp as v1_otp, password as v1_password, user as v1_user
-from app.api.v1 import pdf_extraction as v1_pdf_extraction
-# Updated import for organizations in v1
-try:
-    from app.api.v1.organizations import router as organizations_router
-    logger.info("Successfully imported organizations_router")
-except Exception as import_error:
-    logger.error(f"Failed to import organizations_router: {str(import_error)}")
-    raise
-
-# Add try/except for failing routers to log import errors
-try:
-    from app.api import companies
-    logger.info("Successfully imported companies_router")
-except Exception as import_error:
-    logger.error(f"Failed to import companies_router: {str(import_error)}")
-    raise
-
-try:
-    from app.api import products
-    logger.info("Successfully imported products_router")
-except Exception as import_error:
-    logger.error(f"Failed to import products_router: {str(import_error)}")
-    raise
-
-try:
-    from app.api.v1 import stock as v1_stock
-    logger.info("Successfully imported stock_router")
-except Exception as import_error:
-    logger.error(f"Failed to import stock_router: {str(import_error)}")
-    raise
-
-# Add imports for BOM and Manufacturing
-from app.api.v1 import bom as v1_bom
-from app.api.v1 import manufacturing as v1_manufacturing
-
-# Add import for company branding
-from app.api.v1 import company_branding as v1_company_branding
-
-# Add import for SLA management
-from app.api.v1 import sla as v1_sla
-
-# Add import for dispatch management
-from app.api.v1 import dispatch as v1_dispatch
-
-# Add import for feedback and service closure workflow
-from app.api.v1 import feedback as v1_feedback
-
-# Add import for inventory management
-from app.api.v1 import inventory as v1_inventory
-
 # Create FastAPI app
 app = FastAPI(
     title=config_settings.PROJECT_NAME,
@@ -82,8 +32,12 @@ app = FastAPI(
 
 app.router.redirect_slashes = True
 
-# Temporarily disable TenantMiddleware to test if it's causing the 404 (re-enable after testing)
-# app.add_middleware(TenantMiddleware)
+# Opt-in SQL profiling per request (X-DB-Query-Count / X-DB-Time-Ms headers, N+1 warnings)
+if config_settings.QUERY_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
+
+# Tenant context from verified JWT claims (no database access, requests without an organization pass through)
+app.add_middleware(TenantMiddleware)
 
 # Set up CORS for frontend integration
 # IMPORTANT: This middleware must be added AFTER other route-specific middleware
@@ -110,7 +64,7 @@ async def log_cors_config():
     logger.info("=" * 50)
 
 # ------------------------------------------------------------------------------
-# ENHANCED V1 API ROUTERS
+# API ROUTERS (see app/api/router_manifest.py for the ordered list)
 # ------------------------------------------------------------------------------
 # Authentication endpoints are available at:
 # - - POST /api/auth/login (form-data authentication)
@@ -122,165 +76,10 @@ async def log_cors_config():
 #   headers: { 'Content-Type': 'application/json' },
 #   body: JSON.stringify({ email: 'user@example.com', password: 'password123' })
 # })
-app.include_router(
-    v1_auth.router, 
-    prefix="/api/v1/auth", 
-    tags=["authentication-v1"]
-)
-logger.info("Auth router included successfully at prefix: /api/v1/auth")
-app.include_router(
-    v1_admin.router, 
-    prefix="/api/v1/admin", 
-    tags=["admin-v1"]
-)
-logger.info("Admin router included successfully at prefix: /api/v1/admin")
-app.include_router(
-    v1_reset.router, 
-    prefix="/api/v1/reset", 
-    tags=["reset-v1"]
-)
-logger.info("Reset router included successfully at prefix: /api/v1/reset")
-app.include_router(
-    v1_app_users.router,
-    prefix="/api/v1/app-users",
-    tags=["app-user-management"]
-)
-logger.info("App users router included successfully at prefix: /api/v1/app-users")
-
-# Added includes for missing v1 routers with consistent /api/v1 prefixes
-app.include_router(
-    v1_admin_setup.router,
-    prefix="/api/v1/admin-setup",
-    tags=["admin-setup-v1"]
-)
-logger.info("Admin setup router included successfully at prefix: /api/v1/admin-setup")
-app.include_router(
-    v1_login.router,
-    prefix="/api/v1/login",
-    tags=["login-v1"]
-)
-logger.info("Login router included successfully at prefix: /api/v1/login")
-app.include_router(
-    v1_master_auth.router,
-    prefix="/api/v1/master-auth",
-    tags=["master-auth-v1"]
-)
-logger.info("Master auth router included successfully at prefix: /api/v1/master-auth")
-app.include_router(
-    v1_otp.router,
-    prefix="/api/v1/otp",
-    tags=["otp-v1"]
-)
-logger.info("OTP router included successfully at prefix: /api/v1/otp")
-app.include_router(
-    v1_password.router,
-    prefix="/api/v1/password",
-    tags=["password-v1"]
-)
-logger.info("Password router included successfully at prefix: /api/v1/password")
-app.include_router(
-    v1_user.router,
-    prefix="/api/v1/user",
-    tags=["v1-user"]
-)
-logger.info("User router included successfully at prefix: /api/v1/user")
-
-# PDF Extraction API
-app.include_router(
-    v1_pdf_extraction.router,
-    prefix="/api/v1/pdf-extraction",
-    tags=["pdf-extraction"]
-)
-logger.info("PDF extraction router included successfully at prefix: /api/v1/pdf-extraction")
-
-# Service CRM RBAC API
-from app.api.v1 import rbac as v1_rbac
-app.include_router(
-    v1_rbac.router,
-    prefix="/api/v1/rbac",
-    tags=["service-crm-rbac"]
-)
-logger.info("Service CRM RBAC router included successfully at prefix: /api/v1/rbac")
-
-# ------------------------------------------------------------------------------
-# LEGACY API ROUTERS (business modules)
-# ------------------------------------------------------------------------------
-app.include_router(platform.router, prefix="/api/v1/platform", tags=["platform"])
-logger.info("Platform router included successfully at prefix: /api/v1/platform")
-try:
-    app.include_router(organizations_router, prefix="/api/v1/organizations", tags=["organizations"])
-    logger.info("Organizations router included successfully at prefix: /api/v1/organizations")
-except Exception as e:
-    logger.error(f"Error including organizations router: {str(e)}")
-    print(f"Error including organizations router: {str(e)}")  # Print to console in case file logging fails
-    raise  # Raise to stop server if include fails, to force noticing the issue
-
-app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
-logger.info("Users router included successfully at prefix: /api/v1/users")
-app.include_router(admin.router, prefix="/api/admin", tags=["admin-legacy"])
-logger.info("Admin legacy router included successfully at prefix: /api/admin")
-app.include_router(companies.router, prefix="/api/v1/companies", tags=["companies"])
-logger.info("Companies router included successfully at prefix: /api/v1/companies")
-app.include_router(vendors.router, prefix="/api/v1/vendors", tags=["vendors"])
-logger.info("Vendors router included successfully at prefix: /api/v1/vendors")
-app.include_router(customers.router, prefix="/api/v1/customers", tags=["customers"])
-logger.info("Customers router included successfully at prefix: /api/v1/customers")
-app.include_router(products.router, prefix="/api/v1/products", tags=["products"])
-logger.info("Products router included successfully at prefix: /api/v1/products")
-
-# Company branding and PDF audit endpoints (static)
-app.include_router(v1_company_branding.router, prefix="/api/v1/company", tags=["company-branding"])
-logger.info("Company branding router included successfully at prefix: /api/v1/company")
-app.include_router(v1_company_branding.router, prefix="/api/v1/audit", tags=["audit"])
-logger.info("Audit router included successfully at prefix: /api/v1/audit")
-
-app.include_router(v1_vouchers_router, prefix="/api/v1")  # Updated to v1 vouchers
-logger.info("Vouchers router included successfully at prefix: /api/v1")
-app.include_router(reports.router, prefix="/api/v1/reports", tags=["reports"])
-logger.info("Reports router included successfully at prefix: /api/v1/reports")
-app.include_router(settings.router, prefix="/api/v1/settings", tags=["settings"])
-logger.info("Settings router included successfully at prefix: /api/v1/settings")
-app.include_router(pincode.router, prefix="/api/v1/pincode", tags=["pincode"])
-logger.info("Pincode router included successfully at prefix: /api/v1/pincode")
-
-# Customer Analytics API
-app.include_router(customer_analytics.router, prefix="/api/v1/analytics", tags=["customer-analytics"])
-logger.info("Customer Analytics router included successfully at prefix: /api/v1/analytics")
-
-# Notifications API for Service CRM
-app.include_router(notifications.router, prefix="/api/v1/notifications", tags=["notifications"])
-logger.info("Notifications router included successfully at prefix: /api/v1/notifications")
-
-# Include static path routers BEFORE dynamic ones to prevent conflicts
-app.include_router(v1_stock.router, prefix="/api/v1/stock", tags=["stock"])  # Static /stock paths
-logger.info("Stock router included successfully at prefix: /api/v1/stock")
-
-# Include SLA router
-app.include_router(v1_sla.router, prefix="/api/v1/sla", tags=["sla"])
-logger.info("SLA router included successfully at prefix: /api/v1/sla")
-
-# Include dispatch router
-app.include_router(v1_dispatch.router, prefix="/api/v1/dispatch", tags=["dispatch"])
-logger.info("Dispatch router included successfully at prefix: /api/v1/dispatch")
-
-# Include feedback and service closure router
-app.include_router(v1_feedback.router, prefix="/api/v1/feedback", tags=["feedback-closure"])
-logger.info("Feedback and service closure router included successfully at prefix: /api/v1/feedback")
-
-# Include inventory management router
-app.include_router(v1_inventory.router, prefix="/api/v1/inventory", tags=["inventory-management"])
-logger.info("Inventory management router included successfully at prefix: /api/v1/inventory")
-
-# Include service analytics router
-from app.api.v1 import service_analytics as v1_service_analytics
-app.include_router(v1_service_analytics.router, prefix="/api/v1/service-analytics", tags=["service-analytics"])
-logger.info("Service Analytics router included successfully at prefix: /api/v1/service-analytics")
-
-# Include dynamic path routers LAST
-app.include_router(v1_bom.router, prefix="/api/v1", tags=["bom"])  # Dynamic /{bom_id}
-logger.info("BOM router included successfully at prefix: /api/v1")
-app.include_router(v1_manufacturing.router, prefix="/api/v1", tags=["manufacturing"])  # Potential dynamic paths
-logger.info("Manufacturing router included successfully at prefix: /api/v1")
+#
+# With LAZY_ROUTER_LOADING each router module (and heavy dependencies such as
+# pandas, openpyxl and PyMuPDF) is imported on the first request under its prefix.
+include_manifest(app, ROUTER_MANIFEST, lazy=config_settings.LAZY_ROUTER_LOADING)
 
 @app.get("/routes")
 def get_routes():
@@ -318,12 +117,48 @@ async def startup_event():
                 logger.info("Super admin seeding completed")
             else:
                 logger.warning("Database schema is not updated. Run 'alembic upgrade head' to enable super admin seeding.")
+            # Databases created before the ledger projection existed need their balances built once
+            if AccountBalanceService.backfill_if_empty(db):
+                logger.info("Account balances built from existing vouchers")
         finally:
             db.close()
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
         raise
 
+    # Month-end ledger balance snapshots keep date-filtered ledgers from scanning full history
+    if config_settings.LEDGER_SNAPSHOT_INTERVAL_HOURS > 0:
+        app.state.ledger_snapshot_task = asyncio.create_task(
+            run_snapshot_job(SessionLocal, config_settings.LEDGER_SNAPSHOT_INTERVAL_HOURS * 3600)
+        )
+
+    # Dashboard counters are maintained on flush; the recount repairs drift from bulk SQL changes
+    if config_settings.DASHBOARD_COUNTER_RECOMPUTE_INTERVAL_HOURS > 0:
+        app.state.dashboard_counter_task = asyncio.create_task(
+            run_recompute_job(SessionLocal, config_settings.DASHBOARD_COUNTER_RECOMPUTE_INTERVAL_HOURS * 3600)
+        )
+
+    # Stock moves through an append-only ledger; the check reports balances that drifted from it
+    if config_settings.STOCK_RECONCILE_INTERVAL_HOURS > 0:
+        app.state.stock_reconcile_task = asyncio.create_task(
+            run_reconcile_job(SessionLocal, config_settings.STOCK_RECONCILE_INTERVAL_HOURS * 3600)
+        )
+
+    # Large exports run on worker threads; finished files are deleted once their TTL passes
+    if config_settings.EXPORT_JOB_WORKERS > 0:
+        # Imported here so pandas and openpyxl still load lazily with the export routers
+        from app.services.export_job_service import get_export_job_manager, run_cleanup_job
+        export_jobs = get_export_job_manager()
+        export_jobs.start()
+        app.state.export_job_cleanup_task = asyncio.create_task(
+            run_cleanup_job(export_jobs, min(config_settings.EXPORT_JOB_TTL_MINUTES * 60, 900))
+        )
+
+    # Large imports run on worker threads, which also resume jobs left unfinished by a crashed process
+    if config_settings.IMPORT_JOB_WORKERS > 0:
+        from app.services.import_job_service import get_import_job_manager
+        get_import_job_manager().start()
+
     # Log all registered routes for debugging the 404 issue
     logger.info("=" * 50)
     logger.info("Registered Routes (for debugging):")
@@ -331,11 +166,23 @@ async def startup_event():
         if isinstance(route, APIRoute):
             methods = ', '.join(sorted(route.methods)) if route.methods else 'ALL'
             logger.info(f"{methods} {route.path}")
+        elif isinstance(route, LazyRouterMount) and not route.loaded:
+            logger.info(f"LAZY {route.entry.prefix}/* ({route.entry.module})")
     logger.info("=" * 50)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down TRITIQ ERP API...")
+    for task_name in ("ledger_snapshot_task", "dashboard_counter_task", "stock_reconcile_task", "export_job_cleanup_task"):
+        task = getattr(app.state, task_name, None)
+        if task is not None:
+            task.cancel()
+    if config_settings.EXPORT_JOB_WORKERS > 0:
+        from app.services.export_job_service import get_export_job_manager
+        get_export_job_manager().stop()
+    if config_settings.IMPORT_JOB_WORKERS > 0:
+        from app.services.import_job_service import get_import_job_manager
+        get_import_job_manager().stop()
 
 @app.get("/")
 async def root():
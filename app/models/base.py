@@ -497,7 +497,8 @@ class Stock(Base):
     
     # Stock details
     product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id"), nullable=False)
-    quantity: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # Old values are loaded on change so the movement ledger can record the difference
+    quantity: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, active_history=True)
     unit: Mapped[str] = mapped_column(String, nullable=False)
     location: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -513,6 +514,109 @@ class Stock(Base):
         Index('idx_stock_org_location', 'organization_id', 'location'),
     )
 
+class StockMovement(Base):
+    """
+    Append-only ledger of stock changes, one row per change of a stock entry (a product at a location).
+    Written by app/services/stock_ledger_service.py; a stock entry's quantity equals the sum of its movements.
+    """
+    __tablename__ = "stock_movements"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    
+    # Multi-tenant field
+    organization_id: Mapped[int] = mapped_column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    
+    # Stock entry (balance) moved, with its product and location at the time
+    stock_id: Mapped[int] = mapped_column(Integer, ForeignKey("stock.id", ondelete="CASCADE"), nullable=False)
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id"), nullable=False)
+    location: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    
+    # Movement details
+    movement_type: Mapped[str] = mapped_column(String(20), nullable=False)  # 'receipt', 'issue', 'adjustment', 'transfer', 'opening', 'correction', 'import', 'reconciliation'
+    quantity_change: Mapped[float] = mapped_column(Float, nullable=False)  # Positive into stock, negative out of it
+    balance_after: Mapped[float] = mapped_column(Float, nullable=False)
+    
+    # Reference information
+    reference_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # 'inventory_transaction', 'goods_receipt_note', ...
+    reference_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # User tracking
+    created_by_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_stock_movement_stock', 'stock_id', 'id'),
+        Index('idx_stock_movement_org_product', 'organization_id', 'product_id'),
+        Index('idx_stock_movement_reference', 'reference_type', 'reference_id'),
+    )
+
+class DashboardCounter(Base):
+    """Per-organization dashboard totals, kept current on flush by app/services/dashboard_counter_service.py"""
+    __tablename__ = "dashboard_counters"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    
+    # Multi-tenant field (one row per organization)
+    organization_id: Mapped[int] = mapped_column(Integer, ForeignKey("organizations.id"), nullable=False)
+    
+    # Active masters
+    vendors: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    customers: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    products: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    
+    # Vouchers (all statuses)
+    purchase_vouchers: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sales_vouchers: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    
+    # Stock entries at or below their active product's reorder level
+    low_stock_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint('organization_id', name='uq_dashboard_counter_org'),
+    )
+
+class ImportJob(Base):
+    """A background Excel/CSV import, run chunk by chunk by app/services/import_job_service.py"""
+    __tablename__ = "import_jobs"
+    
+    # uuid4 hex, also names the stored upload
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    
+    # Multi-tenant field
+    organization_id: Mapped[int] = mapped_column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
+    
+    # What is imported: products, customers, vendors or stock, with its options (e.g. the stock mode)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    params: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    filename: Mapped[str] = mapped_column(String, nullable=False)
+    chunk_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    
+    # queued, running, completed, failed or cancelled
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued", index=True)
+    
+    # Checkpoint: sheet rows covered by committed chunks; a resumed job continues after them
+    rows_processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Estimated from the file
+    
+    # Totals of the committed chunks (created, updated, skipped, ...) and their first row errors and warnings
+    counts: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    errors: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    warnings: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Why the job failed
+    
+    # Incremented whenever a worker claims the job; chunks only commit while the job still carries the worker's attempt
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     
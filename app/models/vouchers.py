@@ -2,7 +2,7 @@
 
 # revised fastapi_migration/app/models/vouchers.py
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, ForeignKey, Boolean, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, declared_attr
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -432,6 +432,47 @@ class ReceiptVoucher(BaseVoucher):
         Index('idx_rv_org_date', 'organization_id', 'date'),
     )
 
+# Account Balance (ledger projection maintained by app.services.account_balance_service)
+class AccountBalance(Base):
+    __tablename__ = "account_balances"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    account_type = Column(String, nullable=False)  # vendor, customer
+    account_id = Column(Integer, nullable=False)
+
+    # Vendor: payable (debit - credit); customer: receivable (credit - debit)
+    balance = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    last_transaction_date = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('organization_id', 'account_type', 'account_id', name='uq_account_balance_org_account'),
+        Index('idx_account_balance_org_type', 'organization_id', 'account_type'),
+    )
+
+# Balance of every account with ledger history at the close of a period (month end);
+# the opening balance of a date-filtered ledger is one snapshot row plus the vouchers after it
+class AccountBalanceSnapshot(Base):
+    __tablename__ = "account_balance_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    account_type = Column(String, nullable=False)  # vendor, customer
+    account_id = Column(Integer, nullable=False)
+    period_end = Column(Date, nullable=False)  # Balance includes every voucher dated on or before this day
+
+    # Same convention as the complete ledger's running balance (all voucher statuses)
+    balance = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('organization_id', 'account_type', 'account_id', 'period_end', name='uq_balance_snapshot_org_account_period'),
+        Index('idx_balance_snapshot_org_period', 'organization_id', 'period_end'),
+    )
+
 # Purchase Return (Rejection In)
 class PurchaseReturn(BaseVoucher):
     __tablename__ = "purchase_returns"
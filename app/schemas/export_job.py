@@ -0,0 +1,56 @@
+# app/schemas/export_job.py
+
+from pydantic import BaseModel, Field
+from typing import Optional, Literal, Dict, Any
+from datetime import datetime, date
+
+
+class SalesReportExportParams(BaseModel):
+    """Filters for a background sales report export (same as the sales report endpoint)"""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    customer_id: Optional[int] = None
+
+
+class PurchaseReportExportParams(BaseModel):
+    """Filters for a background purchase report export (same as the purchase report endpoint)"""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    vendor_id: Optional[int] = None
+
+
+class CustomersExportParams(BaseModel):
+    """Filters for a background customers export"""
+    search: Optional[str] = None
+    active_only: bool = True
+
+
+class ProductsExportParams(BaseModel):
+    """Filters for a background products export"""
+    search: Optional[str] = None
+    active_only: bool = True
+
+
+class StockExportParams(BaseModel):
+    """Filters for a background stock export"""
+    product_id: Optional[int] = None
+    low_stock_only: bool = False
+
+
+class ExportJobResponse(BaseModel):
+    """State and progress of a background export job"""
+    job_id: str = Field(..., description="Job identifier used to poll and download the export")
+    kind: str = Field(..., description="Export kind, e.g. sales-report or customers")
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+    params: Dict[str, Any] = Field(default_factory=dict, description="Filters the export was submitted with")
+    rows_written: int = Field(0, description="Rows written to the file so far")
+    rows_total: Optional[int] = Field(None, description="Rows the export will contain, when known up front")
+    progress: Optional[float] = Field(None, description="Fraction of rows written (0-1), when rows_total is known")
+    filename: Optional[str] = None
+    file_size: Optional[int] = Field(None, description="Size of the finished file in bytes")
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = Field(None, description="When the finished file is deleted")
+    download_url: Optional[str] = None
@@ -0,0 +1,38 @@
+# app/schemas/import_job.py
+
+from pydantic import BaseModel, Field
+from typing import Optional, Literal, Dict, Any, List
+from datetime import datetime
+
+
+class ImportJobParams(BaseModel):
+    """Options of a background product, customer or vendor import (there are none yet)"""
+    pass
+
+
+class StockImportJobParams(BaseModel):
+    """Options of a background stock import (same as the stock bulk import endpoint)"""
+    mode: Literal["add", "replace"] = "replace"
+
+
+class ImportJobResponse(BaseModel):
+    """State, progress and row errors of a background import job"""
+    job_id: str = Field(..., description="Job identifier used to poll, resume or cancel the import")
+    kind: str = Field(..., description="What is imported: products, customers, vendors or stock")
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+    params: Dict[str, Any] = Field(default_factory=dict, description="Options the import was submitted with")
+    filename: str
+    chunk_size: int = Field(..., description="Sheet rows committed per chunk")
+    rows_processed: int = Field(0, description="Sheet rows covered by committed chunks; a resumed job continues after them")
+    rows_total: Optional[int] = Field(None, description="Sheet rows estimated from the file, when known")
+    progress: Optional[float] = Field(None, description="Fraction of rows processed (0-1), when rows_total is known")
+    counts: Dict[str, int] = Field(default_factory=dict, description="Totals of the committed chunks, e.g. created, updated, skipped")
+    error_count: int = Field(0, description="Row errors found so far")
+    errors: List[str] = Field(default_factory=list, description="The first row errors, as 'Row N: ...' messages")
+    warnings: List[str] = Field(default_factory=list)
+    error: Optional[str] = Field(None, description="Why the job failed")
+    attempts: int = Field(0, description="Times a worker has started or resumed the job")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = Field(None, description="When the job last committed a chunk")
+    finished_at: Optional[datetime] = None
@@ -102,6 +102,60 @@ class InventoryTransactionResponse(InventoryTransactionInDB):
     created_by_name: Optional[str] = None
 
 
+# Stock Ledger Schemas
+class StockMovementResponse(BaseModel):
+    """Schema for an entry of the append-only stock movement ledger"""
+    id: int
+    stock_id: int
+    product_id: int
+    location: Optional[str] = None
+    movement_type: str
+    quantity_change: float
+    balance_after: float
+    reference_type: Optional[str] = None
+    reference_id: Optional[int] = None
+    notes: Optional[str] = None
+    created_by_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class StockLocationBalance(BaseModel):
+    """Schema for a product's stock balance at one location"""
+    stock_id: int
+    location: Optional[str] = None
+    quantity: float
+    unit: str
+    last_updated: Optional[datetime] = None
+
+
+class ProductStockBalances(BaseModel):
+    """Schema for a product's stock balances per location"""
+    product_id: int
+    product_name: str
+    total_quantity: float
+    locations: List[StockLocationBalance]
+
+
+class StockReconciliationItem(BaseModel):
+    """Schema for a stock entry whose quantity differs from the sum of its movements"""
+    stock_id: int
+    product_id: int
+    location: Optional[str] = None
+    quantity: float
+    ledger_quantity: float
+    difference: float
+
+
+class StockReconciliationResponse(BaseModel):
+    """Schema for stock reconciliation results"""
+    checked_at: datetime
+    in_balance: bool
+    mismatches: List[StockReconciliationItem] = []
+
+
 # Job Parts Schemas
 class JobPartsBase(BaseModel):
     job_id: int
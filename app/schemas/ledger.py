@@ -37,6 +37,13 @@ class LedgerTransaction(BaseModel):
     status: str = Field(..., description="Transaction status")
 
 
+class LedgerOpeningBalance(BaseModel):
+    """Balance an account carries into a ledger (before start_date) or into a ledger page"""
+    account_type: Literal["vendor", "customer"] = Field(..., description="Account type")
+    account_id: int = Field(..., description="Vendor or customer ID")
+    balance: Decimal = Field(..., description="Running balance before the first transaction shown")
+
+
 class CompleteLedgerResponse(BaseModel):
     """Response for complete ledger report"""
     transactions: List[LedgerTransaction] = Field(..., description="List of all transactions")
@@ -45,6 +52,20 @@ class CompleteLedgerResponse(BaseModel):
     total_debit: Decimal = Field(..., description="Total debit amount")
     total_credit: Decimal = Field(..., description="Total credit amount")
     net_balance: Decimal = Field(..., description="Net balance (credit - debit)")
+    opening_balances: List[LedgerOpeningBalance] = Field(
+        default_factory=list, description="Balances brought forward from before start_date"
+    )
+
+
+class CompleteLedgerPage(BaseModel):
+    """One keyset page of the complete ledger"""
+    transactions: List[LedgerTransaction] = Field(..., description="Transactions on this page")
+    opening_balances: List[LedgerOpeningBalance] = Field(
+        ..., description="Balances carried forward for the accounts on this page"
+    )
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+    has_more: bool = Field(..., description="Whether more transactions follow this page")
+    filters_applied: LedgerFilters = Field(..., description="Filters that were applied")
 
 
 class OutstandingBalance(BaseModel):
@@ -77,4 +98,28 @@ class LedgerSummary(BaseModel):
     total_customers: int = Field(..., description="Number of customers")
     total_transactions: int = Field(..., description="Total number of transactions")
     date_range: dict = Field(..., description="Date range of transactions")
-    currency: str = Field(default="INR", description="Currency code")
\ No newline at end of file
+    currency: str = Field(default="INR", description="Currency code")
+
+class AgeingBalance(BaseModel):
+    """Open amounts of one account split by age (FIFO: settlements clear the oldest charges first)"""
+    account_type: Literal["vendor", "customer"] = Field(..., description="Account type")
+    account_id: int = Field(..., description="Vendor or customer ID")
+    account_name: str = Field(..., description="Vendor or customer name")
+    contact_info: Optional[str] = Field(None, description="Contact information")
+    days_0_30: Decimal = Field(default=0, description="Open amount of charges 0-30 days old")
+    days_31_60: Decimal = Field(default=0, description="Open amount of charges 31-60 days old")
+    days_61_90: Decimal = Field(default=0, description="Open amount of charges 61-90 days old")
+    days_over_90: Decimal = Field(default=0, description="Open amount of charges more than 90 days old")
+    total_outstanding: Decimal = Field(..., description="Total open amount (receivable from customers, payable to vendors)")
+    unapplied_amount: Decimal = Field(default=0, description="Settlements in excess of all charges (advances)")
+    oldest_open_date: Optional[datetime] = Field(None, description="Date of the oldest charge still open")
+
+
+class AgeingReportResponse(BaseModel):
+    """Response for receivables/payables ageing report"""
+    as_of_date: date = Field(..., description="Date the ages are measured from")
+    balances: List[AgeingBalance] = Field(..., description="Accounts with open or unapplied amounts, largest first")
+    receivables: dict = Field(..., description="Customer totals per bucket")
+    payables: dict = Field(..., description="Vendor totals per bucket")
+    summary: dict = Field(..., description="Summary statistics")
+    filters_applied: LedgerFilters = Field(..., description="Filters that were applied")
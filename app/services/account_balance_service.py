@@ -0,0 +1,391 @@
+# app/services/account_balance_service.py
+
+"""
+Account balance projection for the ledger.
+
+`account_balances` holds one row per (organization, account_type, account_id)
+with the vendor payable / customer receivable, the number of vouchers behind
+it and the date of the latest one. A session flush listener turns every
+insert, update (amount, party, date, status) and delete of purchase, sales,
+payment and receipt vouchers, debit notes and credit notes into balance
+deltas and applies them in the same transaction with atomic
+`balance = balance + delta` upserts. Cancelled vouchers do not contribute.
+
+Bulk `Query.update()` / `Query.delete()` and raw SQL bypass the listener;
+`AccountBalanceService.rebuild` recomputes the projection from the vouchers
+in one set-based statement and `AccountBalanceService.verify` reports drift
+(see scripts/rebuild_account_balances.py).
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, event, func, insert, inspect, literal, or_, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.base import Vendor, Customer
+from app.models.vouchers import (
+    AccountBalance, PurchaseVoucher, SalesVoucher, PaymentVoucher, ReceiptVoucher, DebitNote, CreditNote
+)
+from app.schemas.ledger import LedgerFilters, OutstandingBalance
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (model, sign for vendor accounts, sign for customer accounts); matches LedgerService:
+# vendor balance = debit - credit (payable), customer balance = credit - debit (receivable)
+LEDGER_SOURCES = (
+    (PurchaseVoucher, 1, None),
+    (SalesVoucher, None, 1),
+    (PaymentVoucher, -1, None),
+    (ReceiptVoucher, None, -1),
+    (DebitNote, 1, -1),
+    (CreditNote, -1, 1),
+)
+_SOURCE_SIGNS = {model: (vendor_sign, customer_sign) for model, vendor_sign, customer_sign in LEDGER_SOURCES}
+
+# Voucher statuses that do not affect outstanding balances
+LEDGER_EXCLUDED_STATUSES = ("cancelled",)
+
+_TRACKED_COLUMNS = ("organization_id", "total_amount", "status", "date", "vendor_id", "customer_id")
+_TRACKED_RELATIONSHIPS = ("vendor", "customer")
+_PENDING_KEY = "account_balance_pending"
+
+AccountKey = Tuple[int, str, int]
+
+
+def _contribution(model, values: Dict[str, Any]) -> Optional[Tuple[AccountKey, float, Optional[datetime]]]:
+    """Account, signed balance change and date a voucher contributes, or None if it contributes nothing"""
+    if values.get("status") in LEDGER_EXCLUDED_STATUSES:
+        return None
+    vendor_sign, customer_sign = _SOURCE_SIGNS[model]
+    if vendor_sign is not None and values.get("vendor_id"):
+        account_type, account_id, sign = "vendor", values["vendor_id"], vendor_sign
+    elif customer_sign is not None and values.get("customer_id"):
+        account_type, account_id, sign = "customer", values["customer_id"], customer_sign
+    else:
+        return None
+    amount = sign * float(values.get("total_amount") or 0)
+    return (values["organization_id"], account_type, account_id), amount, values.get("date")
+
+
+def _current_values(obj) -> Dict[str, Any]:
+    return {column: getattr(obj, column, None) for column in _TRACKED_COLUMNS}
+
+
+def _stored_values(connection: Connection, model, voucher_id: int) -> Optional[Dict[str, Any]]:
+    """Tracked columns as currently stored (before this flush writes the row)"""
+    table = model.__table__
+    columns = [table.c[column] for column in _TRACKED_COLUMNS if column in table.c]
+    row = connection.execute(select(*columns).where(table.c.id == voucher_id)).mappings().first()
+    return dict(row) if row is not None else None
+
+
+def _ledger_fields_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(
+        name in state.mapper.attrs and state.attrs[name].history.has_changes()
+        for name in _TRACKED_COLUMNS + _TRACKED_RELATIONSHIPS
+    )
+
+
+class _PendingDeltas:
+    """Contributions removed before a flush and vouchers whose new contribution is read after it"""
+
+    def __init__(self):
+        self.removed: List[Tuple[AccountKey, float, Optional[datetime]]] = []
+        self.added = []
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_ledger_changes(session, flush_context, instances):
+    # Drop anything left over from a flush that failed before after_flush ran
+    session.info.pop(_PENDING_KEY, None)
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        model = type(obj)
+        if model not in _SOURCE_SIGNS:
+            continue
+        is_new = obj in session.new
+        is_deleted = obj in session.deleted
+        if not is_new and not is_deleted and not _ledger_fields_changed(obj):
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_PENDING_KEY, _PendingDeltas())
+        if not is_new:
+            stored = _stored_values(session.connection(), model, obj.id)
+            contribution = _contribution(model, stored) if stored else None
+            if contribution is not None:
+                pending.removed.append(contribution)
+        if not is_deleted:
+            # Foreign keys assigned through relationships are only populated by the flush
+            pending.added.append(obj)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_ledger_changes(session, flush_context):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+
+    deltas: Dict[AccountKey, Dict[str, Any]] = defaultdict(
+        lambda: {"balance": 0.0, "count": 0, "latest": None, "removed": False}
+    )
+    for key, amount, _ in pending.removed:
+        deltas[key]["balance"] -= amount
+        deltas[key]["count"] -= 1
+        deltas[key]["removed"] = True
+    for obj in pending.added:
+        contribution = _contribution(type(obj), _current_values(obj))
+        if contribution is None:
+            continue
+        key, amount, voucher_date = contribution
+        delta = deltas[key]
+        delta["balance"] += amount
+        delta["count"] += 1
+        if voucher_date is not None and (delta["latest"] is None or voucher_date > delta["latest"]):
+            delta["latest"] = voucher_date
+
+    connection = session.connection()
+    for key, delta in deltas.items():
+        _apply_delta(connection, key, delta)
+
+
+def _account_filter(table, key: AccountKey):
+    organization_id, account_type, account_id = key
+    return and_(
+        table.c.organization_id == organization_id,
+        table.c.account_type == account_type,
+        table.c.account_id == account_id,
+    )
+
+
+def _apply_delta(connection: Connection, key: AccountKey, delta: Dict[str, Any]) -> None:
+    """Atomically add a delta to one account row, creating it on first use"""
+    table = AccountBalance.__table__
+    organization_id, account_type, account_id = key
+    if delta["count"] or delta["balance"]:
+        values = {
+            "organization_id": organization_id,
+            "account_type": account_type,
+            "account_id": account_id,
+            "balance": delta["balance"],
+            "transaction_count": delta["count"],
+            "last_transaction_date": delta["latest"],
+        }
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(connection.dialect.name)
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(**values)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=["organization_id", "account_type", "account_id"],
+                set_={
+                    "balance": table.c.balance + statement.excluded.balance,
+                    "transaction_count": table.c.transaction_count + statement.excluded.transaction_count,
+                    "updated_at": func.now(),
+                },
+            ))
+        else:
+            result = connection.execute(
+                update(table).where(_account_filter(table, key)).values(
+                    balance=table.c.balance + delta["balance"],
+                    transaction_count=table.c.transaction_count + delta["count"],
+                    updated_at=func.now(),
+                )
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(**values))
+
+    if delta["removed"]:
+        # The removed voucher may have been the latest one
+        connection.execute(
+            update(table).where(_account_filter(table, key))
+            .values(last_transaction_date=_latest_voucher_date(key))
+        )
+    elif delta["latest"] is not None:
+        connection.execute(
+            update(table).where(
+                _account_filter(table, key),
+                or_(table.c.last_transaction_date.is_(None), table.c.last_transaction_date < delta["latest"]),
+            ).values(last_transaction_date=delta["latest"])
+        )
+
+
+def _source_select(model, vendor_sign: Optional[int], customer_sign: Optional[int]):
+    """Per-voucher (organization_id, account_type, account_id, amount, date) rows of one voucher table"""
+    if vendor_sign is not None and customer_sign is not None:
+        is_vendor = model.vendor_id.isnot(None)
+        account_type = case((is_vendor, literal("vendor")), else_=literal("customer"))
+        account_id = func.coalesce(model.vendor_id, model.customer_id)
+        amount = case((is_vendor, model.total_amount * vendor_sign), else_=model.total_amount * customer_sign)
+        has_account = or_(is_vendor, model.customer_id.isnot(None))
+    elif vendor_sign is not None:
+        account_type, account_id = literal("vendor"), model.vendor_id
+        amount, has_account = model.total_amount * vendor_sign, model.vendor_id.isnot(None)
+    else:
+        account_type, account_id = literal("customer"), model.customer_id
+        amount, has_account = model.total_amount * customer_sign, model.customer_id.isnot(None)
+
+    return select(
+        model.organization_id.label("organization_id"),
+        account_type.label("account_type"),
+        account_id.label("account_id"),
+        amount.label("amount"),
+        model.date.label("date"),
+    ).where(has_account, func.coalesce(model.status, "").notin_(LEDGER_EXCLUDED_STATUSES))
+
+
+def _ledger_entries(organization_id: Optional[int] = None):
+    """UNION ALL of every voucher's contribution, optionally for one organization"""
+    selects = []
+    for model, vendor_sign, customer_sign in LEDGER_SOURCES:
+        statement = _source_select(model, vendor_sign, customer_sign)
+        if organization_id is not None:
+            statement = statement.where(model.organization_id == organization_id)
+        selects.append(statement)
+    return union_all(*selects).subquery("ledger_entries")
+
+
+def _latest_voucher_date(key: AccountKey):
+    organization_id, account_type, account_id = key
+    entries = _ledger_entries(organization_id)
+    return (
+        select(func.max(entries.c.date))
+        .where(entries.c.account_type == account_type, entries.c.account_id == account_id)
+        .scalar_subquery()
+    )
+
+
+def _aggregated_balances(organization_id: Optional[int] = None):
+    """Balances recomputed from the vouchers, shaped like account_balances rows"""
+    entries = _ledger_entries(organization_id)
+    return select(
+        entries.c.organization_id,
+        entries.c.account_type,
+        entries.c.account_id,
+        func.sum(entries.c.amount).label("balance"),
+        func.count().label("transaction_count"),
+        func.max(entries.c.date).label("last_transaction_date"),
+    ).group_by(entries.c.organization_id, entries.c.account_type, entries.c.account_id)
+
+
+class AccountBalanceService:
+    """Read, rebuild and verify the account_balances projection"""
+
+    @staticmethod
+    def covers(filters: LedgerFilters) -> bool:
+        """The projection holds current balances across all voucher types only"""
+        return filters.start_date is None and filters.end_date is None and filters.voucher_type in (None, "all")
+
+    @staticmethod
+    def get_outstanding_balances(
+        db: Session,
+        organization_id: int,
+        filters: LedgerFilters
+    ) -> List[OutstandingBalance]:
+        """Outstanding balance per account in one indexed read, independent of voucher history size"""
+        account_name = func.coalesce(Vendor.name, Customer.name, "")
+        query = db.query(
+            AccountBalance,
+            account_name.label("account_name"),
+            func.coalesce(Vendor.contact_number, Customer.contact_number).label("contact_info"),
+        ).outerjoin(
+            Vendor, and_(AccountBalance.account_type == "vendor", Vendor.id == AccountBalance.account_id)
+        ).outerjoin(
+            Customer, and_(AccountBalance.account_type == "customer", Customer.id == AccountBalance.account_id)
+        ).filter(
+            AccountBalance.organization_id == organization_id,
+            AccountBalance.transaction_count > 0
+        )
+        if filters.account_type in ("vendor", "customer"):
+            query = query.filter(AccountBalance.account_type == filters.account_type)
+        if filters.account_id:
+            query = query.filter(AccountBalance.account_id == filters.account_id)
+
+        outstanding_balances = []
+        for balance, name, contact_info in query.order_by(account_name).all():
+            outstanding_amount = Decimal(str(round(balance.balance, 2)))
+            if balance.account_type == "vendor" and outstanding_amount > 0:
+                outstanding_amount = -outstanding_amount  # Payable to vendor
+            outstanding_balances.append(OutstandingBalance(
+                account_type=balance.account_type,
+                account_id=balance.account_id,
+                account_name=name,
+                outstanding_amount=outstanding_amount,
+                last_transaction_date=balance.last_transaction_date,
+                transaction_count=balance.transaction_count,
+                contact_info=contact_info or ""
+            ))
+        return outstanding_balances
+
+    @staticmethod
+    def rebuild(db: Session, organization_id: Optional[int] = None) -> int:
+        """
+        Recompute balances from the vouchers (all organizations when organization_id is None).
+
+        Runs in the caller's transaction; commit to publish. Returns the number of account rows written.
+        """
+        table = AccountBalance.__table__
+        connection = db.connection()
+        clear = delete(table)
+        if organization_id is not None:
+            clear = clear.where(table.c.organization_id == organization_id)
+        connection.execute(clear)
+        result = connection.execute(insert(table).from_select(
+            ["organization_id", "account_type", "account_id", "balance", "transaction_count", "last_transaction_date"],
+            _aggregated_balances(organization_id)
+        ))
+        logger.info(f"Rebuilt {result.rowcount} account balances (organization {organization_id or 'all'})")
+        return result.rowcount
+
+    @staticmethod
+    def verify(db: Session, organization_id: Optional[int] = None, tolerance: float = 0.005) -> List[Dict[str, Any]]:
+        """Accounts whose projected balance or transaction count differs from the vouchers"""
+        table = AccountBalance.__table__
+        connection = db.connection()
+        expected = {
+            (row.organization_id, row.account_type, row.account_id): row
+            for row in connection.execute(_aggregated_balances(organization_id))
+        }
+        projected_query = select(table).where(table.c.transaction_count != 0)
+        if organization_id is not None:
+            projected_query = projected_query.where(table.c.organization_id == organization_id)
+        projected = {
+            (row.organization_id, row.account_type, row.account_id): row
+            for row in connection.execute(projected_query)
+        }
+
+        mismatches = []
+        for key in sorted(set(expected) | set(projected)):
+            expected_row, projected_row = expected.get(key), projected.get(key)
+            expected_balance = float(expected_row.balance) if expected_row else 0.0
+            projected_balance = float(projected_row.balance) if projected_row else 0.0
+            expected_count = expected_row.transaction_count if expected_row else 0
+            projected_count = projected_row.transaction_count if projected_row else 0
+            if abs(expected_balance - projected_balance) > tolerance or expected_count != projected_count:
+                mismatches.append({
+                    "organization_id": key[0],
+                    "account_type": key[1],
+                    "account_id": key[2],
+                    "expected_balance": round(expected_balance, 2),
+                    "projected_balance": round(projected_balance, 2),
+                    "expected_count": expected_count,
+                    "projected_count": projected_count,
+                })
+        return mismatches
+
+    @staticmethod
+    def backfill_if_empty(db: Session) -> bool:
+        """Build the projection when its table is empty but vouchers exist (e.g. right after create_all)"""
+        connection = db.connection()
+        if connection.execute(select(select(AccountBalance.__table__.c.id).exists())).scalar():
+            return False
+        entries = _ledger_entries()
+        if not connection.execute(select(select(entries.c.account_id).exists())).scalar():
+            return False
+        AccountBalanceService.rebuild(db)
+        db.commit()
+        return True
@@ -0,0 +1,81 @@
+# app/services/account_resolver.py
+
+"""
+Bulk resolution of vendor/customer accounts for reports.
+
+Reports that list vouchers or balances need the party name and contact details
+for every row. Loading them through `voucher.vendor` / `voucher.customer` or one
+query per account turns a report into N+1 queries; instead collect the
+(account_type, account_id) pairs first and resolve them with one `IN` query
+per account type (chunked for very large reports).
+"""
+
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.base import Vendor, Customer
+
+# Maximum ids per IN list, below every supported database's bound-parameter limit
+RESOLVE_CHUNK_SIZE = 900
+
+_ACCOUNT_MODELS = {"vendor": Vendor, "customer": Customer}
+
+
+class AccountInfo(NamedTuple):
+    """Display details of a vendor or customer account"""
+    account_type: str
+    account_id: int
+    name: str
+    contact_number: Optional[str]
+    email: Optional[str]
+
+
+def resolve_accounts(
+    db: Session,
+    accounts: Iterable[Tuple[str, int]],
+    organization_id: Optional[int] = None
+) -> Dict[Tuple[str, int], AccountInfo]:
+    """
+    Load name and contact details for (account_type, account_id) pairs.
+
+    Args:
+        db: Database session
+        accounts: Pairs of "vendor"/"customer" and id; duplicates and None ids are ignored
+        organization_id: Restrict to this organization's accounts
+
+    Returns:
+        Mapping from (account_type, account_id) to AccountInfo; unknown accounts are absent
+    """
+    ids_by_type: Dict[str, set] = {account_type: set() for account_type in _ACCOUNT_MODELS}
+    for account_type, account_id in accounts:
+        if account_id is not None and account_type in ids_by_type:
+            ids_by_type[account_type].add(account_id)
+
+    resolved: Dict[Tuple[str, int], AccountInfo] = {}
+    for account_type, ids in ids_by_type.items():
+        model = _ACCOUNT_MODELS[account_type]
+        ids = sorted(ids)
+        for start in range(0, len(ids), RESOLVE_CHUNK_SIZE):
+            statement = select(model.id, model.name, model.contact_number, model.email).where(
+                model.id.in_(ids[start:start + RESOLVE_CHUNK_SIZE])
+            )
+            if organization_id is not None:
+                statement = statement.where(model.organization_id == organization_id)
+            for account_id, name, contact_number, email in db.execute(statement):
+                resolved[(account_type, account_id)] = AccountInfo(
+                    account_type, account_id, name, contact_number, email
+                )
+    return resolved
+
+
+def account_name(
+    resolved: Dict[Tuple[str, int], AccountInfo],
+    account_type: str,
+    account_id: Optional[int],
+    default: str = ""
+) -> str:
+    """Name of a resolved account, or default if it was not found"""
+    info = resolved.get((account_type, account_id))
+    return info.name if info is not None else default
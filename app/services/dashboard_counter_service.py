@@ -0,0 +1,354 @@
+# app/services/dashboard_counter_service.py
+
+"""
+Materialized dashboard statistics.
+
+`dashboard_counters` holds one row per organization with the figures shown by
+/api/v1/reports/dashboard-stats: active vendors, customers and products,
+purchase and sales vouchers, and stock entries at or below their product's
+reorder level. Session flush listeners keep it current in the same
+transaction as the change:
+
+- inserting, deleting, (de)activating or moving a vendor, customer, product,
+  purchase voucher or sales voucher applies an atomic `count = count + delta`
+  UPDATE to the organization's row;
+- inserting, deleting or changing the quantity/product of a stock entry, or a
+  product's reorder level or active flag, compares the low-stock entries among
+  the affected ones (those stock entries, and every entry of those products)
+  before and after the flush, and adds the difference to low_stock_items.
+
+An organization's row is created with a full count on its first tracked
+change or first dashboard read, so the dashboard is a single-row lookup.
+Bulk `Query.update()` / `Query.delete()` and raw SQL bypass the listeners;
+`DashboardCounterService.recompute` recounts set-based, run periodically by
+the API (DASHBOARD_COUNTER_RECOMPUTE_INTERVAL_HOURS) and on demand by
+scripts/recompute_dashboard_counters.py, and `DashboardCounterService.verify`
+reports drift.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, insert, inspect, or_, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.base import DashboardCounter, Organization, Vendor, Customer, Product, Stock
+from app.models.vouchers import PurchaseVoucher, SalesVoucher
+import logging
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = ("vendors", "customers", "products", "purchase_vouchers", "sales_vouchers", "low_stock_items")
+
+# model -> (counter, columns that decide whether and where a row is counted); masters count while active
+_COUNTED_MODELS = {
+    Vendor: ("vendors", ("organization_id", "is_active")),
+    Customer: ("customers", ("organization_id", "is_active")),
+    Product: ("products", ("organization_id", "is_active")),
+    PurchaseVoucher: ("purchase_vouchers", ("organization_id",)),
+    SalesVoucher: ("sales_vouchers", ("organization_id",)),
+}
+# Attributes that decide whether a stock entry is low
+_LOW_STOCK_ATTRIBUTES = {
+    Stock: ("organization_id", "product_id", "quantity", "product"),
+    Product: ("organization_id", "reorder_level", "is_active"),
+}
+_PENDING_KEY = "dashboard_counter_pending"
+
+
+def _fields_changed(obj, names) -> bool:
+    state = inspect(obj)
+    return any(name in state.mapper.attrs and state.attrs[name].history.has_changes() for name in names)
+
+
+def _counted(values: Dict[str, Any]) -> bool:
+    # is_active is None on new rows until the flush applies its default of True
+    return values.get("organization_id") is not None and values.get("is_active") is not False
+
+
+def _stored_values(connection: Connection, model, obj_id: int, columns) -> Optional[Dict[str, Any]]:
+    table = model.__table__
+    row = connection.execute(select(*(table.c[column] for column in columns)).where(table.c.id == obj_id)).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def _low_stock_entries(connection: Connection, stock_ids: Set[int], product_ids: Set[int]) -> Dict[int, int]:
+    """Low-stock entries per organization among the given stock entries and the entries of the given products"""
+    if not stock_ids and not product_ids:
+        return {}
+    stock, product = Stock.__table__, Product.__table__
+    criteria = []
+    if stock_ids:
+        criteria.append(stock.c.id.in_(sorted(stock_ids)))
+    if product_ids:
+        criteria.append(stock.c.product_id.in_(sorted(product_ids)))
+    rows = connection.execute(
+        select(stock.c.organization_id, func.count()).select_from(
+            stock.join(product, stock.c.product_id == product.c.id)
+        ).where(
+            or_(*criteria),
+            stock.c.quantity <= product.c.reorder_level,
+            product.c.is_active == True
+        ).group_by(stock.c.organization_id)
+    )
+    return {organization_id: count for organization_id, count in rows}
+
+
+class _PendingCounts:
+    """Counts removed before a flush and objects whose organization is read after it"""
+
+    def __init__(self):
+        self.removed: List[Tuple[int, str]] = []
+        self.added: List[Tuple[Any, str, Tuple[str, ...]]] = []
+        # Stock entries and products whose entries may cross the reorder level, and their low count before the flush
+        self.low_stock_ids: Set[int] = set()
+        self.low_stock_products: Set[int] = set()
+        self.low_stock_added: List[Any] = []
+        self.low_stock_before: Dict[int, int] = {}
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_counter_changes(session, flush_context, instances):
+    # Drop anything left over from a flush that failed before after_flush ran
+    session.info.pop(_PENDING_KEY, None)
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        model = type(obj)
+        counted = _COUNTED_MODELS.get(model)
+        low_stock_attributes = _LOW_STOCK_ATTRIBUTES.get(model)
+        if counted is None and low_stock_attributes is None:
+            continue
+        is_new = obj in session.new
+        is_deleted = obj in session.deleted
+        counter_changed = counted is not None and (is_new or is_deleted or _fields_changed(obj, counted[1]))
+        low_stock_changed = low_stock_attributes is not None and (
+            is_new or is_deleted or _fields_changed(obj, low_stock_attributes)
+        )
+        if not counter_changed and not low_stock_changed:
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_PENDING_KEY, _PendingCounts())
+
+        if counter_changed and not is_new:
+            stored = _stored_values(session.connection(), model, obj.id, counted[1])
+            if stored is not None and _counted(stored):
+                pending.removed.append((stored["organization_id"], counted[0]))
+        if counter_changed and not is_deleted:
+            # organization_id may only be populated by the flush (relationship assignment)
+            pending.added.append((obj, counted[0], counted[1]))
+        if low_stock_changed and model is Stock:
+            if not is_new:
+                pending.low_stock_ids.add(obj.id)
+            if not is_deleted:
+                # New entries get their id from the flush
+                pending.low_stock_added.append(obj)
+        elif low_stock_changed and not is_new:
+            # A new product has no stock entries yet; new entries of it are tracked themselves
+            pending.low_stock_products.add(obj.id)
+
+    if pending is not None:
+        pending.low_stock_before = _low_stock_entries(
+            session.connection(), pending.low_stock_ids, pending.low_stock_products
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_counter_changes(session, flush_context):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+
+    deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for organization_id, counter in pending.removed:
+        deltas[organization_id][counter] -= 1
+    for obj, counter, columns in pending.added:
+        values = {column: getattr(obj, column, None) for column in columns}
+        if _counted(values):
+            deltas[values["organization_id"]][counter] += 1
+
+    connection = session.connection()
+    if pending.low_stock_ids or pending.low_stock_products or pending.low_stock_added:
+        stock_ids = pending.low_stock_ids | {obj.id for obj in pending.low_stock_added}
+        after = _low_stock_entries(connection, stock_ids, pending.low_stock_products)
+        for organization_id in set(pending.low_stock_before) | set(after):
+            deltas[organization_id]["low_stock_items"] += (
+                after.get(organization_id, 0) - pending.low_stock_before.get(organization_id, 0)
+            )
+
+    for organization_id in sorted(deltas):
+        _apply_changes(connection, organization_id, deltas[organization_id])
+
+
+def _apply_changes(connection: Connection, organization_id: int, delta: Dict[str, int]) -> None:
+    """Add deltas to an organization's counters in one UPDATE, or count everything if it has no row yet"""
+    table = DashboardCounter.__table__
+    values = {counter: table.c[counter] + change for counter, change in delta.items() if change}
+    if not values:
+        return
+    result = connection.execute(
+        update(table).where(table.c.organization_id == organization_id).values(updated_at=func.now(), **values)
+    )
+    if result.rowcount == 0:
+        # The count runs after the flush, so it already includes this change
+        _write_counts(connection, [row._asdict() for row in connection.execute(_counts_select(organization_id))])
+
+
+def _count(table, organization_id, *criteria):
+    return select(func.count()).select_from(table).where(
+        table.c.organization_id == organization_id, *criteria
+    ).scalar_subquery()
+
+
+def _low_stock_count(organization_id):
+    stock, product = Stock.__table__, Product.__table__
+    return select(func.count()).select_from(
+        stock.join(product, stock.c.product_id == product.c.id)
+    ).where(
+        stock.c.organization_id == organization_id,
+        stock.c.quantity <= product.c.reorder_level,
+        product.c.is_active == True
+    ).scalar_subquery()
+
+
+def _counts_select(organization_id: Optional[int] = None):
+    """Counters of every organization (or one), computed from the source tables"""
+    organizations = Organization.__table__
+    org_id = organizations.c.id
+    vendors, customers, products = Vendor.__table__, Customer.__table__, Product.__table__
+    statement = select(
+        org_id.label("organization_id"),
+        _count(vendors, org_id, vendors.c.is_active == True).label("vendors"),
+        _count(customers, org_id, customers.c.is_active == True).label("customers"),
+        _count(products, org_id, products.c.is_active == True).label("products"),
+        _count(PurchaseVoucher.__table__, org_id).label("purchase_vouchers"),
+        _count(SalesVoucher.__table__, org_id).label("sales_vouchers"),
+        _low_stock_count(org_id).label("low_stock_items"),
+    )
+    if organization_id is not None:
+        return statement.where(org_id == organization_id)
+    return statement.where(true()).order_by(org_id)
+
+
+def _write_counts(connection: Connection, rows: List[Dict[str, Any]]) -> None:
+    """Insert or overwrite counter rows"""
+    if not rows:
+        return
+    table = DashboardCounter.__table__
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(connection.dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(table)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=["organization_id"],
+            set_={**{column: statement.excluded[column] for column in COUNTER_COLUMNS}, "updated_at": func.now()},
+        ), rows)
+        return
+    for row in rows:
+        result = connection.execute(
+            update(table).where(table.c.organization_id == row["organization_id"])
+            .values(updated_at=func.now(), **{column: row[column] for column in COUNTER_COLUMNS})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**row))
+
+
+class DashboardCounterService:
+    """Read, recompute and verify the materialized dashboard counters"""
+
+    @staticmethod
+    def get_counts(db: Session, organization_id: int) -> Dict[str, int]:
+        """Counters of one organization, counted and stored on first use; the caller commits"""
+        table = DashboardCounter.__table__
+        connection = db.connection()
+        row = connection.execute(
+            select(*(table.c[column] for column in COUNTER_COLUMNS)).where(table.c.organization_id == organization_id)
+        ).first()
+        if row is not None:
+            return row._asdict()
+        counted = connection.execute(_counts_select(organization_id)).first()
+        if counted is None:
+            return {column: 0 for column in COUNTER_COLUMNS}
+        _write_counts(connection, [counted._asdict()])
+        return {column: getattr(counted, column) for column in COUNTER_COLUMNS}
+
+    @staticmethod
+    async def get_counts_async(db: AsyncSession, organization_id: int) -> Dict[str, int]:
+        """Single-row read for async routes; a missing row is counted, stored and committed"""
+        table = DashboardCounter.__table__
+        result = await db.execute(
+            select(*(table.c[column] for column in COUNTER_COLUMNS)).where(table.c.organization_id == organization_id)
+        )
+        row = result.first()
+        if row is not None:
+            return row._asdict()
+        counts = await db.run_sync(DashboardCounterService.get_counts, organization_id)
+        await db.commit()
+        return counts
+
+    @staticmethod
+    def add_low_stock(db: Session, organization_id: int, change: int) -> None:
+        """Add change to an organization's low-stock count after stock moved through Core statements; the caller commits"""
+        _apply_changes(db.connection(), organization_id, {"low_stock_items": change})
+
+    @staticmethod
+    def recompute(db: Session, organization_id: Optional[int] = None) -> int:
+        """
+        Recount from the source tables (all organizations when organization_id is None).
+
+        Runs in the caller's transaction; commit to publish. Returns the number of rows written.
+        """
+        connection = db.connection()
+        rows = [row._asdict() for row in connection.execute(_counts_select(organization_id))]
+        _write_counts(connection, rows)
+        logger.info(f"Recomputed dashboard counters for {len(rows)} organization(s)")
+        return len(rows)
+
+    @staticmethod
+    def verify(db: Session, organization_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored counters that differ from the source tables; organizations without a row are counted on first read"""
+        table = DashboardCounter.__table__
+        connection = db.connection()
+        stored_query = select(table)
+        if organization_id is not None:
+            stored_query = stored_query.where(table.c.organization_id == organization_id)
+        stored = {row.organization_id: row for row in connection.execute(stored_query)}
+
+        mismatches = []
+        for expected in connection.execute(_counts_select(organization_id)):
+            row = stored.get(expected.organization_id)
+            if row is None:
+                continue
+            for column in COUNTER_COLUMNS:
+                if getattr(row, column) != getattr(expected, column):
+                    mismatches.append({
+                        "organization_id": expected.organization_id,
+                        "counter": column,
+                        "expected": getattr(expected, column),
+                        "stored": getattr(row, column),
+                    })
+        return mismatches
+
+
+async def run_recompute_job(session_factory: Callable[[], Session], interval_seconds: float) -> None:
+    """Background loop: recount every organization's dashboard counters, then sleep"""
+    def recompute_all() -> int:
+        db = session_factory()
+        try:
+            written = DashboardCounterService.recompute(db)
+            db.commit()
+            return written
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    while True:
+        try:
+            await asyncio.to_thread(recompute_all)
+        except Exception as e:
+            logger.error(f"Dashboard counter recompute job failed: {e}")
+        await asyncio.sleep(interval_seconds)
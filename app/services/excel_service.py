@@ -1,16 +1,85 @@
 # app/services/excel_service.py
 
+import csv
 import io
+import itertools
 import logging
+import tempfile
 import pandas as pd
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Sequence
 from fastapi.responses import StreamingResponse
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.utils import get_column_letter
+
+from app.utils.import_validation import ImportColumn, ImportSchema, ImportValidationResult, digits_pattern
 
 logger = logging.getLogger(__name__)
 
+# Bytes per chunk when a streamed workbook is sent to the client
+EXCEL_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Rows per batch when an upload is streamed into an importer
+IMPORT_BATCH_SIZE = 5000
+
+# Upload formats the import endpoints accept
+IMPORT_FILE_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+# Sheets looked for, in order, when an upload has no sheet of the requested name
+DATA_SHEET_NAMES = [
+    "Stock Import Template", "Product Import Template", "Vendor Import Template",
+    "Customer Import Template", "Company Import Template", "Import Template", "Data", "Sheet1"
+]
+
+# Import rules shared by the templates; lengths match the pydantic schemas
+HSN_CODE_PATTERN = digits_pattern(4, 6, 8)
+PIN_CODE_COLUMN = ImportColumn("pin_code", required=True, pattern=digits_pattern(6),
+                               pattern_message="must be exactly 6 digits")
+GST_NUMBER_COLUMN = ImportColumn("gst_number", label="GST Number", pattern=r"[0-9A-Za-z]{15}",
+                                 pattern_message="must be exactly 15 characters")
+PAN_NUMBER_COLUMN = ImportColumn("pan_number", label="PAN Number", pattern=r"[0-9A-Za-z]{10}",
+                                 pattern_message="must be exactly 10 characters")
+
+# Customer and vendor templates share their columns
+PARTY_IMPORT_SCHEMA = ImportSchema([
+    ImportColumn("name", required=True),
+    ImportColumn("contact_number", required=True),
+    ImportColumn("email"),
+    ImportColumn("address_line_1", field="address1", required=True),
+    ImportColumn("address_line_2", field="address2"),
+    ImportColumn("city", required=True),
+    ImportColumn("state", required=True),
+    PIN_CODE_COLUMN,
+    ImportColumn("state_code", required=True),
+    GST_NUMBER_COLUMN,
+    PAN_NUMBER_COLUMN,
+])
+
+
+def _pick_sheet(sheet_names: List[str], sheet_name: Optional[str]) -> str:
+    if sheet_name in sheet_names:
+        return sheet_name
+    for name in DATA_SHEET_NAMES:
+        if name in sheet_names:
+            return name
+    if not sheet_names:
+        raise ValueError("The workbook has no sheets")
+    return sheet_names[0]
+
+
+def _cell_value(value: Any) -> Any:
+    """Excel cannot store timezone-aware datetimes"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
 class ExcelService:
+    # Template headers and import rules, declared by each template's service
+    REQUIRED_COLUMNS: List[str] = []
+    IMPORT_SCHEMA: Optional[ImportSchema] = None
+
     @staticmethod
     async def validate_excel_file(file, required_columns: List[str], sheet_name: str = None) -> Dict:
         """
@@ -154,72 +223,146 @@ class ExcelService:
     async def parse_excel_file(file, required_columns: List[str], sheet_name: str = None) -> List[Dict]:
         """
         Parse Excel file and return list of dictionaries.
-        Supports both .xlsx and .xls formats.
+        Supports .xlsx, .xls and .csv formats; see iter_upload_rows for importing large files batch by batch.
+        """
+        records = []
+        for frame in ExcelService.iter_upload_rows(file, required_columns, sheet_name):
+            records.extend(frame.astype(object).where(frame.notna(), None).to_dict(orient='records'))
+        logger.info(f"Successfully parsed {len(records)} records from Excel file")
+        return records
+
+    @staticmethod
+    def iter_upload_rows(
+        file,
+        required_columns: List[str],
+        sheet_name: Optional[str] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        skip_rows: int = 0
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream an uploaded .xlsx, .xls or .csv file as DataFrames of at most batch_size rows.
+
+        .xlsx sheets are read with openpyxl in read-only mode and CSV files line by line, straight
+        from the upload's spooled file, so memory is bounded by the batch size rather than the file
+        size (.xls has no streaming reader and is read whole). The named sheet is used when present,
+        otherwise the first sheet matching DATA_SHEET_NAMES or the first sheet. Headers are normalized
+        ("Pin Code" -> pin_code) and empty rows after the last filled one are dropped. The first
+        skip_rows data rows are read but not returned, to resume an import past rows already written.
+
+        Raises ValueError for missing required columns or unreadable files.
         """
+        filename = (getattr(file, "filename", None) or "").lower()
+        source = file.file
+        source.seek(0)
+        close = None
         try:
-            # Read the uploaded file content
-            content = await file.read()
-            excel_buffer = io.BytesIO(content)
-            
-            # Try to determine the appropriate data sheet name if not provided
-            if sheet_name is None:
-                # Try to read all sheet names and find the data sheet
-                try:
-                    xl_file = pd.ExcelFile(excel_buffer)
-                    sheet_names = xl_file.sheet_names
-                    
-                    # Look for common data sheet patterns
-                    data_sheet_patterns = [
-                        "Stock Import Template", "Product Import Template", "Vendor Import Template", 
-                        "Customer Import Template", "Import Template", "Data", "Sheet1"
-                    ]
-                    
-                    sheet_name = None
-                    for pattern in data_sheet_patterns:
-                        if pattern in sheet_names:
-                            sheet_name = pattern
-                            break
-                    
-                    # If no pattern match, use the first sheet
-                    if sheet_name is None and sheet_names:
-                        sheet_name = sheet_names[0]
-                        
-                except Exception:
-                    # If we can't read sheet names, try the default approach
-                    sheet_name = 0  # First sheet
-            
-            # Reset buffer position
-            excel_buffer.seek(0)
-            
-            # Use pandas to read Excel, specifying the sheet name for data
-            df = pd.read_excel(excel_buffer, sheet_name=sheet_name, 
-                               engine='openpyxl' if file.filename.endswith('.xlsx') else 'xlrd')
-            
-            # Clean column names
-            df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
-            
-            # Validate required columns
-            missing_columns = [col for col in required_columns if col.lower().replace(' ', '_') not in df.columns]
+            if filename.endswith(".csv"):
+                text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+                rows, sheet_info = csv.reader(text), "CSV file"
+                close = text.detach
+            elif filename.endswith(".xls"):
+                sheet = _pick_sheet(pd.ExcelFile(source, engine="xlrd").sheet_names, sheet_name)
+                source.seek(0)
+                frame = pd.read_excel(source, sheet_name=sheet, header=None, dtype=object, engine="xlrd")
+                rows, sheet_info = frame.itertuples(index=False, name=None), f"sheet '{sheet}'"
+            else:
+                workbook = load_workbook(source, read_only=True, data_only=True)
+                close = workbook.close
+                sheet = _pick_sheet(workbook.sheetnames, sheet_name)
+                rows, sheet_info = workbook[sheet].iter_rows(values_only=True), f"sheet '{sheet}'"
+
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(value).strip().lower().replace(' ', '_') if value is not None else "" for value in header]
+            # Unnamed columns are dropped and repeated headers keep their first column
+            positions = [index for index, name in enumerate(columns) if name and name not in columns[:index]]
+            names = [columns[index] for index in positions]
+            missing_columns = [col for col in required_columns if col.lower().replace(' ', '_') not in names]
             if missing_columns:
-                found_columns = ', '.join(df.columns)
-                sheet_info = f"sheet '{sheet_name}'" if isinstance(sheet_name, str) else f"sheet {sheet_name}"
                 raise ValueError(f"Missing required columns in {sheet_info}: {', '.join(missing_columns)}. "
-                               f"Found columns: {found_columns}. "
-                               f"Make sure to upload a data file with the correct sheet and headers, not the instructions sheet.")
-            
-            # Convert to list of dicts, handling NaN values
-            records = df.replace({pd.NA: None, float('nan'): None}).to_dict(orient='records')
-            
-            logger.info(f"Successfully parsed {len(records)} records from Excel file")
-            return records
-            
+                                 f"Found columns: {', '.join(names)}. "
+                                 f"Make sure to upload a data file with the correct sheet and headers, not the instructions sheet.")
+
+            def sheet_rows() -> Iterator[List[Any]]:
+                # Empty rows are held back until a filled row follows them, so trailing empty (but
+                # formatted) rows are dropped while rows further down keep their position in the sheet
+                blank_rows = 0
+                for row in rows:
+                    values = [row[index] if index < len(row) else None for index in positions]
+                    if all(value is None or (isinstance(value, str) and not value.strip()) or value != value
+                           for value in values):
+                        blank_rows += 1
+                        continue
+                    for _ in range(blank_rows):
+                        yield [None] * len(names)
+                    blank_rows = 0
+                    yield values
+
+            batch = []
+            for values in itertools.islice(sheet_rows(), skip_rows, None):
+                batch.append(values)
+                if len(batch) >= batch_size:
+                    yield pd.DataFrame(batch, columns=names, dtype=object)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=names, dtype=object)
         except ValueError as ve:
             logger.error(f"Excel validation error: {str(ve)}")
             raise
         except Exception as e:
             logger.error(f"Error parsing Excel file: {str(e)}")
             raise ValueError(f"Invalid Excel file format or error reading data sheet: {str(e)}. "
-                           f"Please use the downloaded template and fill in the data sheet.")
+                             f"Please use the downloaded template and fill in the data sheet.")
+        finally:
+            if close is not None:
+                close()
+
+    @staticmethod
+    def estimate_upload_rows(file, sheet_name: Optional[str] = None) -> Optional[int]:
+        """
+        Data rows of an upload as far as they can be told without parsing it: the line count of a
+        CSV file or the dimensions recorded in an .xlsx sheet (None when unknown). Trailing empty
+        rows are counted too, so use it for progress reporting only.
+        """
+        filename = (getattr(file, "filename", None) or "").lower()
+        source = file.file
+        try:
+            source.seek(0)
+            if filename.endswith(".csv"):
+                lines, last = 0, b"\n"
+                for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                    lines += chunk.count(b"\n")
+                    last = chunk[-1:]
+                lines += last != b"\n"
+                return max(lines - 1, 0)
+            if filename.endswith(".xls"):
+                return None
+            workbook = load_workbook(source, read_only=True)
+            try:
+                max_row = workbook[_pick_sheet(workbook.sheetnames, sheet_name)].max_row
+            finally:
+                workbook.close()
+            return max(max_row - 1, 0) if max_row else None
+        except Exception as e:
+            logger.warning(f"Could not estimate the rows of {filename}: {e}")
+            return None
+        finally:
+            source.seek(0)
+
+    @classmethod
+    def iter_import_batches(
+        cls,
+        file,
+        sheet_name: Optional[str] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        skip_rows: int = 0
+    ) -> Iterator[ImportValidationResult]:
+        """Stream an upload of this template as batches validated by IMPORT_SCHEMA; row numbers run on across batches"""
+        first_row = skip_rows + 1
+        for frame in ExcelService.iter_upload_rows(file, cls.REQUIRED_COLUMNS, sheet_name, batch_size, skip_rows):
+            yield cls.IMPORT_SCHEMA.validate(frame, first_row=first_row)
+            first_row += len(frame)
 
     @staticmethod
     def create_streaming_response(excel_data: io.BytesIO, filename: str) -> StreamingResponse:
@@ -234,6 +377,71 @@ class ExcelService:
             headers=headers
         )
 
+    @staticmethod
+    def create_chunked_response(chunks: Iterable[bytes], filename: str) -> StreamingResponse:
+        """Create streaming response for an Excel file produced chunk by chunk (see stream_workbook)"""
+        headers = {
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        }
+        return StreamingResponse(
+            chunks,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers=headers
+        )
+
+    @staticmethod
+    def stream_workbook(
+        sheet_title: str,
+        headers: List[str],
+        rows: Iterable[Sequence],
+        footer: Optional[Callable[[], Iterable[Sequence]]] = None,
+        column_widths: Optional[Dict[str, int]] = None
+    ) -> Iterator[bytes]:
+        """
+        Write rows into a single-sheet .xlsx as they are produced and yield the file in chunks.
+
+        The workbook is write-only: openpyxl spools each appended row to a temporary file
+        instead of keeping cells in memory, and the finished archive is saved to another
+        temporary file that is read back EXCEL_STREAM_CHUNK_SIZE bytes at a time, so memory
+        stays flat however many rows are exported. Column widths come from the headers
+        (or column_widths) since write-only sheets cannot be measured after writing.
+        footer is called after the last row, so it can report totals gathered from the rows.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(sheet_title)
+        for index, header in enumerate(headers, start=1):
+            width = (column_widths or {}).get(header, max(len(header) + 4, 14))
+            ws.column_dimensions[get_column_letter(index)].width = width
+        
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        try:
+            for row in rows:
+                ws.append([_cell_value(value) for value in row])
+            if footer is not None:
+                for row in footer():
+                    ws.append([_cell_value(value) for value in row])
+        except BaseException:
+            # Close the sheet's row writer so an aborted export does not leave it half-open
+            ws.close()
+            raise
+        
+        with tempfile.TemporaryFile() as output:
+            wb.save(output)
+            output.seek(0)
+            while True:
+                chunk = output.read(EXCEL_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
 class StockExcelService(ExcelService):
     REQUIRED_COLUMNS = [
         "Product Name",
@@ -247,6 +455,20 @@ class StockExcelService(ExcelService):
         "Location"
     ]
 
+    # Product details only apply to products the import creates; invalid ones fall back to defaults
+    IMPORT_SCHEMA = ImportSchema([
+        ImportColumn("product_name", required=True),
+        ImportColumn("quantity", "number", required=True, minimum=0),
+        ImportColumn("unit", required=True, upper=True),
+        ImportColumn("hsn_code", label="HSN Code", pattern=HSN_CODE_PATTERN,
+                     pattern_message="must be 4, 6 or 8 digits", lenient=True),
+        ImportColumn("part_number"),
+        ImportColumn("unit_price", "number", default=0.0, minimum=0, lenient=True),
+        ImportColumn("gst_rate", "number", label="GST Rate", default=18.0, minimum=0, maximum=100, lenient=True),
+        ImportColumn("reorder_level", "integer", default=10, minimum=0, lenient=True),
+        ImportColumn("location", default=""),
+    ])
+
     @staticmethod
     def create_template() -> io.BytesIO:
         """Create Excel template for stock import with styling and sample data"""
@@ -372,6 +594,20 @@ class StockExcelService(ExcelService):
         logger.info(f"Stock data exported successfully: {len(stock_data)} records")
         return excel_buffer
 
+    @staticmethod
+    def stream_stock(stock_items: Iterable[Dict]) -> Iterator[bytes]:
+        """Stream stock rows to Excel one at a time (stock_items may be a database cursor)"""
+        headers = [
+            "Product Name", "Quantity", "Unit", "HSN Code", "Part Number",
+            "Unit Price", "GST Rate", "Reorder Level", "Location"
+        ]
+        keys = [
+            "product_name", "quantity", "unit", "hsn_code", "part_number",
+            "unit_price", "gst_rate", "reorder_level", "location"
+        ]
+        rows = ([item.get(key) for key in keys] for item in stock_items)
+        return ExcelService.stream_workbook("Stock Export", headers, rows, column_widths=dict.fromkeys(headers, 20))
+
 class VendorExcelService(ExcelService):
     REQUIRED_COLUMNS = [
         "Name",
@@ -387,6 +623,8 @@ class VendorExcelService(ExcelService):
         "PAN Number"
     ]
 
+    IMPORT_SCHEMA = PARTY_IMPORT_SCHEMA
+
     @staticmethod
     def create_template() -> io.BytesIO:
         """Create Excel template for vendor import with styling and sample data"""
@@ -529,6 +767,8 @@ class CustomerExcelService(ExcelService):
         "PAN Number"
     ]
 
+    IMPORT_SCHEMA = PARTY_IMPORT_SCHEMA
+
     @staticmethod
     def create_template() -> io.BytesIO:
         """Create Excel template for customer import with styling and sample data"""
@@ -656,6 +896,20 @@ class CustomerExcelService(ExcelService):
         logger.info(f"Customers data exported successfully: {len(customers_data)} records")
         return excel_buffer
 
+    @staticmethod
+    def stream_customers(customers: Iterable[Dict]) -> Iterator[bytes]:
+        """Stream customers to Excel one at a time (customers may be a database cursor)"""
+        headers = [
+            "Name", "Contact Number", "Email", "Address Line 1", "Address Line 2",
+            "City", "State", "Pin Code", "State Code", "GST Number", "PAN Number"
+        ]
+        keys = [
+            "name", "contact_number", "email", "address1", "address2",
+            "city", "state", "pin_code", "state_code", "gst_number", "pan_number"
+        ]
+        rows = ([item.get(key) for key in keys] for item in customers)
+        return ExcelService.stream_workbook("Customers Export", headers, rows, column_widths=dict.fromkeys(headers, 20))
+
 class ProductExcelService(ExcelService):
     REQUIRED_COLUMNS = [
         "Product Name",
@@ -670,6 +924,22 @@ class ProductExcelService(ExcelService):
         "Is Manufactured"
     ]
 
+    IMPORT_SCHEMA = ImportSchema([
+        ImportColumn("product_name", field="name", required=True),
+        ImportColumn("hsn_code", label="HSN Code", pattern=HSN_CODE_PATTERN,
+                     pattern_message="must be 4, 6 or 8 digits"),
+        ImportColumn("part_number"),
+        ImportColumn("unit", required=True),
+        ImportColumn("unit_price", "number", default=0.0, minimum=0),
+        ImportColumn("gst_rate", "number", label="GST Rate", default=0.0, minimum=0, maximum=100),
+        ImportColumn("is_gst_inclusive", "boolean", label="Is GST Inclusive"),
+        ImportColumn("reorder_level", "integer", default=0, minimum=0),
+        ImportColumn("description"),
+        ImportColumn("is_manufactured", "boolean"),
+        ImportColumn("initial_quantity", "number", minimum=0),
+        ImportColumn("initial_location"),
+    ])
+
     @staticmethod
     def create_template() -> io.BytesIO:
         """Create Excel template for product import with styling and sample data"""
@@ -800,124 +1070,76 @@ class ProductExcelService(ExcelService):
         logger.info(f"Products data exported successfully: {len(products_data)} records")
         return excel_buffer
 
+    @staticmethod
+    def stream_products(products: Iterable[Dict]) -> Iterator[bytes]:
+        """Stream products to Excel one at a time (products may be a database cursor)"""
+        headers = [
+            "Product Name", "HSN Code", "Part Number", "Unit",
+            "Unit Price", "GST Rate", "Is GST Inclusive", "Reorder Level",
+            "Description", "Is Manufactured"
+        ]
+        keys = [
+            "product_name", "hsn_code", "part_number", "unit",
+            "unit_price", "gst_rate", "is_gst_inclusive", "reorder_level",
+            "description", "is_manufactured"
+        ]
+        rows = ([item.get(key) for key in keys] for item in products)
+        return ExcelService.stream_workbook("Products Export", headers, rows, column_widths=dict.fromkeys(headers, 20))
+
 class ReportsExcelService(ExcelService):
     """Service for exporting various reports to Excel"""
     
     @staticmethod
-    def export_sales_report(sales_data: List[Dict]) -> io.BytesIO:
-        """Export sales report to Excel"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Sales Report"
-        
-        # Headers
+    def _stream_voucher_report(
+        sheet_title: str,
+        party_label: str,
+        party_key: str,
+        vouchers: Iterable[Dict],
+        summary_rows: List[Sequence]
+    ) -> Iterator[bytes]:
         headers = [
-            "Voucher Number", "Date", "Customer Name", "Total Amount", 
+            "Voucher Number", "Date", party_label, "Total Amount",
             "GST Amount", "Net Amount", "Status"
         ]
-        ws.append(headers)
-        
-        # Style headers
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        # Add data
-        for voucher in sales_data.get('vouchers', []):
-            ws.append([
+        rows = (
+            [
                 voucher.get('voucher_number', ''),
                 voucher.get('date', ''),
-                voucher.get('customer_name', ''),
+                voucher.get(party_key, ''),
                 voucher.get('total_amount', 0),
                 voucher.get('gst_amount', 0),
-                voucher.get('total_amount', 0) - voucher.get('gst_amount', 0),
+                (voucher.get('total_amount') or 0) - (voucher.get('gst_amount') or 0),
                 voucher.get('status', '')
-            ])
+            ]
+            for voucher in vouchers
+        )
         
-        # Add summary
-        if 'summary' in sales_data:
-            summary = sales_data['summary']
-            ws.append([])  # Empty row
-            ws.append(['SUMMARY'])
-            ws.append(['Total Vouchers', summary.get('total_vouchers', 0)])
-            ws.append(['Total Sales', summary.get('total_sales', 0)])
-            ws.append(['Total GST', summary.get('total_gst', 0)])
+        def footer():
+            yield []  # Empty row
+            yield ['SUMMARY']
+            yield from summary_rows
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        excel_data = io.BytesIO()
-        wb.save(excel_data)
-        excel_data.seek(0)
-        return excel_data
+        return ExcelService.stream_workbook(
+            sheet_title, headers, rows, footer, column_widths={party_label: 40, "Date": 20}
+        )
     
     @staticmethod
-    def export_purchase_report(purchase_data: List[Dict]) -> io.BytesIO:
-        """Export purchase report to Excel"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Purchase Report"
-        
-        # Headers
-        headers = [
-            "Voucher Number", "Date", "Vendor Name", "Total Amount", 
-            "GST Amount", "Net Amount", "Status"
-        ]
-        ws.append(headers)
-        
-        # Style headers
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        # Add data
-        for voucher in purchase_data.get('vouchers', []):
-            ws.append([
-                voucher.get('voucher_number', ''),
-                voucher.get('date', ''),
-                voucher.get('vendor_name', ''),
-                voucher.get('total_amount', 0),
-                voucher.get('gst_amount', 0),
-                voucher.get('total_amount', 0) - voucher.get('gst_amount', 0),
-                voucher.get('status', '')
-            ])
-        
-        # Add summary
-        if 'summary' in purchase_data:
-            summary = purchase_data['summary']
-            ws.append([])  # Empty row
-            ws.append(['SUMMARY'])
-            ws.append(['Total Vouchers', summary.get('total_vouchers', 0)])
-            ws.append(['Total Purchases', summary.get('total_purchases', 0)])
-            ws.append(['Total GST', summary.get('total_gst', 0)])
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        excel_data = io.BytesIO()
-        wb.save(excel_data)
-        excel_data.seek(0)
-        return excel_data
+    def stream_sales_report(vouchers: Iterable[Dict], summary: Dict) -> Iterator[bytes]:
+        """Stream the sales report to Excel row by row (vouchers may be a database cursor)"""
+        return ReportsExcelService._stream_voucher_report("Sales Report", "Customer Name", "customer_name", vouchers, [
+            ['Total Vouchers', summary.get('total_vouchers', 0)],
+            ['Total Sales', summary.get('total_sales', 0)],
+            ['Total GST', summary.get('total_gst', 0)],
+        ])
+    
+    @staticmethod
+    def stream_purchase_report(vouchers: Iterable[Dict], summary: Dict) -> Iterator[bytes]:
+        """Stream the purchase report to Excel row by row (vouchers may be a database cursor)"""
+        return ReportsExcelService._stream_voucher_report("Purchase Report", "Vendor Name", "vendor_name", vouchers, [
+            ['Total Vouchers', summary.get('total_vouchers', 0)],
+            ['Total Purchases', summary.get('total_purchases', 0)],
+            ['Total GST', summary.get('total_gst', 0)],
+        ])
     
     @staticmethod
     def export_inventory_report(inventory_data: List[Dict]) -> io.BytesIO:
@@ -1036,6 +1258,47 @@ class ReportsExcelService(ExcelService):
         excel_data.seek(0)
         return excel_data
     
+    @staticmethod
+    def stream_complete_ledger(transactions: Iterable[Any]) -> Iterator[bytes]:
+        """Stream complete ledger transactions to Excel; totals are accumulated while the rows are written"""
+        headers = [
+            "Date", "Voucher Type", "Voucher Number", "Account Type",
+            "Account Name", "Debit Amount", "Credit Amount", "Running Balance", "Description"
+        ]
+        totals = {"count": 0, "debit": 0, "credit": 0, "accounts": set()}
+        
+        def rows():
+            for transaction in transactions:
+                totals["count"] += 1
+                totals["debit"] += transaction.debit_amount
+                totals["credit"] += transaction.credit_amount
+                totals["accounts"].add((transaction.account_type, transaction.account_id))
+                yield [
+                    transaction.date,
+                    transaction.voucher_type,
+                    transaction.voucher_number,
+                    transaction.account_type,
+                    transaction.account_name,
+                    transaction.debit_amount,
+                    transaction.credit_amount,
+                    transaction.balance,
+                    transaction.description or ''
+                ]
+        
+        def footer():
+            yield []  # Empty row
+            yield ['SUMMARY']
+            yield ['Transaction Count', totals["count"]]
+            yield ['Accounts Involved', len(totals["accounts"])]
+            yield ['Total Debit', totals["debit"]]
+            yield ['Total Credit', totals["credit"]]
+            yield ['Net Balance', totals["credit"] - totals["debit"]]
+        
+        return ExcelService.stream_workbook(
+            "Complete Ledger", headers, rows(), footer,
+            column_widths={"Date": 20, "Account Name": 40, "Description": 50}
+        )
+    
     @staticmethod
     def export_ledger_report(ledger_data: Dict, report_type: str = "complete") -> io.BytesIO:
         """Export ledger report to Excel"""
@@ -1119,6 +1382,61 @@ class ReportsExcelService(ExcelService):
         excel_data.seek(0)
         return excel_data
 
+    
+    @staticmethod
+    def export_ageing_report(ageing_data: Dict) -> io.BytesIO:
+        """Export receivables/payables ageing report to Excel"""
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Ageing Report"
+        
+        bucket_fields = ["days_0_30", "days_31_60", "days_61_90", "days_over_90", "total_outstanding", "unapplied_amount"]
+        headers = [
+            "Account Type", "Account Name", "Contact", "0-30 Days", "31-60 Days",
+            "61-90 Days", "90+ Days", "Total Outstanding", "Unapplied", "Oldest Open Date"
+        ]
+        ws.append([f"Ageing as of {ageing_data.get('as_of_date', '')}"])
+        ws.append(headers)
+        
+        # Style headers
+        for cell in ws[2]:
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+        
+        # Add data
+        for balance in ageing_data.get('balances', []):
+            ws.append([
+                balance.get('account_type', ''),
+                balance.get('account_name', ''),
+                balance.get('contact_info', ''),
+                *[float(balance.get(field) or 0) for field in bucket_fields],
+                balance.get('oldest_open_date', '')
+            ])
+        
+        # Bucket totals
+        ws.append([])
+        for label, key in (("Total Receivables", "receivables"), ("Total Payables", "payables")):
+            totals = ageing_data.get(key, {})
+            ws.append([label, "", "", *[float(totals.get(field) or 0) for field in bucket_fields]])
+            for cell in ws[ws.max_row]:
+                cell.font = Font(bold=True)
+        
+        # Add summary
+        if 'summary' in ageing_data:
+            ws.append([])  # Empty row
+            ws.append(['SUMMARY'])
+            for key, value in ageing_data['summary'].items():
+                ws.append([key.replace('_', ' ').title(), value if isinstance(value, (int, str)) else float(value)])
+        
+        # Column widths from the headers; scanning every cell is too slow for tens of thousands of accounts
+        for index, header in enumerate(headers, start=1):
+            width = 40 if header == "Account Name" else max(len(header) + 4, 14)
+            ws.column_dimensions[ws.cell(row=2, column=index).column_letter].width = width
+        
+        excel_data = io.BytesIO()
+        wb.save(excel_data)
+        excel_data.seek(0)
+        return excel_data
 
 class CompanyExcelService(ExcelService):
     REQUIRED_COLUMNS = [
@@ -1131,6 +1449,25 @@ class CompanyExcelService(ExcelService):
         "Contact Number"
     ]
 
+    IMPORT_SCHEMA = ImportSchema([
+        ImportColumn("name", required=True),
+        ImportColumn("address_line_1", field="address1", required=True),
+        ImportColumn("address_line_2", field="address2"),
+        ImportColumn("city", required=True),
+        ImportColumn("state", required=True),
+        PIN_CODE_COLUMN,
+        ImportColumn("state_code", required=True, pattern=digits_pattern(2),
+                     pattern_message="must be exactly 2 digits"),
+        ImportColumn("contact_number", required=True),
+        ImportColumn("email"),
+        GST_NUMBER_COLUMN,
+        PAN_NUMBER_COLUMN,
+        ImportColumn("registration_number"),
+        ImportColumn("business_type"),
+        ImportColumn("industry"),
+        ImportColumn("website"),
+    ])
+
     @staticmethod
     def create_template() -> io.BytesIO:
         """Create Excel template for company import with styling and sample data"""
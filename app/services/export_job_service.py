@@ -0,0 +1,609 @@
+# app/services/export_job_service.py
+
+"""
+Background Excel export jobs.
+
+Large exports run in a pool of worker threads instead of inside the request.
+Submitting an export stores a job record and queues its id; a worker streams the
+rows from the database into a write-only workbook (see ExcelService.stream_workbook)
+saved under EXPORT_JOB_STORAGE_DIR, updating the job's progress as it goes.
+Clients poll the job and download the file once it is completed. Finished files
+and their records are deleted EXPORT_JOB_TTL_MINUTES after the job ends.
+
+Job records and the queue live in process memory by default. With
+EXPORT_JOB_BACKEND = "redis" (and the redis package installed) they live in
+REDIS_URL instead, so any API worker can serve status and downloads for a job
+run by another; the export files must then be on storage shared by all workers.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tenant import TenantContext
+from app.models.base import Customer, Product, Stock
+from app.schemas.export_job import (
+    SalesReportExportParams, PurchaseReportExportParams, CustomersExportParams,
+    ProductsExportParams, StockExportParams
+)
+from app.schemas.ledger import LedgerFilters
+from app.services.excel_service import (
+    ReportsExcelService, CustomerExcelService, ProductExcelService, StockExcelService
+)
+from app.services.ledger_service import LedgerService
+from app.services.voucher_report_service import VoucherReportService, ReportFilters, REPORT_FETCH_SIZE
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Rows written between progress updates (each update is a store write and a cancellation check)
+EXPORT_PROGRESS_INTERVAL = 1000
+
+
+class ExportJobError(Exception):
+    """Raised when an export job cannot be submitted"""
+    pass
+
+
+class ExportJobLimitError(ExportJobError):
+    """Raised when an organization already has the maximum number of active export jobs"""
+    pass
+
+
+class _ExportCancelled(Exception):
+    pass
+
+
+@dataclass
+class ExportJob:
+    """A background export; timestamps are epoch seconds"""
+    id: str
+    kind: str
+    organization_id: int
+    user_id: Optional[int]
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: str = JOB_QUEUED
+    rows_written: int = 0
+    rows_total: Optional[int] = None
+    filename: Optional[str] = None
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status == JOB_COMPLETED:
+            return 1.0
+        if not self.rows_total:
+            return None
+        return min(self.rows_written / self.rows_total, 1.0)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "ExportJob":
+        return cls(**json.loads(data))
+
+
+# ------------------------------------------------------------------------------
+# Export kinds: each builds (row count if known up front, file chunks) for an
+# organization. Queries filter on organization_id explicitly; the worker also
+# sets the tenant context so automatic tenant criteria apply as in a request.
+# ------------------------------------------------------------------------------
+
+Track = Callable[[Iterable[Any]], Iterator[Any]]
+
+
+class ExportKind(NamedTuple):
+    filename: str
+    params: Type[BaseModel]
+    build: Callable[[Session, int, Any, Track], Tuple[Optional[int], Iterator[bytes]]]
+
+
+def _voucher_report(kind: str, party_key: str, stream: Callable):
+    def build(db: Session, organization_id: int, params, track: Track):
+        filters = ReportFilters(organization_id, params.start_date, params.end_date, getattr(params, party_key))
+        summary = VoucherReportService.summary(db, kind, filters)
+        vouchers = VoucherReportService.iter_vouchers(db, kind, filters)
+        return summary["total_vouchers"], stream(track(vouchers), summary)
+    return build
+
+
+def _complete_ledger(db: Session, organization_id: int, params: LedgerFilters, track: Track):
+    return None, ReportsExcelService.stream_complete_ledger(
+        track(LedgerService.iter_transactions(db, organization_id, params))
+    )
+
+
+def _rows(db: Session, statement) -> Tuple[int, Iterator[Dict[str, Any]]]:
+    total = db.execute(select(func.count()).select_from(statement.order_by(None).subquery())).scalar_one()
+    result = db.execute(statement.execution_options(yield_per=REPORT_FETCH_SIZE))
+    return total, (row._asdict() for row in result)
+
+
+def _customers(db: Session, organization_id: int, params: CustomersExportParams, track: Track):
+    statement = select(
+        Customer.name, Customer.contact_number, Customer.email, Customer.address1, Customer.address2,
+        Customer.city, Customer.state, Customer.pin_code, Customer.state_code,
+        Customer.gst_number, Customer.pan_number
+    ).where(Customer.organization_id == organization_id).order_by(Customer.id)
+    if params.active_only:
+        statement = statement.where(Customer.is_active == True)
+    if params.search:
+        statement = statement.where(
+            Customer.name.contains(params.search) |
+            Customer.contact_number.contains(params.search) |
+            Customer.email.contains(params.search)
+        )
+    total, rows = _rows(db, statement)
+    return total, CustomerExcelService.stream_customers(track(rows))
+
+
+def _products(db: Session, organization_id: int, params: ProductsExportParams, track: Track):
+    statement = select(
+        Product.name.label("product_name"), Product.hsn_code, Product.part_number, Product.unit,
+        Product.unit_price, Product.gst_rate, Product.is_gst_inclusive, Product.reorder_level,
+        Product.description, Product.is_manufactured
+    ).where(Product.organization_id == organization_id).order_by(Product.id)
+    if params.active_only:
+        statement = statement.where(Product.is_active == True)
+    if params.search:
+        statement = statement.where(
+            Product.name.contains(params.search) |
+            Product.hsn_code.contains(params.search) |
+            Product.part_number.contains(params.search)
+        )
+    total, rows = _rows(db, statement)
+    return total, ProductExcelService.stream_products(track(rows))
+
+
+def _stock(db: Session, organization_id: int, params: StockExportParams, track: Track):
+    statement = select(
+        Product.name.label("product_name"), Stock.quantity, Stock.unit, Product.hsn_code,
+        Product.part_number, Product.unit_price, Product.gst_rate, Product.reorder_level, Stock.location
+    ).select_from(Stock).join(Product, Stock.product_id == Product.id).where(
+        Stock.organization_id == organization_id
+    ).order_by(Stock.id)
+    if params.product_id:
+        statement = statement.where(Stock.product_id == params.product_id)
+    if params.low_stock_only:
+        statement = statement.where(Stock.quantity <= Product.reorder_level)
+    total, rows = _rows(db, statement)
+    return total, StockExcelService.stream_stock(track(rows))
+
+
+EXPORT_KINDS: Dict[str, ExportKind] = {
+    "sales-report": ExportKind(
+        "sales_report.xlsx", SalesReportExportParams,
+        _voucher_report("sales", "customer_id", ReportsExcelService.stream_sales_report)
+    ),
+    "purchase-report": ExportKind(
+        "purchase_report.xlsx", PurchaseReportExportParams,
+        _voucher_report("purchase", "vendor_id", ReportsExcelService.stream_purchase_report)
+    ),
+    "complete-ledger": ExportKind("complete_ledger_report.xlsx", LedgerFilters, _complete_ledger),
+    "customers": ExportKind("customers_export.xlsx", CustomersExportParams, _customers),
+    "products": ExportKind("products_export.xlsx", ProductsExportParams, _products),
+    "stock": ExportKind("stock_export.xlsx", StockExportParams, _stock),
+}
+
+
+# ------------------------------------------------------------------------------
+# Job stores. Every status transition goes through update(), which only applies
+# when the job is still in the expected status, so a cancel racing a worker
+# cannot be overwritten. Each organization holds one active slot per job from
+# submission until a worker has processed (or skipped) it.
+# ------------------------------------------------------------------------------
+
+class InMemoryExportJobStore:
+    """Job records and queue kept in this process"""
+
+    def __init__(self):
+        self._jobs: Dict[str, ExportJob] = {}
+        self._active: Dict[int, int] = {}
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def add(self, job: ExportJob, max_active: int) -> None:
+        with self._lock:
+            active = self._active.get(job.organization_id, 0)
+            if max_active > 0 and active >= max_active:
+                raise ExportJobLimitError(f"At most {max_active} export jobs may be active per organization")
+            self._active[job.organization_id] = active + 1
+            self._jobs[job.id] = replace(job)
+        self._queue.put(job.id)
+
+    def release(self, organization_id: int) -> None:
+        with self._lock:
+            active = self._active.get(organization_id, 0) - 1
+            if active > 0:
+                self._active[organization_id] = active
+            else:
+                self._active.pop(organization_id, None)
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job) if job else None
+
+    def update(self, job_id: str, expected_status: str, **changes) -> Optional[ExportJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != expected_status:
+                return None
+            job = self._jobs[job_id] = replace(job, **changes)
+            return replace(job)
+
+    def list(self, organization_id: int) -> List[ExportJob]:
+        with self._lock:
+            return [replace(job) for job in self._jobs.values() if job.organization_id == organization_id]
+
+    def all(self) -> List[ExportJob]:
+        with self._lock:
+            return [replace(job) for job in self._jobs.values()]
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def next_job_id(self, timeout: float) -> Optional[str]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class RedisExportJobStore:
+    """Job records (JSON strings), per-organization job sets, active counters and the queue in Redis"""
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "export_jobs"):
+        self.client = client
+        self.ttl_seconds = max(int(ttl_seconds), 1)
+        self.prefix = prefix
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def _org_key(self, organization_id: int) -> str:
+        return f"{self.prefix}:org:{organization_id}"
+
+    def _active_key(self, organization_id: int) -> str:
+        return f"{self.prefix}:active:{organization_id}"
+
+    def add(self, job: ExportJob, max_active: int) -> None:
+        active_key = self._active_key(job.organization_id)
+        active = self.client.incr(active_key)
+        # A worker that dies mid-job never releases its slot; the expiry bounds the leak
+        self.client.expire(active_key, self.ttl_seconds)
+        if max_active > 0 and active > max_active:
+            self.client.decr(active_key)
+            raise ExportJobLimitError(f"At most {max_active} export jobs may be active per organization")
+        pipe = self.client.pipeline()
+        pipe.set(self._job_key(job.id), job.to_json(), ex=self.ttl_seconds)
+        pipe.sadd(self._org_key(job.organization_id), job.id)
+        pipe.rpush(f"{self.prefix}:queue", job.id)
+        pipe.execute()
+
+    def release(self, organization_id: int) -> None:
+        active_key = self._active_key(organization_id)
+        if self.client.decr(active_key) <= 0:
+            self.client.delete(active_key)
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        data = self.client.get(self._job_key(job_id))
+        return ExportJob.from_json(data) if data else None
+
+    def update(self, job_id: str, expected_status: str, **changes) -> Optional[ExportJob]:
+        key = self._job_key(job_id)
+        updated = []
+
+        def apply(pipe):
+            data = pipe.get(key)
+            job = ExportJob.from_json(data) if data else None
+            if job is None or job.status != expected_status:
+                return
+            job = replace(job, **changes)
+            pipe.multi()
+            pipe.set(key, job.to_json(), ex=self.ttl_seconds)
+            updated.append(job)
+
+        self.client.transaction(apply, key)
+        return updated[0] if updated else None
+
+    def list(self, organization_id: int) -> List[ExportJob]:
+        org_key = self._org_key(organization_id)
+        job_ids = sorted(self.client.smembers(org_key))
+        if not job_ids:
+            return []
+        jobs = []
+        for job_id, data in zip(job_ids, self.client.mget([self._job_key(job_id) for job_id in job_ids])):
+            if data:
+                jobs.append(ExportJob.from_json(data))
+            else:
+                self.client.srem(org_key, job_id)
+        return jobs
+
+    def all(self) -> List[ExportJob]:
+        jobs = []
+        for key in self.client.scan_iter(match=self._job_key("*")):
+            data = self.client.get(key)
+            if data:
+                jobs.append(ExportJob.from_json(data))
+        return jobs
+
+    def delete(self, job_id: str) -> None:
+        job = self.get(job_id)
+        self.client.delete(self._job_key(job_id))
+        if job is not None:
+            self.client.srem(self._org_key(job.organization_id), job_id)
+
+    def next_job_id(self, timeout: float) -> Optional[str]:
+        item = self.client.blpop(f"{self.prefix}:queue", timeout=max(int(timeout), 1))
+        return item[1] if item else None
+
+
+# ------------------------------------------------------------------------------
+# Manager: submission, workers, cancellation and TTL cleanup
+# ------------------------------------------------------------------------------
+
+class ExportJobManager:
+    """Runs export jobs from a store on a pool of worker threads"""
+
+    def __init__(
+        self,
+        store,
+        session_factory: Callable[[], Session],
+        storage_dir: str,
+        workers: int = 2,
+        max_active_per_org: int = 2,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.store = store
+        self.session_factory = session_factory
+        self.storage_dir = Path(storage_dir)
+        self.workers = workers
+        self.max_active_per_org = max_active_per_org
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def submit(
+        self,
+        kind: str,
+        organization_id: int,
+        user_id: Optional[int],
+        params: Optional[Dict[str, Any]] = None
+    ) -> ExportJob:
+        """Validate the filters for kind and queue the export; raises ExportJobLimitError when the org is at its limit"""
+        if kind not in EXPORT_KINDS:
+            raise ExportJobError(f"Unknown export kind: {kind}")
+        export_kind = EXPORT_KINDS[kind]
+        # Raises pydantic.ValidationError for invalid filters
+        validated = export_kind.params.model_validate(params or {})
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            organization_id=organization_id,
+            user_id=user_id,
+            params=validated.model_dump(mode="json", exclude_none=True),
+            filename=export_kind.filename,
+            created_at=self._clock(),
+        )
+        self.store.add(job, self.max_active_per_org)
+        logger.info(f"Queued {kind} export job {job.id} for organization {organization_id}")
+        return job
+
+    def get(self, job_id: str, organization_id: int) -> Optional[ExportJob]:
+        """The job, if it belongs to organization_id"""
+        job = self.store.get(job_id)
+        if job is None or job.organization_id != organization_id:
+            return None
+        return job
+
+    def list(self, organization_id: int) -> List[ExportJob]:
+        """The organization's jobs, newest first"""
+        return sorted(self.store.list(organization_id), key=lambda job: job.created_at, reverse=True)
+
+    def file_path(self, job: ExportJob) -> Path:
+        return self.storage_dir / f"{job.id}.xlsx"
+
+    def cancel(self, job_id: str, organization_id: int) -> bool:
+        """Cancel an active job, or delete a finished one and its file; False when there is no such job"""
+        job = self.get(job_id, organization_id)
+        if job is None:
+            return False
+        now = self._clock()
+        for status in ACTIVE_STATUSES:
+            # A running job stops at its next progress update and removes its partial file
+            if self.store.update(job_id, status, status=JOB_CANCELLED, finished_at=now, expires_at=now + self.ttl_seconds):
+                logger.info(f"Cancelled export job {job_id}")
+                return True
+        self._remove(job)
+        return True
+
+    def run_job(self, job_id: str) -> Optional[ExportJob]:
+        """Generate the file for a queued job (called by the workers); returns the job's final state"""
+        job = self.store.update(job_id, JOB_QUEUED, status=JOB_RUNNING, started_at=self._clock())
+        if job is None:
+            # Cancelled or expired while queued
+            skipped = self.store.get(job_id)
+            if skipped is not None:
+                self.store.release(skipped.organization_id)
+            return skipped
+
+        export_kind = EXPORT_KINDS[job.kind]
+        path = self.file_path(job)
+        partial = path.with_suffix(".part")
+        db = self.session_factory()
+        TenantContext.set_organization_id(job.organization_id)
+        try:
+            rows_total, chunks = export_kind.build(
+                db, job.organization_id, export_kind.params.model_validate(job.params), self._tracker(job_id)
+            )
+            if rows_total is not None:
+                self._checkpoint(job_id, rows_total=rows_total)
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            with open(partial, "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            os.replace(partial, path)
+            now = self._clock()
+            finished = self.store.update(
+                job_id, JOB_RUNNING, status=JOB_COMPLETED, file_size=path.stat().st_size,
+                finished_at=now, expires_at=now + self.ttl_seconds
+            )
+            if finished is None:
+                path.unlink(missing_ok=True)
+                return self.store.get(job_id)
+            logger.info(f"Export job {job_id} completed: {finished.rows_written} rows, {finished.file_size} bytes")
+            return finished
+        except _ExportCancelled:
+            partial.unlink(missing_ok=True)
+            return self.store.get(job_id)
+        except Exception as e:
+            logger.error(f"Export job {job_id} failed: {e}")
+            partial.unlink(missing_ok=True)
+            now = self._clock()
+            return self.store.update(
+                job_id, JOB_RUNNING, status=JOB_FAILED, error=str(e) or type(e).__name__,
+                finished_at=now, expires_at=now + self.ttl_seconds
+            ) or self.store.get(job_id)
+        finally:
+            TenantContext.clear()
+            db.close()
+            self.store.release(job.organization_id)
+
+    def _checkpoint(self, job_id: str, **changes) -> None:
+        if self.store.update(job_id, JOB_RUNNING, **changes) is None:
+            raise _ExportCancelled()
+
+    def _tracker(self, job_id: str) -> Track:
+        """Wrap a row iterable so progress is recorded every EXPORT_PROGRESS_INTERVAL rows"""
+        def track(rows: Iterable[Any]) -> Iterator[Any]:
+            written = 0
+            for row in rows:
+                yield row
+                written += 1
+                if written % EXPORT_PROGRESS_INTERVAL == 0:
+                    self._checkpoint(job_id, rows_written=written)
+            self._checkpoint(job_id, rows_written=written)
+        return track
+
+    def _remove(self, job: ExportJob) -> None:
+        self.file_path(job).unlink(missing_ok=True)
+        self.store.delete(job.id)
+
+    def cleanup_expired(self) -> int:
+        """Delete finished jobs past their expiry, with their files, and stray files older than the TTL"""
+        now = self._clock()
+        removed = 0
+        for job in self.store.all():
+            if job.status not in ACTIVE_STATUSES and job.expires_at is not None and job.expires_at <= now:
+                self._remove(job)
+                removed += 1
+        if self.storage_dir.is_dir():
+            for path in self.storage_dir.iterdir():
+                # Left behind by a restart (in-memory records are lost) or a crashed worker
+                if path.suffix in (".xlsx", ".part") and path.stat().st_mtime + self.ttl_seconds <= now \
+                        and self.store.get(path.stem) is None:
+                    path.unlink(missing_ok=True)
+        if removed:
+            logger.info(f"Removed {removed} expired export job(s)")
+        return removed
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        self._stopping.clear()
+        for index in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self._work, name=f"export-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers once their current job finishes (waiting at most timeout seconds each)"""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job_id = self.store.next_job_id(timeout=1.0)
+                if job_id is not None:
+                    self.run_job(job_id)
+            except Exception as e:
+                logger.error(f"Export worker error: {e}")
+                time.sleep(1.0)
+
+
+_manager: Optional[ExportJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def _create_store():
+    if settings.EXPORT_JOB_BACKEND == "redis":
+        if REDIS_AVAILABLE:
+            client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            return RedisExportJobStore(client, settings.EXPORT_JOB_TTL_MINUTES * 60)
+        logger.warning("EXPORT_JOB_BACKEND is 'redis' but the redis package is not installed; using the in-process queue")
+    return InMemoryExportJobStore()
+
+
+def get_export_job_manager() -> ExportJobManager:
+    """The process-wide export job manager, created from settings on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from app.core.database import read_router
+            _manager = ExportJobManager(
+                _create_store(),
+                read_router.session,
+                os.path.join(settings.UPLOAD_FOLDER, settings.EXPORT_JOB_STORAGE_DIR),
+                workers=settings.EXPORT_JOB_WORKERS,
+                max_active_per_org=settings.EXPORT_JOB_MAX_ACTIVE_PER_ORG,
+                ttl_seconds=settings.EXPORT_JOB_TTL_MINUTES * 60,
+            )
+        return _manager
+
+
+async def run_cleanup_job(manager: ExportJobManager, interval_seconds: float) -> None:
+    """Remove expired export files and job records every interval_seconds"""
+    while True:
+        try:
+            await asyncio.to_thread(manager.cleanup_expired)
+        except Exception as e:
+            logger.error(f"Export job cleanup failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,495 @@
+# app/services/import_job_service.py
+
+"""
+Background import jobs.
+
+Large imports run on worker threads instead of inside the request. Submitting an
+import stores the upload under IMPORT_JOB_STORAGE_DIR and an ImportJob row; a
+worker claims the job and streams the file through the template's ImportSchema in
+chunks of chunk_size rows (see ExcelService.iter_import_batches). Each chunk is
+written and committed in one transaction with the job's checkpoint: the rows it
+covers, the running totals and its row errors. A chunk is therefore either
+imported and recorded or neither, and clients polling the job see the progress
+and errors of every committed chunk.
+
+A job whose worker crashes stays "running" without new checkpoints. Once its
+heartbeat (the last checkpoint) is IMPORT_JOB_STALE_MINUTES old, any worker,
+in this or another API process, claims it again and resumes after the last
+committed row, up to IMPORT_JOB_MAX_ATTEMPTS claims in all. Failed jobs keep
+their upload and can be resumed on request. Every claim increments the job's
+attempt number and checkpoints only apply while the job still carries the
+worker's attempt, so a worker presumed dead cannot commit over its successor.
+Uploads are deleted once their job completes or is cancelled.
+"""
+
+import logging
+import shutil
+from contextlib import closing
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type
+
+from fastapi import UploadFile
+from pydantic import BaseModel
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tenant import TenantContext
+from app.models.base import Customer, ImportJob, Vendor
+from app.schemas.import_job import ImportJobParams, StockImportJobParams
+from app.services.dashboard_counter_service import DashboardCounterService
+from app.services.excel_service import (
+    ExcelService, CustomerExcelService, ProductExcelService, StockExcelService, VendorExcelService,
+    IMPORT_FILE_EXTENSIONS
+)
+from app.services.master_import_service import MasterImportService
+from app.services.stock_import_service import StockImportService, StockImportResult, ProductIndex
+from app.utils.import_validation import ImportValidationResult
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Jobs looked at per poll when a worker searches for work
+IMPORT_CLAIM_BATCH = 10
+
+
+class ImportJobError(Exception):
+    """Raised when an import job cannot be submitted or resumed"""
+    pass
+
+
+class ImportJobLimitError(ImportJobError):
+    """Raised when an organization already has the maximum number of active import jobs"""
+    pass
+
+
+class _ImportStopped(Exception):
+    """The job was cancelled or claimed by another worker while this one ran it"""
+    pass
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class ImportChunk:
+    """What one chunk adds to its job: totals to sum and "Row N: ..." messages"""
+    counts: Dict[str, int]
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+# ------------------------------------------------------------------------------
+# Import kinds: each imports a validated chunk in the caller's transaction. state
+# is kept across the chunks of one run (it is lost when a job is resumed).
+# ------------------------------------------------------------------------------
+
+class ImportKind(NamedTuple):
+    template: Type[ExcelService]
+    sheet_name: str
+    params: Type[BaseModel]
+    import_chunk: Callable[[Session, int, ImportValidationResult, Dict[str, Any], Dict[str, Any]], ImportChunk]
+    # Imports of masters that stock operations depend on need the company set up first
+    requires_company: bool = False
+    # Run in the transaction that completes the job
+    finish: Optional[Callable[[Session, int], None]] = None
+
+
+def _parties(model):
+    def import_chunk(db: Session, organization_id: int, validation: ImportValidationResult, params, state) -> ImportChunk:
+        result = MasterImportService.import_parties(db, organization_id, model, validation)
+        return ImportChunk({"created": result.created, "updated": result.updated, "skipped": validation.skipped}, result.errors)
+    return import_chunk
+
+
+def _products(db: Session, organization_id: int, validation: ImportValidationResult, params, state) -> ImportChunk:
+    result = MasterImportService.import_products(db, organization_id, validation)
+    return ImportChunk({
+        "created": result.created, "updated": result.updated, "skipped": validation.skipped,
+        "created_stocks": result.created_stocks, "updated_stocks": result.updated_stocks,
+    }, result.errors)
+
+
+def _stock(db: Session, organization_id: int, validation: ImportValidationResult, params, state) -> ImportChunk:
+    result = StockImportResult()
+    products = state.setdefault("products", ProductIndex())
+    StockImportService.import_batch(db, organization_id, validation, params["mode"], products, result)
+    return ImportChunk(
+        {
+            "created": result.created_stocks, "updated": result.updated_stocks, "skipped": result.skipped,
+            "created_products": result.created_products,
+        },
+        [f"Row {error.row}: {error.error}" for error in result.detailed_errors],
+        result.warnings,
+    )
+
+
+def _recompute_counters(db: Session, organization_id: int) -> None:
+    # Stock is written with Core statements that bypass the counter listeners
+    DashboardCounterService.recompute(db, organization_id)
+
+
+IMPORT_KINDS: Dict[str, ImportKind] = {
+    "products": ImportKind(ProductExcelService, "Product Import Template", ImportJobParams, _products, requires_company=True),
+    "customers": ImportKind(CustomerExcelService, "Customer Import Template", ImportJobParams, _parties(Customer)),
+    "vendors": ImportKind(VendorExcelService, "Vendor Import Template", ImportJobParams, _parties(Vendor)),
+    "stock": ImportKind(
+        StockExcelService, "Stock Import Template", StockImportJobParams, _stock,
+        requires_company=True, finish=_recompute_counters
+    ),
+}
+
+
+@dataclass
+class _Checkpoint:
+    """The job's progress as of its last committed chunk, advanced chunk by chunk"""
+    rows_processed: int
+    counts: Dict[str, int]
+    error_count: int
+    errors: List[str]
+    warnings: List[str]
+
+    @classmethod
+    def of(cls, job: ImportJob) -> "_Checkpoint":
+        return cls(job.rows_processed, dict(job.counts or {}), job.error_count, list(job.errors or []), list(job.warnings or []))
+
+    def add(self, rows: int, chunk: ImportChunk, max_messages: int) -> None:
+        self.rows_processed += rows
+        for name, value in chunk.counts.items():
+            self.counts[name] = self.counts.get(name, 0) + int(value)
+        self.error_count += len(chunk.errors)
+        self.errors.extend(chunk.errors[:max(max_messages - len(self.errors), 0)])
+        self.warnings.extend(chunk.warnings[:max(max_messages - len(self.warnings), 0)])
+
+    def values(self) -> Dict[str, Any]:
+        return {
+            "rows_processed": self.rows_processed, "counts": self.counts, "error_count": self.error_count,
+            "errors": self.errors, "warnings": self.warnings,
+        }
+
+
+class ImportJobManager:
+    """Runs import jobs recorded in the import_jobs table on a pool of worker threads"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        storage_dir: str,
+        workers: int = 1,
+        max_active_per_org: int = 2,
+        chunk_size: int = 1000,
+        stale_seconds: float = 600.0,
+        max_attempts: int = 3,
+        max_messages: int = 1000,
+        poll_interval: float = 5.0,
+        clock: Callable[[], datetime] = _utcnow
+    ):
+        self.session_factory = session_factory
+        self.storage_dir = Path(storage_dir)
+        self.workers = workers
+        self.max_active_per_org = max_active_per_org
+        self.chunk_size = chunk_size
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.max_messages = max_messages
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+
+    def file_path(self, job: ImportJob) -> Path:
+        return self.storage_dir / f"{job.id}{Path(job.filename).suffix.lower()}"
+
+    def submit(
+        self,
+        kind: str,
+        organization_id: int,
+        user_id: Optional[int],
+        upload: UploadFile,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None
+    ) -> ImportJob:
+        """Store the upload and queue its import; raises ImportJobLimitError when the org is at its limit"""
+        if kind not in IMPORT_KINDS:
+            raise ImportJobError(f"Unknown import kind: {kind}")
+        import_kind = IMPORT_KINDS[kind]
+        # Raises pydantic.ValidationError for invalid options
+        validated = import_kind.params.model_validate(params or {})
+        if not upload.filename or not upload.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
+            raise ImportJobError("Only Excel or CSV files (.xlsx, .xls, .csv) are allowed")
+        chunk_size = chunk_size or self.chunk_size
+        if chunk_size < 1:
+            raise ImportJobError("chunk_size must be at least 1")
+
+        with self.session_factory() as db:
+            active = db.execute(select(func.count()).select_from(ImportJob).where(
+                ImportJob.organization_id == organization_id, ImportJob.status.in_(ACTIVE_STATUSES)
+            )).scalar_one()
+            if self.max_active_per_org > 0 and active >= self.max_active_per_org:
+                raise ImportJobLimitError(
+                    f"At most {self.max_active_per_org} import jobs may be active per organization"
+                )
+            job = ImportJob(
+                id=uuid.uuid4().hex,
+                organization_id=organization_id,
+                user_id=user_id,
+                kind=kind,
+                params=validated.model_dump(mode="json"),
+                filename=Path(upload.filename).name,
+                chunk_size=chunk_size,
+                status=JOB_QUEUED,
+                rows_processed=0,
+                error_count=0,
+                attempts=0,
+                created_at=self._clock(),
+            )
+            path = self.file_path(job)
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            upload.file.seek(0)
+            with open(path, "wb") as stored:
+                shutil.copyfileobj(upload.file, stored, 1024 * 1024)
+            try:
+                job.rows_total = ExcelService.estimate_upload_rows(upload, import_kind.sheet_name)
+                db.add(job)
+                db.commit()
+            except Exception:
+                path.unlink(missing_ok=True)
+                raise
+            db.refresh(job)
+            db.expunge(job)
+        logger.info(f"Queued {kind} import job {job.id} for organization {organization_id}")
+        self._wake.set()
+        return job
+
+    def get(self, job_id: str, organization_id: int) -> Optional[ImportJob]:
+        """The job, if it belongs to organization_id"""
+        with self.session_factory() as db:
+            job = db.get(ImportJob, job_id)
+            if job is None or job.organization_id != organization_id:
+                return None
+            db.expunge(job)
+            return job
+
+    def list(self, organization_id: int, limit: int = 50) -> List[ImportJob]:
+        """The organization's most recent jobs, newest first"""
+        with self.session_factory() as db:
+            jobs = db.execute(
+                select(ImportJob).where(ImportJob.organization_id == organization_id)
+                .order_by(ImportJob.created_at.desc()).limit(limit)
+            ).scalars().all()
+            db.expunge_all()
+            return list(jobs)
+
+    def cancel(self, job_id: str, organization_id: int) -> bool:
+        """Cancel an active job, or delete a finished one and its upload; False when there is no such job"""
+        job = self.get(job_id, organization_id)
+        if job is None:
+            return False
+        with self.session_factory() as db:
+            if job.status in ACTIVE_STATUSES:
+                # A running job stops before committing its next chunk and removes the upload
+                cancelled = db.execute(update(ImportJob).where(
+                    ImportJob.id == job_id, ImportJob.status.in_(ACTIVE_STATUSES)
+                ).values(status=JOB_CANCELLED, finished_at=self._clock()).execution_options(synchronize_session=False))
+                db.commit()
+                if cancelled.rowcount:
+                    if job.status == JOB_QUEUED:
+                        self.file_path(job).unlink(missing_ok=True)
+                    logger.info(f"Cancelled import job {job_id}")
+                    return True
+            db.execute(ImportJob.__table__.delete().where(ImportJob.id == job_id))
+            db.commit()
+        self.file_path(job).unlink(missing_ok=True)
+        return True
+
+    def resume(self, job_id: str, organization_id: int) -> Optional[ImportJob]:
+        """Queue a failed job again; it continues after its last committed chunk"""
+        job = self.get(job_id, organization_id)
+        if job is None:
+            return None
+        if job.status != JOB_FAILED:
+            raise ImportJobError(f"Only failed import jobs can be resumed, this one is {job.status}")
+        if not self.file_path(job).is_file():
+            raise ImportJobError("The uploaded file of this import is no longer available")
+        with self.session_factory() as db:
+            db.execute(update(ImportJob).where(ImportJob.id == job_id, ImportJob.status == JOB_FAILED).values(
+                status=JOB_QUEUED, error=None, finished_at=None
+            ).execution_options(synchronize_session=False))
+            db.commit()
+        self._wake.set()
+        return self.get(job_id, organization_id)
+
+    def _claim(self, job_id: str) -> Optional[ImportJob]:
+        """Take a queued job, or a running one whose worker stopped checkpointing; None when it is not available"""
+        now = self._clock()
+        with self.session_factory() as db:
+            claimed = db.execute(update(ImportJob).where(
+                ImportJob.id == job_id,
+                or_(
+                    ImportJob.status == JOB_QUEUED,
+                    and_(ImportJob.status == JOB_RUNNING, ImportJob.heartbeat_at < now - timedelta(seconds=self.stale_seconds)),
+                )
+            ).values(
+                status=JOB_RUNNING, attempts=ImportJob.attempts + 1, heartbeat_at=now,
+                started_at=func.coalesce(ImportJob.started_at, now)
+            ).execution_options(synchronize_session=False))
+            db.commit()
+            if not claimed.rowcount:
+                return None
+            job = db.get(ImportJob, job_id)
+            db.expunge(job)
+            return job
+
+    def run_job(self, job_id: str) -> Optional[ImportJob]:
+        """Import a queued (or stalled) job from its last checkpoint; returns its final state, None if it was not claimed"""
+        job = self._claim(job_id)
+        if job is None:
+            return None
+        if job.attempts > 1:
+            logger.info(f"Resuming import job {job_id} after row {job.rows_processed} (attempt {job.attempts})")
+
+        import_kind = IMPORT_KINDS[job.kind]
+        params = import_kind.params.model_validate(job.params or {}).model_dump()
+        checkpoint = _Checkpoint.of(job)
+        path = self.file_path(job)
+        db = self.session_factory()
+        TenantContext.set_organization_id(job.organization_id)
+        try:
+            state: Dict[str, Any] = {}
+            with open(path, "rb") as source:
+                upload = UploadFile(file=source, filename=job.filename)
+                batches = import_kind.template.iter_import_batches(
+                    upload, import_kind.sheet_name, job.chunk_size, skip_rows=job.rows_processed
+                )
+                # The reader is closed before its file when a chunk fails
+                with closing(batches):
+                    for validation in batches:
+                        chunk = import_kind.import_chunk(db, job.organization_id, validation, params, state)
+                        checkpoint.add(validation.total, chunk, self.max_messages)
+                        self._checkpoint(db, job, heartbeat_at=self._clock(), **checkpoint.values())
+                        db.commit()
+
+            if import_kind.finish is not None:
+                import_kind.finish(db, job.organization_id)
+            self._checkpoint(db, job, status=JOB_COMPLETED, heartbeat_at=self._clock(), finished_at=self._clock())
+            db.commit()
+            path.unlink(missing_ok=True)
+            logger.info(f"Import job {job_id} completed: {checkpoint.rows_processed} rows, {checkpoint.counts}")
+        except _ImportStopped:
+            db.rollback()
+            stopped = self._load(job_id)
+            if stopped is not None and stopped.status == JOB_CANCELLED:
+                path.unlink(missing_ok=True)
+            return stopped
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Import job {job_id} failed after row {checkpoint.rows_processed}: {e}")
+            try:
+                self._checkpoint(db, job, status=JOB_FAILED, error=str(e) or type(e).__name__, finished_at=self._clock())
+                db.commit()
+            except _ImportStopped:
+                db.rollback()
+        finally:
+            TenantContext.clear()
+            db.close()
+        return self._load(job_id)
+
+    def _checkpoint(self, db: Session, job: ImportJob, **changes) -> None:
+        """Update the job in db's transaction, provided it is still running under this worker's attempt"""
+        updated = db.execute(update(ImportJob).where(
+            ImportJob.id == job.id, ImportJob.status == JOB_RUNNING, ImportJob.attempts == job.attempts
+        ).values(**changes).execution_options(synchronize_session=False))
+        if not updated.rowcount:
+            raise _ImportStopped()
+
+    def _load(self, job_id: str) -> Optional[ImportJob]:
+        with self.session_factory() as db:
+            job = db.get(ImportJob, job_id)
+            if job is not None:
+                db.expunge(job)
+            return job
+
+    def run_next(self) -> Optional[ImportJob]:
+        """Run the oldest queued or stalled job this worker can claim; None when there is none"""
+        now = self._clock()
+        stale = now - timedelta(seconds=self.stale_seconds)
+        with self.session_factory() as db:
+            # Jobs that keep stalling (e.g. a file that crashes the process) are not retried forever
+            db.execute(update(ImportJob).where(
+                ImportJob.status == JOB_RUNNING, ImportJob.heartbeat_at < stale,
+                ImportJob.attempts >= self.max_attempts
+            ).values(
+                status=JOB_FAILED, finished_at=now,
+                error=f"The import stopped responding {self.max_attempts} times; resume it to try again"
+            ).execution_options(synchronize_session=False))
+            db.commit()
+            job_ids = db.execute(select(ImportJob.id).where(or_(
+                ImportJob.status == JOB_QUEUED,
+                and_(ImportJob.status == JOB_RUNNING, ImportJob.heartbeat_at < stale),
+            )).order_by(ImportJob.created_at).limit(IMPORT_CLAIM_BATCH)).scalars().all()
+        for job_id in job_ids:
+            job = self.run_job(job_id)
+            if job is not None:
+                return job
+        return None
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        self._stopping.clear()
+        for index in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self._work, name=f"import-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers once their current chunk finishes (waiting at most timeout seconds each)"""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if self.run_next() is None:
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+            except Exception as e:
+                logger.error(f"Import worker error: {e}")
+                self._stopping.wait(self.poll_interval)
+
+
+_manager: Optional[ImportJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_import_job_manager() -> ImportJobManager:
+    """The process-wide import job manager, created from settings on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from app.core.database import SessionLocal
+            _manager = ImportJobManager(
+                SessionLocal,
+                str(Path(settings.UPLOAD_FOLDER) / settings.IMPORT_JOB_STORAGE_DIR),
+                workers=settings.IMPORT_JOB_WORKERS,
+                max_active_per_org=settings.IMPORT_JOB_MAX_ACTIVE_PER_ORG,
+                chunk_size=settings.IMPORT_JOB_CHUNK_SIZE,
+                stale_seconds=settings.IMPORT_JOB_STALE_MINUTES * 60,
+                max_attempts=settings.IMPORT_JOB_MAX_ATTEMPTS,
+                max_messages=settings.IMPORT_JOB_MAX_MESSAGES,
+            )
+        return _manager
@@ -1,10 +1,13 @@
 # app/services/ledger_service.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
-from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime, date
+from sqlalchemy import and_, or_, desc, asc, case, func, literal, select, union_all
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from datetime import datetime, date, time, timedelta
 from decimal import Decimal
+import base64
+import binascii
+import json
 
 from app.models.base import Vendor, Customer
 from app.models.vouchers import (
@@ -12,14 +15,63 @@ from app.models.vouchers import (
     DebitNote, CreditNote, BaseVoucher
 )
 from app.schemas.ledger import (
-    LedgerFilters, LedgerTransaction, CompleteLedgerResponse,
-    OutstandingBalance, OutstandingLedgerResponse
+    LedgerFilters, LedgerTransaction, CompleteLedgerResponse, CompleteLedgerPage,
+    LedgerOpeningBalance, OutstandingBalance, OutstandingLedgerResponse,
+    AgeingBalance, AgeingReportResponse
 )
-from app.core.tenant import TenantQueryFilter
+from app.core.config import settings
+from app.services.account_balance_service import AccountBalanceService, LEDGER_EXCLUDED_STATUSES
+from app.services.ledger_snapshot_service import LedgerSnapshotService
+from app.services.account_resolver import resolve_accounts
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Voucher tables in the ledger: (model, voucher type, account relation, side the total is posted to).
+# Debit/credit notes have no fixed relation; they post to their vendor or customer.
+LEDGER_VOUCHER_SOURCES = (
+    (PurchaseVoucher, "purchase_voucher", "vendor", "debit"),    # Increases vendor payable
+    (SalesVoucher, "sales_voucher", "customer", "credit"),       # Increases customer receivable
+    (PaymentVoucher, "payment_voucher", "vendor", "credit"),     # Decreases vendor payable
+    (ReceiptVoucher, "receipt_voucher", "customer", "debit"),    # Decreases customer receivable
+    (DebitNote, "debit_note", None, "debit"),
+    (CreditNote, "credit_note", None, "credit"),
+)
+
+# Rows fetched per round trip when streaming the ledger
+LEDGER_STREAM_BATCH_SIZE = 1000
+
+# Default and maximum transactions per keyset page
+LEDGER_PAGE_SIZE = 500
+LEDGER_MAX_PAGE_SIZE = 5000
+
+# Ageing buckets: (field, maximum age in days); older open charges fall in days_over_90
+AGEING_BUCKETS = (("days_0_30", 30), ("days_31_60", 60), ("days_61_90", 90))
+AGEING_OVERFLOW_BUCKET = "days_over_90"
+
+# Position of a ledger row in ledger order: (date, source rank, voucher id)
+LedgerPosition = Tuple[datetime, int, int]
+
+
+def encode_ledger_cursor(position: LedgerPosition) -> str:
+    """Opaque page cursor for the ledger row at position"""
+    voucher_date, rank, voucher_id = position
+    payload = json.dumps([voucher_date.isoformat(), rank, voucher_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_ledger_cursor(cursor: str) -> LedgerPosition:
+    """Inverse of encode_ledger_cursor; raises ValueError for malformed cursors"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        voucher_date, rank, voucher_id = json.loads(payload)
+        position = (datetime.fromisoformat(voucher_date), int(rank), int(voucher_id))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid ledger cursor") from e
+    if not 0 <= position[1] < len(LEDGER_VOUCHER_SOURCES):
+        raise ValueError("Invalid ledger cursor")
+    return position
+
 
 class LedgerService:
     """Service for generating ledger reports"""
@@ -42,11 +94,13 @@ class LedgerService:
             CompleteLedgerResponse with all transactions and summary
         """
         try:
-            # Get all relevant transactions
-            transactions = LedgerService._get_all_transactions(db, organization_id, filters)
+            # Balances brought forward from before the start date (period snapshot + later vouchers)
+            opening_balances = LedgerSnapshotService.opening_balances(db, organization_id, filters)
             
-            # Calculate running balances
-            transactions_with_balance = LedgerService._calculate_running_balances(transactions)
+            # Get all relevant transactions; running balances are computed by the database
+            transactions_with_balance = LedgerService._get_all_transactions(
+                db, organization_id, filters, opening_balances=opening_balances
+            )
             
             # Calculate summary
             total_debit = sum(t.debit_amount for t in transactions_with_balance)
@@ -66,7 +120,13 @@ class LedgerService:
                 filters_applied=filters,
                 total_debit=total_debit,
                 total_credit=total_credit,
-                net_balance=net_balance
+                net_balance=net_balance,
+                opening_balances=[
+                    LedgerOpeningBalance(
+                        account_type=account_type, account_id=account_id, balance=Decimal(str(round(balance, 2)))
+                    )
+                    for (account_type, account_id), balance in sorted(opening_balances.items())
+                ]
             )
             
         except Exception as e:
@@ -92,7 +152,7 @@ class LedgerService:
         """
         try:
             # Get outstanding balances
-            outstanding_balances = LedgerService._calculate_outstanding_balances(
+            outstanding_balances = LedgerService._get_outstanding_balances(
                 db, organization_id, filters
             )
             
@@ -129,224 +189,530 @@ class LedgerService:
             raise
     
     @staticmethod
-    def _get_all_transactions(
+    def get_ageing_report(
         db: Session,
         organization_id: int,
-        filters: LedgerFilters
-    ) -> List[LedgerTransaction]:
-        """Get all transactions from various voucher types"""
-        transactions = []
+        filters: LedgerFilters,
+        as_of_date: Optional[date] = None
+    ) -> AgeingReportResponse:
+        """
+        Generate receivables/payables ageing as of a date
         
-        # Define voucher types and their impact on accounts
-        voucher_configs = [
-            {
-                "model": PurchaseVoucher,
-                "type": "purchase_voucher",
-                "account_relation": "vendor",
-                "account_field": "vendor_id",
-                "debit_amount_field": "total_amount",  # Increases vendor payable
-                "credit_amount_field": None
-            },
-            {
-                "model": SalesVoucher,
-                "type": "sales_voucher", 
-                "account_relation": "customer",
-                "account_field": "customer_id",
-                "debit_amount_field": None,
-                "credit_amount_field": "total_amount"  # Increases customer receivable
-            },
-            {
-                "model": PaymentVoucher,
-                "type": "payment_voucher",
-                "account_relation": "vendor",
-                "account_field": "vendor_id", 
-                "debit_amount_field": None,
-                "credit_amount_field": "total_amount"  # Decreases vendor payable
-            },
-            {
-                "model": ReceiptVoucher,
-                "type": "receipt_voucher",
-                "account_relation": "customer", 
-                "account_field": "customer_id",
-                "debit_amount_field": "total_amount",  # Decreases customer receivable
-                "credit_amount_field": None
-            },
-            {
-                "model": DebitNote,
-                "type": "debit_note",
-                "account_relation": None,  # Can be either vendor or customer
-                "account_field": None,
-                "debit_amount_field": "total_amount",
-                "credit_amount_field": None
-            },
-            {
-                "model": CreditNote,
-                "type": "credit_note",
-                "account_relation": None,  # Can be either vendor or customer
-                "account_field": None,
-                "debit_amount_field": None,
-                "credit_amount_field": "total_amount"
-            }
-        ]
+        Charges (sales vouchers for customers, purchase vouchers for vendors, and the notes
+        that increase a balance) are settled first-in first-out by receipts, payments and
+        the notes that reduce it; each charge's open remainder is aged from its voucher date.
+        Matching and bucketing run in one SQL statement, so only the per-account result rows
+        leave the database.
         
-        for config in voucher_configs:
-            # Skip if filtering by voucher type and this doesn't match
-            if filters.voucher_type != "all" and filters.voucher_type != config["type"]:
-                continue
-                
-            voucher_transactions = LedgerService._get_voucher_transactions(
-                db, organization_id, config, filters
+        Args:
+            db: Database session
+            organization_id: Organization ID for tenant filtering
+            filters: Ledger filters (account type/id; dates and voucher type do not apply)
+            as_of_date: Date ages are measured from (default today); later vouchers are ignored
+            
+        Returns:
+            AgeingReportResponse with per-account buckets and totals
+        """
+        try:
+            as_of_date = as_of_date or date.today()
+            filters = filters.model_copy(update={"start_date": None, "end_date": as_of_date, "voucher_type": "all"})
+            statement = LedgerService._ageing_statement(organization_id, filters, as_of_date)
+            rows = db.execute(statement).all() if statement is not None else []
+            
+            bucket_fields = [field for field, _ in AGEING_BUCKETS] + [AGEING_OVERFLOW_BUCKET]
+            amount_fields = bucket_fields + ["total_outstanding", "unapplied_amount"]
+            totals = {
+                account_type: dict.fromkeys(amount_fields, Decimal(0)) for account_type in ("customer", "vendor")
+            }
+            balances = []
+            for row in rows:
+                amounts = {field: Decimal(str(round(getattr(row, field) or 0.0, 2))) for field in amount_fields}
+                for field, amount in amounts.items():
+                    totals[row.account_type][field] += amount
+                balances.append(AgeingBalance.model_construct(
+                    account_type=row.account_type,
+                    account_id=row.account_id,
+                    account_name=row.account_name,
+                    contact_info=row.contact_info or "",
+                    oldest_open_date=row.oldest_open_date,
+                    **amounts
+                ))
+            
+            summary = {
+                "total_accounts": len(balances),
+                "customer_accounts": len([b for b in balances if b.account_type == "customer"]),
+                "vendor_accounts": len([b for b in balances if b.account_type == "vendor"]),
+                "total_receivable": totals["customer"]["total_outstanding"],
+                "total_payable": totals["vendor"]["total_outstanding"],
+                "currency": "INR"
+            }
+            
+            return AgeingReportResponse(
+                as_of_date=as_of_date,
+                balances=balances,
+                receivables=totals["customer"],
+                payables=totals["vendor"],
+                summary=summary,
+                filters_applied=filters
             )
-            transactions.extend(voucher_transactions)
+            
+        except Exception as e:
+            logger.error(f"Error generating ageing report: {e}")
+            raise
+    
+    @staticmethod
+    def _ageing_statement(organization_id: int, filters: LedgerFilters, as_of_date: date):
+        """
+        FIFO ageing per account: a charge's open amount is what remains of it after the account's
+        total settlements are applied to the running total of charges in ledger order. Window
+        functions give every row its account's running charges and totals in one pass, so no
+        derived tables are joined to each other.
+        """
+        entries = LedgerService._union_entries(organization_id, filters)
+        if entries is None:
+            return None
+        signed_amount = LedgerService._signed_amount(entries)
+        charge = case((signed_amount > 0, signed_amount), else_=0.0)
+        settlement = case((signed_amount < 0, -signed_amount), else_=0.0)
+        account = (entries.c.account_type, entries.c.account_id)
+        
+        # Bucket index by voucher date: 0 for the newest bucket, len(AGEING_BUCKETS) for the overflow
+        bucket = case(
+            *[
+                (entries.c.date >= datetime.combine(as_of_date - timedelta(days=days), time.min), index)
+                for index, (_, days) in enumerate(AGEING_BUCKETS)
+            ],
+            else_=len(AGEING_BUCKETS)
+        )
+        windowed = select(
+            *account,
+            entries.c.date,
+            charge.label("charge"),
+            bucket.label("bucket"),
+            func.sum(charge).over(
+                partition_by=account, order_by=(entries.c.date, entries.c.source_rank, entries.c.id), rows=(None, 0)
+            ).label("cumulative"),
+            func.sum(charge).over(partition_by=account).label("charged"),
+            func.sum(settlement).over(partition_by=account).label("settled")
+        ).where(
+            func.coalesce(entries.c.status, "").notin_(LEDGER_EXCLUDED_STATUSES)
+        ).subquery("windowed_entries")
         
-        # Sort by date
-        transactions.sort(key=lambda x: x.date)
+        remaining = windowed.c.cumulative - windowed.c.settled
+        open_amount = case(
+            (windowed.c.charge <= 0, 0.0),
+            (remaining <= 0, 0.0),
+            (remaining >= windowed.c.charge, windowed.c.charge),
+            else_=remaining
+        )
+        bucket_fields = [field for field, _ in AGEING_BUCKETS] + [AGEING_OVERFLOW_BUCKET]
+        total_outstanding = func.sum(open_amount)
+        unapplied = func.max(windowed.c.settled) - func.max(windowed.c.charged)
+        aged = select(
+            windowed.c.account_type,
+            windowed.c.account_id,
+            *[
+                func.sum(case((windowed.c.bucket == index, open_amount), else_=0.0)).label(field)
+                for index, field in enumerate(bucket_fields)
+            ],
+            total_outstanding.label("total_outstanding"),
+            case((unapplied > 0, unapplied), else_=0.0).label("unapplied_amount"),
+            func.min(case((and_(windowed.c.charge > 0, remaining > 0), windowed.c.date))).label("oldest_open_date")
+        ).group_by(
+            windowed.c.account_type, windowed.c.account_id
+        ).having(
+            or_(total_outstanding > 0.005, unapplied > 0.005)
+        ).subquery("aged")
         
-        return transactions
+        account_name = func.coalesce(Vendor.name, Customer.name, "")
+        return select(
+            aged.c.account_type,
+            aged.c.account_id,
+            account_name.label("account_name"),
+            func.coalesce(Vendor.contact_number, Customer.contact_number).label("contact_info"),
+            *[aged.c[field] for field in bucket_fields],
+            aged.c.total_outstanding,
+            aged.c.unapplied_amount,
+            aged.c.oldest_open_date
+        ).outerjoin(
+            Vendor, and_(aged.c.account_type == "vendor", Vendor.id == aged.c.account_id)
+        ).outerjoin(
+            Customer, and_(aged.c.account_type == "customer", Customer.id == aged.c.account_id)
+        ).order_by(desc(aged.c.total_outstanding), account_name)
     
     @staticmethod
-    def _get_voucher_transactions(
+    def _get_all_transactions(
         db: Session,
         organization_id: int,
-        config: Dict[str, Any],
-        filters: LedgerFilters
+        filters: LedgerFilters,
+        opening_balances: Optional[Dict[Tuple[str, int], float]] = None
     ) -> List[LedgerTransaction]:
-        """Get transactions for a specific voucher type"""
-        model = config["model"]
+        """Get all transactions from various voucher types, in date order with running balances"""
+        return list(LedgerService.iter_transactions(
+            db, organization_id, filters, opening_balances=opening_balances
+        ))
+    
+    @staticmethod
+    def iter_transactions(
+        db: Session,
+        organization_id: int,
+        filters: LedgerFilters,
+        batch_size: int = LEDGER_STREAM_BATCH_SIZE,
+        opening_balances: Optional[Dict[Tuple[str, int], float]] = None
+    ) -> Iterator[LedgerTransaction]:
+        """
+        Stream ledger transactions from a single query, fetching batch_size rows at a time.
+        Running balances continue from the balance each account had before filters.start_date.
+        """
+        statement = LedgerService._ledger_statement(organization_id, filters)
+        if statement is None:
+            return
+        if opening_balances is None:
+            opening_balances = LedgerSnapshotService.opening_balances(db, organization_id, filters)
+        zero = Decimal(0)
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for (voucher_id, voucher_type, voucher_number, voucher_date, account_type, account_id, account_name,
+             debit_amount, credit_amount, balance, description, reference, voucher_status) in result:
+            if opening_balances:
+                balance = (balance or 0.0) + opening_balances.get((account_type, account_id), 0.0)
+            # Rows come straight from the database, so skip Pydantic validation
+            yield LedgerTransaction.model_construct(
+                id=voucher_id,
+                voucher_type=voucher_type,
+                voucher_number=voucher_number,
+                date=voucher_date,
+                account_type=account_type,
+                account_id=account_id,
+                account_name=account_name,
+                debit_amount=Decimal(str(debit_amount)) if debit_amount else zero,
+                credit_amount=Decimal(str(credit_amount)) if credit_amount else zero,
+                balance=Decimal(str(round(balance, 2))) if balance else zero,
+                description=description,
+                reference=reference,
+                status=voucher_status
+            )
+    
+    @staticmethod
+    def get_complete_ledger_page(
+        db: Session,
+        organization_id: int,
+        filters: LedgerFilters,
+        cursor: Optional[str] = None,
+        limit: int = LEDGER_PAGE_SIZE
+    ) -> CompleteLedgerPage:
+        """
+        One keyset page of the complete ledger
         
-        # Build base query with tenant filtering
-        query = TenantQueryFilter.apply_organization_filter(
-            db.query(model), model, organization_id
-        )
+        Pages are ordered by (date, voucher type, id) and start after the row encoded in
+        cursor, so deep pages cost the same as the first one. Running balances continue
+        from the balance each account carried into the page.
         
-        # Apply date filters
-        if filters.start_date:
-            query = query.filter(model.date >= filters.start_date)
-        if filters.end_date:
-            query = query.filter(model.date <= filters.end_date)
+        Args:
+            db: Database session
+            organization_id: Organization ID for tenant filtering
+            filters: Ledger filters
+            cursor: next_cursor of the previous page, or None for the first page
+            limit: Maximum transactions on the page
+            
+        Returns:
+            CompleteLedgerPage with transactions, opening balances and the next cursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        position = decode_ledger_cursor(cursor) if cursor else None
+        entries = LedgerService._union_entries(organization_id, filters, after=position, limit=limit + 1)
+        rows = []
+        if entries is not None:
+            rows = db.execute(
+                select(
+                    entries, func.coalesce(Vendor.name, Customer.name, "").label("account_name")
+                ).outerjoin(
+                    Vendor, and_(entries.c.account_type == "vendor", Vendor.id == entries.c.account_id)
+                ).outerjoin(
+                    Customer, and_(entries.c.account_type == "customer", Customer.id == entries.c.account_id)
+                ).order_by(
+                    entries.c.date, entries.c.source_rank, entries.c.id
+                ).limit(limit + 1)
+            ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         
-        # Handle special cases for DebitNote and CreditNote which can have vendor or customer
-        if config["type"] in ["debit_note", "credit_note"]:
-            # For debit/credit notes, we need to check both vendor_id and customer_id
-            if filters.account_type == "vendor":
-                query = query.filter(model.vendor_id.isnot(None))
-            elif filters.account_type == "customer":
-                query = query.filter(model.customer_id.isnot(None))
-                
-            if filters.account_id:
-                if filters.account_type == "vendor":
-                    query = query.filter(model.vendor_id == filters.account_id)
-                elif filters.account_type == "customer":
-                    query = query.filter(model.customer_id == filters.account_id)
-        else:
-            # Regular vouchers with single account type
-            if config["account_relation"]:
-                # Filter by account type
-                if filters.account_type != "all" and filters.account_type != config["account_relation"]:
-                    return []
-                
-                # Filter by specific account ID
-                if filters.account_id:
-                    account_field = getattr(model, config["account_field"])
-                    query = query.filter(account_field == filters.account_id)
+        accounts = list(dict.fromkeys((row.account_type, row.account_id) for row in rows))
+        balances = dict.fromkeys(accounts, 0.0)
+        if accounts:
+            # Carried forward = balance before the start date + the in-range rows before this page
+            for account, balance in LedgerSnapshotService.opening_balances(db, organization_id, filters, accounts).items():
+                balances[account] += balance
+            if position is not None:
+                totals = LedgerService._account_totals(db, organization_id, filters, through=position, accounts=accounts)
+                for account, (balance, _) in totals.items():
+                    balances[account] += balance
+        opening_balances = [
+            LedgerOpeningBalance(
+                account_type=account_type, account_id=account_id,
+                balance=Decimal(str(round(balances[(account_type, account_id)], 2)))
+            )
+            for account_type, account_id in accounts
+        ]
         
-        vouchers = query.all()
+        zero = Decimal(0)
         transactions = []
+        for row in rows:
+            account = (row.account_type, row.account_id)
+            debit_amount = row.debit_amount or 0.0
+            credit_amount = row.credit_amount or 0.0
+            if row.account_type == "vendor":
+                balances[account] += debit_amount - credit_amount
+            else:
+                balances[account] += credit_amount - debit_amount
+            balance = balances[account]
+            transactions.append(LedgerTransaction.model_construct(
+                id=row.id,
+                voucher_type=row.voucher_type,
+                voucher_number=row.voucher_number,
+                date=row.date,
+                account_type=row.account_type,
+                account_id=row.account_id,
+                account_name=row.account_name,
+                debit_amount=Decimal(str(debit_amount)) if debit_amount else zero,
+                credit_amount=Decimal(str(credit_amount)) if credit_amount else zero,
+                balance=Decimal(str(round(balance, 2))) if balance else zero,
+                description=row.description,
+                reference=row.reference,
+                status=row.status
+            ))
         
-        for voucher in vouchers:
-            # Determine account info
-            account_type, account_id, account_name = LedgerService._get_account_info(
-                voucher, config, db
-            )
-            
-            if not account_type:  # Skip if couldn't determine account
-                continue
-            
-            # Calculate debit/credit amounts
-            debit_amount = Decimal(0)
-            credit_amount = Decimal(0)
-            
-            if config["debit_amount_field"]:
-                debit_amount = Decimal(str(getattr(voucher, config["debit_amount_field"], 0) or 0))
-            if config["credit_amount_field"]:
-                credit_amount = Decimal(str(getattr(voucher, config["credit_amount_field"], 0) or 0))
-            
-            transaction = LedgerTransaction(
-                id=voucher.id,
-                voucher_type=config["type"],
-                voucher_number=voucher.voucher_number,
-                date=voucher.date,
-                account_type=account_type,
-                account_id=account_id,
-                account_name=account_name,
-                debit_amount=debit_amount,
-                credit_amount=credit_amount,
-                balance=Decimal(0),  # Will be calculated later
-                description=getattr(voucher, 'notes', '') or getattr(voucher, 'reason', ''),
-                reference=getattr(voucher, 'reference', ''),
-                status=voucher.status
-            )
-            transactions.append(transaction)
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_ledger_cursor((last.date, last.source_rank, last.id))
         
-        return transactions
+        return CompleteLedgerPage(
+            transactions=transactions,
+            opening_balances=opening_balances,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            filters_applied=filters
+        )
+    
+    @staticmethod
+    def _account_totals(
+        db: Session,
+        organization_id: int,
+        filters: LedgerFilters,
+        through: Optional[LedgerPosition] = None,
+        accounts: Optional[List[Tuple[str, int]]] = None
+    ) -> Dict[Tuple[str, int], Tuple[float, int]]:
+        """
+        Balance and transaction count of each account over the filtered ledger, optionally
+        only up to and including position through and only for the given accounts
+        """
+        entries = LedgerService._union_entries(organization_id, filters, through=through)
+        if entries is None:
+            return {}
+        statement = select(
+            entries.c.account_type,
+            entries.c.account_id,
+            func.sum(LedgerService._signed_amount(entries)),
+            func.count()
+        ).group_by(entries.c.account_type, entries.c.account_id)
+        if accounts is not None:
+            statement = statement.where(
+                LedgerService._accounts_condition(entries.c.account_type, entries.c.account_id, accounts)
+            )
+        return {
+            (account_type, account_id): (balance or 0.0, count)
+            for account_type, account_id, balance, count in db.execute(statement)
+        }
     
     @staticmethod
-    def _get_account_info(voucher, config: Dict[str, Any], db: Session) -> Tuple[str, int, str]:
-        """Get account type, ID and name from voucher"""
-        account_type = None
-        account_id = None
-        account_name = ""
+    def _accounts_condition(account_type_column, account_id_column, accounts: List[Tuple[str, int]]):
+        """Restrict rows to the given (account_type, account_id) pairs"""
+        vendor_ids = [account_id for account_type, account_id in accounts if account_type == "vendor"]
+        customer_ids = [account_id for account_type, account_id in accounts if account_type == "customer"]
+        return or_(
+            and_(account_type_column == "vendor", account_id_column.in_(vendor_ids)),
+            and_(account_type_column == "customer", account_id_column.in_(customer_ids))
+        )
+    
+    @staticmethod
+    def _ledger_statement(organization_id: int, filters: LedgerFilters):
+        """
+        One UNION ALL across the voucher tables, joined to vendors/customers for names,
+        with running balances computed by SUM() OVER (PARTITION BY account ORDER BY date, id)
+        """
+        entries = LedgerService._union_entries(organization_id, filters)
+        if entries is None:
+            return None
         
-        if config["type"] in ["debit_note", "credit_note"]:
-            # Check both vendor and customer for debit/credit notes
-            if hasattr(voucher, 'vendor_id') and voucher.vendor_id:
-                account_type = "vendor"
-                account_id = voucher.vendor_id
-                if hasattr(voucher, 'vendor') and voucher.vendor:
-                    account_name = voucher.vendor.name
-            elif hasattr(voucher, 'customer_id') and voucher.customer_id:
-                account_type = "customer"
-                account_id = voucher.customer_id
-                if hasattr(voucher, 'customer') and voucher.customer:
-                    account_name = voucher.customer.name
-        else:
-            # Regular vouchers
-            account_type = config["account_relation"]
-            if config["account_field"]:
-                account_id = getattr(voucher, config["account_field"])
-                
-                # Get account name
-                relation_attr = config["account_relation"]
-                if hasattr(voucher, relation_attr):
-                    account_obj = getattr(voucher, relation_attr)
-                    if account_obj:
-                        account_name = account_obj.name
+        # Voucher type rank keeps same-day vouchers in a stable order across tables
+        ordering = (entries.c.date, entries.c.source_rank, entries.c.id)
+        running_balance = func.sum(LedgerService._signed_amount(entries)).over(
+            partition_by=(entries.c.account_type, entries.c.account_id),
+            order_by=ordering,
+            rows=(None, 0)
+        )
         
-        return account_type, account_id, account_name
+        return select(
+            entries.c.id,
+            entries.c.voucher_type,
+            entries.c.voucher_number,
+            entries.c.date,
+            entries.c.account_type,
+            entries.c.account_id,
+            func.coalesce(Vendor.name, Customer.name, "").label("account_name"),
+            entries.c.debit_amount,
+            entries.c.credit_amount,
+            running_balance.label("balance"),
+            entries.c.description,
+            entries.c.reference,
+            entries.c.status
+        ).outerjoin(
+            Vendor, and_(entries.c.account_type == "vendor", Vendor.id == entries.c.account_id)
+        ).outerjoin(
+            Customer, and_(entries.c.account_type == "customer", Customer.id == entries.c.account_id)
+        ).order_by(*ordering)
+    
+    @staticmethod
+    def _union_entries(
+        organization_id: int,
+        filters: LedgerFilters,
+        after: Optional[LedgerPosition] = None,
+        through: Optional[LedgerPosition] = None,
+        limit: Optional[int] = None
+    ):
+        """
+        UNION ALL of the voucher tables' ledger rows as a subquery, or None if the filters
+        exclude every table. With limit, each table contributes only its first rows in
+        ledger order so every branch can stop early on its (organization_id, date) index.
+        """
+        selects = []
+        for rank, source in enumerate(LEDGER_VOUCHER_SOURCES):
+            statement = LedgerService._voucher_entries(
+                rank, source, organization_id, filters, after=after, through=through
+            )
+            if statement is None:
+                continue
+            if limit is not None:
+                model = source[0]
+                branch = statement.order_by(model.date, model.id).limit(limit).subquery()
+                statement = select(branch)
+            selects.append(statement)
+        if not selects:
+            return None
+        return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery("ledger_entries")
     
     @staticmethod
-    def _calculate_running_balances(transactions: List[LedgerTransaction]) -> List[LedgerTransaction]:
-        """Calculate running balances for transactions"""
-        # Group transactions by account
-        account_balances = {}
+    def _signed_amount(entries):
+        """Vendors: debit increases payable; customers: credit increases receivable"""
+        return case(
+            (entries.c.account_type == "vendor", entries.c.debit_amount - entries.c.credit_amount),
+            else_=entries.c.credit_amount - entries.c.debit_amount
+        )
+    
+    @staticmethod
+    def _keyset_condition(model, rank: int, position: LedgerPosition, after: bool):
+        """
+        (date, source_rank, id) > position (after) or <= position (through), spelled out for
+        one voucher table where source_rank is the constant rank
+        """
+        position_date, position_rank, position_id = position
+        if rank > position_rank:
+            # Same-day rows of this table sort after the position
+            return model.date >= position_date if after else model.date < position_date
+        if rank < position_rank:
+            return model.date > position_date if after else model.date <= position_date
+        if after:
+            return or_(model.date > position_date, and_(model.date == position_date, model.id > position_id))
+        return or_(model.date < position_date, and_(model.date == position_date, model.id <= position_id))
+    
+    @staticmethod
+    def _voucher_entries(
+        rank: int,
+        source: Tuple[Any, str, Optional[str], str],
+        organization_id: int,
+        filters: LedgerFilters,
+        after: Optional[LedgerPosition] = None,
+        through: Optional[LedgerPosition] = None
+    ):
+        """
+        Ledger rows of one voucher table, or None if the filters exclude it. after/through
+        restrict the rows to those past or up to a ledger position.
+        """
+        model, voucher_type, account_relation, side = source
         
-        for transaction in transactions:
-            account_key = (transaction.account_type, transaction.account_id)
-            
-            if account_key not in account_balances:
-                account_balances[account_key] = Decimal(0)
-            
-            # Update balance based on account type and transaction type
-            if transaction.account_type == "vendor":
-                # For vendors: debit increases payable (positive), credit decreases payable (negative)
-                account_balances[account_key] += transaction.debit_amount - transaction.credit_amount
-            else:  # customer
-                # For customers: credit increases receivable (positive), debit decreases receivable (negative)
-                account_balances[account_key] += transaction.credit_amount - transaction.debit_amount
-            
-            transaction.balance = account_balances[account_key]
+        # Skip if filtering by voucher type and this doesn't match
+        if filters.voucher_type not in (None, "all") and filters.voucher_type != voucher_type:
+            return None
+        
+        conditions = [model.organization_id == organization_id]
         
-        return transactions
+        # Apply date filters; the end date includes the whole day
+        if filters.start_date:
+            conditions.append(model.date >= datetime.combine(filters.start_date, time.min))
+        if filters.end_date:
+            conditions.append(model.date < datetime.combine(filters.end_date + timedelta(days=1), time.min))
+        if after is not None:
+            conditions.append(LedgerService._keyset_condition(model, rank, after, after=True))
+        if through is not None:
+            conditions.append(LedgerService._keyset_condition(model, rank, through, after=False))
+        
+        if account_relation is None:
+            # Debit/credit notes carry either a vendor or a customer; the vendor wins when both are set
+            is_vendor = model.vendor_id.isnot(None)
+            account_type = case((is_vendor, literal("vendor")), else_=literal("customer"))
+            account_id = func.coalesce(model.vendor_id, model.customer_id)
+            conditions.append(or_(is_vendor, model.customer_id.isnot(None)))
+            if filters.account_type == "vendor":
+                conditions.append(is_vendor)
+                if filters.account_id:
+                    conditions.append(model.vendor_id == filters.account_id)
+            elif filters.account_type == "customer":
+                conditions.append(model.customer_id.isnot(None))
+                if filters.account_id:
+                    conditions.append(model.customer_id == filters.account_id)
+            description = func.coalesce(func.nullif(model.notes, ""), model.reason)
+        else:
+            # Regular vouchers with single account type
+            if filters.account_type not in (None, "all") and filters.account_type != account_relation:
+                return None
+            account_field = getattr(model, f"{account_relation}_id")
+            account_type = literal(account_relation)
+            account_id = account_field
+            if filters.account_id:
+                conditions.append(account_field == filters.account_id)
+            description = func.coalesce(model.notes, "")
+        
+        amount = func.coalesce(model.total_amount, 0.0)
+        no_amount = literal(0.0)
+        reference = model.reference if "reference" in model.__table__.c else literal("")
+        
+        return select(
+            literal(rank).label("source_rank"),
+            model.id.label("id"),
+            literal(voucher_type).label("voucher_type"),
+            model.voucher_number.label("voucher_number"),
+            model.date.label("date"),
+            account_type.label("account_type"),
+            account_id.label("account_id"),
+            (amount if side == "debit" else no_amount).label("debit_amount"),
+            (amount if side == "credit" else no_amount).label("credit_amount"),
+            description.label("description"),
+            reference.label("reference"),
+            model.status.label("status")
+        ).where(*conditions)
+    
+    @staticmethod
+    def _get_outstanding_balances(
+        db: Session,
+        organization_id: int,
+        filters: LedgerFilters
+    ) -> List[OutstandingBalance]:
+        """Current balances come from the account_balances projection; date or voucher type filtered views are computed from vouchers"""
+        if settings.LEDGER_BALANCE_PROJECTION_ENABLED and AccountBalanceService.covers(filters):
+            return AccountBalanceService.get_outstanding_balances(db, organization_id, filters)
+        return LedgerService._calculate_outstanding_balances(db, organization_id, filters)
     
     @staticmethod
     def _calculate_outstanding_balances(
@@ -355,13 +721,15 @@ class LedgerService:
         filters: LedgerFilters
     ) -> List[OutstandingBalance]:
         """Calculate outstanding balances for all accounts"""
-        # Get all transactions to calculate balances
-        all_transactions = LedgerService._get_all_transactions(db, organization_id, filters)
+        # Get all transactions to calculate balances; only their amounts are summed, so no opening balances
+        all_transactions = LedgerService._get_all_transactions(db, organization_id, filters, opening_balances={})
         
         # Group by account and calculate final balances
         account_data = {}
         
         for transaction in all_transactions:
+            if transaction.status in LEDGER_EXCLUDED_STATUSES:
+                continue
             account_key = (transaction.account_type, transaction.account_id)
             
             if account_key not in account_data:
@@ -388,23 +756,12 @@ class LedgerService:
                 account_data[account_key]["last_transaction_date"] = transaction.date
             account_data[account_key]["transaction_count"] += 1
         
-        # Get contact information
+        # Get contact information for all accounts at once
+        resolved = resolve_accounts(db, account_data.keys(), organization_id)
         for account_key, data in account_data.items():
-            account_type, account_id = account_key
-            if account_type == "vendor":
-                vendor = db.query(Vendor).filter(
-                    Vendor.id == account_id,
-                    Vendor.organization_id == organization_id
-                ).first()
-                if vendor:
-                    data["contact_info"] = vendor.contact_number
-            else:  # customer
-                customer = db.query(Customer).filter(
-                    Customer.id == account_id,
-                    Customer.organization_id == organization_id
-                ).first()
-                if customer:
-                    data["contact_info"] = customer.contact_number
+            account = resolved.get(account_key)
+            if account:
+                data["contact_info"] = account.contact_number
         
         # Convert to response objects
         outstanding_balances = []
@@ -0,0 +1,254 @@
+# app/services/ledger_snapshot_service.py
+
+"""
+Period-close balance snapshots for the complete ledger.
+
+`account_balance_snapshots` holds, for every closed month, the running balance
+and voucher count of each vendor/customer account with ledger history up to
+the month end (the fiscal year close is the March snapshot). A complete ledger
+filtered from `start_date` opens every account with the latest snapshot before
+the start date plus the vouchers between that snapshot and the start date, so
+the cost of a date-filtered ledger follows the requested range rather than the
+account's whole history.
+
+Snapshots are generated by `LedgerSnapshotService.generate`, run periodically
+in the background by the API (LEDGER_SNAPSHOT_INTERVAL_HOURS) and on demand by
+scripts/generate_ledger_snapshots.py. Saving, editing or deleting a voucher
+dated inside a closed month drops that organization's snapshots from that
+month on; until the next run, openings fall back to an earlier snapshot.
+Bulk `Query.update()` / `Query.delete()` and raw SQL bypass this; regenerate
+with `--rebuild` after such changes.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.base import Organization
+from app.models.vouchers import AccountBalanceSnapshot
+from app.schemas.ledger import LedgerFilters
+from app.services.account_balance_service import LEDGER_SOURCES
+import logging
+
+logger = logging.getLogger(__name__)
+
+_LEDGER_MODELS = tuple(model for model, _, _ in LEDGER_SOURCES)
+_TRACKED_ATTRIBUTES = ("organization_id", "date", "total_amount", "vendor_id", "customer_id", "vendor", "customer")
+_PENDING_KEY = "ledger_snapshot_stale_from"
+
+Account = Tuple[str, int]
+
+
+def _month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def _last_closed_month_end(today: Optional[date] = None) -> date:
+    return (today or date.today()).replace(day=1) - timedelta(days=1)
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_backdated_changes(session, flush_context, instances):
+    session.info.pop(_PENDING_KEY, None)
+    last_close = None
+    stale_from: Dict[int, date] = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, _LEDGER_MODELS):
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and obj not in session.deleted and not any(
+            name in state.mapper.attrs and state.attrs[name].history.has_changes() for name in _TRACKED_ATTRIBUTES
+        ):
+            continue
+        if last_close is None:
+            last_close = _last_closed_month_end()
+        # Load expired attributes so their history holds the stored values
+        obj.organization_id, obj.date
+        # Old and new values, so moving a voucher out of a closed month also counts
+        organizations = [value for value in state.attrs.organization_id.history.sum() if value is not None]
+        dates = [_as_date(value) for value in state.attrs.date.history.sum() if value is not None]
+        earliest = min(dates, default=date.min)
+        if earliest > last_close:
+            continue  # Snapshots only exist for closed months
+        for organization_id in organizations:
+            if organization_id not in stale_from or earliest < stale_from[organization_id]:
+                stale_from[organization_id] = earliest
+    if stale_from:
+        session.info[_PENDING_KEY] = stale_from
+
+
+@event.listens_for(Session, "after_flush")
+def _drop_stale_snapshots(session, flush_context):
+    stale_from = session.info.pop(_PENDING_KEY, None)
+    if not stale_from:
+        return
+    table = AccountBalanceSnapshot.__table__
+    connection = session.connection()
+    for organization_id, earliest in stale_from.items():
+        connection.execute(delete(table).where(
+            table.c.organization_id == organization_id,
+            table.c.period_end >= earliest
+        ))
+
+
+class LedgerSnapshotService:
+    """Generate period-close balance snapshots and derive ledger opening balances from them"""
+
+    @staticmethod
+    def opening_balances(
+        db: Session,
+        organization_id: int,
+        filters: LedgerFilters,
+        accounts: Optional[List[Account]] = None
+    ) -> Dict[Account, float]:
+        """
+        Balance each account carried into filters.start_date: the latest snapshot before the
+        start date plus the filtered vouchers after it. Empty when there is no start date.
+        """
+        if not filters.start_date:
+            return {}
+        from app.services.ledger_service import LedgerService
+
+        before = filters.start_date - timedelta(days=1)
+        balances: Dict[Account, float] = {}
+        gap_start = None
+        # Snapshots hold whole-account balances, so they only apply across all voucher types
+        if filters.voucher_type in (None, "all"):
+            table = AccountBalanceSnapshot.__table__
+            period_end = db.scalar(select(func.max(table.c.period_end)).where(
+                table.c.organization_id == organization_id,
+                table.c.period_end <= before
+            ))
+            if period_end is not None:
+                statement = select(table.c.account_type, table.c.account_id, table.c.balance).where(
+                    table.c.organization_id == organization_id,
+                    table.c.period_end == period_end
+                )
+                if filters.account_type not in (None, "all"):
+                    statement = statement.where(table.c.account_type == filters.account_type)
+                if filters.account_id:
+                    statement = statement.where(table.c.account_id == filters.account_id)
+                if accounts is not None:
+                    statement = statement.where(
+                        LedgerService._accounts_condition(table.c.account_type, table.c.account_id, accounts)
+                    )
+                balances = {
+                    (account_type, account_id): balance
+                    for account_type, account_id, balance in db.execute(statement)
+                }
+                gap_start = period_end + timedelta(days=1)
+
+        if gap_start is None or gap_start <= before:
+            gap_filters = filters.model_copy(update={"start_date": gap_start, "end_date": before})
+            totals = LedgerService._account_totals(db, organization_id, gap_filters, accounts=accounts)
+            for account, (amount, _) in totals.items():
+                balances[account] = balances.get(account, 0.0) + amount
+        return balances
+
+    @staticmethod
+    def generate(
+        db: Session,
+        organization_id: Optional[int] = None,
+        today: Optional[date] = None,
+        rebuild: bool = False
+    ) -> int:
+        """
+        Create the missing month-end snapshots up to the last month closed before today.
+        With rebuild, existing snapshots are dropped and regenerated. Returns the rows
+        written; the caller commits.
+        """
+        table = AccountBalanceSnapshot.__table__
+        last_close = _last_closed_month_end(today)
+        if organization_id is not None:
+            organization_ids = [organization_id]
+        else:
+            organization_ids = db.scalars(select(Organization.id).order_by(Organization.id)).all()
+
+        written = 0
+        for org_id in organization_ids:
+            if rebuild:
+                db.execute(delete(table).where(table.c.organization_id == org_id))
+            written += LedgerSnapshotService._generate_for_organization(db, org_id, last_close)
+        return written
+
+    @staticmethod
+    def _generate_for_organization(db: Session, organization_id: int, last_close: date) -> int:
+        """Roll the latest snapshot forward month by month, one grouped query per month"""
+        from app.services.ledger_service import LedgerService
+
+        table = AccountBalanceSnapshot.__table__
+        latest = db.scalar(select(func.max(table.c.period_end)).where(table.c.organization_id == organization_id))
+        balances: Dict[Account, Tuple[float, int]] = {}
+        if latest is not None:
+            rows = db.execute(
+                select(table.c.account_type, table.c.account_id, table.c.balance, table.c.transaction_count).where(
+                    table.c.organization_id == organization_id,
+                    table.c.period_end == latest
+                )
+            )
+            balances = {(account_type, account_id): (balance, count) for account_type, account_id, balance, count in rows}
+            period_start = latest + timedelta(days=1)
+        else:
+            entries = LedgerService._union_entries(organization_id, LedgerFilters())
+            first = db.scalar(select(func.min(entries.c.date))) if entries is not None else None
+            if first is None:
+                return 0
+            period_start = _as_date(first).replace(day=1)
+
+        written = 0
+        while period_start <= last_close:
+            period_end = _month_end(period_start)
+            totals = LedgerService._account_totals(
+                db, organization_id, LedgerFilters(start_date=period_start, end_date=period_end)
+            )
+            for account, (amount, count) in totals.items():
+                balance, transaction_count = balances.get(account, (0.0, 0))
+                balances[account] = (balance + amount, transaction_count + count)
+            if balances:
+                db.execute(insert(table), [
+                    {
+                        "organization_id": organization_id,
+                        "account_type": account_type,
+                        "account_id": account_id,
+                        "period_end": period_end,
+                        "balance": balance,
+                        "transaction_count": transaction_count,
+                    }
+                    for (account_type, account_id), (balance, transaction_count) in balances.items()
+                ])
+                written += len(balances)
+            period_start = period_end + timedelta(days=1)
+
+        if written:
+            logger.info(f"Generated {written} ledger snapshot rows for organization {organization_id} through {last_close}")
+        return written
+
+
+async def run_snapshot_job(session_factory: Callable[[], Session], interval_seconds: float) -> None:
+    """Background loop: generate missing snapshots for every organization, then sleep"""
+    def generate_all() -> int:
+        db = session_factory()
+        try:
+            written = LedgerSnapshotService.generate(db)
+            db.commit()
+            return written
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    while True:
+        try:
+            await asyncio.to_thread(generate_all)
+        except Exception as e:
+            logger.error(f"Ledger snapshot job failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,138 @@
+# app/services/master_import_service.py
+
+"""
+Import of validated product, customer and vendor rows.
+
+Each call imports one batch validated by the template's ImportSchema (see
+ExcelService.iter_import_batches): records are matched to existing masters of the
+organization by name and updated, or created. Runs in the caller's transaction, so
+the import endpoints and background import jobs decide when a batch is committed.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import List, Type, Union
+
+from sqlalchemy.orm import Session
+
+from app.models.base import Customer, Product, Stock, Vendor
+from app.utils.import_validation import ImportValidationResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MasterImportResult:
+    """Outcome of importing a batch; errors are "Row N: ..." messages"""
+    created: int = 0
+    updated: int = 0
+    created_stocks: int = 0
+    updated_stocks: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class MasterImportService:
+    """Create or update masters from validated import rows"""
+
+    @staticmethod
+    def import_parties(
+        db: Session,
+        organization_id: int,
+        model: Union[Type[Customer], Type[Vendor]],
+        validation: ImportValidationResult
+    ) -> MasterImportResult:
+        """Import customer or vendor rows; rows failing validation are reported with their errors"""
+        result = MasterImportResult(errors=validation.messages)
+        label = model.__name__.lower()
+        for party_data in validation.records():
+            i = party_data.pop("_row")
+            try:
+                # Check if the party already exists
+                existing_party = db.query(model).filter(
+                    model.name == party_data["name"],
+                    model.organization_id == organization_id
+                ).first()
+
+                if existing_party:
+                    for field_name, value in party_data.items():
+                        setattr(existing_party, field_name, value)
+                    result.updated += 1
+                    logger.info(f"Updated {label}: {party_data['name']}")
+                else:
+                    db.add(model(organization_id=organization_id, **party_data))
+                    result.created += 1
+                    logger.info(f"Created {label}: {party_data['name']}")
+
+            except Exception as e:
+                result.errors.append(f"Row {i}: Error processing record - {str(e)}")
+                continue
+        return result
+
+    @staticmethod
+    def import_products(db: Session, organization_id: int, validation: ImportValidationResult) -> MasterImportResult:
+        """Import product rows, creating or updating the product's stock from the optional initial stock columns"""
+        result = MasterImportResult(errors=validation.messages)
+        for product_data in validation.records():
+            i = product_data.pop("_row")
+            # Optional initial stock columns
+            initial_quantity = product_data.pop("initial_quantity")
+            initial_location = product_data.pop("initial_location") or ""
+            try:
+                # Check if product already exists
+                existing_product = db.query(Product).filter(
+                    Product.name == product_data["name"],
+                    Product.organization_id == organization_id
+                ).first()
+
+                if existing_product:
+                    # Update existing product
+                    for field_name, value in product_data.items():
+                        setattr(existing_product, field_name, value)
+                    result.updated += 1
+                    product = existing_product
+                    logger.info(f"Updated product: {product_data['name']}")
+                else:
+                    # Create new product
+                    product = Product(organization_id=organization_id, **product_data)
+                    db.add(product)
+                    db.flush()  # Get the new product ID
+                    result.created += 1
+                    logger.info(f"Created product: {product_data['name']}")
+
+                # Only create/update stock if initial_quantity is provided or if it's a new product
+                if initial_quantity is not None or not existing_product:
+                    quantity = initial_quantity if initial_quantity is not None else 0.0
+
+                    # Check if stock entry exists for this product
+                    existing_stock = db.query(Stock).filter(
+                        Stock.product_id == product.id,
+                        Stock.organization_id == organization_id
+                    ).first()
+
+                    if existing_stock:
+                        # Update existing stock only if initial_quantity was provided
+                        if initial_quantity is not None:
+                            existing_stock.quantity = quantity
+                            existing_stock.unit = product_data["unit"]
+                            if initial_location:
+                                existing_stock.location = initial_location
+                            result.updated_stocks += 1
+                            logger.info(f"Updated stock for product: {product_data['name']}")
+                    else:
+                        db.add(Stock(
+                            organization_id=organization_id,
+                            product_id=product.id,
+                            quantity=quantity,
+                            unit=product_data["unit"],
+                            location=initial_location or "Default"
+                        ))
+                        result.created_stocks += 1
+                        logger.info(f"Created stock entry for product: {product_data['name']} with quantity: {quantity}")
+
+            except (ValueError, TypeError) as e:
+                result.errors.append(f"Row {i}: Invalid data format - {str(e)}")
+                continue
+            except Exception as e:
+                result.errors.append(f"Row {i}: Error processing record - {str(e)}")
+                continue
+        return result
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from typing import Dict, Any
 from app.models.base import (
     Organization, User, Company, Product, Customer, Vendor, 
-    Stock, EmailNotification, PaymentTerm, OTPVerification, AuditLog
+    Stock, StockMovement, EmailNotification, PaymentTerm, OTPVerification, AuditLog
 )
 import logging
 
@@ -38,7 +38,9 @@ class ResetService:
             deleted_notifications = db.query(EmailNotification).delete()
             result["deleted"]["email_notifications"] = deleted_notifications
             
-            # Delete all stock entries
+            # Delete all stock movements and entries
+            deleted_movements = db.query(StockMovement).delete()
+            result["deleted"]["stock_movements"] = deleted_movements
             deleted_stock = db.query(Stock).delete()
             result["deleted"]["stock"] = deleted_stock
             
@@ -120,7 +122,11 @@ class ResetService:
             ).delete()
             result["deleted"]["email_notifications"] = deleted_notifications
             
-            # Delete all stock entries for this org
+            # Delete all stock movements and entries for this org
+            deleted_movements = db.query(StockMovement).filter(
+                StockMovement.organization_id == organization_id
+            ).delete()
+            result["deleted"]["stock_movements"] = deleted_movements
             deleted_stock = db.query(Stock).filter(
                 Stock.organization_id == organization_id
             ).delete()
@@ -0,0 +1,362 @@
+# app/services/stock_import_service.py
+
+"""
+Set-based stock import.
+
+The imported sheet is validated with the stock template's ImportSchema (batch by
+batch when it is streamed from the upload), product names are resolved to ids
+(compared case-insensitively) with one `IN` query, or one scan of the
+organization's products for batches naming more than STOCK_IMPORT_CHUNK_SIZE
+products, missing products are inserted in multi-row INSERTs, and stock is
+written with `INSERT ... ON CONFLICT` on uq_stock_org_product_location, so the
+number of statements grows with the number of chunks rather than the number of
+rows.
+
+Stock entries are keyed by product and location: a row for a location the product
+has no stock at yet creates a new entry. Several rows for the same product and
+location are combined (summed in "add" mode, last row wins in "replace" mode).
+The statements bypass the ORM flush listeners, so the changes are recorded in the
+stock movement ledger as "import" movements of the difference they made, and
+the dashboard counters of the organization are recomputed afterwards.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+from sqlalchemy import func, insert, select, update, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.base import Product, Stock
+from app.schemas.stock import BulkImportError
+from app.services.dashboard_counter_service import DashboardCounterService
+from app.services.excel_service import StockExcelService
+from app.services.stock_ledger_service import StockLedgerService
+from app.utils.import_validation import ImportValidationResult
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT/upsert statement and names or ids per IN list
+STOCK_IMPORT_CHUNK_SIZE = 1000
+
+STOCK_IMPORT_MODES = ("add", "replace")
+
+# Warnings kept in a StockImportResult; the rest are only counted
+STOCK_IMPORT_MAX_WARNINGS = 1000
+
+
+@dataclass
+class StockImportResult:
+    """Outcome of a stock import; row numbers count data rows from 1"""
+    total_processed: int = 0
+    created_products: int = 0
+    created_stocks: int = 0
+    updated_stocks: int = 0
+    skipped: int = 0
+    detailed_errors: List[BulkImportError] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ProductIndex:
+    """Product ids by lower-cased name, kept across the batches of one import"""
+    ids: Dict[str, int] = field(default_factory=dict)
+    # Set once every product of the organization has been read, so unknown names are new products
+    complete: bool = False
+
+
+def _chunks(values: List[Any], size: int = STOCK_IMPORT_CHUNK_SIZE) -> Iterable[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class StockImportService:
+    """Import stock rows (parsed from the stock import template) in set-based statements"""
+
+    @staticmethod
+    def import_rows(
+        db: Session,
+        organization_id: int,
+        rows: Union[pd.DataFrame, List[Dict[str, Any]]],
+        mode: str = "replace"
+    ) -> StockImportResult:
+        """
+        Validate rows, create missing products and create or update stock entries.
+
+        rows use the normalized template column names (product_name, quantity, unit,
+        hsn_code, part_number, unit_price, gst_rate, reorder_level, location). Runs in
+        the caller's transaction; commit to publish.
+        """
+        if mode not in STOCK_IMPORT_MODES:
+            raise ValueError(f"Invalid mode: {mode}")
+        batches = [StockExcelService.IMPORT_SCHEMA.validate(rows)]
+        return StockImportService.import_batches(db, organization_id, batches, mode, commit=False)
+
+    @staticmethod
+    def import_batches(
+        db: Session,
+        organization_id: int,
+        batches: Iterable[ImportValidationResult],
+        mode: str = "replace",
+        commit: bool = True
+    ) -> StockImportResult:
+        """
+        Import validated batches of a sheet (see StockExcelService.iter_import_batches) one after the other.
+
+        With commit set every batch is committed as soon as it is written, so a long sheet is
+        imported while it is still being read and a failing batch leaves the earlier ones in place.
+        Product ids resolved for one batch are reused by the following ones. Warnings beyond
+        STOCK_IMPORT_MAX_WARNINGS are counted rather than kept.
+        """
+        if mode not in STOCK_IMPORT_MODES:
+            raise ValueError(f"Invalid mode: {mode}")
+        result = StockImportResult()
+        products = ProductIndex()
+        omitted_warnings = 0
+        for validation in batches:
+            StockImportService.import_batch(db, organization_id, validation, mode, products, result)
+            if len(result.warnings) > STOCK_IMPORT_MAX_WARNINGS:
+                omitted_warnings += len(result.warnings) - STOCK_IMPORT_MAX_WARNINGS
+                del result.warnings[STOCK_IMPORT_MAX_WARNINGS:]
+            if commit:
+                db.commit()
+
+        if omitted_warnings:
+            result.warnings.append(f"... and {omitted_warnings} more warnings")
+        result.errors = [f"Row {error.row}: {error.error}" for error in result.detailed_errors]
+        if result.created_products or result.created_stocks or result.updated_stocks:
+            DashboardCounterService.recompute(db, organization_id)
+            if commit:
+                db.commit()
+        return result
+
+    @staticmethod
+    def import_batch(
+        db: Session,
+        organization_id: int,
+        validation: ImportValidationResult,
+        mode: str,
+        products: ProductIndex,
+        result: StockImportResult
+    ) -> None:
+        """
+        Import one validated batch into result, in the caller's transaction.
+
+        products carries the resolved product ids from one batch of an import to the next;
+        result.errors is left to the caller (import_batches fills it at the end).
+        """
+        result.total_processed += validation.total
+        result.warnings.extend(validation.warnings)
+        errors = list(validation.errors)
+        frame = validation.rows
+        if not frame.empty:
+            frame["name_key"] = frame["product_name"].str.lower()
+            product_ids = StockImportService._resolve_products(
+                db, organization_id, frame["name_key"].unique().tolist(), products
+            )
+            frame = StockImportService._create_products(db, organization_id, frame, product_ids, errors, result)
+            frame["product_id"] = frame["name_key"].map(product_ids)
+            StockImportService._write_stock(db, organization_id, frame, mode, result)
+
+        # Batches arrive in sheet order, so sorting each batch keeps the whole list sorted
+        errors.sort(key=lambda error: error.row)
+        result.detailed_errors.extend(errors)
+        result.skipped += validation.total - len(frame)
+
+    @staticmethod
+    def _resolve_products(
+        db: Session,
+        organization_id: int,
+        name_keys: List[str],
+        products: Optional[ProductIndex] = None
+    ) -> Dict[str, int]:
+        """Lower-cased product name -> id (the oldest product when names differ only in case)"""
+        products = products if products is not None else ProductIndex()
+        product_ids = products.ids
+        name_keys = [key for key in name_keys if key not in product_ids]
+        if not name_keys or products.complete:
+            return product_ids
+        name_key = func.lower(Product.name)
+        statement = select(name_key, Product.id).where(Product.organization_id == organization_id).order_by(Product.id)
+        if len(name_keys) <= STOCK_IMPORT_CHUNK_SIZE:
+            rows = db.execute(statement.where(name_key.in_(name_keys)))
+        else:
+            # lower(name) cannot use the name index, so every IN list would scan the organization's
+            # products; one scan of (name, id) pairs is cheaper than a scan per chunk, and once
+            # all of them are known the following batches need no lookups at all
+            rows = db.execute(statement)
+            products.complete = True
+        for key, product_id in rows:
+            product_ids.setdefault(key, product_id)
+        return product_ids
+
+    @staticmethod
+    def _created_product_ids(db: Session, organization_id: int, names: List[str]) -> Dict[str, int]:
+        """Ids of products just inserted under their exact names (uses the name index)"""
+        product_ids: Dict[str, int] = {}
+        for chunk in _chunks(names):
+            statement = select(Product.name, Product.id).where(
+                Product.organization_id == organization_id, Product.name.in_(chunk)
+            )
+            product_ids.update((name.lower(), product_id) for name, product_id in db.execute(statement))
+        return product_ids
+
+    @staticmethod
+    def _create_products(
+        db: Session,
+        organization_id: int,
+        frame: pd.DataFrame,
+        product_ids: Dict[str, int],
+        errors: List[BulkImportError],
+        result: StockImportResult
+    ) -> pd.DataFrame:
+        """
+        Insert the products named in the sheet that do not exist yet, using their first row.
+
+        Returns the rows left to import: rows of products that could not be created are reported and dropped.
+        """
+        new = frame[~frame["name_key"].isin(product_ids.keys())].drop_duplicates("name_key")
+        if new.empty:
+            return frame
+
+        # Part numbers are unique per organization
+        part_numbers = new["part_number"].dropna()
+        taken = set()
+        for chunk in _chunks(part_numbers.unique().tolist()):
+            taken.update(db.execute(select(Product.part_number).where(
+                Product.organization_id == organization_id, Product.part_number.in_(chunk)
+            )).scalars())
+        conflicting = new["part_number"].isin(taken) | (
+            new["part_number"].notna() & new["part_number"].duplicated(keep="first")
+        )
+        if conflicting.any():
+            failed = frame["name_key"].isin(set(new.loc[conflicting, "name_key"]))
+            errors.extend(
+                BulkImportError(
+                    row=row, field="product_creation", value=name,
+                    error="Invalid product data - part number already exists", error_code="PRODUCT_CREATION_FAILED"
+                )
+                for row, name in zip(frame.loc[failed, "_row"].tolist(), frame.loc[failed, "product_name"])
+            )
+            frame = frame[~failed]
+            new = new[~conflicting]
+            if new.empty:
+                return frame
+
+        columns = ["product_name", "hsn_code", "part_number", "unit", "unit_price", "gst_rate", "reorder_level"]
+        records = [
+            {
+                "organization_id": organization_id,
+                "name": name,
+                "hsn_code": hsn_code,
+                "part_number": part_number,
+                "unit": unit,
+                "unit_price": float(unit_price),
+                "gst_rate": float(gst_rate),
+                "reorder_level": int(reorder_level),
+                "is_active": True,
+            }
+            for name, hsn_code, part_number, unit, unit_price, gst_rate, reorder_level
+            in new[columns].itertuples(index=False)
+        ]
+        for chunk in _chunks(records):
+            db.execute(insert(Product.__table__), chunk)
+        product_ids.update(StockImportService._created_product_ids(db, organization_id, new["product_name"].tolist()))
+        result.created_products += len(records)
+        logger.info(f"Created {len(records)} products from stock import for org {organization_id}")
+        return frame
+
+    @staticmethod
+    def _write_stock(
+        db: Session,
+        organization_id: int,
+        valid: pd.DataFrame,
+        mode: str,
+        result: StockImportResult
+    ) -> None:
+        if valid.empty:
+            return
+        # One entry per product and location: quantities are summed when adding, the last row wins when replacing
+        grouped = valid.groupby(["product_id", "location"], sort=False)
+        entries = grouped.agg(
+            quantity=("quantity", "sum" if mode == "add" else "last"),
+            unit=("unit", "last"),
+            product_name=("product_name", "last"),
+            row=("_row", "last"),
+        ).reset_index()
+
+        # Existing entries, keyed like the sheet (a NULL location matches an empty cell)
+        existing: Dict[Tuple[int, str], Tuple[int, float, Optional[str]]] = {}
+        for chunk in _chunks([int(product_id) for product_id in entries["product_id"].unique()]):
+            statement = select(Stock.id, Stock.product_id, Stock.location, Stock.quantity).where(
+                Stock.organization_id == organization_id, Stock.product_id.in_(chunk)
+            ).order_by(Stock.id)
+            for stock_id, product_id, location, quantity in db.execute(statement):
+                existing.setdefault((product_id, (location or "").strip()), (stock_id, quantity, location))
+
+        upserts: List[Dict[str, Any]] = []
+        null_location_updates: List[Dict[str, Any]] = []
+        for product_id, location, quantity, unit, product_name, row in entries.itertuples(index=False):
+            product_id, quantity = int(product_id), float(quantity)
+            match = existing.get((product_id, location))
+            if match is None:
+                result.created_stocks += 1
+            else:
+                result.updated_stocks += 1
+                stock_id, old_quantity, stored_location = match
+                new_quantity = old_quantity + quantity if mode == "add" else quantity
+                if old_quantity != new_quantity:
+                    result.warnings.append(
+                        f"Row {row}: Updated stock for '{product_name}' from {old_quantity} to {new_quantity} (mode: {mode})"
+                    )
+                if stored_location is None:
+                    # NULL never conflicts in the unique constraint, so these are updated by id
+                    null_location_updates.append({"stock_id": stock_id, "delta": quantity, "unit": unit})
+                    continue
+                location = stored_location
+            upserts.append({
+                "organization_id": organization_id, "product_id": product_id,
+                "location": location, "quantity": quantity, "unit": unit,
+            })
+
+        table = Stock.__table__
+        if null_location_updates:
+            new_quantity = table.c.quantity + bindparam("delta") if mode == "add" else bindparam("delta")
+            db.execute(
+                update(table).where(table.c.id == bindparam("stock_id")).values(
+                    quantity=new_quantity, unit=bindparam("unit"), last_updated=func.now()
+                ).execution_options(synchronize_session=False),
+                null_location_updates
+            )
+        for chunk in _chunks(upserts):
+            StockImportService._upsert_stock(db, chunk, mode)
+        # The upserts hold the entries' row locks, so the difference to the ledger is what they changed
+        StockLedgerService.record_differences(
+            db, organization_id, "import", [int(product_id) for product_id in entries["product_id"].unique()]
+        )
+
+    @staticmethod
+    def _upsert_stock(db: Session, rows: List[Dict[str, Any]], mode: str) -> None:
+        table = Stock.__table__
+        connection = db.connection()
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(connection.dialect.name)
+        if dialect_insert is not None:
+            statement = dialect_insert(table)
+            quantity = table.c.quantity + statement.excluded.quantity if mode == "add" else statement.excluded.quantity
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=["organization_id", "product_id", "location"],
+                set_={"quantity": quantity, "unit": statement.excluded.unit, "last_updated": func.now()},
+            ), rows)
+            return
+        for row in rows:
+            quantity = table.c.quantity + row["quantity"] if mode == "add" else row["quantity"]
+            updated = connection.execute(update(table).where(
+                table.c.organization_id == row["organization_id"],
+                table.c.product_id == row["product_id"],
+                table.c.location == row["location"],
+            ).values(quantity=quantity, unit=row["unit"], last_updated=func.now()))
+            if updated.rowcount == 0:
+                connection.execute(insert(table).values(**row))
@@ -0,0 +1,370 @@
+# app/services/stock_ledger_service.py
+
+"""
+Stock movement ledger.
+
+Stock entries (a product's balance at one location) change by appending a
+StockMovement and applying its quantity_change in one atomic statement in the
+caller's transaction:
+
+    UPDATE stock SET quantity = quantity + :change
+    WHERE id = :entry [AND quantity + :change >= 0]
+    RETURNING quantity
+
+The UPDATE holds the entry's row lock until commit, so concurrent issues of one
+product queue on the row instead of overwriting each other's read-modify-write,
+an issue never takes a balance below zero, and every movement records the exact
+balance it produced. Setting an absolute quantity locks the entry with a no-op
+UPDATE first and records the difference.
+
+Writers that still assign Stock.quantity through the ORM are recorded by mapper
+listeners ("opening" for new entries, "correction" for changes), and set-based
+imports append "import" movements for the difference they made, so an entry's
+quantity equals the sum of its movements. `StockLedgerService.reconcile`
+reports entries where it does not (raw SQL, restores, writers that bypass the
+session); it is run periodically by the API (STOCK_RECONCILE_INTERVAL_HOURS)
+and on demand by scripts/reconcile_stock.py, which can record the differences
+as "reconciliation" movements.
+
+Movements applied with Core statements bypass the dashboard counter listeners.
+Each one compares the entry's balance before and after with its product's
+reorder level, and the resulting +1/-1 low-stock changes are added to the
+organizations' counters just before the session commits, after all stock rows
+of the transaction are locked.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event, func, insert, inspect, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from app.models.base import Product, Stock, StockMovement
+from app.services.dashboard_counter_service import DashboardCounterService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Differences up to this are float rounding, not drift
+STOCK_LEDGER_TOLERANCE = 1e-6
+# Product ids per IN list when recording import differences
+STOCK_LEDGER_CHUNK_SIZE = 500
+
+_LOW_STOCK_KEY = "stock_ledger_low_stock"
+
+
+class InsufficientStockError(ValueError):
+    """Raised when an issue would take a stock balance below zero"""
+
+    def __init__(self, available: float, requested: float):
+        self.available = available
+        self.requested = requested
+        super().__init__(f"Insufficient stock. Current: {available}, Requested: {requested}")
+
+
+def _entry_id(organization_id: int, product_id: int, location: Optional[str]):
+    """The product's stock entry at location; with no location, its first entry"""
+    table = Stock.__table__
+    criteria = [table.c.organization_id == organization_id, table.c.product_id == product_id]
+    if location is not None:
+        criteria.append(table.c.location == location)
+    return select(func.min(table.c.id)).where(*criteria).scalar_subquery()
+
+
+def _low_stock_threshold():
+    """Reorder level of the moved entry's product, NULL when the product is inactive"""
+    table, product = Stock.__table__, Product.__table__
+    return select(product.c.reorder_level).where(
+        product.c.id == table.c.product_id, product.c.is_active == True
+    ).scalar_subquery()
+
+
+def _is_low(quantity: Optional[float], reorder_level: Optional[float]) -> bool:
+    return quantity is not None and reorder_level is not None and quantity <= reorder_level
+
+
+def _add_low_stock_change(
+    db: Session, organization_id: int, reorder_level: Optional[float], before: Optional[float], after: float
+) -> None:
+    # before is None for an entry created by this movement
+    change = int(_is_low(after, reorder_level)) - int(_is_low(before, reorder_level))
+    if change:
+        changes = db.info.setdefault(_LOW_STOCK_KEY, {})
+        changes[organization_id] = changes.get(organization_id, 0) + change
+
+
+def _sync_loaded(db: Session, stock_id: int, quantity: float) -> None:
+    # Stock loaded in the session would otherwise keep its old quantity until expired
+    stock = db.identity_map.get(identity_key(Stock, stock_id))
+    if stock is not None:
+        set_committed_value(stock, "quantity", quantity)
+
+
+def _ledger_totals(organization_id: Optional[int]):
+    movements = StockMovement.__table__
+    totals = select(movements.c.stock_id, func.sum(movements.c.quantity_change).label("quantity"))
+    if organization_id is not None:
+        totals = totals.where(movements.c.organization_id == organization_id)
+    return totals.group_by(movements.c.stock_id).subquery()
+
+
+def _differences_select(organization_id: Optional[int], product_ids: Optional[List[int]] = None):
+    """Stock entries whose quantity differs from the sum of their movements"""
+    stock = Stock.__table__
+    totals = _ledger_totals(organization_id)
+    ledger_quantity = func.coalesce(totals.c.quantity, 0.0)
+    statement = select(
+        stock.c.organization_id, stock.c.id.label("stock_id"), stock.c.product_id, stock.c.location,
+        stock.c.quantity, ledger_quantity.label("ledger_quantity"),
+        (stock.c.quantity - ledger_quantity).label("difference"),
+    ).select_from(stock.outerjoin(totals, totals.c.stock_id == stock.c.id)).where(
+        func.abs(stock.c.quantity - ledger_quantity) > STOCK_LEDGER_TOLERANCE
+    )
+    if organization_id is not None:
+        statement = statement.where(stock.c.organization_id == organization_id)
+    if product_ids is not None:
+        statement = statement.where(stock.c.product_id.in_(product_ids))
+    return statement.order_by(stock.c.id)
+
+
+class StockLedgerService:
+    """Move stock through the movement ledger, read per-location balances and reconcile"""
+
+    @staticmethod
+    def apply_movement(
+        db: Session,
+        organization_id: int,
+        product_id: int,
+        quantity_change: float,
+        movement_type: str,
+        location: Optional[str] = None,
+        unit: Optional[str] = None,
+        allow_negative: bool = False,
+        create: bool = True,
+        reference_type: Optional[str] = None,
+        reference_id: Optional[int] = None,
+        notes: Optional[str] = None,
+        user_id: Optional[int] = None
+    ) -> Optional[StockMovement]:
+        """
+        Add quantity_change to the product's stock entry at location (its first entry when location
+        is None) and record the movement, in the caller's transaction; the caller commits.
+
+        A missing entry is created at zero, or nothing is moved and None returned when create is
+        False. Raises InsufficientStockError when a negative change exceeds the balance (unless
+        allow_negative) and ValueError when the product is not the organization's.
+        """
+        table = Stock.__table__
+        statement = update(table).where(table.c.id == _entry_id(organization_id, product_id, location)).values(
+            quantity=table.c.quantity + quantity_change, last_updated=func.now()
+        )
+        if quantity_change < 0 and not allow_negative:
+            statement = statement.where(table.c.quantity + quantity_change >= 0)
+        statement = statement.returning(table.c.id, table.c.quantity, table.c.location, _low_stock_threshold())
+
+        created = False
+        row = db.execute(statement).first()
+        if row is None:
+            available = db.execute(
+                select(table.c.quantity).where(table.c.id == _entry_id(organization_id, product_id, location))
+            ).scalar()
+            if available is not None:
+                raise InsufficientStockError(available, abs(quantity_change))
+            if not create:
+                return None
+            if quantity_change < 0 and not allow_negative:
+                raise InsufficientStockError(0.0, abs(quantity_change))
+            created = StockLedgerService._create_entry(db, organization_id, product_id, location, unit)
+            row = db.execute(statement).first()
+
+        stock_id, balance, stored_location, reorder_level = row
+        _sync_loaded(db, stock_id, balance)
+        _add_low_stock_change(db, organization_id, reorder_level, None if created else balance - quantity_change, balance)
+        movement = StockMovement(
+            organization_id=organization_id,
+            stock_id=stock_id,
+            product_id=product_id,
+            location=stored_location,
+            movement_type=movement_type,
+            quantity_change=quantity_change,
+            balance_after=balance,
+            reference_type=reference_type,
+            reference_id=reference_id,
+            notes=notes,
+            created_by_id=user_id,
+        )
+        db.add(movement)
+        return movement
+
+    @staticmethod
+    def set_quantity(
+        db: Session,
+        organization_id: int,
+        product_id: int,
+        quantity: float,
+        movement_type: str = "correction",
+        location: Optional[str] = None,
+        unit: Optional[str] = None,
+        **movement: Any
+    ) -> Optional[StockMovement]:
+        """Set the balance of a stock entry by recording the difference; None when it already matches"""
+        table = Stock.__table__
+        # The no-op UPDATE locks the entry, so no movement lands between the read and the change
+        current = db.execute(
+            update(table).where(table.c.id == _entry_id(organization_id, product_id, location))
+            .values(quantity=table.c.quantity).returning(table.c.quantity)
+        ).scalar()
+        if current is None and quantity == 0:
+            if StockLedgerService._create_entry(db, organization_id, product_id, location, unit):
+                reorder_level = db.execute(select(Product.reorder_level).where(
+                    Product.id == product_id, Product.is_active == True
+                )).scalar()
+                _add_low_stock_change(db, organization_id, reorder_level, None, 0.0)
+            return None
+        if current == quantity:
+            return None
+        return StockLedgerService.apply_movement(
+            db, organization_id, product_id, quantity - (current or 0.0), movement_type,
+            location=location, unit=unit, allow_negative=True, **movement
+        )
+
+    @staticmethod
+    def _create_entry(
+        db: Session, organization_id: int, product_id: int, location: Optional[str], unit: Optional[str]
+    ) -> bool:
+        """Insert an empty stock entry; False when a concurrent transaction created it first"""
+        product_unit = db.execute(select(Product.unit).where(
+            Product.id == product_id, Product.organization_id == organization_id
+        )).first()
+        if product_unit is None:
+            raise ValueError(f"Product {product_id} not found")
+        row = {
+            "organization_id": organization_id, "product_id": product_id, "quantity": 0.0,
+            "unit": unit or product_unit.unit, "location": location if location is not None else "",
+        }
+        table = Stock.__table__
+        connection = db.connection()
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(connection.dialect.name)
+        if dialect_insert is not None:
+            # A concurrent transaction may have created the entry first
+            result = connection.execute(dialect_insert(table).values(**row).on_conflict_do_nothing(
+                index_elements=["organization_id", "product_id", "location"]
+            ))
+            return result.rowcount == 1
+        connection.execute(insert(table).values(**row))
+        return True
+
+    @staticmethod
+    def record_differences(
+        db: Session, organization_id: Optional[int], movement_type: str, product_ids: Optional[Iterable[int]] = None
+    ) -> int:
+        """
+        Append a movement for every stock entry whose quantity differs from its movements (all
+        entries, or those of product_ids), so the ledger matches the stock table again. Used after
+        set-based writes and by reconciliation; runs in the caller's transaction. Returns the
+        number of movements recorded.
+        """
+        movements = StockMovement.__table__
+        columns = [
+            "organization_id", "stock_id", "product_id", "location", "movement_type", "quantity_change", "balance_after"
+        ]
+        chunks: List[Optional[List[int]]] = [None]
+        if product_ids is not None:
+            product_ids = sorted(set(product_ids))
+            chunks = [product_ids[start:start + STOCK_LEDGER_CHUNK_SIZE]
+                      for start in range(0, len(product_ids), STOCK_LEDGER_CHUNK_SIZE)]
+        recorded = 0
+        for chunk in chunks:
+            differences = _differences_select(organization_id, chunk).subquery()
+            result = db.execute(insert(movements).from_select(columns, select(
+                differences.c.organization_id, differences.c.stock_id, differences.c.product_id,
+                differences.c.location, literal(movement_type), differences.c.difference, differences.c.quantity,
+            )))
+            recorded += result.rowcount or 0
+        return recorded
+
+    @staticmethod
+    def balances(db: Session, organization_id: int, product_id: int) -> List[Stock]:
+        """A product's stock entries, one per location"""
+        return db.query(Stock).filter(
+            Stock.organization_id == organization_id, Stock.product_id == product_id
+        ).order_by(Stock.location, Stock.id).all()
+
+    @staticmethod
+    def reconcile(db: Session, organization_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stock entries whose quantity is not the sum of their movements (all organizations when None)"""
+        return [row._asdict() for row in db.execute(_differences_select(organization_id))]
+
+    @staticmethod
+    def repair(db: Session, organization_id: Optional[int] = None) -> int:
+        """Record the differences reconcile reports as "reconciliation" movements; the caller commits"""
+        recorded = StockLedgerService.record_differences(db, organization_id, "reconciliation")
+        logger.info(f"Recorded {recorded} stock reconciliation movement(s)")
+        return recorded
+
+
+# ------------------------------------------------------------------------------
+# ORM writes to Stock are recorded as movements, and the low-stock changes of
+# Core movements are added to the dashboard counters on commit
+# ------------------------------------------------------------------------------
+
+@event.listens_for(Stock, "after_insert")
+def _record_opening_balance(mapper, connection, target):
+    if target.quantity:
+        connection.execute(insert(StockMovement.__table__).values(
+            organization_id=target.organization_id, stock_id=target.id, product_id=target.product_id,
+            location=target.location, movement_type="opening", quantity_change=target.quantity,
+            balance_after=target.quantity,
+        ))
+
+
+@event.listens_for(Stock, "after_update")
+def _record_correction(mapper, connection, target):
+    history = inspect(target).attrs.quantity.history
+    if not history.added:
+        return
+    old_quantity = history.deleted[0] if history.deleted and history.deleted[0] is not None else 0.0
+    change = (target.quantity or 0.0) - old_quantity
+    if change:
+        connection.execute(insert(StockMovement.__table__).values(
+            organization_id=target.organization_id, stock_id=target.id, product_id=target.product_id,
+            location=target.location, movement_type="correction", quantity_change=change,
+            balance_after=target.quantity,
+        ))
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_low_stock_changes(session):
+    for organization_id, change in sorted(session.info.pop(_LOW_STOCK_KEY, {}).items()):
+        if change:
+            DashboardCounterService.add_low_stock(session, organization_id, change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_low_stock(session):
+    session.info.pop(_LOW_STOCK_KEY, None)
+
+
+async def run_reconcile_job(session_factory: Callable[[], Session], interval_seconds: float) -> None:
+    """Background loop: report stock entries that drifted from their movement ledger, then sleep"""
+    def reconcile_all() -> List[Dict[str, Any]]:
+        db = session_factory()
+        try:
+            return StockLedgerService.reconcile(db)
+        finally:
+            db.close()
+
+    while True:
+        try:
+            mismatches = await asyncio.to_thread(reconcile_all)
+            if mismatches:
+                logger.warning(
+                    f"{len(mismatches)} stock entr{'y' if len(mismatches) == 1 else 'ies'} differ from the movement "
+                    f"ledger, e.g. {mismatches[:5]}; run scripts/reconcile_stock.py"
+                )
+        except Exception as e:
+            logger.error(f"Stock reconciliation job failed: {e}")
+        await asyncio.sleep(interval_seconds)
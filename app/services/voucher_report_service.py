@@ -0,0 +1,174 @@
+# app/services/voucher_report_service.py
+
+"""
+Sales and purchase report queries computed in the database.
+
+The report summary (voucher count, total, GST) is one `SUM` query, the voucher
+listing is one paginated query with the party name joined in, and optional
+groupings (by day, month, party or product) are one `GROUP BY` query each, so
+the cost of a report does not grow with the number of vouchers it covers in
+Python memory.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import String, cast, desc, func, select
+from sqlalchemy.orm import Session
+
+from app.models.base import Vendor, Customer, Product
+from app.models.vouchers import PurchaseVoucher, PurchaseVoucherItem, SalesVoucher, SalesVoucherItem
+
+REPORT_PAGE_SIZE = 100
+REPORT_MAX_PAGE_SIZE = 1000
+REPORT_GROUPINGS = ("day", "month", "party", "product")
+
+# Rows fetched per round-trip when iterating a full report (Excel export)
+REPORT_FETCH_SIZE = 1000
+
+
+class _ReportSource(NamedTuple):
+    voucher: Any
+    party: Any
+    party_key: str
+    item: Any
+    item_voucher_key: str
+    total_key: str
+
+
+_SOURCES = {
+    "sales": _ReportSource(SalesVoucher, Customer, "customer", SalesVoucherItem, "sales_voucher_id", "total_sales"),
+    "purchase": _ReportSource(
+        PurchaseVoucher, Vendor, "vendor", PurchaseVoucherItem, "purchase_voucher_id", "total_purchases"
+    ),
+}
+
+
+class ReportFilters(NamedTuple):
+    """Filters shared by a report, its groupings and its export"""
+    organization_id: int
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    party_id: Optional[int] = None
+
+
+def _gst(model):
+    return (
+        func.coalesce(model.cgst_amount, 0.0)
+        + func.coalesce(model.sgst_amount, 0.0)
+        + func.coalesce(model.igst_amount, 0.0)
+    )
+
+
+def _filtered(source: _ReportSource, statement, filters: ReportFilters):
+    """Restrict a statement over the voucher table (joined to its party) to the report filters"""
+    voucher, party = source.voucher, source.party
+    party_id = getattr(voucher, f"{source.party_key}_id")
+    statement = statement.join(party, party_id == party.id).where(voucher.organization_id == filters.organization_id)
+    if filters.start_date:
+        statement = statement.where(voucher.date >= filters.start_date)
+    if filters.end_date:
+        statement = statement.where(voucher.date <= filters.end_date)
+    if filters.party_id:
+        statement = statement.where(party_id == filters.party_id)
+    return statement
+
+
+class VoucherReportService:
+    """Summaries, listings and groupings of sales and purchase vouchers"""
+
+    @staticmethod
+    def summary(db: Session, kind: str, filters: ReportFilters) -> Dict[str, Any]:
+        """Voucher count, total amount and total GST in one aggregate query"""
+        source = _SOURCES[kind]
+        voucher = source.voucher
+        statement = _filtered(source, select(
+            func.count(voucher.id),
+            func.coalesce(func.sum(voucher.total_amount), 0.0),
+            func.coalesce(func.sum(_gst(voucher)), 0.0),
+        ).select_from(voucher), filters)
+        count, total, gst = db.execute(statement).one()
+        return {"total_vouchers": count, source.total_key: total, "total_gst": gst}
+
+    @staticmethod
+    def _listing(kind: str, filters: ReportFilters):
+        source = _SOURCES[kind]
+        voucher = source.voucher
+        return _filtered(source, select(
+            voucher.id,
+            voucher.voucher_number,
+            voucher.date,
+            source.party.name.label(f"{source.party_key}_name"),
+            voucher.total_amount,
+            _gst(voucher).label("gst_amount"),
+            voucher.status,
+        ).select_from(voucher), filters).order_by(voucher.date, voucher.id)
+
+    @staticmethod
+    def vouchers(
+        db: Session,
+        kind: str,
+        filters: ReportFilters,
+        skip: int = 0,
+        limit: int = REPORT_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """One page of vouchers, oldest first, with the party name joined in"""
+        statement = VoucherReportService._listing(kind, filters).offset(skip).limit(limit)
+        return [row._asdict() for row in db.execute(statement)]
+
+    @staticmethod
+    def iter_vouchers(db: Session, kind: str, filters: ReportFilters) -> Iterator[Dict[str, Any]]:
+        """Every voucher of the report, fetched in batches of REPORT_FETCH_SIZE rows"""
+        statement = VoucherReportService._listing(kind, filters).execution_options(yield_per=REPORT_FETCH_SIZE)
+        for row in db.execute(statement):
+            yield row._asdict()
+
+    @staticmethod
+    def groups(db: Session, kind: str, filters: ReportFilters, group_by: str) -> List[Dict[str, Any]]:
+        """
+        Totals per day or month (chronological), or per party or product (largest first).
+        Product groups sum the voucher items, so their amounts are line totals.
+        """
+        if group_by not in REPORT_GROUPINGS:
+            raise ValueError(f"Unsupported grouping: {group_by}")
+        source = _SOURCES[kind]
+        voucher, party = source.voucher, source.party
+
+        if group_by == "product":
+            item = source.item
+            total = func.coalesce(func.sum(item.total_amount), 0.0)
+            statement = _filtered(source, select(
+                Product.id.label("product_id"),
+                Product.name.label("product_name"),
+                func.count(func.distinct(voucher.id)).label("voucher_count"),
+                func.coalesce(func.sum(item.quantity), 0.0).label("quantity"),
+                total.label("total_amount"),
+                func.coalesce(func.sum(_gst(item)), 0.0).label("gst_amount"),
+            ).select_from(voucher), filters).join(
+                item, getattr(item, source.item_voucher_key) == voucher.id
+            ).join(Product, item.product_id == Product.id).group_by(
+                Product.id, Product.name
+            ).order_by(desc(total), Product.name)
+            return [row._asdict() for row in db.execute(statement)]
+
+        total = func.coalesce(func.sum(voucher.total_amount), 0.0)
+        aggregates = (
+            func.count(voucher.id).label("voucher_count"),
+            total.label("total_amount"),
+            func.coalesce(func.sum(_gst(voucher)), 0.0).label("gst_amount"),
+        )
+        if group_by == "party":
+            statement = _filtered(source, select(
+                party.id.label(f"{source.party_key}_id"),
+                party.name.label(f"{source.party_key}_name"),
+                *aggregates
+            ).select_from(voucher), filters).group_by(party.id, party.name).order_by(desc(total), party.name)
+        else:
+            # ISO date text ("YYYY-MM-DD"), truncated to "YYYY-MM" for months, on every supported database
+            period = cast(func.date(voucher.date), String)
+            if group_by == "month":
+                period = func.substr(period, 1, 7)
+            statement = _filtered(source, select(
+                period.label("period"), *aggregates
+            ).select_from(voucher), filters).group_by(period).order_by(period)
+        return [row._asdict() for row in db.execute(statement)]
@@ -1,12 +1,14 @@
 """
 Excel import utilities with enhanced validation and error handling
 """
-import io
 import pandas as pd
 from typing import List, Dict, Any, Optional, Tuple
 from fastapi import UploadFile, HTTPException
 import logging
 
+from app.services.excel_service import ExcelService, StockExcelService, IMPORT_FILE_EXTENSIONS
+from app.utils.import_validation import ImportColumn, ImportSchema
+
 logger = logging.getLogger(__name__)
 
 class ExcelImportError(Exception):
@@ -57,34 +59,17 @@ class ExcelImportValidator:
         Returns:
             List of tuples (row_index, column_name, error_message)
         """
-        errors = []
-        
-        for col_name, expected_type in column_types.items():
-            if col_name not in df.columns:
-                continue
-                
-            for idx, value in enumerate(df[col_name]):
-                if pd.isna(value):
-                    continue
-                    
-                try:
-                    if expected_type == float:
-                        converted = float(value)
-                        if pd.isna(converted) or not pd.isfinite(converted):
-                            errors.append((idx + 2, col_name, f"Invalid number format: '{value}'. Expected a valid decimal number."))
-                    elif expected_type == int:
-                        converted = int(float(value))  # Handle decimal inputs that should be integers
-                        if converted < 0 and col_name in ['quantity', 'reorder_level']:
-                            errors.append((idx + 2, col_name, f"Value cannot be negative: '{value}'"))
-                    elif expected_type == str:
-                        str_val = str(value).strip()
-                        if len(str_val) == 0:
-                            errors.append((idx + 2, col_name, f"Value cannot be empty"))
-                except (ValueError, TypeError) as e:
-                    actual_type = type(value).__name__
-                    errors.append((idx + 2, col_name, f"Invalid {expected_type.__name__} format: '{value}' ({actual_type}). {str(e)}"))
-        
-        return errors
+        # Checked a column at a time by the import schema engine; row numbers are Excel lines (header is line 1)
+        kinds = {float: "number", int: "integer"}
+        schema = ImportSchema([
+            ImportColumn(
+                col_name, kinds.get(expected_type, "text"),
+                minimum=0 if expected_type == int and col_name in ('quantity', 'reorder_level') else None
+            )
+            for col_name, expected_type in column_types.items() if col_name in df.columns
+        ])
+        result = schema.validate(df)
+        return [(error.row + 1, error.field, error.error) for error in result.errors]
     
     @staticmethod
     def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
@@ -106,8 +91,7 @@ class ExcelImportValidator:
         # Clean string values
         for col in df.select_dtypes(include=['object']).columns:
             df[col] = df[col].astype(str).str.strip()
-            df[col] = df[col].replace('nan', None)
-            df[col] = df[col].replace('', None)
+            df[col] = df[col].replace(['nan', 'None', ''], None)
         
         return df
 
@@ -117,13 +101,6 @@ class StockExcelImporter:
     REQUIRED_COLUMNS = ["Product Name", "Unit", "Quantity"]
     OPTIONAL_COLUMNS = ["HSN Code", "Part Number", "Unit Price", "GST Rate", "Reorder Level", "Location"]
     
-    COLUMN_TYPES = {
-        "quantity": float,
-        "unit_price": float,
-        "gst_rate": float,
-        "reorder_level": int
-    }
-    
     @classmethod
     async def import_from_file(cls, file: UploadFile) -> Tuple[List[Dict[str, Any]], List[str]]:
         """
@@ -141,67 +118,50 @@ class StockExcelImporter:
         errors = []
         
         # Validate file type
-        if not file.filename.endswith(('.xlsx', '.xls')):
+        if not file.filename or not file.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail="Invalid file type. Only Excel files (.xlsx, .xls) are allowed."
+                detail="Invalid file type. Only Excel or CSV files (.xlsx, .xls, .csv) are allowed."
             )
         
         try:
-            # Read file content
-            content = await file.read()
+            records = []
+            seen_names: Dict[str, Optional[int]] = {}
+            first_row = 1
             
-            # Parse Excel file
-            try:
-                df = pd.read_excel(io.BytesIO(content))
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to parse Excel file: {str(e)}"
-                )
+            # The file is streamed in batches instead of being read whole; column rules (types, ranges,
+            # GST rate bounds, HSN format) are checked a column at a time within each batch
+            for df in ExcelService.iter_upload_rows(file, cls.REQUIRED_COLUMNS):
+                df = ExcelImportValidator.clean_dataframe(df)
+                validation = StockExcelService.IMPORT_SCHEMA.validate(df, first_row=first_row)
+                errors.extend(validation.messages)
+                errors.extend(validation.warnings)
+                
+                # Additional business logic validation
+                errors.extend(cls._validate_business_rules(df, first_row, seen_names))
+                
+                for record in validation.records():
+                    record.pop("_row")
+                    records.append(record)
+                first_row += len(df)
             
             # Check if file is empty
-            if df.empty:
+            if first_row == 1:
                 raise HTTPException(
                     status_code=400,
                     detail="Excel file is empty or contains no data."
                 )
             
-            # Clean the DataFrame
-            df = ExcelImportValidator.clean_dataframe(df)
-            
-            # Validate required columns
-            missing_columns = ExcelImportValidator.validate_required_columns(df, cls.REQUIRED_COLUMNS)
-            if missing_columns:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Missing required columns: {', '.join(missing_columns)}"
-                )
-            
-            # Validate data types
-            type_errors = ExcelImportValidator.validate_data_types(df, cls.COLUMN_TYPES)
-            for row, col, error in type_errors:
-                errors.append(f"Row {row}, Column '{col}': {error}")
-            
-            # Additional business logic validation
-            business_errors = cls._validate_business_rules(df)
-            errors.extend(business_errors)
-            
-            # Convert to records
-            records = []
-            for idx, row in df.iterrows():
-                try:
-                    record = cls._process_row(row, idx + 1)
-                    records.append(record)
-                except ExcelImportError as e:
-                    errors.append(f"Row {e.row}: {e.message}")
-                except Exception as e:
-                    errors.append(f"Row {idx + 1}: Unexpected error - {str(e)}")
-            
             return records, errors
             
         except HTTPException:
             raise
+        except ValueError as e:
+            # Missing required columns or an unreadable file
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to parse Excel file: {str(e)}"
+            )
         except Exception as e:
             logger.error(f"Unexpected error during Excel import: {str(e)}")
             raise HTTPException(
@@ -210,123 +170,40 @@ class StockExcelImporter:
             )
     
     @classmethod
-    def _process_row(cls, row: pd.Series, row_number: int) -> Dict[str, Any]:
-        """
-        Process a single row of Excel data
-        
-        Args:
-            row: Pandas Series representing a row
-            row_number: Row number for error reporting
-            
-        Returns:
-            Dictionary of processed data
-            
-        Raises:
-            ExcelImportError: For row-specific validation errors
-        """
-        record = {}
-        
-        # Required fields
-        product_name = row.get('product_name')
-        if not product_name or pd.isna(product_name) or str(product_name).strip() == '':
-            raise ExcelImportError("Product Name is required and cannot be empty", row_number, "product_name")
-        record['product_name'] = str(product_name).strip()
-        
-        unit = row.get('unit')
-        if not unit or pd.isna(unit) or str(unit).strip() == '':
-            raise ExcelImportError("Unit is required and cannot be empty", row_number, "unit")
-        record['unit'] = str(unit).strip().upper()
-        
-        # Quantity validation
-        quantity = row.get('quantity')
-        if pd.isna(quantity):
-            record['quantity'] = 0.0
-        else:
-            try:
-                quantity_val = float(quantity)
-                if quantity_val < 0:
-                    raise ExcelImportError("Quantity cannot be negative", row_number, "quantity")
-                record['quantity'] = quantity_val
-            except (ValueError, TypeError):
-                raise ExcelImportError(f"Invalid quantity value: {quantity}", row_number, "quantity")
-        
-        # Optional fields with validation
-        optional_fields = {
-            'hsn_code': str,
-            'part_number': str,
-            'location': str
-        }
-        
-        for field, field_type in optional_fields.items():
-            value = row.get(field)
-            if not pd.isna(value) and str(value).strip() != '' and str(value).strip().lower() != 'nan':
-                record[field] = field_type(value).strip()
-            else:
-                record[field] = None
-        
-        # Numeric optional fields
-        numeric_fields = {
-            'unit_price': (float, 0.0),
-            'gst_rate': (float, 18.0),
-            'reorder_level': (int, 10)
-        }
-        
-        for field, (field_type, default_value) in numeric_fields.items():
-            value = row.get(field)
-            if pd.isna(value) or str(value).strip() == '' or str(value).strip().lower() == 'nan':
-                record[field] = default_value
-            else:
-                try:
-                    parsed_value = field_type(value)
-                    if field in ['unit_price', 'gst_rate'] and parsed_value < 0:
-                        raise ExcelImportError(f"{field} cannot be negative", row_number, field)
-                    if field == 'gst_rate' and parsed_value > 100:
-                        raise ExcelImportError("GST rate cannot exceed 100%", row_number, field)
-                    record[field] = parsed_value
-                except (ValueError, TypeError):
-                    raise ExcelImportError(f"Invalid {field} value: {value}", row_number, field)
-        
-        return record
-
-    @classmethod
-    def _validate_business_rules(cls, df: pd.DataFrame) -> List[str]:
+    def _validate_business_rules(
+        cls,
+        df: pd.DataFrame,
+        first_row: int = 1,
+        seen_names: Optional[Dict[str, Optional[int]]] = None
+    ) -> List[str]:
         """
-        Validate business-specific rules for stock data
+        Validate business-specific rules for stock data that span rows
         
         Args:
             df: DataFrame to validate
+            first_row: Number of the DataFrame's first row, for batches of a longer file
+            seen_names: Names of the earlier batches, mapped to their first row until it is reported
             
         Returns:
             List of error messages
         """
         errors = []
+        seen_names = seen_names if seen_names is not None else {}
         
         # Check for duplicate product names within the file
         if 'product_name' in df.columns:
-            duplicates = df.duplicated(subset=['product_name'], keep=False)
-            if duplicates.any():
-                duplicate_rows = df[duplicates]
-                for idx, row in duplicate_rows.iterrows():
-                    errors.append(f"Row {idx + 2}: Duplicate product name '{row['product_name']}' found in file")
-        
-        # Validate GST rates are within acceptable range
-        if 'gst_rate' in df.columns:
-            for idx, rate in enumerate(df['gst_rate']):
-                if not pd.isna(rate):
-                    try:
-                        rate_val = float(rate)
-                        if rate_val < 0 or rate_val > 100:
-                            errors.append(f"Row {idx + 2}, Column 'gst_rate': GST rate must be between 0 and 100%, got {rate_val}%")
-                    except (ValueError, TypeError):
-                        pass  # Already handled by data type validation
-        
-        # Validate HSN codes if present
-        if 'hsn_code' in df.columns:
-            for idx, hsn in enumerate(df['hsn_code']):
-                if not pd.isna(hsn) and str(hsn).strip():
-                    hsn_str = str(hsn).strip()
-                    if not hsn_str.isdigit() or len(hsn_str) not in [4, 6, 8]:
-                        errors.append(f"Row {idx + 2}, Column 'hsn_code': HSN code must be 4, 6, or 8 digits, got '{hsn_str}'")
+            names = df['product_name'].astype(str).str.strip().where(df['product_name'].notna())
+            for row, name in enumerate(names.tolist(), start=first_row):
+                if name is None or name != name:
+                    continue
+                if name not in seen_names:
+                    seen_names[name] = row
+                    continue
+                first = seen_names[name]
+                if first is not None:
+                    errors.append(f"Row {first}: Duplicate product name '{name}' found in file")
+                    seen_names[name] = None
+                errors.append(f"Row {row}: Duplicate product name '{name}' found in file")
         
         return errors
 
@@ -357,15 +234,15 @@ class CompanyExcelImporter:
 
 def validate_excel_file_type(filename: str) -> bool:
     """
-    Validate that the file is an Excel file
+    Validate that the file is an Excel (or CSV) file
     
     Args:
         filename: Name of the file
         
     Returns:
-        True if valid Excel file, False otherwise
+        True if valid Excel or CSV file, False otherwise
     """
-    return filename.lower().endswith(('.xlsx', '.xls'))
+    return filename.lower().endswith(IMPORT_FILE_EXTENSIONS)
 
 def get_excel_template_data(entity_type: str) -> List[Dict[str, Any]]:
     """
@@ -0,0 +1,271 @@
+"""
+Declarative, column-wise validation of imported sheets.
+
+An ImportSchema lists the columns of an import template and the rules each column
+follows (required cells, type coercion, numeric ranges, text formats). validate()
+checks whole pandas columns at a time and reports every failing cell as a
+BulkImportError, so the cost of validating a sheet is a handful of vectorized
+operations per column rather than Python code per row; only failing cells are
+visited one by one to build their messages.
+
+Row numbers count data rows from 1, like the import endpoints always have.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.stock import BulkImportError
+
+# error_code values of the reported BulkImportErrors
+REQUIRED_FIELD_MISSING = "REQUIRED_FIELD_MISSING"
+INVALID_DATA_TYPE = "INVALID_DATA_TYPE"
+INVALID_VALUE = "INVALID_VALUE"
+INVALID_FORMAT = "INVALID_FORMAT"
+
+COLUMN_KINDS = ("text", "number", "integer", "boolean")
+
+# Cells holding only these (compared case-insensitively) count as empty
+EMPTY_MARKERS = ("", "none", "null", "na", "nan")
+# Boolean cells holding these (compared case-insensitively) are true, anything else is false
+TRUE_MARKERS = ("TRUE", "YES", "Y", "1")
+
+
+@dataclass(frozen=True)
+class ImportColumn:
+    """
+    Rules for one column of an import sheet.
+
+    name is the normalized header ("Pin Code" -> pin_code) and field the key the
+    validated value is stored under (defaults to name). Empty optional cells take
+    default. Invalid values fail their row, unless the column is lenient: then they
+    are replaced by default and reported as warnings.
+    """
+    name: str
+    kind: str = "text"
+    required: bool = False
+    field: Optional[str] = None
+    label: Optional[str] = None
+    default: Any = None
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    pattern: Optional[str] = None
+    pattern_message: str = "has an invalid format"
+    upper: bool = False
+    lenient: bool = False
+
+    def __post_init__(self):
+        if self.kind not in COLUMN_KINDS:
+            raise ValueError(f"Invalid column kind '{self.kind}' for {self.name}, expected one of {COLUMN_KINDS}")
+        if self.pattern is not None and self.kind != "text":
+            raise ValueError(f"Only text columns can have a pattern ({self.name})")
+
+    @property
+    def target(self) -> str:
+        return self.field or self.name
+
+    @property
+    def title(self) -> str:
+        return self.label or self.name.replace("_", " ").title()
+
+    def range_message(self) -> Optional[str]:
+        if self.minimum is not None and self.maximum is not None:
+            return f"{self.title} must be between {self.minimum:g} and {self.maximum:g}, got {{value}}"
+        if self.minimum == 0:
+            return f"{self.title} cannot be negative"
+        if self.minimum is not None:
+            return f"{self.title} must be at least {self.minimum:g}, got {{value}}"
+        if self.maximum is not None:
+            return f"{self.title} cannot exceed {self.maximum:g}, got {{value}}"
+        return None
+
+
+@dataclass
+class ImportValidationResult:
+    """Valid rows (one column per field plus _row) and the errors of the rejected ones"""
+    rows: pd.DataFrame
+    total: int
+    errors: List[BulkImportError] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def skipped(self) -> int:
+        return self.total - len(self.rows)
+
+    @property
+    def messages(self) -> List[str]:
+        """The errors in the "Row N: ..." form of BulkImportResponse.errors"""
+        return [f"Row {error.row}: {error.error}" for error in self.errors]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Valid rows as dicts of plain Python values, None for empty cells"""
+        names = list(self.rows.columns)
+        columns = []
+        for name in names:
+            column = self.rows[name]
+            if column.hasnans:
+                column = column.astype(object).where(column.notna(), None)
+            columns.append(column.tolist())
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _cell_text(value: Any) -> str:
+    """A cell as a stripped string, empty when missing; Excel hands numeric codes over as floats (8471.0)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _text(series: pd.Series) -> List[str]:
+    return [_cell_text(value) for value in series]
+
+
+def _fallback(default: Any) -> str:
+    """Suffix of the warning for an invalid cell of a lenient column"""
+    if default is None:
+        return "; value ignored"
+    if isinstance(default, float):
+        return f"; using {default:g}"
+    return f"; using {default}"
+
+
+class ImportSchema:
+    """The columns of an import template, validated together"""
+
+    def __init__(self, columns: Sequence[ImportColumn]):
+        self.columns = tuple(columns)
+        targets = [column.target for column in self.columns]
+        if len(set(targets)) != len(targets):
+            raise ValueError("Import columns must map to distinct fields")
+
+    @property
+    def required_columns(self) -> List[str]:
+        return [column.name for column in self.columns if column.required]
+
+    def validate(self, rows: Union[pd.DataFrame, List[Dict[str, Any]]], first_row: int = 1) -> ImportValidationResult:
+        """
+        Coerce and check every column; rows with any invalid cell are left out of the result's rows.
+
+        first_row is the number of the first row, for batches of a longer sheet.
+        """
+        frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame.from_records(rows)
+        frame = frame.reset_index(drop=True)
+        row_numbers = pd.Series(np.arange(first_row, first_row + len(frame)), index=frame.index)
+        failed = pd.Series(False, index=frame.index)
+        values: Dict[str, pd.Series] = {}
+        errors: List[Tuple[int, int, BulkImportError]] = []
+        warnings: List[Tuple[int, int, str]] = []
+
+        for position, column in enumerate(self.columns):
+            if column.name in frame.columns:
+                raw = frame[column.name]
+            else:
+                raw = pd.Series(None, index=frame.index, dtype=object)
+            column_values, problems = self._check(column, raw)
+            for mask, error_code, message in problems:
+                if not mask.any():
+                    continue
+                shown = _text(raw[mask])
+                rows_hit = row_numbers[mask].tolist()
+                if column.lenient and error_code != REQUIRED_FIELD_MISSING:
+                    fallback = _fallback(column.default)
+                    warnings.extend(
+                        (row, position, f"Row {row}: {message.format(value=value)}{fallback}")
+                        for row, value in zip(rows_hit, shown)
+                    )
+                    column_values = column_values.where(~mask, column.default)
+                    continue
+                failed |= mask
+                errors.extend(
+                    (row, position, BulkImportError(
+                        row=row, field=column.target, value=value,
+                        error=message.format(value=value), error_code=error_code
+                    ))
+                    for row, value in zip(rows_hit, shown)
+                )
+            if column.kind == "integer":
+                column_values = column_values.astype("Int64")
+            values[column.target] = column_values
+
+        valid = pd.DataFrame(values, index=frame.index)
+        valid["_row"] = row_numbers
+        errors.sort(key=lambda entry: entry[:2])
+        warnings.sort(key=lambda entry: entry[:2])
+        return ImportValidationResult(
+            rows=valid[~failed].reset_index(drop=True),
+            total=len(frame),
+            errors=[error for _, _, error in errors],
+            warnings=[warning for _, _, warning in warnings],
+        )
+
+    @staticmethod
+    def _check(column: ImportColumn, raw: pd.Series) -> Tuple[pd.Series, List[Tuple[pd.Series, str, str]]]:
+        """The coerced column and its (failing cells, error code, message) checks, in reporting order"""
+        problems: List[Tuple[pd.Series, str, str]] = []
+        if column.kind in ("number", "integer"):
+            if pd.api.types.is_numeric_dtype(raw.dtype) and not pd.api.types.is_bool_dtype(raw.dtype):
+                numbers = raw.astype(float)
+                missing = numbers.isna()
+            else:
+                numbers = pd.to_numeric(raw, errors="coerce").astype(float)
+                missing = raw.isna()
+                # Only cells that did not parse can still be placeholders such as 'NA'
+                unparsed = numbers.isna() & ~missing
+                if unparsed.any():
+                    missing[unparsed] = [text.lower() in EMPTY_MARKERS for text in _text(raw[unparsed])]
+        else:
+            # Sheets repeat values a lot (units, locations, codes), so the string work is done once per
+            # distinct value and spread back over the rows through the factorized codes
+            codes, uniques = pd.factorize(raw)
+            uniques = np.asarray(uniques, dtype=object).tolist()
+            if isinstance(raw.dtype, pd.StringDtype):
+                texts = [value.strip() for value in uniques]
+            else:
+                texts = [_cell_text(value) for value in uniques]
+            texts.append("")  # code -1 marks missing cells
+            empty = np.array([text.lower() in EMPTY_MARKERS for text in texts])
+            missing = pd.Series(empty[codes], index=raw.index)
+            if column.kind == "boolean":
+                true = np.array([text.upper() in TRUE_MARKERS for text in texts])
+                return pd.Series(true[codes], index=raw.index).where(~missing, bool(column.default)), problems
+            if column.upper:
+                texts = [text.upper() for text in texts]
+            if column.required:
+                problems.append((missing, REQUIRED_FIELD_MISSING, f"{column.title} is required and cannot be empty"))
+            if column.pattern is not None:
+                pattern = re.compile(column.pattern)
+                matches = np.array([pattern.fullmatch(text) is not None for text in texts])
+                problems.append((~missing & ~matches[codes], INVALID_FORMAT,
+                                 f"{column.title} {column.pattern_message}, got '{{value}}'"))
+            values = np.empty(len(texts), dtype=object)
+            values[:] = texts
+            return pd.Series(values[codes], index=raw.index).where(~missing, column.default), problems
+
+        if column.required:
+            problems.append((missing, REQUIRED_FIELD_MISSING, f"{column.title} is required and cannot be empty"))
+        parsed = np.isfinite(numbers)
+        problems.append((~missing & ~parsed, INVALID_DATA_TYPE,
+                         f"Invalid data format - {column.title} must be a number, got '{{value}}'"))
+        numbers = numbers.where(parsed)
+        if column.kind == "integer":
+            numbers = np.trunc(numbers)
+        range_message = column.range_message()
+        if range_message is not None:
+            out_of_range = pd.Series(False, index=raw.index)
+            if column.minimum is not None:
+                out_of_range |= numbers < column.minimum
+            if column.maximum is not None:
+                out_of_range |= numbers > column.maximum
+            problems.append((parsed & out_of_range, INVALID_VALUE, range_message))
+        return numbers.where(~missing, column.default), problems
+
+
+def digits_pattern(*lengths: int) -> str:
+    """Pattern matching a string of digits of any of the given lengths"""
+    return "|".join(rf"\d{{{length}}}" for length in lengths)
+
@@ -0,0 +1,50 @@
+"""Add account_balances ledger projection
+
+Revision ID: a1c4e2f7b9d3
+Revises: 65386d18e079
+Create Date: 2025-09-02 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c4e2f7b9d3'
+down_revision = '65386d18e079'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('account_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('account_type', sa.String(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('last_transaction_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('organization_id', 'account_type', 'account_id', name='uq_account_balance_org_account')
+    )
+    with op.batch_alter_table('account_balances', schema=None) as batch_op:
+        batch_op.create_index('idx_account_balance_org_type', ['organization_id', 'account_type'], unique=False)
+        batch_op.create_index(batch_op.f('ix_account_balances_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_account_balances_organization_id'), ['organization_id'], unique=False)
+
+    # Build balances from the existing vouchers
+    from app.services.account_balance_service import AccountBalanceService
+    AccountBalanceService.rebuild(Session(bind=op.get_bind()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('account_balances', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_account_balances_organization_id'))
+        batch_op.drop_index(batch_op.f('ix_account_balances_id'))
+        batch_op.drop_index('idx_account_balance_org_type')
+
+    op.drop_table('account_balances')
@@ -0,0 +1,46 @@
+"""Add account_balance_snapshots for ledger opening balances
+
+Revision ID: b7d2e9c4a6f1
+Revises: a1c4e2f7b9d3
+Create Date: 2025-09-04 16:27:09.552810
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e9c4a6f1'
+down_revision = 'a1c4e2f7b9d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('account_balance_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('account_type', sa.String(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('organization_id', 'account_type', 'account_id', 'period_end', name='uq_balance_snapshot_org_account_period')
+    )
+    with op.batch_alter_table('account_balance_snapshots', schema=None) as batch_op:
+        batch_op.create_index('idx_balance_snapshot_org_period', ['organization_id', 'period_end'], unique=False)
+        batch_op.create_index(batch_op.f('ix_account_balance_snapshots_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_account_balance_snapshots_organization_id'), ['organization_id'], unique=False)
+    # Snapshots are generated by the background job (or scripts/generate_ledger_snapshots.py)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('account_balance_snapshots', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_account_balance_snapshots_organization_id'))
+        batch_op.drop_index(batch_op.f('ix_account_balance_snapshots_id'))
+        batch_op.drop_index('idx_balance_snapshot_org_period')
+
+    op.drop_table('account_balance_snapshots')
@@ -0,0 +1,47 @@
+"""Add dashboard_counters for materialized dashboard statistics
+
+Revision ID: c3f8a1d5e7b2
+Revises: b7d2e9c4a6f1
+Create Date: 2025-09-06 10:42:51.184306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a1d5e7b2'
+down_revision = 'b7d2e9c4a6f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('dashboard_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('vendors', sa.Integer(), nullable=False),
+    sa.Column('customers', sa.Integer(), nullable=False),
+    sa.Column('products', sa.Integer(), nullable=False),
+    sa.Column('purchase_vouchers', sa.Integer(), nullable=False),
+    sa.Column('sales_vouchers', sa.Integer(), nullable=False),
+    sa.Column('low_stock_items', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('organization_id', name='uq_dashboard_counter_org')
+    )
+    with op.batch_alter_table('dashboard_counters', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_dashboard_counters_id'), ['id'], unique=False)
+
+    # Count the existing masters, vouchers and stock
+    from app.services.dashboard_counter_service import DashboardCounterService
+    DashboardCounterService.recompute(Session(bind=op.get_bind()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('dashboard_counters', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_dashboard_counters_id'))
+
+    op.drop_table('dashboard_counters')
@@ -0,0 +1,64 @@
+"""Add stock_movements ledger with opening balances
+
+Revision ID: e5b8d3f0a2c7
+Revises: d4a7c2e9f1b6
+Create Date: 2025-09-10 09:41:22.604117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8d3f0a2c7'
+down_revision = 'd4a7c2e9f1b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('stock_movements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('stock_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('movement_type', sa.String(length=20), nullable=False),
+    sa.Column('quantity_change', sa.Float(), nullable=False),
+    sa.Column('balance_after', sa.Float(), nullable=False),
+    sa.Column('reference_type', sa.String(), nullable=True),
+    sa.Column('reference_id', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['stock_id'], ['stock.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('stock_movements', schema=None) as batch_op:
+        batch_op.create_index('idx_stock_movement_org_product', ['organization_id', 'product_id'], unique=False)
+        batch_op.create_index('idx_stock_movement_reference', ['reference_type', 'reference_id'], unique=False)
+        batch_op.create_index('idx_stock_movement_stock', ['stock_id', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_stock_movements_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_stock_movements_organization_id'), ['organization_id'], unique=False)
+
+    # Existing balances become opening movements, so every entry equals the sum of its movements
+    op.execute(
+        "INSERT INTO stock_movements "
+        "(organization_id, stock_id, product_id, location, movement_type, quantity_change, balance_after) "
+        "SELECT organization_id, id, product_id, location, 'opening', quantity, quantity "
+        "FROM stock WHERE quantity <> 0"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('stock_movements', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_stock_movements_organization_id'))
+        batch_op.drop_index(batch_op.f('ix_stock_movements_id'))
+        batch_op.drop_index('idx_stock_movement_stock')
+        batch_op.drop_index('idx_stock_movement_reference')
+        batch_op.drop_index('idx_stock_movement_org_product')
+
+    op.drop_table('stock_movements')
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Async Database Path Benchmark
+
+Measures requests/sec for the dashboard statistics and voucher list endpoints
+using the legacy synchronous session (blocking the event loop inside `async def`
+routes) versus the async session path (`get_async_db`).
+
+The benchmark drives the ASGI app in-process with httpx, so numbers reflect a
+single worker. Point --database-url at PostgreSQL to see the effect of real
+network round-trips; the default is a throwaway SQLite file.
+
+Usage: python scripts/benchmark_async_db.py [--requests 2000] [--concurrency 100]
+                                            [--vouchers 5000] [--database-url URL]
+"""
+
+import sys
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database sessions")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint and mode")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent in-flight requests")
+    parser.add_argument("--vouchers", type=int, default=5000, help="Sales vouchers to seed")
+    parser.add_argument("--database-url", default=None, help="Sync database URL (default: temp SQLite file)")
+    return parser.parse_args()
+
+
+def seed_database(session_factory, voucher_count: int):
+    """Seed one organization with masters and sales vouchers"""
+    from app.models.base import Organization, User, Customer, Product, Stock
+    from app.models.vouchers import SalesVoucher, SalesVoucherItem
+
+    db = session_factory()
+    try:
+        db.add(Organization(
+            id=1, name="Bench Org", subdomain="bench", primary_email="bench@test.com",
+            primary_phone="1234567890", address1="Address", city="City", state="State",
+            pin_code="123456", plan_type="basic"
+        ))
+        db.add(User(id=1, organization_id=1, email="bench@test.com", username="bench",
+                    hashed_password="x", role="admin", is_active=True))
+        db.add(Customer(id=1, organization_id=1, name="Customer", contact_number="1",
+                        address1="A", city="C", state="S", pin_code="1", state_code="S"))
+        db.add(Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0, reorder_level=5))
+        db.add(Stock(organization_id=1, product_id=1, quantity=1, unit="PCS"))
+        for i in range(voucher_count):
+            db.add(SalesVoucher(
+                organization_id=1, voucher_number=f"SV{i:06d}", date=datetime(2024, 1, 1),
+                customer_id=1, total_amount=118.0, created_by=1,
+                items=[SalesVoucherItem(product_id=1, quantity=1, unit="PCS", unit_price=100.0,
+                                        taxable_amount=100.0, total_amount=118.0)]
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_app(sync_session_factory, async_session_factory):
+    """Build an app exposing both the legacy sync routes and the async routes"""
+    from fastapi import FastAPI, Depends
+    from sqlalchemy.orm import Session, joinedload
+    from app.core.database import get_async_db
+    from app.core.tenant import TenantContext, TenantQueryMixin
+    from app.api.v1.auth import get_current_active_user, get_current_active_principal
+    from app.api import reports
+    from app.api.v1.vouchers import router as vouchers_router
+    from app.models.base import User, Vendor, Customer, Product, Stock
+    from app.models.vouchers import PurchaseVoucher, SalesVoucher
+
+    user = User(id=1, organization_id=1, email="bench@test.com", role="admin", is_active=True)
+
+    def get_sync_db():
+        db = sync_session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(reports.router, prefix="/async/reports")
+    app.include_router(vouchers_router, prefix="/async")
+    app.dependency_overrides[get_async_db] = override_async_db
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    app.dependency_overrides[get_current_active_principal] = lambda: user
+
+    @app.get("/sync/reports/dashboard-stats")
+    async def legacy_dashboard(db: Session = Depends(get_sync_db)):
+        org_id = TenantContext.get_organization_id()
+        counts = [
+            TenantQueryMixin.filter_by_tenant(db.query(Vendor), Vendor, org_id).filter(Vendor.is_active == True).count(),
+            TenantQueryMixin.filter_by_tenant(db.query(Customer), Customer, org_id).filter(Customer.is_active == True).count(),
+            TenantQueryMixin.filter_by_tenant(db.query(Product), Product, org_id).filter(Product.is_active == True).count(),
+            TenantQueryMixin.filter_by_tenant(db.query(PurchaseVoucher), PurchaseVoucher, org_id).count(),
+            TenantQueryMixin.filter_by_tenant(db.query(SalesVoucher), SalesVoucher, org_id).count(),
+            TenantQueryMixin.filter_by_tenant(db.query(Stock), Stock, org_id).join(Product).filter(
+                Stock.quantity <= Product.reorder_level, Product.is_active == True
+            ).count(),
+        ]
+        return {"counts": counts}
+
+    @app.get("/sync/sales-vouchers")
+    async def legacy_sales_vouchers(limit: int = 20, db: Session = Depends(get_sync_db)):
+        vouchers = db.query(SalesVoucher).options(joinedload(SalesVoucher.customer)).filter(
+            SalesVoucher.organization_id == 1
+        ).order_by(SalesVoucher.created_at.desc()).limit(limit).all()
+        return [{"id": v.id, "items": len(v.items)} for v in vouchers]
+
+    class TenantScope:
+        """Pin the benchmark organization into the tenant context"""
+
+        def __init__(self, inner):
+            self.inner = inner
+
+        async def __call__(self, scope, receive, send):
+            TenantContext.set_organization_id(1)
+            await self.inner(scope, receive, send)
+
+    return TenantScope(app)
+
+
+async def run_load(app, path: str, total: int, concurrency: int) -> float:
+    """Issue `total` GET requests with bounded concurrency and return requests/sec"""
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await one()  # warm up
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+    return total / elapsed
+
+
+def main():
+    args = parse_args()
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from app.core.database import Base, get_async_database_url
+    import app.models.vouchers  # noqa: F401 - register voucher tables
+
+    tmp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        tmp_dir = tempfile.mkdtemp(prefix="bench_async_db_")
+        database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+
+    sync_engine = create_engine(database_url, connect_args={"check_same_thread": False}
+                                if database_url.startswith("sqlite") else {})
+    Base.metadata.create_all(sync_engine)
+    sync_factory = sessionmaker(bind=sync_engine, autoflush=False)
+    async_engine = create_async_engine(get_async_database_url(database_url))
+    async_factory = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"🔧 Database: {database_url}")
+    if tmp_dir:
+        print(f"🌱 Seeding {args.vouchers} sales vouchers...")
+        seed_database(sync_factory, args.vouchers)
+
+    app = build_app(sync_factory, async_factory)
+    scenarios = [
+        ("dashboard-stats", "/sync/reports/dashboard-stats", "/async/reports/dashboard-stats"),
+        ("sales-vouchers", "/sync/sales-vouchers?limit=20", "/async/sales-vouchers/?limit=20"),
+    ]
+
+    print(f"\n📊 {args.requests} requests per run, concurrency {args.concurrency}\n")
+    print(f"{'endpoint':<18}{'sync req/s':>14}{'async req/s':>14}{'speedup':>10}")
+    for name, sync_path, async_path in scenarios:
+        before = asyncio.run(run_load(app, sync_path, args.requests, args.concurrency))
+        after = asyncio.run(run_load(app, async_path, args.requests, args.concurrency))
+        print(f"{name:<18}{before:>14.1f}{after:>14.1f}{after / before:>9.2f}x")
+
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Excel Export Benchmark
+
+Compares the legacy report export (every row materialized as a dict, a regular
+openpyxl workbook built in memory, a column-width scan over every cell and the
+file saved to a BytesIO) with the streaming export engine
+(`ExcelService.stream_workbook` via `ReportsExcelService.stream_sales_report`),
+which appends rows to a write-only workbook as they are produced and yields the
+saved file in chunks.
+
+Rows are synthetic sales report rows generated on the fly, so the numbers
+isolate the export engine from the database. Each path runs in its own child
+process so its peak RSS is measured independently. openpyxl serializes rows
+noticeably faster when lxml is installed.
+
+Usage: python scripts/benchmark_excel_export.py [--rows 1000000] [--skip-legacy]
+"""
+
+import sys
+import time
+import argparse
+import resource
+import subprocess
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory vs streaming Excel export")
+    parser.add_argument("--rows", type=int, default=1000000, help="Report rows to export")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the streaming export")
+    parser.add_argument("--run", choices=["legacy", "streaming"], help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def generate_rows(count: int):
+    start = datetime(2023, 4, 1)
+    for i in range(count):
+        total = 100.0 + (i % 5000)
+        yield {
+            "voucher_number": f"SV{i:08d}",
+            "date": start + timedelta(minutes=i),
+            "customer_name": f"Customer {i % 50000:05d}",
+            "total_amount": total,
+            "gst_amount": round(total * 0.18, 2),
+            "status": "confirmed",
+        }
+
+
+def legacy_export(rows):
+    """The pre-streaming export: regular workbook, width scan over every cell, BytesIO"""
+    import io
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sales Report"
+    ws.append(["Voucher Number", "Date", "Customer Name", "Total Amount", "GST Amount", "Net Amount", "Status"])
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+    for voucher in rows:
+        ws.append([
+            voucher["voucher_number"], voucher["date"], voucher["customer_name"], voucher["total_amount"],
+            voucher["gst_amount"], voucher["total_amount"] - voucher["gst_amount"], voucher["status"]
+        ])
+    for column in ws.columns:
+        max_length = max(len(str(cell.value)) for cell in column)
+        ws.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+    excel_data = io.BytesIO()
+    wb.save(excel_data)
+    return [excel_data.getvalue()]
+
+
+def run_child(mode: str, row_count: int):
+    """Export in this process and print elapsed seconds, bytes written and peak RSS (KiB)"""
+    from app.services.excel_service import ReportsExcelService
+
+    summary = {"total_vouchers": row_count, "total_sales": 0.0, "total_gst": 0.0}
+    started = time.perf_counter()
+    if mode == "legacy":
+        chunks = legacy_export(list(generate_rows(row_count)))
+    else:
+        chunks = ReportsExcelService.stream_sales_report(generate_rows(row_count), summary)
+    written = sum(len(chunk) for chunk in chunks)
+    elapsed = time.perf_counter() - started
+    print(f"{elapsed} {written} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}")
+
+
+def measure(mode: str, row_count: int):
+    result = subprocess.run(
+        [sys.executable, __file__, "--run", mode, "--rows", str(row_count)],
+        capture_output=True, text=True, check=True
+    )
+    elapsed, written, peak_kib = result.stdout.split()[-3:]
+    return float(elapsed), int(written), int(peak_kib) / 1024
+
+
+def main():
+    args = parse_args()
+    if args.run:
+        run_child(args.run, args.rows)
+        return
+
+    modes = ["streaming"] if args.skip_legacy else ["streaming", "legacy"]
+    print(f"\n📊 Exporting {args.rows:,} sales report rows\n")
+    print(f"   {'path':<34}{'time':>10}{'rows/s':>12}{'file':>11}{'peak RSS':>12}")
+    results = {}
+    for mode in modes:
+        elapsed, written, peak_mib = measure(mode, args.rows)
+        results[mode] = (elapsed, peak_mib)
+        label = "write-only workbook, chunked" if mode == "streaming" else "legacy in-memory workbook"
+        print(
+            f"   {label:<34}{elapsed:>8.1f} s{args.rows / elapsed:>12,.0f}"
+            f"{written / 1024 / 1024:>8.1f} MB{peak_mib:>9.0f} MiB"
+        )
+
+    if "legacy" in results:
+        (stream_time, stream_rss), (legacy_time, legacy_rss) = results["streaming"], results["legacy"]
+        print(f"\n   ✅ peak RSS {legacy_rss / stream_rss:.1f}x lower, {legacy_time / stream_time:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
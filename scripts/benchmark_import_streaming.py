@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Import Streaming Benchmark
+
+Compares reading a stock import sheet whole (`pd.read_excel` into one DataFrame,
+validated at once, as the import endpoints used to) with streaming it through
+`StockExcelService.iter_import_batches` (openpyxl read-only rows, validated in
+batches of IMPORT_BATCH_SIZE).
+
+Reports the time until the first rows are ready to be written, the total time
+and the peak memory traced by tracemalloc while the sheet is read; the streamed
+peak stays flat as the sheet grows while the whole-sheet peak grows with it.
+Times include the overhead of tracemalloc, so compare them with each other only.
+
+Usage: python scripts/benchmark_import_streaming.py [--rows 200000]
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark whole-sheet vs streamed import parsing")
+    parser.add_argument("--rows", type=int, default=200000, help="Sheet rows to import")
+    return parser.parse_args()
+
+
+def write_sheet(path: str, count: int):
+    from openpyxl import Workbook
+    from app.services.excel_service import StockExcelService
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Stock Import Template")
+    sheet.append(StockExcelService.REQUIRED_COLUMNS)
+    for i in range(count):
+        sheet.append([f"Product {i:07d}", i % 500, "PCS", "84713010", f"P-{i:07d}", 10.0 + i % 1000, 18, 10, f"Bin {i % 40}"])
+    workbook.save(path)
+
+
+def whole_sheet(path: str):
+    """Read the sheet into one DataFrame and validate it at once"""
+    import pandas as pd
+    from app.services.excel_service import StockExcelService
+
+    frame = pd.read_excel(path, sheet_name="Stock Import Template")
+    frame.columns = [str(column).strip().lower().replace(" ", "_") for column in frame.columns]
+    validation = StockExcelService.IMPORT_SCHEMA.validate(frame)
+    yield len(validation.rows)
+
+
+def streamed(path: str):
+    from app.services.excel_service import StockExcelService
+
+    with open(path, "rb") as source:
+        upload = SimpleNamespace(filename=path, file=source)
+        for validation in StockExcelService.iter_import_batches(upload, "Stock Import Template"):
+            yield len(validation.rows)
+
+
+def measure(function, path: str):
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_batch = None
+    rows = 0
+    for valid in function(path):
+        if first_batch is None:
+            first_batch = time.perf_counter() - started
+        rows += valid
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_batch, elapsed, peak, rows
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "stock.xlsx")
+        write_sheet(path, args.rows)
+        size = Path(path).stat().st_size
+        print(f"\n📊 Reading {args.rows:,} stock import rows ({size / 1024 / 1024:.1f} MB workbook)\n")
+        print(f"   {'path':<22}{'first batch':>14}{'total':>10}{'peak memory':>14}{'valid':>10}")
+        for label, function in (("streamed batches", streamed), ("whole sheet", whole_sheet)):
+            first_batch, elapsed, peak, rows = measure(function, path)
+            print(f"   {label:<22}{first_batch:>12.2f} s{elapsed:>8.2f} s{peak / 1024 / 1024:>11.1f} MB{rows:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Import Validation Benchmark
+
+Compares the legacy row-by-row validation of a stock import sheet (the checks
+`StockExcelImporter` used to run: a per-cell type loop, per-row GST rate and
+HSN code loops and `_process_row` over `DataFrame.iterrows`) with the
+column-wise `ImportSchema.validate` engine, both starting from the DataFrame
+read from the sheet and ending with the validated rows as dicts.
+
+Rows are synthetic stock template rows; about 1% of them carry an invalid cell
+(missing unit, unparseable or negative quantity, out-of-range GST rate, bad HSN
+code) so both paths also build their error reports. The schema treats invalid
+product details as warnings, so it keeps a few more rows than the legacy checks;
+the legacy HSN check also rejects the codes Excel hands over as floats (8471.0),
+which inflates its error count.
+
+Usage: python scripts/benchmark_import_validation.py [--rows 200000] [--repeat 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark row-by-row vs column-wise import validation")
+    parser.add_argument("--rows", type=int, default=200000, help="Sheet rows to validate")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path; the best one is reported")
+    return parser.parse_args()
+
+
+def generate_rows(count: int):
+    rows = []
+    for i in range(count):
+        row = {
+            "product_name": f"Product {i:07d}",
+            "quantity": float(i % 500),
+            "unit": "pcs",
+            "hsn_code": 84713010.0,
+            "part_number": f"P-{i:07d}",
+            "unit_price": 10.0 + i % 1000,
+            "gst_rate": 18.0,
+            "reorder_level": 10.0,
+            "location": f"Bin {i % 40}",
+        }
+        problem = i % 400
+        if problem == 1:
+            row["unit"] = None
+        elif problem == 2:
+            row["quantity"] = "lots"
+        elif problem == 3:
+            row["quantity"] = -5.0
+        elif problem == 4:
+            row["gst_rate"] = 250.0
+        elif problem == 5:
+            row["hsn_code"] = "12"
+        rows.append(row)
+    return rows
+
+
+LEGACY_COLUMN_TYPES = {"quantity": float, "unit_price": float, "gst_rate": float, "reorder_level": int}
+
+
+def legacy_process_row(row, row_number: int):
+    """StockExcelImporter._process_row as it was before the schema engine"""
+    import pandas as pd
+
+    record = {}
+    product_name = row.get("product_name")
+    if not product_name or pd.isna(product_name) or str(product_name).strip() == "":
+        raise ValueError("Product Name is required and cannot be empty")
+    record["product_name"] = str(product_name).strip()
+    unit = row.get("unit")
+    if not unit or pd.isna(unit) or str(unit).strip() == "":
+        raise ValueError("Unit is required and cannot be empty")
+    record["unit"] = str(unit).strip().upper()
+    quantity = row.get("quantity")
+    if pd.isna(quantity):
+        record["quantity"] = 0.0
+    else:
+        try:
+            quantity_val = float(quantity)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid quantity value: {quantity}")
+        if quantity_val < 0:
+            raise ValueError("Quantity cannot be negative")
+        record["quantity"] = quantity_val
+    for field in ("hsn_code", "part_number", "location"):
+        value = row.get(field)
+        if not pd.isna(value) and str(value).strip() != "" and str(value).strip().lower() != "nan":
+            record[field] = str(value).strip()
+        else:
+            record[field] = None
+    for field, (field_type, default_value) in {"unit_price": (float, 0.0), "gst_rate": (float, 18.0),
+                                               "reorder_level": (int, 10)}.items():
+        value = row.get(field)
+        if pd.isna(value) or str(value).strip() == "" or str(value).strip().lower() == "nan":
+            record[field] = default_value
+            continue
+        try:
+            parsed_value = field_type(value)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid {field} value: {value}")
+        if field in ("unit_price", "gst_rate") and parsed_value < 0:
+            raise ValueError(f"{field} cannot be negative")
+        if field == "gst_rate" and parsed_value > 100:
+            raise ValueError("GST rate cannot exceed 100%")
+        record[field] = parsed_value
+    return record
+
+
+def legacy_validate_data_types(frame, column_types):
+    """ExcelImportValidator.validate_data_types as it was: one try/except per cell"""
+    import math
+    import pandas as pd
+
+    errors = []
+    for col_name, expected_type in column_types.items():
+        for idx, value in enumerate(frame[col_name]):
+            if pd.isna(value):
+                continue
+            try:
+                if expected_type == float:
+                    if not math.isfinite(float(value)):
+                        errors.append((idx + 2, col_name, f"Invalid number format: '{value}'. Expected a valid decimal number."))
+                elif expected_type == int:
+                    converted = int(float(value))
+                    if converted < 0 and col_name in ["quantity", "reorder_level"]:
+                        errors.append((idx + 2, col_name, f"Value cannot be negative: '{value}'"))
+            except (ValueError, TypeError) as e:
+                errors.append((idx + 2, col_name, f"Invalid {expected_type.__name__} format: '{value}'. {e}"))
+    return errors
+
+
+def legacy_validate(frame):
+    """The pre-schema StockExcelImporter checks: per-cell type loop, per-row rule loops and iterrows"""
+    import pandas as pd
+
+    errors = [
+        f"Row {row}, Column '{column}': {error}"
+        for row, column, error in legacy_validate_data_types(frame, LEGACY_COLUMN_TYPES)
+    ]
+    for idx, rate in enumerate(frame["gst_rate"]):
+        if not pd.isna(rate):
+            try:
+                rate_val = float(rate)
+            except (ValueError, TypeError):
+                continue
+            if rate_val < 0 or rate_val > 100:
+                errors.append(f"Row {idx + 2}, Column 'gst_rate': GST rate must be between 0 and 100%, got {rate_val}%")
+    for idx, hsn in enumerate(frame["hsn_code"]):
+        if not pd.isna(hsn) and str(hsn).strip():
+            hsn_str = str(hsn).strip()
+            if not hsn_str.isdigit() or len(hsn_str) not in (4, 6, 8):
+                errors.append(f"Row {idx + 2}, Column 'hsn_code': HSN code must be 4, 6, or 8 digits, got '{hsn_str}'")
+    records = []
+    for idx, row in frame.iterrows():
+        try:
+            records.append(legacy_process_row(row, idx + 1))
+        except ValueError as e:
+            errors.append(f"Row {idx + 1}: {e}")
+    return records, errors
+
+
+def schema_validate(frame):
+    from app.services.excel_service import StockExcelService
+
+    validation = StockExcelService.IMPORT_SCHEMA.validate(frame)
+    return validation.records(), validation.messages + validation.warnings
+
+
+def best_of(function, frame, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        records, errors = function(frame)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(records), len(errors)
+
+
+def main():
+    args = parse_args()
+    import pandas as pd
+
+    # Both paths start from the DataFrame read from the sheet
+    frame = pd.DataFrame.from_records(generate_rows(args.rows))
+    print(f"\n📊 Validating {args.rows:,} stock import rows (best of {args.repeat})\n")
+    print(f"   {'path':<28}{'time':>10}{'rows/s':>14}{'valid':>10}{'reported':>10}")
+    results = {}
+    for label, function in (("column-wise ImportSchema", schema_validate), ("legacy row-by-row", legacy_validate)):
+        elapsed, valid, reported = best_of(function, frame, args.repeat)
+        results[label] = elapsed
+        print(f"   {label:<28}{elapsed:>8.2f} s{args.rows / elapsed:>14,.0f}{valid:>10,}{reported:>10,}")
+
+    speedup = results["legacy row-by-row"] / results["column-wise ImportSchema"]
+    print(f"\n   ✅ column-wise validation is {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
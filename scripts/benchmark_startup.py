@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Startup (Cold Boot) Benchmark
+
+Imports `app.main` in a fresh interpreter under `python -X importtime`, once with
+every router imported eagerly and once with LAZY_ROUTER_LOADING, and reports
+wall-clock boot time, the cumulative import time of app.main, the number of
+modules loaded, whether heavy dependencies (pandas, openpyxl, PyMuPDF) were
+imported, and the slowest modules by self time.
+
+Results can be appended to a JSON lines file (--output) to track boot time
+across commits.
+
+Usage: python scripts/benchmark_startup.py [--runs 3] [--top 10] [--output startup_times.jsonl]
+"""
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "fitz")
+
+BOOT_CODE = (
+    "from app.core.config import settings; "
+    "settings.LAZY_ROUTER_LOADING = {lazy}; "
+    "import app.main"
+)
+
+
+def parse_importtime(stderr: str):
+    """Parse `-X importtime` lines into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def boot_once(lazy: bool):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_CODE.format(lazy=lazy)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    modules = parse_importtime(result.stderr)
+    error = None
+    if result.returncode != 0:
+        tail = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        error = tail[-1] if tail else f"exit code {result.returncode}"
+    return {
+        "wall_s": wall,
+        "app_main_s": modules.get("app.main", (0, 0))[1] / 1e6,
+        "modules": len(modules),
+        "heavy": [name for name in HEAVY_MODULES if name in modules],
+        "slowest": sorted(modules.items(), key=lambda item: item[1][0], reverse=True),
+        "error": error,
+    }
+
+
+def benchmark(lazy: bool, runs: int, top: int):
+    label = "lazy" if lazy else "eager"
+    boots = [boot_once(lazy) for _ in range(runs)]
+    median_wall = statistics.median(b["wall_s"] for b in boots)
+    median_main = statistics.median(b["app_main_s"] for b in boots)
+    last = boots[-1]
+
+    print(f"\n🚀 {label.upper()} router loading ({runs} runs)")
+    print(f"   Boot wall time (median):     {median_wall:.3f}s")
+    print(f"   app.main cumulative import:  {median_main:.3f}s")
+    print(f"   Modules imported:            {last['modules']}")
+    print(f"   Heavy dependencies imported: {', '.join(last['heavy']) or 'none'}")
+    if last["error"]:
+        print(f"   ❌ import app.main failed: {last['error']}")
+    print(f"   Slowest modules (self time):")
+    for name, (self_us, cumulative_us) in last["slowest"][:top]:
+        print(f"     {self_us / 1000:>9.1f} ms  {name}")
+
+    return {
+        "mode": label,
+        "runs": runs,
+        "wall_s": round(median_wall, 4),
+        "app_main_s": round(median_main, 4),
+        "modules": last["modules"],
+        "heavy": last["heavy"],
+        "error": last["error"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.main cold boot with -X importtime")
+    parser.add_argument("--runs", type=int, default=3, help="Boots per mode (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list")
+    parser.add_argument("--output", help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    results = [benchmark(lazy, args.runs, args.top) for lazy in (False, True)]
+
+    eager, lazy = results
+    if eager["wall_s"] and lazy["wall_s"]:
+        print(f"\n📈 Lazy boot is {eager['wall_s'] / lazy['wall_s']:.2f}x faster "
+              f"({eager['wall_s'] - lazy['wall_s']:.3f}s saved per worker)")
+
+    if args.output:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+        record = {"timestamp": datetime.now().isoformat(), "commit": commit, "results": results}
+        with open(args.output, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"💾 Results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
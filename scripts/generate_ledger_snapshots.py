@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Generate month-end ledger balance snapshots.
+
+The API generates missing snapshots in the background every
+LEDGER_SNAPSHOT_INTERVAL_HOURS; run this to fill them right away (e.g. after
+a migration or a bulk import).
+
+  --rebuild   drop the existing snapshots and regenerate them; needed after
+              bulk updates or raw SQL changes to vouchers in closed months
+
+Usage: python scripts/generate_ledger_snapshots.py [--organization-id 42] [--rebuild]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate month-end ledger balance snapshots")
+    parser.add_argument("--organization-id", type=int, default=None, help="Limit to one organization")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate existing snapshots")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+    from app.services.ledger_snapshot_service import LedgerSnapshotService
+
+    scope = f"organization {args.organization_id}" if args.organization_id else "all organizations"
+    db = SessionLocal()
+    try:
+        rows = LedgerSnapshotService.generate(db, args.organization_id, rebuild=args.rebuild)
+        db.commit()
+        print(f"✅ Wrote {rows} snapshot row(s) ({scope})")
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed: {e}")
+        return 2
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Concurrent Stock Issue Load Test
+
+Fires many parallel inventory issues at one product (one SKU, one location)
+through `InventoryService.create_inventory_transaction` and checks the stock
+movement ledger invariants afterwards:
+
+- exactly min(issues, opening stock) issues succeed, the rest are refused as
+  insufficient stock, and the balance never goes below zero;
+- the final balance is the opening stock minus the successful issues (no lost
+  updates);
+- every movement recorded a distinct balance_after, and the stock entry equals
+  the sum of its movements (`StockLedgerService.reconcile` finds nothing).
+
+The default database is a throwaway SQLite file, where transactions start with
+BEGIN IMMEDIATE because SQLite locks the whole database rather than rows; point
+--database-url at an empty PostgreSQL database to exercise the row locks.
+
+Usage: python scripts/load_test_stock_issues.py [--issues 500] [--stock 400] [--workers 32] [--database-url URL]
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test concurrent stock issues against one product")
+    parser.add_argument("--issues", type=int, default=500, help="Issues of one unit to submit")
+    parser.add_argument("--stock", type=int, default=400, help="Opening stock of the product")
+    parser.add_argument("--workers", type=int, default=32, help="Threads issuing in parallel")
+    parser.add_argument("--database-url", default=None, help="Database URL (default: temp SQLite file)")
+    return parser.parse_args()
+
+
+def create_engine_for(url):
+    from sqlalchemy import create_engine, event
+
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=64, max_overflow=0)
+
+    engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 60}, pool_size=64, max_overflow=0)
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+def seed(session_factory, stock):
+    from app.models.base import Organization, Product, Stock
+
+    db = session_factory()
+    try:
+        db.add(Organization(
+            id=1, name="Load Test Org", subdomain="loadtest", primary_email="load@test.com",
+            primary_phone="1234567890", address1="Address", city="City", state="State",
+            pin_code="123456", plan_type="basic"
+        ))
+        db.add(Product(id=1, organization_id=1, name="Load Test SKU", unit="PCS", unit_price=1.0, reorder_level=0))
+        db.add(Stock(organization_id=1, product_id=1, quantity=float(stock), unit="PCS", location="Main"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    args = parse_args()
+
+    from sqlalchemy import func
+    from sqlalchemy.orm import sessionmaker
+    from app.models.base import Base, Stock, StockMovement
+    from app.api.v1.inventory import InventoryService
+    from app.schemas.inventory import InventoryTransactionCreate, TransactionType
+    from app.services.stock_ledger_service import StockLedgerService, InsufficientStockError
+
+    temp_path = None
+    url = args.database_url
+    if url is None:
+        fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{temp_path}"
+
+    engine = create_engine_for(url)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    seed(session_factory, args.stock)
+
+    issue = InventoryTransactionCreate(
+        product_id=1, transaction_type=TransactionType.ISSUE, quantity=1, unit="PCS", location="Main",
+        stock_before=0, stock_after=0, transaction_date=datetime.utcnow()
+    )
+
+    def issue_one(_):
+        db = session_factory()
+        try:
+            InventoryService.create_inventory_transaction(db, 1, None, issue)
+            return "issued"
+        except InsufficientStockError:
+            db.rollback()
+            return "refused"
+        finally:
+            db.close()
+
+    print(f"🚀 {args.issues} issues of 1 unit against {args.stock} in stock, {args.workers} workers ({engine.dialect.name})")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        outcomes = list(pool.map(issue_one, range(args.issues)))
+    elapsed = time.perf_counter() - start
+
+    issued, refused = outcomes.count("issued"), outcomes.count("refused")
+    db = session_factory()
+    try:
+        balance = db.query(Stock.quantity).filter(Stock.product_id == 1).scalar()
+        balances_after = [value for value, in db.query(StockMovement.balance_after).filter(
+            StockMovement.movement_type == "issue"
+        )]
+        ledger_total = db.query(func.sum(StockMovement.quantity_change)).scalar()
+        mismatches = StockLedgerService.reconcile(db)
+    finally:
+        db.close()
+        engine.dispose()
+        if temp_path:
+            os.unlink(temp_path)
+
+    expected_issued = min(args.issues, args.stock)
+    checks = [
+        (issued == expected_issued, f"issued {issued}, expected {expected_issued} ({refused} refused)"),
+        (balance == args.stock - expected_issued, f"final balance {balance}, expected {args.stock - expected_issued}"),
+        (len(set(balances_after)) == len(balances_after) == issued, f"{len(set(balances_after))} distinct balances after {issued} issues"),
+        (min(balances_after, default=0) >= 0, "no negative balance"),
+        (ledger_total == balance and not mismatches, f"ledger total {ledger_total}, {len(mismatches)} reconciliation mismatch(es)"),
+    ]
+    for passed, message in checks:
+        print(f"   {'✅' if passed else '❌'} {message}")
+    print(f"⏱️  {elapsed:.2f}s, {args.issues / elapsed:.0f} issues/s")
+    return 0 if all(passed for passed, _ in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
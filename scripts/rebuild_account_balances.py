@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Rebuild or verify the account_balances ledger projection.
+
+The projection is kept up to date on every voucher flush; run this after bulk
+imports, raw SQL fixes or restores, or to check it against the vouchers.
+
+  --verify   only report accounts whose projected balance or transaction
+             count differs from the vouchers (exit code 1 on drift)
+
+Usage: python scripts/rebuild_account_balances.py [--organization-id 42] [--verify]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the account_balances projection")
+    parser.add_argument("--organization-id", type=int, default=None, help="Limit to one organization")
+    parser.add_argument("--verify", action="store_true", help="Report drift without rewriting balances")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+    from app.services.account_balance_service import AccountBalanceService
+
+    scope = f"organization {args.organization_id}" if args.organization_id else "all organizations"
+    db = SessionLocal()
+    try:
+        if args.verify:
+            mismatches = AccountBalanceService.verify(db, args.organization_id)
+            if not mismatches:
+                print(f"✅ Account balances match the vouchers ({scope})")
+                return 0
+            print(f"❌ {len(mismatches)} account balance(s) out of sync ({scope}):")
+            for mismatch in mismatches:
+                print(
+                    f"   org {mismatch['organization_id']} {mismatch['account_type']} {mismatch['account_id']}: "
+                    f"expected {mismatch['expected_balance']} ({mismatch['expected_count']} vouchers), "
+                    f"projected {mismatch['projected_balance']} ({mismatch['projected_count']} vouchers)"
+                )
+            print("   Run without --verify to rebuild.")
+            return 1
+
+        rows = AccountBalanceService.rebuild(db, args.organization_id)
+        db.commit()
+        print(f"✅ Rebuilt {rows} account balance(s) ({scope})")
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed: {e}")
+        return 2
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
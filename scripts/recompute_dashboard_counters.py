@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Recompute or verify the materialized dashboard counters.
+
+The counters are kept up to date on every flush of masters, vouchers and
+stock; run this after bulk imports, raw SQL fixes or restores, or to check
+them against the source tables.
+
+  --verify   only report counters that differ from the source tables
+             (exit code 1 on drift)
+
+Usage: python scripts/recompute_dashboard_counters.py [--organization-id 42] [--verify]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute or verify the dashboard_counters table")
+    parser.add_argument("--organization-id", type=int, default=None, help="Limit to one organization")
+    parser.add_argument("--verify", action="store_true", help="Report drift without rewriting counters")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+    from app.services.dashboard_counter_service import DashboardCounterService
+
+    scope = f"organization {args.organization_id}" if args.organization_id else "all organizations"
+    db = SessionLocal()
+    try:
+        if args.verify:
+            mismatches = DashboardCounterService.verify(db, args.organization_id)
+            if not mismatches:
+                print(f"✅ Dashboard counters match the source tables ({scope})")
+                return 0
+            print(f"❌ {len(mismatches)} dashboard counter(s) out of sync ({scope}):")
+            for mismatch in mismatches:
+                print(
+                    f"   org {mismatch['organization_id']} {mismatch['counter']}: "
+                    f"expected {mismatch['expected']}, stored {mismatch['stored']}"
+                )
+            print("   Run without --verify to recompute.")
+            return 1
+
+        rows = DashboardCounterService.recompute(db, args.organization_id)
+        db.commit()
+        print(f"✅ Recomputed dashboard counters for {rows} organization(s) ({scope})")
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed: {e}")
+        return 2
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Reconcile stock balances with the stock movement ledger.
+
+Every stock entry's quantity should equal the sum of its movements. Run this
+after raw SQL fixes or restores, or to check for writers that bypass the
+ledger.
+
+  --repair   record each difference as a "reconciliation" movement, so the
+             ledger explains the current balances (the stock table is not
+             changed)
+
+Usage: python scripts/reconcile_stock.py [--organization-id 42] [--repair]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check stock balances against the stock_movements ledger")
+    parser.add_argument("--organization-id", type=int, default=None, help="Limit to one organization")
+    parser.add_argument("--repair", action="store_true", help="Record differences as reconciliation movements")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+    from app.services.stock_ledger_service import StockLedgerService
+
+    scope = f"organization {args.organization_id}" if args.organization_id else "all organizations"
+    db = SessionLocal()
+    try:
+        mismatches = StockLedgerService.reconcile(db, args.organization_id)
+        if not mismatches:
+            print(f"✅ Stock balances match the movement ledger ({scope})")
+            return 0
+        print(f"❌ {len(mismatches)} stock entr{'y' if len(mismatches) == 1 else 'ies'} out of balance ({scope}):")
+        for mismatch in mismatches:
+            print(
+                f"   org {mismatch['organization_id']} stock {mismatch['stock_id']} "
+                f"(product {mismatch['product_id']}, location {mismatch['location']!r}): "
+                f"stock {mismatch['quantity']}, movements {mismatch['ledger_quantity']}"
+            )
+        if not args.repair:
+            print("   Run with --repair to record the differences as reconciliation movements.")
+            return 1
+
+        recorded = StockLedgerService.repair(db, args.organization_id)
+        db.commit()
+        print(f"✅ Recorded {recorded} reconciliation movement(s) ({scope})")
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed: {e}")
+        return 2
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -192,6 +192,7 @@ def test_import_parsing():
         class MockFile:
             def __init__(self, buffer):
                 self.buffer = buffer
+                self.file = buffer
                 self.filename = "test.xlsx"
             
             async def read(self):
@@ -0,0 +1,210 @@
+# tests/test_account_balances.py
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.query_profiler import query_budget
+from app.models.base import Base, Organization, User, Vendor, Customer
+from app.models.vouchers import (
+    AccountBalance, PurchaseVoucher, PaymentVoucher, SalesVoucher, ReceiptVoucher, CreditNote, DebitNote
+)
+from app.schemas.ledger import LedgerFilters
+from app.services.account_balance_service import AccountBalanceService
+from app.services.ledger_service import LedgerService
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Organization(
+        id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    for model, account_id, name in ((Vendor, 1, "Acme Supplies"), (Customer, 1, "Beta Retail"), (Customer, 2, "Gamma Stores")):
+        session.add(model(
+            id=account_id, organization_id=1, name=name, contact_number=f"98{account_id}",
+            address1="Test Address", city="Test City", state="Test State", pin_code="123456", state_code="TS"
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _voucher(model, number, amount, day=1, **kwargs):
+    return model(
+        organization_id=1, voucher_number=number, date=datetime(2024, 6, day),
+        total_amount=amount, status="confirmed", created_by=1, **kwargs
+    )
+
+
+def _balance(db_session, account_type, account_id):
+    return db_session.query(AccountBalance).filter_by(
+        organization_id=1, account_type=account_type, account_id=account_id
+    ).one_or_none()
+
+
+class TestProjectionMaintenance:
+    """Test that voucher writes keep account_balances in step"""
+
+    def test_creating_vouchers_updates_balances(self, db_session):
+        db_session.add_all([
+            _voucher(PurchaseVoucher, "PV001", 1000.0, vendor_id=1),
+            _voucher(PaymentVoucher, "PAY001", 300.0, day=5, vendor_id=1),
+            _voucher(SalesVoucher, "SV001", 1500.0, customer_id=1),
+            _voucher(ReceiptVoucher, "RV001", 500.0, day=3, customer_id=1),
+        ])
+        db_session.commit()
+
+        vendor = _balance(db_session, "vendor", 1)
+        customer = _balance(db_session, "customer", 1)
+        assert (vendor.balance, vendor.transaction_count) == (700.0, 2)
+        assert (customer.balance, customer.transaction_count) == (1000.0, 2)
+        assert vendor.last_transaction_date.day == 5
+
+    def test_party_assigned_through_relationship(self, db_session):
+        customer = db_session.get(Customer, 2)
+        db_session.add(_voucher(SalesVoucher, "SV001", 250.0, customer=customer))
+        db_session.commit()
+        assert _balance(db_session, "customer", 2).balance == 250.0
+
+    def test_notes_follow_their_party(self, db_session):
+        db_session.add_all([
+            _voucher(SalesVoucher, "SV001", 1000.0, customer_id=1),
+            _voucher(CreditNote, "CN001", 100.0, customer_id=1, reason="Discount"),
+            _voucher(DebitNote, "DN001", 40.0, customer_id=1, reason="Short payment"),
+            _voucher(DebitNote, "DN002", 60.0, vendor_id=1, reason="Freight"),
+        ])
+        db_session.commit()
+        assert _balance(db_session, "customer", 1).balance == 1060.0
+        assert _balance(db_session, "vendor", 1).balance == 60.0
+
+    def test_update_cancel_and_delete(self, db_session):
+        first = _voucher(SalesVoucher, "SV001", 1000.0, day=1, customer_id=1)
+        second = _voucher(SalesVoucher, "SV002", 400.0, day=9, customer_id=1)
+        db_session.add_all([first, second])
+        db_session.commit()
+
+        first.total_amount = 1200.0
+        db_session.commit()
+        assert _balance(db_session, "customer", 1).balance == 1600.0
+
+        second.status = "cancelled"
+        db_session.commit()
+        balance = _balance(db_session, "customer", 1)
+        db_session.refresh(balance)
+        assert (balance.balance, balance.transaction_count) == (1200.0, 1)
+        assert balance.last_transaction_date.day == 1
+
+        db_session.delete(first)
+        db_session.commit()
+        db_session.refresh(balance)
+        assert (balance.balance, balance.transaction_count) == (0.0, 0)
+        assert balance.last_transaction_date is None
+
+    def test_moving_a_voucher_between_customers(self, db_session):
+        voucher = _voucher(SalesVoucher, "SV001", 800.0, customer_id=1)
+        db_session.add(voucher)
+        db_session.commit()
+
+        voucher.customer_id = 2
+        db_session.commit()
+        assert _balance(db_session, "customer", 1).balance == 0.0
+        assert _balance(db_session, "customer", 2).balance == 800.0
+
+    def test_rollback_discards_balance_changes(self, db_session):
+        db_session.add(_voucher(SalesVoucher, "SV001", 800.0, customer_id=1))
+        db_session.flush()
+        db_session.rollback()
+        assert _balance(db_session, "customer", 1) is None
+
+
+class TestRebuildAndVerify:
+    """Test the rebuild/verify command backend"""
+
+    def test_verify_detects_and_rebuild_repairs_drift(self, db_session):
+        db_session.add_all([
+            _voucher(SalesVoucher, "SV001", 1500.0, customer_id=1),
+            _voucher(PurchaseVoucher, "PV001", 700.0, vendor_id=1),
+        ])
+        db_session.commit()
+        assert AccountBalanceService.verify(db_session) == []
+
+        # Bulk updates bypass the flush listener
+        db_session.execute(update(SalesVoucher).values(total_amount=2000.0))
+        db_session.commit()
+        (mismatch,) = AccountBalanceService.verify(db_session)
+        assert (mismatch["expected_balance"], mismatch["projected_balance"]) == (2000.0, 1500.0)
+
+        assert AccountBalanceService.rebuild(db_session) == 2
+        db_session.commit()
+        assert AccountBalanceService.verify(db_session) == []
+        assert _balance(db_session, "customer", 1).balance == 2000.0
+
+    def test_backfill_only_when_empty(self, db_session):
+        db_session.add(_voucher(SalesVoucher, "SV001", 1500.0, customer_id=1))
+        db_session.commit()
+        assert AccountBalanceService.backfill_if_empty(db_session) is False
+
+        db_session.query(AccountBalance).delete()
+        db_session.commit()
+        assert AccountBalanceService.backfill_if_empty(db_session) is True
+        assert _balance(db_session, "customer", 1).balance == 1500.0
+
+
+class TestOutstandingLedgerFromProjection:
+    """Test that the outstanding ledger reads the projection"""
+
+    @pytest.fixture
+    def vouchers(self, db_session):
+        db_session.add_all([
+            _voucher(PurchaseVoucher, "PV001", 1000.0, vendor_id=1),
+            _voucher(PaymentVoucher, "PAY001", 300.0, day=5, vendor_id=1),
+            _voucher(SalesVoucher, "SV001", 1500.0, customer_id=1),
+            _voucher(SalesVoucher, "SV002", 250.5, customer_id=2),
+            _voucher(SalesVoucher, "SV003", 999.0, customer_id=2),
+        ])
+        db_session.commit()
+        voucher = db_session.query(SalesVoucher).filter_by(voucher_number="SV003").one()
+        voucher.status = "cancelled"
+        db_session.commit()
+
+    def test_matches_voucher_scan(self, db_session, vouchers, monkeypatch):
+        filters = LedgerFilters()
+        projected = LedgerService.get_outstanding_ledger(db_session, 1, filters)
+        monkeypatch.setattr(settings, "LEDGER_BALANCE_PROJECTION_ENABLED", False)
+        scanned = LedgerService.get_outstanding_ledger(db_session, 1, filters)
+
+        def rows(response):
+            return [
+                (b.account_type, b.account_id, b.account_name, b.outstanding_amount, b.transaction_count, b.contact_info)
+                for b in response.outstanding_balances
+            ]
+
+        assert rows(projected) == rows(scanned)
+        assert projected.total_payable == scanned.total_payable == Decimal("-700")
+        assert projected.total_receivable == scanned.total_receivable == Decimal("1750.5")
+
+    def test_single_query(self, db_session, vouchers):
+        with query_budget(1):
+            response = LedgerService.get_outstanding_ledger(db_session, 1, LedgerFilters(account_type="customer"))
+        assert [b.account_name for b in response.outstanding_balances] == ["Beta Retail", "Gamma Stores"]
+
+    def test_date_filtered_requests_scan_vouchers(self, db_session, vouchers):
+        response = LedgerService.get_outstanding_ledger(
+            db_session, 1, LedgerFilters(start_date=datetime(2024, 6, 2).date())
+        )
+        assert [(b.account_type, b.outstanding_amount) for b in response.outstanding_balances] == [
+            ("vendor", Decimal("-300"))
+        ]
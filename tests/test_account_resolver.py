@@ -0,0 +1,146 @@
+# tests/test_account_resolver.py
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import reports
+from app.api.v1.auth import get_current_active_user
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.core.query_profiler import profile_queries, query_budget
+from app.core.tenant import TenantContext
+from app.models.base import Base, Organization, User, Vendor, Customer
+from app.models.vouchers import PurchaseVoucher, PaymentVoucher, SalesVoucher
+from app.services import account_resolver
+from app.services.account_resolver import resolve_accounts
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    session.commit()
+    session.close()
+    return factory
+
+
+def _seed_accounts(session, count, org_id=1, first_id=1):
+    for account_id in range(first_id, first_id + count):
+        for model, prefix in ((Vendor, "Vendor"), (Customer, "Customer")):
+            session.add(model(
+                id=account_id, organization_id=org_id, name=f"{prefix} {account_id:03d}",
+                contact_number=f"98{account_id:08d}", email=f"{prefix.lower()}{account_id}@test.com",
+                address1="Test Address", city="Test City", state="Test State", pin_code="123456", state_code="TS"
+            ))
+        session.add_all([
+            PurchaseVoucher(organization_id=org_id, voucher_number=f"PV{account_id:03d}", date=datetime(2024, 6, 1),
+                            vendor_id=account_id, total_amount=1000.0, status="confirmed", created_by=1),
+            PaymentVoucher(organization_id=org_id, voucher_number=f"PAY{account_id:03d}", date=datetime(2024, 6, 2),
+                           vendor_id=account_id, total_amount=400.0, status="confirmed", created_by=1),
+            SalesVoucher(organization_id=org_id, voucher_number=f"SV{account_id:03d}", date=datetime(2024, 6, 3),
+                         customer_id=account_id, total_amount=700.0, status="confirmed", created_by=1),
+        ])
+    session.commit()
+
+
+class TestResolveAccounts:
+    """Test bulk account resolution"""
+
+    def test_one_query_per_account_type(self, session_factory):
+        session = session_factory()
+        _seed_accounts(session, 5)
+        accounts = [("vendor", 1), ("vendor", 3), ("vendor", 3), ("customer", 2), ("customer", 99), ("vendor", None)]
+
+        with query_budget(2):
+            resolved = resolve_accounts(session, accounts)
+
+        assert sorted(resolved) == [("customer", 2), ("vendor", 1), ("vendor", 3)]
+        assert resolved[("vendor", 3)].name == "Vendor 003"
+        assert resolved[("customer", 2)].contact_number == "9800000002"
+        assert resolved[("customer", 2)].email == "customer2@test.com"
+
+    def test_organization_scope_and_chunking(self, session_factory, monkeypatch):
+        session = session_factory()
+        _seed_accounts(session, 5)
+        _seed_accounts(session, 2, org_id=2, first_id=6)
+        monkeypatch.setattr(account_resolver, "RESOLVE_CHUNK_SIZE", 2)
+
+        accounts = [("vendor", account_id) for account_id in range(1, 8)]
+        with profile_queries() as profile:
+            resolved = resolve_accounts(session, accounts, organization_id=1)
+        assert sorted(account_id for _, account_id in resolved) == [1, 2, 3, 4, 5]
+        assert profile.query_count == 4
+
+
+class TestReportQueryCounts:
+    """Ledger and report endpoints issue a constant number of queries however many accounts they list"""
+
+    def _get(self, session_factory, path, **params):
+        session = session_factory()
+        app = FastAPI()
+        app.include_router(reports.router, prefix="/api/v1/reports")
+        app.dependency_overrides[get_read_db] = lambda: session
+        user = session.get(User, 1)
+        app.dependency_overrides[get_current_active_user] = lambda: user
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get(f"/api/v1/reports{path}", params=params)
+
+        with profile_queries() as profile:
+            response = asyncio.run(request())
+        session.close()
+        assert response.status_code == 200, response.text
+        return response.json(), profile.query_count
+
+    @pytest.mark.parametrize("accounts", [2, 25])
+    def test_outstanding_ledger_scan(self, session_factory, monkeypatch, accounts):
+        monkeypatch.setattr(settings, "LEDGER_BALANCE_PROJECTION_ENABLED", False)
+        _seed_accounts(session_factory(), accounts)
+
+        body, queries = self._get(session_factory, "/outstanding-ledger")
+        # Ledger query + one vendor lookup + one customer lookup
+        assert queries == 3
+        balances = body["outstanding_balances"]
+        assert len(balances) == accounts * 2
+        assert {b["contact_info"] for b in balances if b["account_id"] == 1} == {"9800000001"}
+
+    @pytest.mark.parametrize("accounts", [2, 25])
+    def test_complete_ledger(self, session_factory, accounts):
+        _seed_accounts(session_factory(), accounts)
+        body, queries = self._get(session_factory, "/complete-ledger")
+        assert queries == 1
+        assert len(body["transactions"]) == accounts * 3
+
+    @pytest.mark.parametrize("accounts", [2, 25])
+    def test_sales_report(self, session_factory, accounts):
+        _seed_accounts(session_factory(), accounts)
+        TenantContext.set_organization_id(1)
+        try:
+            body, queries = self._get(session_factory, "/sales-report")
+        finally:
+            TenantContext.clear()
+        assert queries == 2
+        assert body["vouchers"][0]["customer_name"] == "Customer 001"
@@ -0,0 +1,164 @@
+# tests/test_ageing_report.py
+
+import asyncio
+import io
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from openpyxl import load_workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import reports
+from app.api.v1.auth import get_current_active_user
+from app.core.database import get_read_db
+from app.core.query_profiler import query_budget
+from app.models.base import Base, Organization, User, Vendor, Customer
+from app.models.vouchers import PurchaseVoucher, PaymentVoucher, SalesVoucher, ReceiptVoucher
+from app.schemas.ledger import LedgerFilters
+from app.services.ledger_service import LedgerService
+
+AS_OF = date(2024, 6, 30)
+
+
+def _days_ago(days):
+    return datetime.combine(AS_OF - timedelta(days=days), datetime.min.time()).replace(hour=11)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Organization(
+        id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    for model, account_id, name in (
+        (Vendor, 1, "Acme Supplies"), (Customer, 1, "Beta Retail"), (Customer, 2, "Gamma Stores"), (Customer, 3, "Delta Mart")
+    ):
+        session.add(model(
+            id=account_id, organization_id=1, name=name, contact_number=f"98{account_id}",
+            address1="Test Address", city="Test City", state="Test State", pin_code="123456", state_code="TS"
+        ))
+
+    def voucher(model, number, amount, days_ago, status="confirmed", **kwargs):
+        session.add(model(
+            organization_id=1, voucher_number=number, date=_days_ago(days_ago),
+            total_amount=amount, status=status, created_by=1, **kwargs
+        ))
+
+    # Beta Retail: the receipt clears the oldest invoice and part of the next
+    voucher(SalesVoucher, "SV001", 1000.0, 100, customer_id=1)
+    voucher(SalesVoucher, "SV002", 500.0, 45, customer_id=1)
+    voucher(SalesVoucher, "SV003", 300.0, 10, customer_id=1)
+    voucher(ReceiptVoucher, "RV001", 1200.0, 20, customer_id=1)
+    voucher(SalesVoucher, "SV-FUTURE", 700.0, -3, customer_id=1)
+    # Gamma Stores: advance with no invoice
+    voucher(ReceiptVoucher, "RV002", 200.0, 5, customer_id=2)
+    # Delta Mart: cancelled invoices do not age
+    voucher(SalesVoucher, "SV004", 400.0, 70, customer_id=3)
+    voucher(SalesVoucher, "SV005", 999.0, 5, customer_id=3, status="cancelled")
+    # Acme Supplies: an old bill, partly paid
+    voucher(PurchaseVoucher, "PV001", 800.0, 120, vendor_id=1)
+    voucher(PaymentVoucher, "PAY001", 100.0, 30, vendor_id=1)
+    session.commit()
+    yield session
+    session.close()
+
+
+def _row(balance):
+    return (
+        balance.days_0_30, balance.days_31_60, balance.days_61_90, balance.days_over_90,
+        balance.total_outstanding, balance.unapplied_amount
+    )
+
+
+class TestAgeingReport:
+    """Test FIFO ageing computed in SQL"""
+
+    def test_fifo_buckets(self, db_session):
+        report = LedgerService.get_ageing_report(db_session, 1, LedgerFilters(), AS_OF)
+        balances = {(b.account_type, b.account_name): b for b in report.balances}
+        D = Decimal
+
+        assert _row(balances[("customer", "Beta Retail")]) == (D("300.0"), D("300.0"), D("0.0"), D("0.0"), D("600.0"), D("0.0"))
+        assert balances[("customer", "Beta Retail")].oldest_open_date.date() == AS_OF - timedelta(days=45)
+        assert _row(balances[("customer", "Delta Mart")]) == (D("0.0"), D("0.0"), D("400.0"), D("0.0"), D("400.0"), D("0.0"))
+        assert _row(balances[("customer", "Gamma Stores")]) == (D("0.0"), D("0.0"), D("0.0"), D("0.0"), D("0.0"), D("200.0"))
+        assert _row(balances[("vendor", "Acme Supplies")]) == (D("0.0"), D("0.0"), D("0.0"), D("700.0"), D("700.0"), D("0.0"))
+        assert balances[("vendor", "Acme Supplies")].contact_info == "981"
+
+        # Largest outstanding first
+        assert [b.account_name for b in report.balances] == ["Acme Supplies", "Beta Retail", "Delta Mart", "Gamma Stores"]
+        assert report.receivables["total_outstanding"] == Decimal("1000.0")
+        assert report.receivables["days_31_60"] == Decimal("300.0")
+        assert report.payables["days_over_90"] == Decimal("700.0")
+
+    def test_as_of_date_moves_buckets(self, db_session):
+        report = LedgerService.get_ageing_report(
+            db_session, 1, LedgerFilters(account_type="customer", account_id=1), AS_OF + timedelta(days=30)
+        )
+        (balance,) = report.balances
+        # SV-FUTURE is now in range; SV002 has aged past 60 days
+        assert _row(balance) == (
+            Decimal("700.0"), Decimal("300.0"), Decimal("300.0"), Decimal("0.0"), Decimal("1300.0"), Decimal("0.0")
+        )
+
+    def test_reconciles_with_outstanding_ledger(self, db_session):
+        report = LedgerService.get_ageing_report(db_session, 1, LedgerFilters(), date(2024, 12, 31))
+        outstanding = LedgerService.get_outstanding_ledger(db_session, 1, LedgerFilters())
+        aged = {(b.account_type, b.account_id): b.total_outstanding - b.unapplied_amount for b in report.balances}
+        assert aged == {
+            (b.account_type, b.account_id): abs(b.outstanding_amount) if b.account_type == "vendor" else b.outstanding_amount
+            for b in outstanding.outstanding_balances
+        }
+
+    def test_single_query(self, db_session):
+        with query_budget(1):
+            LedgerService.get_ageing_report(db_session, 1, LedgerFilters(), AS_OF)
+
+
+class TestAgeingEndpoints:
+    """Test the ageing endpoint and its Excel export"""
+
+    def _get(self, db_session, path, **params):
+        app = FastAPI()
+        app.include_router(reports.router, prefix="/api/v1/reports")
+        app.dependency_overrides[get_read_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: db_session.get(User, 1)
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get(f"/api/v1/reports{path}", params=params)
+        return asyncio.run(request())
+
+    def test_ageing_endpoint(self, db_session):
+        response = self._get(db_session, "/ageing-report", as_of_date=AS_OF.isoformat(), account_type="customer")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["as_of_date"] == "2024-06-30"
+        assert [b["account_name"] for b in body["balances"]] == ["Beta Retail", "Delta Mart", "Gamma Stores"]
+        assert Decimal(body["summary"]["total_receivable"]) == Decimal("1000")
+
+    def test_excel_export(self, db_session):
+        response = self._get(db_session, "/ageing-report/export/excel", as_of_date=AS_OF.isoformat())
+        assert response.status_code == 200
+
+        sheet = load_workbook(io.BytesIO(response.content)).active
+        rows = list(sheet.iter_rows(values_only=True))
+        assert rows[1][:4] == ("Account Type", "Account Name", "Contact", "0-30 Days")
+        assert rows[2][:8] == ("vendor", "Acme Supplies", "981", 0, 0, 0, 700, 700)
+        assert ("Total Receivables", None, None, 300, 300, 400, 0, 1000, 200) in [row[:9] for row in rows]
@@ -0,0 +1,131 @@
+# tests/test_async_database.py
+
+import asyncio
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.core.database import Base, get_async_database_url
+from app.core.tenant import TenantContext
+from app.models.base import Organization, User, Vendor, Customer, Product, Stock
+from app.models.vouchers import PurchaseVoucher, PurchaseVoucherItem, SalesVoucher, SalesVoucherItem
+from app.schemas.vouchers import PurchaseVoucherInDB, SalesVoucherInDB
+from app.api.reports import get_dashboard_statistics
+from app.api.v1.vouchers.sales_voucher import get_sales_vouchers
+from app.api.v1.vouchers.purchase_voucher import get_purchase_vouchers
+
+
+def _seed(session):
+    session.add(Organization(
+        id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", full_name="Test User", role="admin", is_active=True
+    ))
+    party = dict(organization_id=1, contact_number="1234567890", address1="Test Address",
+                 city="Test City", state="Test State", pin_code="123456", state_code="TS")
+    session.add(Vendor(id=1, name="Test Vendor", **party))
+    session.add(Customer(id=1, name="Test Customer", **party))
+    session.add(Customer(id=2, name="Inactive Customer", is_active=False, **party))
+    session.add(Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0, reorder_level=5))
+    session.add(Stock(organization_id=1, product_id=1, quantity=2, unit="PCS"))
+    session.add(SalesVoucher(
+        id=1, organization_id=1, voucher_number="SV001", date=datetime(2024, 6, 1),
+        customer_id=1, total_amount=118.0, created_by=1,
+        items=[SalesVoucherItem(product_id=1, quantity=10, unit="PCS", unit_price=10.0,
+                                taxable_amount=100.0, total_amount=118.0)]
+    ))
+    session.add(PurchaseVoucher(
+        id=1, organization_id=1, voucher_number="PV001", date=datetime(2024, 6, 1),
+        vendor_id=1, total_amount=59.0, created_by=1,
+        items=[PurchaseVoucherItem(product_id=1, quantity=5, unit="PCS", unit_price=10.0,
+                                   taxable_amount=50.0, total_amount=59.0)]
+    ))
+
+
+@pytest.fixture
+def async_session_factory():
+    """Create an aiosqlite in-memory database with seed data"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            _seed(session)
+            await session.commit()
+
+    asyncio.run(setup())
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def current_user():
+    user = User(id=1, organization_id=1, email="test@test.com", role="admin", is_active=True)
+    TenantContext.set_organization_id(1)
+    yield user
+    TenantContext.clear()
+
+
+class TestAsyncDatabaseUrl:
+    """Test mapping of sync database URLs to async drivers"""
+
+    def test_postgres_urls_use_asyncpg(self):
+        assert get_async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        assert get_async_database_url("postgres://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        assert get_async_database_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+    def test_sqlite_url_uses_aiosqlite(self):
+        assert get_async_database_url("sqlite:///./tritiq_erp.db") == "sqlite+aiosqlite:///./tritiq_erp.db"
+
+    def test_already_async_url_is_unchanged(self):
+        assert get_async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+class TestAsyncRoutes:
+    """Test routes migrated to the async session path"""
+
+    def test_dashboard_stats(self, async_session_factory, current_user):
+        async def run():
+            async with async_session_factory() as db:
+                return await get_dashboard_statistics(db=db, current_user=current_user)
+
+        stats = asyncio.run(run())
+        assert stats == {
+            "masters": {"vendors": 1, "customers": 1, "products": 1},
+            "vouchers": {"purchase_vouchers": 1, "sales_vouchers": 1},
+            "inventory": {"low_stock_items": 1}
+        }
+
+    def test_sales_voucher_list_serializes_without_lazy_loads(self, async_session_factory, current_user):
+        async def run():
+            async with async_session_factory() as db:
+                vouchers = await get_sales_vouchers(
+                    skip=0, limit=5, status=None, sort="desc", sortBy="created_at",
+                    db=db, current_user=current_user
+                )
+                return [SalesVoucherInDB.model_validate(v, from_attributes=True) for v in vouchers]
+
+        vouchers = asyncio.run(run())
+        assert len(vouchers) == 1
+        assert vouchers[0].voucher_number == "SV001"
+        assert len(vouchers[0].items) == 1
+
+    def test_purchase_voucher_list_loads_vendor_and_products(self, async_session_factory, current_user):
+        async def run():
+            async with async_session_factory() as db:
+                vouchers = await get_purchase_vouchers(
+                    skip=0, limit=5, status="draft", sort="asc", sortBy="date",
+                    db=db, current_user=current_user
+                )
+                return [PurchaseVoucherInDB.model_validate(v, from_attributes=True) for v in vouchers]
+
+        vouchers = asyncio.run(run())
+        assert len(vouchers) == 1
+        assert vouchers[0].vendor.name == "Test Vendor"
+        assert vouchers[0].items[0].product.name == "Widget"
@@ -0,0 +1,111 @@
+# tests/test_auth_trace.py
+
+import logging
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.auth_cache import principal_cache
+from app.core.config import Settings, settings
+from app.core.logging import AuthTrace, start_auth_trace, auth_trace_span
+from app.core.security import create_access_token, get_current_principal, get_current_user, verify_token
+from app.models.base import Base, User
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(
+        id=1, organization_id=1, email="trace@test.com", username="trace",
+        hashed_password="hashed", role="standard_user", is_active=True
+    ))
+    session.commit()
+    principal_cache.clear()
+    yield session
+    principal_cache.clear()
+    session.close()
+
+
+@pytest.fixture
+def trace_everything(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRACE_SAMPLE_RATE", 1.0)
+
+
+def _trace_records(caplog):
+    return [r.auth_trace for r in caplog.records if hasattr(r, "auth_trace")]
+
+
+class TestAuthTraceSampling:
+    """Test auth trace sampling and spans"""
+
+    def test_tracing_is_off_by_default(self):
+        assert settings.AUTH_TRACE_SAMPLE_RATE == 0.0
+        assert start_auth_trace("test") is None
+
+    def test_full_sample_rate_always_traces(self, trace_everything):
+        assert isinstance(start_auth_trace("test"), AuthTrace)
+
+    def test_partial_sample_rate_uses_random_draw(self, monkeypatch):
+        monkeypatch.setattr(settings, "AUTH_TRACE_SAMPLE_RATE", 0.25)
+        monkeypatch.setattr("app.core.logging.random.random", lambda: 0.2)
+        assert start_auth_trace("test") is not None
+        monkeypatch.setattr("app.core.logging.random.random", lambda: 0.3)
+        assert start_auth_trace("test") is None
+
+    def test_span_on_unsampled_trace_is_noop(self):
+        with auth_trace_span(None, "decode"):
+            pass
+
+    def test_span_records_milliseconds(self):
+        trace = AuthTrace("test")
+        with trace.span("decode"):
+            pass
+        data = trace.as_dict()
+        assert data["decode_ms"] >= 0
+        assert data["total_ms"] == data["decode_ms"]
+
+    def test_sample_rate_must_be_a_fraction(self):
+        with pytest.raises(ValidationError):
+            Settings(AUTH_TRACE_SAMPLE_RATE=1.5)
+
+
+class TestAuthTraceInDependencies:
+    """Test that auth dependencies emit traces and never print tokens"""
+
+    def test_verify_token_does_not_print(self, capsys):
+        token = create_access_token("trace@test.com", organization_id=1)
+        assert verify_token(token)[0] == "trace@test.com"
+        assert verify_token("not-a-token") == (None, None, None, None)
+        assert capsys.readouterr().out == ""
+
+    def test_get_current_user_records_decode_and_lookup(self, db_session, trace_everything, caplog, capsys):
+        token = create_access_token("trace@test.com", organization_id=1)
+        with caplog.at_level(logging.INFO, logger="fastapi_migration.auth_trace"):
+            get_current_user(db=db_session, token=token)
+
+        (trace,) = _trace_records(caplog)
+        assert trace["source"] == "get_current_user"
+        assert trace["outcome"] == "ok"
+        assert "decode_ms" in trace and "user_lookup_ms" in trace
+        assert token not in capsys.readouterr().out
+
+    def test_get_current_principal_records_cache_hit_and_miss(self, db_session, trace_everything, caplog):
+        token = create_access_token("trace@test.com", organization_id=1)
+        with caplog.at_level(logging.INFO, logger="fastapi_migration.auth_trace"):
+            get_current_principal(db=db_session, token=token)
+            get_current_principal(db=db_session, token=token)
+
+        miss, hit = _trace_records(caplog)
+        assert miss["cache"] == "miss" and "user_lookup_ms" in miss
+        assert hit["cache"] == "hit" and "user_lookup_ms" not in hit
+
+    def test_invalid_token_outcome_is_traced(self, db_session, trace_everything, caplog):
+        with caplog.at_level(logging.INFO, logger="fastapi_migration.auth_trace"):
+            with pytest.raises(Exception):
+                get_current_user(db=db_session, token="garbage")
+
+        (trace,) = _trace_records(caplog)
+        assert trace["outcome"] == "invalid_token"
@@ -0,0 +1,277 @@
+# tests/test_dashboard_counters.py
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.reports import get_dashboard_statistics
+from app.core.query_profiler import query_budget
+from app.core.tenant import TenantContext
+from app.models.base import Base, Organization, User, Vendor, Customer, Product, Stock, DashboardCounter
+from app.models.vouchers import PurchaseVoucher, SalesVoucher
+from app.services.dashboard_counter_service import DashboardCounterService, COUNTER_COLUMNS
+
+PARTY = dict(contact_number="1234567890", address1="Test Address", city="Test City",
+             state="Test State", pin_code="123456", state_code="TS")
+
+
+def _organization(org_id):
+    return Organization(
+        id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    )
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([_organization(1), _organization(2)])
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _stored(session, org_id=1):
+    row = session.query(DashboardCounter).filter_by(organization_id=org_id).one_or_none()
+    return {column: getattr(row, column) for column in COUNTER_COLUMNS} if row else None
+
+
+def _counts(**values):
+    return {column: values.get(column, 0) for column in COUNTER_COLUMNS}
+
+
+class TestCounterMaintenance:
+    """Test counters maintained by the flush listeners"""
+
+    def test_first_change_creates_a_full_row(self, db_session):
+        assert _stored(db_session) is None
+        db_session.add(Vendor(id=1, organization_id=1, name="Acme", **PARTY))
+        db_session.commit()
+        assert _stored(db_session) == _counts(vendors=1)
+        assert _stored(db_session, 2) is None
+
+    def test_masters_follow_create_delete_and_deactivate(self, db_session):
+        db_session.add_all([
+            Vendor(id=1, organization_id=1, name="Acme", **PARTY),
+            Customer(id=1, organization_id=1, name="Beta", **PARTY),
+            Customer(id=2, organization_id=1, name="Gamma", **PARTY),
+            Customer(id=3, organization_id=1, name="Dormant", is_active=False, **PARTY),
+            Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0),
+        ])
+        db_session.commit()
+        assert _stored(db_session) == _counts(vendors=1, customers=2, products=1)
+
+        db_session.get(Customer, 2).is_active = False
+        db_session.get(Customer, 3).is_active = True
+        db_session.delete(db_session.get(Vendor, 1))
+        db_session.commit()
+        assert _stored(db_session) == _counts(customers=2, products=1)
+
+        # Deleting an inactive master does not change the count
+        db_session.delete(db_session.get(Customer, 2))
+        db_session.commit()
+        assert _stored(db_session) == _counts(customers=2, products=1)
+
+    def test_moving_between_organizations(self, db_session):
+        db_session.add(Vendor(id=1, organization_id=1, name="Acme", **PARTY))
+        db_session.commit()
+        DashboardCounterService.recompute(db_session)
+        db_session.commit()
+
+        db_session.get(Vendor, 1).organization_id = 2
+        db_session.commit()
+        assert _stored(db_session, 1)["vendors"] == 0
+        assert _stored(db_session, 2)["vendors"] == 1
+
+    def test_vouchers(self, db_session):
+        db_session.add_all([
+            Vendor(id=1, organization_id=1, name="Acme", **PARTY),
+            Customer(id=1, organization_id=1, name="Beta", **PARTY),
+        ])
+        db_session.add_all([
+            PurchaseVoucher(organization_id=1, voucher_number="PV001", date=datetime(2024, 6, 1),
+                            vendor_id=1, total_amount=100.0, created_by=1),
+            SalesVoucher(organization_id=1, voucher_number="SV001", date=datetime(2024, 6, 1),
+                         customer_id=1, total_amount=100.0, status="cancelled", created_by=1),
+            SalesVoucher(organization_id=1, voucher_number="SV002", date=datetime(2024, 6, 2),
+                         customer_id=1, total_amount=100.0, created_by=1),
+        ])
+        db_session.commit()
+        assert _stored(db_session) == _counts(vendors=1, customers=1, purchase_vouchers=1, sales_vouchers=2)
+
+        db_session.query(SalesVoucher).filter_by(voucher_number="SV002").one().total_amount = 150.0
+        db_session.delete(db_session.query(PurchaseVoucher).one())
+        db_session.commit()
+        assert _stored(db_session) == _counts(vendors=1, customers=1, sales_vouchers=2)
+
+    def test_low_stock_follows_stock_and_products(self, db_session):
+        db_session.add_all([
+            Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0, reorder_level=5),
+            Product(id=2, organization_id=1, name="Gadget", unit="PCS", unit_price=10.0, reorder_level=0),
+        ])
+        db_session.add_all([
+            Stock(organization_id=1, product_id=1, quantity=2, unit="PCS", location="A"),
+            Stock(organization_id=1, product_id=1, quantity=20, unit="PCS", location="B"),
+            Stock(organization_id=1, product_id=2, quantity=3, unit="PCS"),
+        ])
+        db_session.commit()
+        assert _stored(db_session)["low_stock_items"] == 1
+
+        stock_b = db_session.query(Stock).filter_by(location="B").one()
+        stock_b.quantity = 5
+        db_session.commit()
+        assert _stored(db_session)["low_stock_items"] == 2
+
+        db_session.get(Product, 2).reorder_level = 10
+        db_session.commit()
+        assert _stored(db_session)["low_stock_items"] == 3
+
+        db_session.get(Product, 1).is_active = False
+        db_session.commit()
+        assert _stored(db_session) == _counts(products=1, low_stock_items=1)
+
+        db_session.delete(db_session.query(Stock).filter_by(product_id=2).one())
+        db_session.commit()
+        assert _stored(db_session)["low_stock_items"] == 0
+
+    def test_low_stock_changes_are_deltas_of_the_affected_entries(self, db_session):
+        db_session.add_all([
+            Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0, reorder_level=5),
+            Product(id=2, organization_id=1, name="Gadget", unit="PCS", unit_price=10.0, reorder_level=0),
+        ])
+        db_session.add_all([
+            Stock(id=1, organization_id=1, product_id=1, quantity=20, unit="PCS", location="A"),
+            Stock(id=2, organization_id=1, product_id=2, quantity=3, unit="PCS", location="B"),
+            Stock(id=3, organization_id=1, product_id=2, quantity=30, unit="PCS", location="C"),
+        ])
+        db_session.commit()
+        # A bulk write makes entry 3 low without the listeners seeing it
+        db_session.execute(update(Stock).where(Stock.id == 3).values(quantity=0))
+        db_session.commit()
+        assert _stored(db_session)["low_stock_items"] == 0
+
+        # Entry 1 moves to Gadget and Gadget's reorder level rises in one flush: entries 1 and 2 become low
+        stock, product = db_session.get(Stock, 1), db_session.get(Product, 2)
+        stock.product_id = 2
+        product.reorder_level = 25
+        db_session.commit()
+        assert _stored(db_session)["low_stock_items"] == 2
+        assert [(m["counter"], m["expected"], m["stored"]) for m in DashboardCounterService.verify(db_session, 1)] == [
+            ("low_stock_items", 3, 2)
+        ]
+
+    def test_one_update_per_flush(self, db_session):
+        db_session.add(Vendor(id=1, organization_id=1, name="Acme", **PARTY))
+        db_session.commit()
+
+        db_session.add_all([Vendor(id=i, organization_id=1, name=f"Vendor {i}", **PARTY) for i in range(2, 12)])
+        # The vendor inserts plus a single counter UPDATE, not one per vendor
+        with query_budget(11):
+            db_session.flush()
+        db_session.commit()
+        assert _stored(db_session)["vendors"] == 11
+
+    def test_rollback_discards_changes(self, db_session):
+        db_session.add(Vendor(id=1, organization_id=1, name="Acme", **PARTY))
+        db_session.commit()
+        db_session.add(Vendor(id=2, organization_id=1, name="Temp", **PARTY))
+        db_session.flush()
+        db_session.rollback()
+        assert _stored(db_session)["vendors"] == 1
+
+
+class TestRecomputeAndVerify:
+    """Test the consistency recompute"""
+
+    def test_recompute_repairs_bulk_changes(self, db_session):
+        db_session.add_all([Customer(id=i, organization_id=1, name=f"Customer {i}", **PARTY) for i in range(1, 4)])
+        db_session.add(Vendor(id=1, organization_id=2, name="Acme", **PARTY))
+        db_session.commit()
+
+        # Bulk updates bypass the listeners
+        db_session.execute(update(Customer).where(Customer.id < 3).values(is_active=False))
+        db_session.commit()
+        assert DashboardCounterService.verify(db_session) == [
+            {"organization_id": 1, "counter": "customers", "expected": 1, "stored": 3}
+        ]
+
+        assert DashboardCounterService.recompute(db_session) == 2
+        db_session.commit()
+        assert DashboardCounterService.verify(db_session) == []
+        assert _stored(db_session, 1) == _counts(customers=1)
+        assert _stored(db_session, 2) == _counts(vendors=1)
+
+
+@pytest.fixture
+def async_session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            session.add(_organization(1))
+            await session.commit()
+            # Seed without the listeners' row, as on a database created before the counters existed
+            session.add_all([
+                Vendor(id=1, organization_id=1, name="Acme", **PARTY),
+                Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0, reorder_level=5),
+            ])
+            await session.flush()
+            session.add(Stock(organization_id=1, product_id=1, quantity=2, unit="PCS"))
+            await session.commit()
+            await session.execute(DashboardCounter.__table__.delete())
+            await session.commit()
+
+    asyncio.run(setup())
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+class TestDashboardEndpoint:
+    """Test the dashboard-stats endpoint reading the counters"""
+
+    def _stats(self, factory):
+        user = User(id=1, organization_id=1, email="test@test.com", role="admin", is_active=True)
+
+        async def run():
+            async with factory() as db:
+                return await get_dashboard_statistics(db=db, current_user=user)
+
+        TenantContext.set_organization_id(1)
+        try:
+            return asyncio.run(run())
+        finally:
+            TenantContext.clear()
+
+    def test_counts_on_first_read_then_single_row(self, async_session_factory):
+        expected = {
+            "masters": {"vendors": 1, "customers": 0, "products": 1},
+            "vouchers": {"purchase_vouchers": 0, "sales_vouchers": 0},
+            "inventory": {"low_stock_items": 1}
+        }
+        assert self._stats(async_session_factory) == expected
+        with query_budget(1):
+            assert self._stats(async_session_factory) == expected
+
+    def test_reflects_async_writes(self, async_session_factory):
+        async def add_customer():
+            async with async_session_factory() as session:
+                session.add(Customer(id=1, organization_id=1, name="Beta", **PARTY))
+                await session.commit()
+
+        self._stats(async_session_factory)
+        asyncio.run(add_customer())
+        assert self._stats(async_session_factory)["masters"]["customers"] == 1
@@ -0,0 +1,141 @@
+# tests/test_excel_streaming.py
+
+import asyncio
+import io
+import tracemalloc
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from openpyxl import load_workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import reports
+from app.api.v1.auth import get_current_active_user
+from app.core.database import get_read_db
+from app.models.base import Base, Organization, User, Vendor, Customer
+from app.models.vouchers import PurchaseVoucher, PaymentVoucher, SalesVoucher
+from app.services import excel_service
+from app.services.excel_service import ExcelService, ReportsExcelService
+
+
+def _sheet(chunks):
+    return load_workbook(io.BytesIO(b"".join(chunks))).active
+
+
+class TestStreamWorkbook:
+    """Test the write-only streaming workbook engine"""
+
+    def test_rows_footer_and_styles(self, monkeypatch):
+        monkeypatch.setattr(excel_service, "EXCEL_STREAM_CHUNK_SIZE", 1024)
+        totals = {"sum": 0}
+
+        def rows():
+            for i in range(500):
+                totals["sum"] += i
+                yield [f"row {i}", i, datetime(2024, 6, 1, 10, tzinfo=timezone.utc)]
+
+        chunks = list(ExcelService.stream_workbook(
+            "Data", ["Name", "Value", "When"], rows(), lambda: [[], ["Total", totals["sum"]]]
+        ))
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 1024 for chunk in chunks)
+
+        sheet = _sheet(chunks)
+        assert sheet.title == "Data"
+        assert [cell.value for cell in sheet[1]] == ["Name", "Value", "When"]
+        assert sheet["A1"].font.bold
+        assert [cell.value for cell in sheet[501]] == ["row 499", 499, datetime(2024, 6, 1, 10)]
+        assert [cell.value for cell in sheet[503]][:2] == ["Total", sum(range(500))]
+
+    def test_rows_are_consumed_lazily(self):
+        produced = []
+
+        def rows():
+            for i in range(3):
+                produced.append(i)
+                yield [i]
+
+        stream = ReportsExcelService.stream_sales_report(({"voucher_number": str(i)} for i in rows()), {})
+        assert produced == []
+        next(stream)
+        assert produced == [0, 1, 2]
+
+    def test_memory_stays_flat(self):
+        def vouchers(count):
+            for i in range(count):
+                yield {"voucher_number": f"SV{i:06d}", "date": datetime(2024, 6, 1), "customer_name": "Customer",
+                       "total_amount": 118.0, "gst_amount": 18.0, "status": "confirmed"}
+
+        def peak(count):
+            tracemalloc.start()
+            for _ in ReportsExcelService.stream_sales_report(vouchers(count), {}):
+                pass
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_bytes
+
+        small, large = peak(500), peak(5000)
+        assert large < small * 2
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Organization(
+        id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    party = dict(organization_id=1, contact_number="1234567890", address1="Test Address",
+                 city="Test City", state="Test State", pin_code="123456", state_code="TS")
+    session.add_all([Vendor(id=1, name="Acme Supplies", **party), Customer(id=1, name="Beta Retail", **party)])
+    session.add_all([
+        PurchaseVoucher(organization_id=1, voucher_number="PV001", date=datetime(2024, 6, 1), vendor_id=1,
+                        total_amount=1000.0, status="confirmed", created_by=1),
+        PaymentVoucher(organization_id=1, voucher_number="PAY001", date=datetime(2024, 6, 2), vendor_id=1,
+                       total_amount=400.0, status="confirmed", created_by=1),
+        SalesVoucher(organization_id=1, voucher_number="SV001", date=datetime(2024, 6, 3), customer_id=1,
+                     total_amount=700.0, status="confirmed", created_by=1),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestLedgerExport:
+    """Test the streamed complete ledger export"""
+
+    def test_complete_ledger_export(self, db_session):
+        app = FastAPI()
+        app.include_router(reports.router, prefix="/api/v1/reports")
+        app.dependency_overrides[get_read_db] = lambda: db_session
+        user = db_session.get(User, 1)
+        app.dependency_overrides[get_current_active_user] = lambda: user
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get("/api/v1/reports/complete-ledger/export/excel")
+
+        response = asyncio.run(request())
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == "attachment; filename=complete_ledger_report.xlsx"
+
+        rows = list(_sheet([response.content]).iter_rows(values_only=True))
+        assert [row[2] for row in rows[1:4]] == ["PV001", "PAY001", "SV001"]
+        # Running balances per account
+        assert [row[7] for row in rows[1:4]] == [1000, 600, 700]
+        assert ("Transaction Count", 3) in [row[:2] for row in rows]
+        assert ("Net Balance", 100) in [row[:2] for row in rows]
@@ -0,0 +1,299 @@
+# tests/test_export_jobs.py
+
+import asyncio
+import io
+import os
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1 import exports
+from app.api.v1.auth import get_current_active_user
+from app.core.tenant import TenantContext
+from app.models.base import Base, Organization, User, Customer, Product, Stock
+from app.models.vouchers import SalesVoucher
+from app.services import export_job_service
+from app.services.export_job_service import (
+    ExportJobManager, InMemoryExportJobStore, ExportJobError, ExportJobLimitError, ExportKind,
+    JOB_QUEUED, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED
+)
+
+PARTY = dict(contact_number="1234567890", address1="Test Address", city="Test City",
+             state="Test State", pin_code="123456", state_code="TS")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    session.add(User(
+        id=2, organization_id=1, email="standard@test.com", username="standarduser",
+        hashed_password="hashed", role="standard_user", is_active=True
+    ))
+    session.add_all([
+        Customer(id=1, organization_id=1, name="Beta Retail", **PARTY),
+        Customer(id=2, organization_id=1, name="Dormant", is_active=False, **PARTY),
+        Customer(id=3, organization_id=2, name="Other Org Customer", **PARTY),
+        Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0, reorder_level=5),
+        Product(id=2, organization_id=1, name="Gadget", unit="PCS", unit_price=50.0, reorder_level=0),
+    ])
+    session.add_all([
+        Stock(organization_id=1, product_id=1, quantity=2, unit="PCS", location="A"),
+        Stock(organization_id=1, product_id=2, quantity=8, unit="PCS", location="B"),
+    ])
+    session.add_all([
+        SalesVoucher(organization_id=1, voucher_number=f"SV{i:03d}", date=datetime(2024, 6, i), customer_id=1,
+                     total_amount=100.0 * i, status="confirmed", created_by=1)
+        for i in range(1, 4)
+    ])
+    session.commit()
+    session.close()
+    return factory
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def manager(session_factory, tmp_path, clock):
+    return ExportJobManager(
+        InMemoryExportJobStore(), session_factory, str(tmp_path / "exports"),
+        workers=1, max_active_per_org=2, ttl_seconds=600, clock=clock
+    )
+
+
+def _rows(manager, job):
+    workbook = load_workbook(manager.file_path(job))
+    return list(workbook.active.iter_rows(values_only=True))
+
+
+class TestExportJobs:
+    """Test running export jobs from the in-process store"""
+
+    def test_customers_export(self, manager):
+        job = manager.submit("customers", 1, 1)
+        assert job.status == JOB_QUEUED
+        assert job.params == {"active_only": True}
+
+        finished = manager.run_job(job.id)
+        assert finished.status == JOB_COMPLETED
+        assert (finished.rows_written, finished.rows_total, finished.progress) == (1, 1, 1.0)
+        assert finished.file_size == os.path.getsize(manager.file_path(job))
+        assert finished.expires_at == finished.finished_at + 600
+
+        rows = _rows(manager, job)
+        assert rows[0][:3] == ("Name", "Contact Number", "Email")
+        assert [row[0] for row in rows[1:]] == ["Beta Retail"]
+        # The worker does not leak its tenant context
+        assert TenantContext.get_organization_id() is None
+
+    def test_filters_are_applied(self, manager):
+        job = manager.submit("customers", 1, 1, {"active_only": False, "search": "Dor"})
+        manager.run_job(job.id)
+        assert [row[0] for row in _rows(manager, job)[1:]] == ["Dormant"]
+
+        job = manager.submit("stock", 1, 1, {"low_stock_only": True})
+        manager.run_job(job.id)
+        assert [row[:2] for row in _rows(manager, job)[1:]] == [("Widget", 2)]
+
+    def test_sales_report_export(self, manager):
+        job = manager.submit("sales-report", 1, 1, {"start_date": "2024-06-02"})
+        assert job.params == {"start_date": "2024-06-02"}
+        finished = manager.run_job(job.id)
+        assert (finished.status, finished.rows_total, finished.rows_written) == (JOB_COMPLETED, 2, 2)
+        rows = _rows(manager, job)
+        assert [row[0] for row in rows[1:3]] == ["SV002", "SV003"]
+        assert ("Total Sales", 500) in [row[:2] for row in rows]
+
+    def test_invalid_submissions(self, manager):
+        with pytest.raises(ExportJobError):
+            manager.submit("invoices", 1, 1)
+        with pytest.raises(ValidationError):
+            manager.submit("sales-report", 1, 1, {"start_date": "not a date"})
+        assert manager.list(1) == []
+
+    def test_active_jobs_per_organization(self, manager):
+        first = manager.submit("customers", 1, 1)
+        manager.submit("products", 1, 1)
+        with pytest.raises(ExportJobLimitError):
+            manager.submit("stock", 1, 1)
+        # Other organizations have their own limit
+        manager.submit("customers", 2, None)
+
+        manager.run_job(first.id)
+        manager.submit("stock", 1, 1)
+        assert len(manager.list(1)) == 3
+
+    def test_cancel_queued_job(self, manager):
+        job = manager.submit("customers", 1, 1)
+        assert manager.cancel(job.id, 1)
+        assert manager.run_job(job.id).status == JOB_CANCELLED
+        assert not manager.file_path(job).exists()
+        # The cancelled job released its slot
+        manager.submit("customers", 1, 1)
+        manager.submit("customers", 1, 1)
+
+    def test_cancel_running_job(self, manager, monkeypatch):
+        monkeypatch.setattr(export_job_service, "EXPORT_PROGRESS_INTERVAL", 1)
+        job = manager.submit("customers", 1, 1, {"active_only": False})
+        store_update = manager.store.update
+
+        def update(job_id, expected_status, **changes):
+            if changes.get("rows_written") == 1:
+                manager.cancel(job_id, 1)
+            return store_update(job_id, expected_status, **changes)
+
+        monkeypatch.setattr(manager.store, "update", update)
+        assert manager.run_job(job.id).status == JOB_CANCELLED
+        assert list(manager.storage_dir.iterdir()) == []
+
+    def test_failed_job(self, manager, monkeypatch):
+        def build(db, organization_id, params, track):
+            raise RuntimeError("database went away")
+
+        monkeypatch.setitem(export_job_service.EXPORT_KINDS, "customers",
+                            ExportKind("customers_export.xlsx", export_job_service.CustomersExportParams, build))
+        job = manager.submit("customers", 1, 1)
+        finished = manager.run_job(job.id)
+        assert (finished.status, finished.error) == (JOB_FAILED, "database went away")
+        assert not manager.file_path(job).exists()
+
+    def test_cleanup_after_ttl(self, manager, clock):
+        job = manager.submit("customers", 1, 1)
+        manager.run_job(job.id)
+        stray = manager.storage_dir / "0123abcd.part"
+        stray.write_bytes(b"partial")
+        os.utime(stray, (clock.now - 601, clock.now - 601))
+
+        assert manager.cleanup_expired() == 0
+        assert manager.file_path(job).exists()
+        assert not stray.exists()
+
+        clock.now += 601
+        assert manager.cleanup_expired() == 1
+        assert manager.get(job.id, 1) is None
+        assert not manager.file_path(job).exists()
+
+    def test_worker_threads(self, manager):
+        manager.start()
+        try:
+            job = manager.submit("products", 1, 1)
+            deadline = time.monotonic() + 10
+            while manager.get(job.id, 1).status != JOB_COMPLETED and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            manager.stop()
+        assert [row[0] for row in _rows(manager, job)[1:]] == ["Widget", "Gadget"]
+
+
+class TestExportEndpoints:
+    """Test submitting, polling and downloading exports over HTTP"""
+
+    def _request(self, manager, session_factory, method, path, org_id=1, user_id=1, **kwargs):
+        app = FastAPI()
+        app.include_router(exports.router, prefix="/api/v1/exports")
+        session = session_factory()
+        user = session.get(User, user_id)
+        app.dependency_overrides[get_current_active_user] = lambda: user
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, f"/api/v1/exports{path}", **kwargs)
+
+        TenantContext.set_organization_id(org_id)
+        try:
+            return asyncio.run(request())
+        finally:
+            TenantContext.clear()
+            session.close()
+
+    @pytest.fixture(autouse=True)
+    def _manager(self, manager, monkeypatch):
+        monkeypatch.setattr(exports, "get_export_job_manager", lambda: manager)
+
+    def test_submit_poll_and_download(self, manager, session_factory):
+        response = self._request(manager, session_factory, "POST", "/sales-report", json={"customer_id": 1})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["status"] == "queued"
+
+        manager.run_job(job_id)
+        body = self._request(manager, session_factory, "GET", f"/{job_id}").json()
+        assert (body["status"], body["rows_written"], body["progress"]) == ("completed", 3, 1.0)
+        assert body["download_url"] == f"/api/v1/exports/{job_id}/download"
+
+        response = self._request(manager, session_factory, "GET", f"/{job_id}/download")
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == 'attachment; filename="sales_report.xlsx"'
+        rows = list(load_workbook(io.BytesIO(response.content)).active.iter_rows(values_only=True))
+        assert [row[0] for row in rows[1:4]] == ["SV001", "SV002", "SV003"]
+
+        listing = self._request(manager, session_factory, "GET", "")
+        assert [job["job_id"] for job in listing.json()] == [job_id]
+
+    def test_jobs_are_scoped_to_the_organization(self, manager, session_factory):
+        job = manager.submit("customers", 2, None)
+        manager.run_job(job.id)
+        assert self._request(manager, session_factory, "GET", f"/{job.id}").status_code == 404
+        assert self._request(manager, session_factory, "GET", f"/{job.id}/download").status_code == 404
+        assert self._request(manager, session_factory, "GET", f"/{job.id}", org_id=2).status_code == 200
+
+    def test_report_jobs_need_report_access(self, manager, session_factory):
+        report = manager.submit("sales-report", 1, 1, {"customer_id": 1})
+        customers = manager.submit("customers", 1, 2)
+        manager.run_job(report.id)
+
+        for method, path in (("GET", f"/{report.id}"), ("GET", f"/{report.id}/download"), ("DELETE", f"/{report.id}")):
+            assert self._request(manager, session_factory, method, path, user_id=2).status_code == 403
+        assert manager.get(report.id, 1).status == "completed"
+
+        listing = self._request(manager, session_factory, "GET", "", user_id=2)
+        assert [job["job_id"] for job in listing.json()] == [customers.id]
+        listing = self._request(manager, session_factory, "GET", "")
+        assert {job["job_id"] for job in listing.json()} == {report.id, customers.id}
+
+    def test_errors(self, manager, session_factory):
+        assert self._request(manager, session_factory, "POST", "/invoices").status_code == 404
+        response = self._request(manager, session_factory, "POST", "/stock", json={"product_id": "x"})
+        assert response.status_code == 422
+
+        job_id = self._request(manager, session_factory, "POST", "/customers").json()["job_id"]
+        assert self._request(manager, session_factory, "GET", f"/{job_id}/download").status_code == 409
+        self._request(manager, session_factory, "POST", "/products")
+        assert self._request(manager, session_factory, "POST", "/stock").status_code == 429
+
+        assert self._request(manager, session_factory, "DELETE", f"/{job_id}").status_code == 200
+        assert manager.get(job_id, 1).status == "cancelled"
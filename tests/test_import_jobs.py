@@ -0,0 +1,308 @@
+# tests/test_import_jobs.py
+
+import asyncio
+import io
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import imports
+from app.api.v1.auth import get_current_active_user
+from app.core.database import get_db
+from app.core.tenant import TenantContext
+from app.models.base import Base, Organization, User, Customer, Product, Stock
+from app.services import import_job_service
+from app.services.import_job_service import (
+    ImportJobManager, ImportJobError, ImportJobLimitError,
+    JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED
+)
+
+CUSTOMER_HEADER = "Name,Contact Number,Email,Address Line 1,Address Line 2,City,State,Pin Code,State Code,GST Number,PAN Number\n"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = datetime(2025, 9, 1, 12, 0, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+class _Crash(BaseException):
+    """Stands in for the worker process dying mid-import"""
+    pass
+
+
+def _customers_csv(count, invalid=()):
+    lines = [
+        f"Customer {i},9876543210,,1 Road,,Pune,MH,{'4110' if i in invalid else '411001'},27,,\n"
+        for i in range(1, count + 1)
+    ]
+    return (CUSTOMER_HEADER + "".join(lines)).encode()
+
+
+def _stock_csv(rows):
+    header = "Product Name,Quantity,Unit,HSN Code,Part Number,Unit Price,GST Rate,Reorder Level,Location\n"
+    return (header + "".join(f"{name},{quantity},PCS,,,,,,Main\n" for name, quantity in rows)).encode()
+
+
+def _upload(filename, content):
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database, so the sessions of the manager and the worker use separate connections
+    engine = create_engine(f"sqlite:///{tmp_path / 'imports.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    session.add(Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0))
+    session.add(Stock(organization_id=1, product_id=1, quantity=5, unit="PCS", location="Main"))
+    session.commit()
+    session.close()
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def manager(session_factory, tmp_path, clock):
+    return ImportJobManager(
+        session_factory, str(tmp_path / "imports"), workers=1, max_active_per_org=2,
+        chunk_size=2, stale_seconds=600, max_attempts=3, max_messages=2, clock=clock
+    )
+
+
+def _customers(session_factory):
+    with session_factory() as session:
+        return [name for name, in session.query(Customer.name).order_by(Customer.id)]
+
+
+def _interrupt(monkeypatch, kind, on_chunk):
+    """Call on_chunk(chunk number) before each chunk of kind is imported"""
+    import_kind = import_job_service.IMPORT_KINDS[kind]
+    calls = []
+
+    def import_chunk(db, organization_id, validation, params, state):
+        calls.append(validation.total)
+        on_chunk(len(calls))
+        return import_kind.import_chunk(db, organization_id, validation, params, state)
+
+    monkeypatch.setitem(import_job_service.IMPORT_KINDS, kind, import_kind._replace(import_chunk=import_chunk))
+    return calls
+
+
+class TestImportJobs:
+    """Test running import jobs in committed chunks"""
+
+    def test_customers_import(self, manager):
+        job = manager.submit("customers", 1, 1, _upload("customers.csv", _customers_csv(5, invalid=(2, 3, 4))), chunk_size=2)
+        assert (job.status, job.rows_total, job.params) == (JOB_QUEUED, 5, {})
+        assert manager.file_path(job).is_file()
+
+        finished = manager.run_job(job.id)
+        assert (finished.status, finished.rows_processed, finished.attempts) == (JOB_COMPLETED, 5, 1)
+        assert finished.counts == {"created": 2, "updated": 0, "skipped": 3}
+        # Only the first max_messages row errors are kept
+        assert finished.error_count == 3
+        assert finished.errors == [
+            "Row 2: Pin Code must be exactly 6 digits, got '4110'",
+            "Row 3: Pin Code must be exactly 6 digits, got '4110'",
+        ]
+        assert _customers(manager.session_factory) == ["Customer 1", "Customer 5"]
+        assert not manager.file_path(job).exists()
+        assert TenantContext.get_organization_id() is None
+        # Nothing is left to run
+        assert manager.run_next() is None
+
+    def test_crashed_job_resumes_after_last_chunk(self, manager, clock, monkeypatch):
+        def crash(chunk):
+            if chunk == 2:
+                raise _Crash()
+
+        _interrupt(monkeypatch, "customers", crash)
+        job = manager.submit("customers", 1, 1, _upload("customers.csv", _customers_csv(5)))
+        with pytest.raises(_Crash):
+            manager.run_job(job.id)
+        crashed = manager.get(job.id, 1)
+        assert (crashed.status, crashed.rows_processed) == (JOB_RUNNING, 2)
+        assert _customers(manager.session_factory) == ["Customer 1", "Customer 2"]
+
+        # The job is only taken over once its heartbeat is stale
+        assert manager.run_next() is None
+        clock.now += timedelta(seconds=601)
+        resumed = manager.run_next()
+        assert (resumed.id, resumed.status, resumed.attempts, resumed.rows_processed) == (job.id, JOB_COMPLETED, 2, 5)
+        assert resumed.counts == {"created": 5, "updated": 0, "skipped": 0}
+        assert _customers(manager.session_factory) == [f"Customer {i}" for i in range(1, 6)]
+
+    def test_stalled_worker_cannot_commit_after_takeover(self, manager, clock, monkeypatch):
+        def take_over(chunk):
+            if chunk == 2:
+                # Another worker claims the job while this one is stuck on its second chunk
+                clock.now += timedelta(seconds=601)
+                assert manager._claim(job.id).attempts == 2
+
+        _interrupt(monkeypatch, "customers", take_over)
+        job = manager.submit("customers", 1, 1, _upload("customers.csv", _customers_csv(5)))
+        stopped = manager.run_job(job.id)
+        assert (stopped.status, stopped.attempts, stopped.rows_processed) == (JOB_RUNNING, 2, 2)
+        # The second chunk was rolled back
+        assert _customers(manager.session_factory) == ["Customer 1", "Customer 2"]
+
+    def test_jobs_stalling_too_often_fail(self, manager, clock, monkeypatch):
+        def crash(chunk):
+            raise _Crash()
+
+        _interrupt(monkeypatch, "customers", crash)
+        job = manager.submit("customers", 1, 1, _upload("customers.csv", _customers_csv(1)))
+        for _ in range(3):
+            with pytest.raises(_Crash):
+                manager.run_next()
+            clock.now += timedelta(seconds=601)
+        assert manager.run_next() is None
+        failed = manager.get(job.id, 1)
+        assert (failed.status, failed.attempts) == (JOB_FAILED, 3)
+        assert "stopped responding" in failed.error
+
+    def test_failed_stock_job_resumes_without_adding_twice(self, manager, monkeypatch):
+        failures = []
+
+        def fail_once(chunk):
+            if chunk == 2 and not failures:
+                failures.append(chunk)
+                raise RuntimeError("database went away")
+
+        _interrupt(monkeypatch, "stock", fail_once)
+        rows = [("Widget", 1), ("Bolt", 2), ("Widget", 3), ("Nut", "x"), ("Bolt", 4)]
+        job = manager.submit("stock", 1, 1, _upload("stock.csv", _stock_csv(rows)), {"mode": "add"})
+        failed = manager.run_job(job.id)
+        assert (failed.status, failed.error, failed.rows_processed) == (JOB_FAILED, "database went away", 2)
+        assert manager.file_path(failed).is_file()
+        assert manager.resume(job.id, 2) is None
+        assert manager.resume(job.id, 1).status == JOB_QUEUED
+
+        finished = manager.run_job(job.id)
+        assert (finished.status, finished.rows_processed) == (JOB_COMPLETED, 5)
+        assert finished.counts == {"created": 1, "updated": 3, "skipped": 1, "created_products": 1}
+        assert finished.errors == ["Row 4: Invalid data format - Quantity must be a number, got 'x'"]
+        with pytest.raises(ImportJobError):
+            manager.resume(job.id, 1)
+        with manager.session_factory() as session:
+            stock = session.query(Product.name, Stock.quantity).join(Stock, Stock.product_id == Product.id)
+            assert sorted(tuple(row) for row in stock) == [("Bolt", 6.0), ("Widget", 9.0)]
+
+    def test_cancel_running_job(self, manager, monkeypatch):
+        def cancel(chunk):
+            if chunk == 2:
+                assert manager.cancel(job.id, 1)
+
+        _interrupt(monkeypatch, "customers", cancel)
+        job = manager.submit("customers", 1, 1, _upload("customers.csv", _customers_csv(5)))
+        cancelled = manager.run_job(job.id)
+        assert (cancelled.status, cancelled.rows_processed) == (JOB_CANCELLED, 2)
+        assert _customers(manager.session_factory) == ["Customer 1", "Customer 2"]
+        assert not manager.file_path(job).exists()
+
+        # Deleting a finished job removes its record
+        assert manager.cancel(job.id, 1)
+        assert manager.get(job.id, 1) is None
+
+    def test_invalid_submissions(self, manager):
+        upload = _upload("customers.csv", _customers_csv(1))
+        with pytest.raises(ImportJobError):
+            manager.submit("invoices", 1, 1, upload)
+        with pytest.raises(ImportJobError):
+            manager.submit("customers", 1, 1, _upload("customers.txt", b"Name\n"))
+        with pytest.raises(ValidationError):
+            manager.submit("stock", 1, 1, upload, {"mode": "merge"})
+
+        manager.submit("customers", 1, 1, upload)
+        manager.submit("vendors", 1, 1, upload)
+        with pytest.raises(ImportJobLimitError):
+            manager.submit("customers", 1, 1, upload)
+        # Other organizations have their own limit
+        manager.submit("customers", 2, None, upload)
+        assert len(manager.list(1)) == 2
+
+    def test_file_errors_fail_the_job(self, manager):
+        job = manager.submit("customers", 1, 1, _upload("customers.csv", b"Name,City\nAcme,Pune\n"))
+        failed = manager.run_job(job.id)
+        assert failed.status == JOB_FAILED
+        assert failed.error.startswith("Missing required columns in CSV file")
+
+
+class TestImportEndpoints:
+    """Test submitting and polling imports over HTTP"""
+
+    def _request(self, session_factory, method, path, org_id=1, **kwargs):
+        app = FastAPI()
+        app.include_router(imports.router, prefix="/api/v1/imports")
+        session = session_factory()
+        user = session.get(User, 1)
+        app.dependency_overrides[get_db] = lambda: session
+        app.dependency_overrides[get_current_active_user] = lambda: user
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, f"/api/v1/imports{path}", **kwargs)
+
+        TenantContext.set_organization_id(org_id)
+        try:
+            return asyncio.run(request())
+        finally:
+            TenantContext.clear()
+            session.close()
+
+    @pytest.fixture(autouse=True)
+    def _manager(self, manager, monkeypatch):
+        monkeypatch.setattr(imports, "get_import_job_manager", lambda: manager)
+
+    def test_submit_and_poll(self, manager, session_factory):
+        files = {"file": ("customers.csv", _customers_csv(3, invalid=(2,)))}
+        response = self._request(session_factory, "POST", "/customers", files=files, data={"chunk_size": "2"})
+        assert response.status_code == 202
+        body = response.json()
+        assert (body["status"], body["chunk_size"], body["rows_total"], body["progress"]) == ("queued", 2, 3, 0.0)
+
+        manager.run_next()
+        body = self._request(session_factory, "GET", f"/{body['job_id']}").json()
+        assert (body["status"], body["rows_processed"], body["progress"]) == ("completed", 3, 1.0)
+        assert body["counts"] == {"created": 2, "updated": 0, "skipped": 1}
+        assert body["errors"] == ["Row 2: Pin Code must be exactly 6 digits, got '4110'"]
+        assert self._request(session_factory, "GET", f"/{body['job_id']}", org_id=2).status_code == 404
+        assert [job["job_id"] for job in self._request(session_factory, "GET", "").json()] == [body["job_id"]]
+
+    def test_errors(self, manager, session_factory):
+        files = {"file": ("customers.csv", _customers_csv(1))}
+        assert self._request(session_factory, "POST", "/invoices", files=files).status_code == 404
+        assert self._request(session_factory, "POST", "/customers", files={"file": ("c.txt", b"x")}).status_code == 400
+
+        job_id = self._request(session_factory, "POST", "/customers", files=files).json()["job_id"]
+        assert self._request(session_factory, "POST", f"/{job_id}/resume").status_code == 409
+        self._request(session_factory, "POST", "/vendors", files=files)
+        assert self._request(session_factory, "POST", "/customers", files=files).status_code == 429
+
+        assert self._request(session_factory, "DELETE", f"/{job_id}").json() == {"message": "Import job cancelled"}
+        assert manager.get(job_id, 1).status == "cancelled"
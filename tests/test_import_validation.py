@@ -0,0 +1,217 @@
+# tests/test_import_validation.py
+
+import asyncio
+import io
+from types import SimpleNamespace
+
+import httpx
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import customers
+from app.api.v1.auth import get_current_active_user
+from app.core.database import get_db
+from app.models.base import Base, Organization, User, Customer
+from app.services.excel_service import CustomerExcelService, ExcelService, ProductExcelService
+from app.utils.excel_import import ExcelImportValidator
+from app.utils.import_validation import ImportColumn, ImportSchema, digits_pattern
+
+SCHEMA = ImportSchema([
+    ImportColumn("product_name", field="name", required=True),
+    ImportColumn("unit", required=True, upper=True),
+    ImportColumn("quantity", "number", required=True, minimum=0),
+    ImportColumn("hsn_code", label="HSN Code", pattern=digits_pattern(4, 6, 8), pattern_message="must be 4, 6 or 8 digits"),
+    ImportColumn("gst_rate", "number", label="GST Rate", default=18.0, minimum=0, maximum=100, lenient=True),
+    ImportColumn("reorder_level", "integer", default=10, minimum=0),
+    ImportColumn("is_active", "boolean"),
+])
+
+
+class TestImportSchema:
+    """Test column-wise validation of import rows"""
+
+    def test_valid_rows_are_coerced(self):
+        result = SCHEMA.validate([
+            {"product_name": " Bolt ", "unit": "pcs", "quantity": "2.5", "hsn_code": 8471.0,
+             "reorder_level": "4", "is_active": "yes"},
+            {"product_name": "Nut", "unit": "kg", "quantity": 3, "hsn_code": "NA", "gst_rate": 5},
+        ])
+        assert (result.total, result.skipped, result.errors, result.warnings) == (2, 0, [], [])
+        assert result.records() == [
+            {"name": "Bolt", "unit": "PCS", "quantity": 2.5, "hsn_code": "8471", "gst_rate": 18.0,
+             "reorder_level": 4, "is_active": True, "_row": 1},
+            {"name": "Nut", "unit": "KG", "quantity": 3.0, "hsn_code": None, "gst_rate": 5.0,
+             "reorder_level": 10, "is_active": False, "_row": 2},
+        ]
+        assert type(result.records()[0]["reorder_level"]) is int
+
+    def test_every_invalid_cell_is_reported(self):
+        result = SCHEMA.validate([
+            {"product_name": "", "unit": None, "quantity": "lots"},
+            {"product_name": "Bolt", "unit": "PCS", "quantity": -1, "hsn_code": "12", "reorder_level": "x"},
+            {"product_name": "Nut", "unit": "PCS", "quantity": 1},
+        ])
+        assert [(e.row, e.field, e.error_code) for e in result.errors] == [
+            (1, "name", "REQUIRED_FIELD_MISSING"),
+            (1, "unit", "REQUIRED_FIELD_MISSING"),
+            (1, "quantity", "INVALID_DATA_TYPE"),
+            (2, "quantity", "INVALID_VALUE"),
+            (2, "hsn_code", "INVALID_FORMAT"),
+            (2, "reorder_level", "INVALID_DATA_TYPE"),
+        ]
+        assert result.messages[2] == "Row 1: Invalid data format - Quantity must be a number, got 'lots'"
+        assert result.messages[4] == "Row 2: HSN Code must be 4, 6 or 8 digits, got '12'"
+        assert result.skipped == 2
+        assert result.records()[0]["_row"] == 3
+
+    def test_lenient_columns_fall_back_with_a_warning(self):
+        result = SCHEMA.validate([
+            {"product_name": "Bolt", "unit": "PCS", "quantity": 1, "gst_rate": 250},
+            {"product_name": "Nut", "unit": "PCS", "quantity": 1, "gst_rate": "high"},
+        ])
+        assert result.errors == []
+        assert result.warnings == [
+            "Row 1: GST Rate must be between 0 and 100, got 250; using 18",
+            "Row 2: Invalid data format - GST Rate must be a number, got 'high'; using 18",
+        ]
+        assert [record["gst_rate"] for record in result.records()] == [18.0, 18.0]
+
+    def test_dataframe_input_and_missing_columns(self):
+        frame = pd.DataFrame({"product_name": ["Bolt", None], "unit": ["PCS", "PCS"], "quantity": [1.0, float("nan")]})
+        result = SCHEMA.validate(frame)
+        assert [(e.row, e.field) for e in result.errors] == [(2, "name"), (2, "quantity")]
+        assert result.records() == [{
+            "name": "Bolt", "unit": "PCS", "quantity": 1.0, "hsn_code": None, "gst_rate": 18.0,
+            "reorder_level": 10, "is_active": False, "_row": 1
+        }]
+
+    def test_invalid_schemas(self):
+        with pytest.raises(ValueError):
+            ImportColumn("quantity", "decimal")
+        with pytest.raises(ValueError):
+            ImportColumn("quantity", "number", pattern=r"\d+")
+        with pytest.raises(ValueError):
+            ImportSchema([ImportColumn("name"), ImportColumn("product_name", field="name")])
+
+    def test_template_schemas(self):
+        result = CustomerExcelService.IMPORT_SCHEMA.validate([{
+            "name": "Acme", "contact_number": 9876543210.0, "address_line_1": "1 Road", "city": "Pune",
+            "state": "MH", "pin_code": 411001.0, "state_code": 27.0, "gst_number": "27AACFV1234D1Z",
+        }])
+        assert [(e.field, e.error) for e in result.errors] == [
+            ("gst_number", "GST Number must be exactly 15 characters, got '27AACFV1234D1Z'")
+        ]
+
+        result = ProductExcelService.IMPORT_SCHEMA.validate([{
+            "product_name": "Bolt", "unit": "PCS", "gst_rate": 28, "initial_quantity": None, "is_gst_inclusive": "TRUE",
+        }])
+        record, = result.records()
+        assert (record["gst_rate"], record["is_gst_inclusive"], record["initial_quantity"]) == (28.0, True, None)
+
+    def test_legacy_data_type_validator(self):
+        frame = pd.DataFrame({"quantity": [1, "x"], "reorder_level": [-2, 3]})
+        errors = ExcelImportValidator.validate_data_types(frame, {"quantity": float, "reorder_level": int})
+        # Row numbers are Excel lines
+        assert [(row, column) for row, column, _ in errors] == [(2, "reorder_level"), (3, "quantity")]
+
+
+def _upload(filename, content):
+    return SimpleNamespace(filename=filename, file=io.BytesIO(content))
+
+
+def _customer_rows(count):
+    return [
+        [f"Customer {i}", 9876543210, None, "1 Road", None, "Pune", "MH", 411001 if i % 2 else 4110, "27", None, None]
+        for i in range(count)
+    ]
+
+
+class TestUploadStreaming:
+    """Test streaming uploads in validated batches"""
+
+    def test_xlsx_batches_keep_row_numbers(self):
+        frame = pd.DataFrame(_customer_rows(5), columns=CustomerExcelService.REQUIRED_COLUMNS)
+        buffer = io.BytesIO()
+        with pd.ExcelWriter(buffer) as writer:
+            pd.DataFrame({"Instructions": ["Fill in the data sheet"]}).to_excel(writer, index=False, sheet_name="Instructions")
+            frame.to_excel(writer, index=False, sheet_name="Customer Import Template")
+
+        batches = list(CustomerExcelService.iter_import_batches(_upload("customers.xlsx", buffer.getvalue()), batch_size=2))
+        assert [batch.total for batch in batches] == [2, 2, 1]
+        assert [error.row for batch in batches for error in batch.errors] == [1, 3, 5]
+        assert [record["_row"] for batch in batches for record in batch.records()] == [2, 4]
+
+    def test_csv_rows(self):
+        content = (
+            "\ufeffName,Contact Number,City,,City\n"
+            "Acme,9876543210,Pune,x,Mumbai\n"
+            ",,\n"
+            "Globex,,Delhi\n"
+            ",,,,\n"
+        ).encode()
+        frame, = ExcelService.iter_upload_rows(_upload("customers.csv", content), ["Name", "City"])
+        # Unnamed and repeated columns are dropped, empty rows are kept in place unless trailing
+        assert list(frame.columns) == ["name", "contact_number", "city"]
+        assert frame.to_dict(orient="list") == {
+            "name": ["Acme", None, "Globex"], "contact_number": ["9876543210", None, ""], "city": ["Pune", None, "Delhi"]
+        }
+
+    def test_unreadable_uploads(self):
+        with pytest.raises(ValueError, match="Missing required columns in CSV file: Name"):
+            list(ExcelService.iter_upload_rows(_upload("customers.csv", b"city\nPune\n"), ["Name"]))
+        with pytest.raises(ValueError, match="Invalid Excel file format"):
+            list(ExcelService.iter_upload_rows(_upload("customers.xlsx", b"not a workbook"), ["Name"]))
+        assert list(ExcelService.iter_upload_rows(_upload("customers.csv", b""), ["Name"])) == []
+
+
+class TestCustomerImportEndpoint:
+    """Test the customer Excel import through the schema"""
+
+    def test_import(self):
+        engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        session = factory()
+        session.add(Organization(
+            id=1, name="Org 1", subdomain="org1", primary_email="org1@test.com", primary_phone="1234567890",
+            address1="Test Address", city="Test City", state="Test State", pin_code="123456", plan_type="basic"
+        ))
+        session.add(User(id=1, organization_id=1, email="test@test.com", username="testuser",
+                         hashed_password="hashed", role="admin", is_active=True))
+        session.commit()
+        user = session.get(User, 1)
+
+        frame = pd.DataFrame([
+            ["Acme", 9876543210, "a@acme.com", "1 Road", None, "Pune", "MH", 411001, "27", None, None],
+            ["Nameless", 9876543210, None, None, None, "Pune", "MH", 4110, "27", None, None],
+        ], columns=CustomerExcelService.REQUIRED_COLUMNS)
+        buffer = io.BytesIO()
+        frame.to_excel(buffer, index=False, sheet_name="Customer Import Template")
+
+        app = FastAPI()
+        app.include_router(customers.router, prefix="/api/customers")
+        app.dependency_overrides[get_db] = lambda: session
+        app.dependency_overrides[get_current_active_user] = lambda: user
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post("/api/customers/import/excel", files={"file": ("customers.xlsx", buffer.getvalue())})
+
+        try:
+            response = asyncio.run(request())
+            assert response.status_code == 200
+            body = response.json()
+            assert (body["total_processed"], body["created"]) == (2, 1)
+            assert body["errors"] == [
+                "Row 2: Address Line 1 is required and cannot be empty",
+                "Row 2: Pin Code must be exactly 6 digits, got '4110'",
+            ]
+            acme = session.query(Customer).filter_by(organization_id=1).one()
+            assert (acme.contact_number, acme.pin_code, acme.address2) == ("9876543210", "411001", None)
+        finally:
+            session.close()
@@ -0,0 +1,121 @@
+# tests/test_jwt_verifier.py
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from jose import jwt
+
+from app.core.jwt_verifier import JWTVerifier, InvalidTokenError, PYJWT_AVAILABLE
+from app.core.security import verify_token, create_access_token
+
+SECRET = "test-secret"
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _token(sub="user@test.com", exp_offset=3600, secret=SECRET, **claims):
+    now = datetime.now(timezone.utc)
+    payload = {"sub": sub, **claims}
+    if exp_offset is not None:
+        payload["exp"] = now + timedelta(seconds=exp_offset)
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def _verifier(**kwargs):
+    secret = kwargs.pop("secret", SECRET)
+    return JWTVerifier(lambda: secret, ["HS256"], **kwargs)
+
+
+class TestJWTVerifier:
+    """Test decoded-claims caching in JWTVerifier"""
+
+    def test_repeated_token_is_served_from_cache(self):
+        verifier = _verifier()
+        token = _token()
+        assert verifier.decode(token)["sub"] == "user@test.com"
+        assert verifier.decode(token)["sub"] == "user@test.com"
+        stats = verifier.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["size"] == 1
+
+    def test_returned_claims_are_copies(self):
+        verifier = _verifier()
+        token = _token()
+        verifier.decode(token)["sub"] = "tampered"
+        assert verifier.decode(token)["sub"] == "user@test.com"
+
+    def test_cached_claims_expire_with_token(self):
+        token = _token(exp_offset=60)
+        exp = jwt.get_unverified_claims(token)["exp"]
+        clock = FakeClock(exp - 120)
+        verifier = _verifier(clock=clock)
+        verifier.decode(token)
+        clock.now = exp + 1
+        # Past the cached expiry the token is re-verified by the backend instead of served from cache
+        verifier.decode(token)
+        assert verifier.stats()["expired"] == 1
+        assert verifier.stats()["misses"] == 2
+        assert verifier.stats()["hits"] == 0
+
+    def test_invalid_signature_is_rejected_and_counted(self):
+        verifier = _verifier()
+        with pytest.raises(InvalidTokenError):
+            verifier.decode(_token(secret="other-secret"))
+        assert verifier.stats()["failures"] == 1
+        assert verifier.stats()["size"] == 0
+
+    def test_tokens_without_exp_are_not_cached(self):
+        verifier = _verifier()
+        token = _token(exp_offset=None)
+        verifier.decode(token)
+        verifier.decode(token)
+        assert verifier.stats()["hits"] == 0
+        assert verifier.stats()["size"] == 0
+
+    def test_cache_is_bounded(self):
+        verifier = _verifier(max_entries=2)
+        tokens = [_token(sub=f"u{i}@test.com") for i in range(3)]
+        for token in tokens:
+            verifier.decode(token)
+        assert verifier.stats()["size"] == 2
+        assert verifier.stats()["evictions"] == 1
+
+    def test_secret_rotation_clears_cache(self):
+        secrets = {"current": SECRET}
+        verifier = JWTVerifier(lambda: secrets["current"], ["HS256"])
+        token = _token()
+        verifier.decode(token)
+        secrets["current"] = "rotated-secret"
+        with pytest.raises(InvalidTokenError):
+            verifier.decode(token)
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError):
+            _verifier(backend="nope")
+
+    @pytest.mark.skipif(not PYJWT_AVAILABLE, reason="PyJWT not installed")
+    def test_pyjwt_backend_accepts_jose_tokens(self):
+        verifier = _verifier(backend="pyjwt")
+        assert verifier.backend == "pyjwt"
+        claims = verifier.decode(_token(organization_id=3))
+        assert claims["organization_id"] == 3
+        with pytest.raises(InvalidTokenError):
+            verifier.decode(_token(secret="other-secret"))
+
+
+class TestVerifyTokenSignature:
+    """verify_token keeps its tuple signature on top of the verifier"""
+
+    def test_verify_token_round_trip(self):
+        token = create_access_token("user@test.com", organization_id=7, user_role="admin")
+        assert verify_token(token) == ("user@test.com", 7, "admin", "organization")
+        assert verify_token(token) == ("user@test.com", 7, "admin", "organization")
+
+    def test_verify_token_invalid(self):
+        assert verify_token("not-a-token") == (None, None, None, None)
@@ -0,0 +1,135 @@
+# tests/test_lazy_router.py
+
+import asyncio
+import importlib.util
+import sys
+import textwrap
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.router_manifest import ROUTER_MANIFEST
+from app.core.lazy_router import LazyRouterMount, RouterEntry, include_manifest
+
+STATIC_MODULE = textwrap.dedent('''
+    from fastapi import APIRouter, Depends
+
+    router = APIRouter()
+
+    def get_caller():
+        return "real"
+
+    @router.get("/items/summary")
+    def summary(caller: str = Depends(get_caller)):
+        return {"route": "summary", "caller": caller}
+
+    @router.post("/items")
+    def create_item():
+        return {"route": "create"}
+''')
+
+DYNAMIC_MODULE = textwrap.dedent('''
+    from fastapi import APIRouter
+
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    def item(item_id: str):
+        return {"route": "dynamic", "item_id": item_id}
+''')
+
+
+@pytest.fixture
+def router_modules(tmp_path, monkeypatch):
+    package = tmp_path / "lazy_fixture_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "static_routes.py").write_text(STATIC_MODULE)
+    (package / "dynamic_routes.py").write_text(DYNAMIC_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_fixture_pkg"
+    for name in [name for name in sys.modules if name.startswith("lazy_fixture_pkg")]:
+        del sys.modules[name]
+
+
+def _manifest(package):
+    return [
+        RouterEntry(f"{package}.static_routes", "/api/v1/things", ["things"]),
+        RouterEntry(f"{package}.dynamic_routes", "/api/v1/things", ["things-dynamic"]),
+    ]
+
+
+def _get(app, method, path):
+    async def call():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.request(method, path)
+    return asyncio.run(call())
+
+
+class TestLazyRouterLoading:
+    """Test deferred router imports and route precedence"""
+
+    def test_modules_are_not_imported_until_first_request(self, router_modules):
+        app = FastAPI()
+        include_manifest(app, _manifest(router_modules), lazy=True)
+        assert f"{router_modules}.static_routes" not in sys.modules
+
+        response = _get(app, "GET", "/api/v1/things/items/summary")
+
+        assert response.json() == {"route": "summary", "caller": "real"}
+        assert f"{router_modules}.static_routes" in sys.modules
+        # The first matching entry answered, so the later one is still pending
+        assert f"{router_modules}.dynamic_routes" not in sys.modules
+
+    def test_unrelated_prefix_does_not_import(self, router_modules):
+        app = FastAPI()
+        include_manifest(app, _manifest(router_modules), lazy=True)
+        assert _get(app, "GET", "/api/v1/other").status_code == 404
+        assert f"{router_modules}.static_routes" not in sys.modules
+
+    def test_route_order_matches_eager_registration(self, router_modules):
+        lazy_app, eager_app = FastAPI(), FastAPI()
+        include_manifest(lazy_app, _manifest(router_modules), lazy=True)
+        include_manifest(eager_app, _manifest(router_modules), lazy=False)
+
+        for method, path in [("GET", "/api/v1/things/items/summary"), ("GET", "/api/v1/things/items/42"),
+                             ("DELETE", "/api/v1/things/items"), ("POST", "/api/v1/things/items")]:
+            lazy_response, eager_response = _get(lazy_app, method, path), _get(eager_app, method, path)
+            assert lazy_response.status_code == eager_response.status_code
+            assert lazy_response.content == eager_response.content
+
+    def test_dependency_overrides_apply_to_lazy_routes(self, router_modules):
+        app = FastAPI()
+        include_manifest(app, _manifest(router_modules), lazy=True)
+        module = importlib.import_module(f"{router_modules}.static_routes")
+        app.dependency_overrides[module.get_caller] = lambda: "override"
+
+        assert _get(app, "GET", "/api/v1/things/items/summary").json()["caller"] == "override"
+
+    def test_openapi_includes_pending_routers(self, router_modules):
+        app = FastAPI()
+        include_manifest(app, _manifest(router_modules), lazy=True)
+
+        schema = _get(app, "GET", "/openapi.json").json()
+
+        assert "/api/v1/things/items/summary" in schema["paths"]
+        assert "/api/v1/things/items/{item_id}" in schema["paths"]
+        assert not any(isinstance(route, LazyRouterMount) for route in app.router.routes)
+
+    def test_url_for_resolves_through_lazy_mount(self, router_modules):
+        app = FastAPI()
+        include_manifest(app, _manifest(router_modules), lazy=True)
+        assert app.url_path_for("item", item_id="7") == "/api/v1/things/items/7"
+
+
+class TestRouterManifest:
+    """The application manifest must only reference importable modules"""
+
+    def test_manifest_modules_exist(self):
+        for entry in ROUTER_MANIFEST:
+            assert importlib.util.find_spec(entry.module) is not None, entry.module
+
+    def test_manifest_prefixes_are_normalised(self):
+        for entry in ROUTER_MANIFEST:
+            assert entry.prefix.startswith("/") and not entry.prefix.endswith("/"), entry.prefix
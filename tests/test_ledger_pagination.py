@@ -0,0 +1,170 @@
+# tests/test_ledger_pagination.py
+
+import asyncio
+import json
+from datetime import datetime, date
+from decimal import Decimal
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import reports
+from app.api.v1.auth import get_current_active_user
+from app.core.database import get_read_db
+from app.core.query_profiler import query_budget
+from app.models.base import Base, Organization, User, Vendor, Customer
+from app.models.vouchers import PurchaseVoucher, PaymentVoucher, SalesVoucher, ReceiptVoucher, CreditNote, DebitNote
+from app.schemas.ledger import LedgerFilters
+from app.services.ledger_service import LedgerService, encode_ledger_cursor, decode_ledger_cursor
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Organization(
+        id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    for model, account_id, name in (
+        (Vendor, 1, "Acme Supplies"), (Vendor, 2, "Delta Metals"), (Customer, 1, "Beta Retail"), (Customer, 2, "Gamma Stores")
+    ):
+        session.add(model(
+            id=account_id, organization_id=1, name=name, contact_number="9876543210",
+            address1="Test Address", city="Test City", state="Test State", pin_code="123456", state_code="TS"
+        ))
+
+    # Several vouchers per day and per table so page boundaries fall inside same-day ties
+    sources = (
+        (PurchaseVoucher, "vendor_id", {}), (SalesVoucher, "customer_id", {}),
+        (PaymentVoucher, "vendor_id", {}), (ReceiptVoucher, "customer_id", {}),
+        (DebitNote, "vendor_id", {"reason": "Freight"}), (CreditNote, "customer_id", {"reason": "Discount"}),
+    )
+    for i in range(1, 41):
+        model, party, extra = sources[i % len(sources)]
+        session.add(model(
+            organization_id=1, voucher_number=f"{model.__tablename__[:3].upper()}{i:03d}",
+            date=datetime(2024, 6, 1 + i // 8), total_amount=float(100 + i * 7), status="confirmed",
+            created_by=1, **{party: 1 + i % 2}, **extra
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _rows(transactions):
+    return [
+        (t.voucher_type, t.id, t.account_type, t.account_id, t.account_name, t.debit_amount, t.credit_amount, t.balance)
+        for t in transactions
+    ]
+
+
+def _all_pages(db_session, filters, limit):
+    pages = []
+    cursor = None
+    while True:
+        page = LedgerService.get_complete_ledger_page(db_session, 1, filters, cursor=cursor, limit=limit)
+        pages.append(page)
+        if not page.has_more:
+            return pages
+        cursor = page.next_cursor
+
+
+class TestLedgerPagination:
+    """Test keyset pages of the complete ledger"""
+
+    @pytest.mark.parametrize("limit", [1, 7, 40, 100])
+    def test_pages_reproduce_the_complete_ledger(self, db_session, limit):
+        filters = LedgerFilters()
+        pages = _all_pages(db_session, filters, limit)
+
+        assert _rows(t for page in pages for t in page.transactions) == _rows(
+            LedgerService._get_all_transactions(db_session, 1, filters)
+        )
+        assert all(len(page.transactions) <= limit for page in pages)
+        assert pages[-1].next_cursor is None
+
+    def test_pages_honour_filters(self, db_session):
+        filters = LedgerFilters(start_date=date(2024, 6, 2), account_type="customer", account_id=1)
+        pages = _all_pages(db_session, filters, 3)
+        assert _rows(t for page in pages for t in page.transactions) == _rows(
+            LedgerService._get_all_transactions(db_session, 1, filters)
+        )
+
+    def test_opening_balances_carry_forward(self, db_session):
+        first = LedgerService.get_complete_ledger_page(db_session, 1, LedgerFilters(), limit=10)
+        assert all(opening.balance == 0 for opening in first.opening_balances)
+
+        second = LedgerService.get_complete_ledger_page(db_session, 1, LedgerFilters(), cursor=first.next_cursor, limit=10)
+        closing = {(t.account_type, t.account_id): t.balance for t in first.transactions}
+        for opening in second.opening_balances:
+            assert opening.balance == closing.get((opening.account_type, opening.account_id), Decimal(0))
+
+    def test_each_page_costs_two_queries(self, db_session):
+        first = LedgerService.get_complete_ledger_page(db_session, 1, LedgerFilters(), limit=5)
+        with query_budget(2):
+            LedgerService.get_complete_ledger_page(db_session, 1, LedgerFilters(), cursor=first.next_cursor, limit=5)
+
+    def test_cursor_round_trip_and_rejection(self):
+        position = (datetime(2024, 6, 3, 10, 30), 2, 17)
+        assert decode_ledger_cursor(encode_ledger_cursor(position)) == position
+        for cursor in ("not-a-cursor", encode_ledger_cursor((datetime(2024, 6, 3), 9, 1))):
+            with pytest.raises(ValueError):
+                decode_ledger_cursor(cursor)
+
+
+class TestLedgerEndpoints:
+    """Test the page and NDJSON stream endpoints"""
+
+    @pytest.fixture
+    def client_get(self, db_session):
+        app = FastAPI()
+        app.include_router(reports.router, prefix="/api/v1/reports")
+        app.dependency_overrides[get_read_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: db_session.get(User, 1)
+
+        def get(path, **params):
+            async def request():
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await client.get(f"/api/v1/reports{path}", params=params)
+            return asyncio.run(request())
+        return get
+
+    def test_page_endpoint(self, client_get):
+        response = client_get("/complete-ledger/page", limit=15)
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["transactions"]) == 15 and body["has_more"] is True
+
+        response = client_get("/complete-ledger/page", limit=100, cursor=body["next_cursor"])
+        assert response.status_code == 200
+        assert len(response.json()["transactions"]) == 25
+        assert response.json()["next_cursor"] is None
+
+    def test_page_endpoint_rejects_bad_cursor(self, client_get):
+        assert client_get("/complete-ledger/page", cursor="garbage").status_code == 400
+        assert client_get("/complete-ledger/page", limit=0).status_code == 422
+
+    def test_stream_endpoint(self, client_get, db_session):
+        response = client_get("/complete-ledger/stream", account_type="vendor")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        expected = LedgerService._get_all_transactions(db_session, 1, LedgerFilters(account_type="vendor"))
+        assert [(line["voucher_number"], Decimal(line["balance"])) for line in lines] == [
+            (t.voucher_number, t.balance) for t in expected
+        ]
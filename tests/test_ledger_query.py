@@ -0,0 +1,120 @@
+# tests/test_ledger_query.py
+
+import pytest
+from datetime import datetime, date
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.query_profiler import query_budget
+from app.models.base import Base, Organization, User, Vendor, Customer
+from app.models.vouchers import PurchaseVoucher, PaymentVoucher, SalesVoucher, ReceiptVoucher, CreditNote, DebitNote
+from app.schemas.ledger import LedgerFilters
+from app.services.ledger_service import LedgerService
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    for model, account_id, org_id, name in (
+        (Vendor, 1, 1, "Acme Supplies"), (Customer, 1, 1, "Beta Retail"), (Customer, 2, 2, "Other Org Customer")
+    ):
+        session.add(model(
+            id=account_id, organization_id=org_id, name=name, contact_number="9876543210",
+            address1="Test Address", city="Test City", state="Test State", pin_code="123456", state_code="TS"
+        ))
+
+    def voucher(model, voucher_id, number, amount, day, org_id=1, **kwargs):
+        session.add(model(
+            id=voucher_id, organization_id=org_id, voucher_number=number, date=datetime(2024, 6, day),
+            total_amount=amount, status=kwargs.pop("status", "confirmed"), created_by=1, **kwargs
+        ))
+
+    voucher(PurchaseVoucher, 1, "PV001", 1000.0, 1, vendor_id=1, notes="Raw material")
+    voucher(SalesVoucher, 1, "SV001", 1500.0, 2, customer_id=1)
+    voucher(PaymentVoucher, 1, "PAY001", 300.0, 3, vendor_id=1, reference="UTR123")
+    voucher(ReceiptVoucher, 1, "RV001", 500.0, 3, customer_id=1)
+    voucher(CreditNote, 1, "CN001", 100.0, 4, customer_id=1, reason="Discount")
+    voucher(DebitNote, 1, "DN001", 50.0, 4, vendor_id=1, reason="Freight", status="cancelled")
+    voucher(SalesVoucher, 2, "SV002", 200.0, 1, customer_id=1)
+    voucher(SalesVoucher, 3, "SV-OTHER", 999.0, 1, org_id=2, customer_id=2)
+    session.commit()
+    yield session
+    session.close()
+
+
+def _rows(transactions):
+    return [(t.voucher_number, t.account_type, t.debit_amount, t.credit_amount, t.balance) for t in transactions]
+
+
+class TestLedgerQuery:
+    """Test the single-query complete ledger"""
+
+    def test_complete_ledger_order_and_running_balances(self, db_session):
+        response = LedgerService.get_complete_ledger(db_session, 1, LedgerFilters())
+
+        assert _rows(response.transactions) == [
+            ("PV001", "vendor", Decimal("1000.0"), Decimal("0"), Decimal("1000.0")),
+            ("SV002", "customer", Decimal("0"), Decimal("200.0"), Decimal("200.0")),
+            ("SV001", "customer", Decimal("0"), Decimal("1500.0"), Decimal("1700.0")),
+            ("PAY001", "vendor", Decimal("0"), Decimal("300.0"), Decimal("700.0")),
+            ("RV001", "customer", Decimal("500.0"), Decimal("0"), Decimal("1200.0")),
+            ("DN001", "vendor", Decimal("50.0"), Decimal("0"), Decimal("750.0")),
+            ("CN001", "customer", Decimal("0"), Decimal("100.0"), Decimal("1300.0")),
+        ]
+        assert response.total_debit == Decimal("1550")
+        assert response.total_credit == Decimal("2100")
+        assert response.summary["accounts_involved"] == 2
+
+    def test_names_descriptions_and_references(self, db_session):
+        transactions = {t.voucher_number: t for t in LedgerService._get_all_transactions(db_session, 1, LedgerFilters())}
+        assert transactions["PV001"].account_name == "Acme Supplies"
+        assert transactions["SV001"].account_name == "Beta Retail"
+        assert transactions["PV001"].description == "Raw material"
+        assert transactions["CN001"].description == "Discount"
+        assert transactions["PAY001"].reference == "UTR123"
+        assert transactions["SV001"].reference == ""
+        assert transactions["DN001"].status == "cancelled"
+
+    def test_filters(self, db_session):
+        def numbers(**filters):
+            return [t.voucher_number for t in LedgerService._get_all_transactions(db_session, 1, LedgerFilters(**filters))]
+
+        assert numbers(account_type="vendor") == ["PV001", "PAY001", "DN001"]
+        assert numbers(account_type="customer", account_id=1) == ["SV002", "SV001", "RV001", "CN001"]
+        assert numbers(voucher_type="sales_voucher") == ["SV002", "SV001"]
+        assert numbers(voucher_type="payment_voucher", account_type="customer") == []
+        assert numbers(start_date=date(2024, 6, 3), end_date=date(2024, 6, 3)) == ["PAY001", "RV001"]
+
+    def test_balances_open_with_history_before_start_date(self, db_session):
+        response = LedgerService.get_complete_ledger(
+            db_session, 1, LedgerFilters(start_date=date(2024, 6, 3), account_type="customer")
+        )
+        assert [(t.voucher_number, t.balance) for t in response.transactions] == [
+            ("RV001", Decimal("1200.0")), ("CN001", Decimal("1300.0"))
+        ]
+        assert [(b.account_type, b.account_id, b.balance) for b in response.opening_balances] == [
+            ("customer", 1, Decimal("1700.0"))
+        ]
+
+    def test_other_organizations_are_excluded(self, db_session):
+        numbers = [t.voucher_number for t in LedgerService._get_all_transactions(db_session, 2, LedgerFilters())]
+        assert numbers == ["SV-OTHER"]
+
+    def test_single_query_streamed_in_batches(self, db_session):
+        with query_budget(1):
+            transactions = list(LedgerService.iter_transactions(db_session, 1, LedgerFilters(), batch_size=2))
+        assert len(transactions) == 7
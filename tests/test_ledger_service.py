@@ -81,141 +81,6 @@ class TestLedgerService:
 class TestLedgerCalculations(TestLedgerService):
     """Test ledger calculation logic"""
     
-    def test_calculate_running_balances_vendor(self):
-        """Test running balance calculation for vendor transactions"""
-        transactions = [
-            LedgerTransaction(
-                id=1,
-                voucher_type="purchase_voucher",
-                voucher_number="PV001",
-                date=datetime(2024, 1, 1),
-                account_type="vendor",
-                account_id=1,
-                account_name="Test Vendor",
-                debit_amount=Decimal("1000"),  # Purchase increases payable
-                credit_amount=Decimal("0"),
-                balance=Decimal("0"),
-                status="confirmed"
-            ),
-            LedgerTransaction(
-                id=2,
-                voucher_type="payment_voucher", 
-                voucher_number="PAY001",
-                date=datetime(2024, 1, 5),
-                account_type="vendor",
-                account_id=1,
-                account_name="Test Vendor",
-                debit_amount=Decimal("0"),
-                credit_amount=Decimal("600"),  # Payment reduces payable
-                balance=Decimal("0"),
-                status="confirmed"
-            )
-        ]
-        
-        result = LedgerService._calculate_running_balances(transactions)
-        
-        # First transaction: +1000 (debit increases vendor payable)
-        assert result[0].balance == Decimal("1000")
-        
-        # Second transaction: 1000 - 600 = 400 (credit reduces vendor payable)
-        assert result[1].balance == Decimal("400")
-    
-    def test_calculate_running_balances_customer(self):
-        """Test running balance calculation for customer transactions"""
-        transactions = [
-            LedgerTransaction(
-                id=1,
-                voucher_type="sales_voucher",
-                voucher_number="SV001", 
-                date=datetime(2024, 1, 1),
-                account_type="customer",
-                account_id=1,
-                account_name="Test Customer",
-                debit_amount=Decimal("0"),
-                credit_amount=Decimal("1500"),  # Sale increases receivable
-                balance=Decimal("0"),
-                status="confirmed"
-            ),
-            LedgerTransaction(
-                id=2,
-                voucher_type="receipt_voucher",
-                voucher_number="REC001",
-                date=datetime(2024, 1, 5),
-                account_type="customer", 
-                account_id=1,
-                account_name="Test Customer",
-                debit_amount=Decimal("800"),  # Receipt reduces receivable
-                credit_amount=Decimal("0"),
-                balance=Decimal("0"),
-                status="confirmed"
-            )
-        ]
-        
-        result = LedgerService._calculate_running_balances(transactions)
-        
-        # First transaction: +1500 (credit increases customer receivable)
-        assert result[0].balance == Decimal("1500")
-        
-        # Second transaction: 1500 - 800 = 700 (debit reduces customer receivable)
-        assert result[1].balance == Decimal("700")
-    
-    def test_get_account_info_payment_voucher(self):
-        """Test account info extraction for payment voucher"""
-        voucher = Mock()
-        voucher.vendor_id = 1
-        voucher.vendor = Mock()
-        voucher.vendor.name = "Test Vendor"
-        
-        config = {
-            "type": "payment_voucher",
-            "account_relation": "vendor",
-            "account_field": "vendor_id"
-        }
-        
-        account_type, account_id, account_name = LedgerService._get_account_info(
-            voucher, config, Mock()
-        )
-        
-        assert account_type == "vendor"
-        assert account_id == 1
-        assert account_name == "Test Vendor"
-    
-    def test_get_account_info_debit_note_vendor(self):
-        """Test account info extraction for debit note with vendor"""
-        voucher = Mock()
-        voucher.vendor_id = 1
-        voucher.customer_id = None
-        voucher.vendor = Mock()
-        voucher.vendor.name = "Test Vendor"
-        
-        config = {"type": "debit_note"}
-        
-        account_type, account_id, account_name = LedgerService._get_account_info(
-            voucher, config, Mock()
-        )
-        
-        assert account_type == "vendor"
-        assert account_id == 1
-        assert account_name == "Test Vendor"
-    
-    def test_get_account_info_debit_note_customer(self):
-        """Test account info extraction for debit note with customer"""
-        voucher = Mock()
-        voucher.vendor_id = None
-        voucher.customer_id = 2
-        voucher.customer = Mock()
-        voucher.customer.name = "Test Customer"
-        
-        config = {"type": "debit_note"}
-        
-        account_type, account_id, account_name = LedgerService._get_account_info(
-            voucher, config, Mock()
-        )
-        
-        assert account_type == "customer"
-        assert account_id == 2
-        assert account_name == "Test Customer"
-    
     def test_date_range_calculation(self):
         """Test date range calculation from transactions"""
         transactions = [
@@ -277,13 +142,13 @@ class TestOutstandingBalanceCalculation(TestLedgerService):
         ]
         mock_get_transactions.return_value = mock_transactions
         
-        # Mock vendor query
-        mock_vendor = Mock()
-        mock_vendor.contact_number = "1234567890"
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_vendor
+        # Mock the batched vendor lookup: (id, name, contact_number, email) rows
+        mock_db.execute.return_value = [(1, "Test Vendor", "1234567890", None)]
         
         filters = LedgerFilters()
         result = LedgerService._calculate_outstanding_balances(mock_db, 1, filters)
+        # Only amounts are summed, so the opening balances are not read
+        mock_get_transactions.assert_called_once_with(mock_db, 1, filters, opening_balances={})
         
         assert len(result) == 1
         balance = result[0]
@@ -316,10 +181,8 @@ class TestOutstandingBalanceCalculation(TestLedgerService):
         ]
         mock_get_transactions.return_value = mock_transactions
         
-        # Mock customer query
-        mock_customer = Mock()
-        mock_customer.contact_number = "0987654321"
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_customer
+        # Mock the batched customer lookup: (id, name, contact_number, email) rows
+        mock_db.execute.return_value = [(1, "Test Customer", "0987654321", None)]
         
         filters = LedgerFilters()
         result = LedgerService._calculate_outstanding_balances(mock_db, 1, filters)
@@ -392,7 +255,7 @@ class TestErrorHandling(TestLedgerService):
         
         assert "Database error" in str(exc_info.value)
     
-    @patch.object(LedgerService, '_calculate_outstanding_balances')
+    @patch.object(LedgerService, '_get_outstanding_balances')
     def test_outstanding_ledger_calculation_error(self, mock_calculate, mock_db):
         """Test outstanding ledger handles calculation errors"""
         mock_calculate.side_effect = Exception("Calculation error")
@@ -0,0 +1,150 @@
+# tests/test_ledger_snapshots.py
+
+import pytest
+from datetime import datetime, date
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base, Organization, User, Vendor, Customer
+from app.models.vouchers import AccountBalanceSnapshot, PurchaseVoucher, PaymentVoucher, SalesVoucher, ReceiptVoucher, CreditNote
+from app.schemas.ledger import LedgerFilters
+from app.services.ledger_service import LedgerService
+from app.services.ledger_snapshot_service import LedgerSnapshotService
+
+TODAY = date(2024, 4, 10)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Organization(
+        id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    for model, account_id, name in ((Vendor, 1, "Acme Supplies"), (Customer, 1, "Beta Retail"), (Customer, 2, "Gamma Stores")):
+        session.add(model(
+            id=account_id, organization_id=1, name=name, contact_number="9876543210",
+            address1="Test Address", city="Test City", state="Test State", pin_code="123456", state_code="TS"
+        ))
+    session.add_all([
+        _voucher(PurchaseVoucher, "PV001", 1000.0, datetime(2024, 1, 5), vendor_id=1),
+        _voucher(SalesVoucher, "SV001", 1500.0, datetime(2024, 1, 20), customer_id=1),
+        _voucher(PaymentVoucher, "PAY001", 400.0, datetime(2024, 2, 10), vendor_id=1),
+        _voucher(SalesVoucher, "SV002", 800.0, datetime(2024, 2, 29, 18), customer_id=2),
+        _voucher(ReceiptVoucher, "RV001", 500.0, datetime(2024, 3, 15), customer_id=1),
+        _voucher(CreditNote, "CN001", 50.0, datetime(2024, 3, 31), customer_id=2, reason="Discount"),
+        _voucher(SalesVoucher, "SV003", 300.0, datetime(2024, 4, 2), customer_id=1),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _voucher(model, number, amount, when, **kwargs):
+    return model(
+        organization_id=1, voucher_number=number, date=when,
+        total_amount=amount, status="confirmed", created_by=1, **kwargs
+    )
+
+
+def _snapshot_periods(db_session):
+    return sorted({row.period_end for row in db_session.query(AccountBalanceSnapshot)})
+
+
+def _scanned_openings(db_session, filters):
+    """Opening balances without any snapshots"""
+    nested = db_session.begin_nested()
+    db_session.query(AccountBalanceSnapshot).delete()
+    openings = LedgerSnapshotService.opening_balances(db_session, 1, filters)
+    nested.rollback()
+    return openings
+
+
+class TestSnapshotGeneration:
+    """Test month-end snapshot generation"""
+
+    def test_generates_closed_months_with_carried_forward_accounts(self, db_session):
+        assert LedgerSnapshotService.generate(db_session, today=TODAY) == 2 + 3 + 3
+        db_session.commit()
+        assert _snapshot_periods(db_session) == [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31)]
+
+        march = {
+            (row.account_type, row.account_id): (row.balance, row.transaction_count)
+            for row in db_session.query(AccountBalanceSnapshot).filter_by(period_end=date(2024, 3, 31))
+        }
+        assert march == {("vendor", 1): (600.0, 2), ("customer", 1): (1000.0, 2), ("customer", 2): (850.0, 2)}
+
+    def test_generation_is_incremental(self, db_session):
+        LedgerSnapshotService.generate(db_session, today=date(2024, 3, 1))
+        db_session.commit()
+        assert _snapshot_periods(db_session) == [date(2024, 1, 31), date(2024, 2, 29)]
+
+        assert LedgerSnapshotService.generate(db_session, today=TODAY) == 3
+        assert LedgerSnapshotService.generate(db_session, today=TODAY) == 0
+        assert LedgerSnapshotService.generate(db_session, today=TODAY, rebuild=True) == 8
+
+    def test_backdated_voucher_drops_later_snapshots(self, db_session):
+        LedgerSnapshotService.generate(db_session, today=TODAY)
+        db_session.commit()
+
+        db_session.add(_voucher(SalesVoucher, "SV-LATE", 100.0, datetime(2024, 2, 3), customer_id=1))
+        db_session.commit()
+        assert _snapshot_periods(db_session) == [date(2024, 1, 31)]
+
+        voucher = db_session.query(PurchaseVoucher).filter_by(voucher_number="PV001").one()
+        db_session.delete(voucher)
+        db_session.commit()
+        assert _snapshot_periods(db_session) == []
+
+
+class TestOpeningBalances:
+    """Test opening balances of date-filtered ledgers"""
+
+    @pytest.mark.parametrize("filters", [
+        LedgerFilters(start_date=date(2024, 3, 20)),
+        LedgerFilters(start_date=date(2024, 4, 1)),
+        LedgerFilters(start_date=date(2024, 2, 1), account_type="customer"),
+        LedgerFilters(start_date=date(2024, 3, 1), account_id=2),
+        LedgerFilters(start_date=date(2024, 4, 1), voucher_type="sales_voucher"),
+    ])
+    def test_snapshot_openings_match_a_full_scan(self, db_session, filters):
+        LedgerSnapshotService.generate(db_session, today=TODAY)
+        db_session.commit()
+        assert LedgerSnapshotService.opening_balances(db_session, 1, filters) == _scanned_openings(db_session, filters)
+
+    def test_opening_reads_the_latest_snapshot(self, db_session):
+        LedgerSnapshotService.generate(db_session, today=TODAY)
+        db_session.execute(
+            update(AccountBalanceSnapshot)
+            .where(AccountBalanceSnapshot.period_end == date(2024, 2, 29), AccountBalanceSnapshot.account_type == "vendor")
+            .values(balance=10000.0)
+        )
+        db_session.commit()
+        openings = LedgerSnapshotService.opening_balances(db_session, 1, LedgerFilters(start_date=date(2024, 3, 10)))
+        assert openings[("vendor", 1)] == 10000.0
+
+    def test_ledger_and_pages_carry_openings(self, db_session):
+        LedgerSnapshotService.generate(db_session, today=TODAY)
+        db_session.commit()
+        filters = LedgerFilters(start_date=date(2024, 3, 1))
+
+        response = LedgerService.get_complete_ledger(db_session, 1, filters)
+        assert [(t.voucher_number, float(t.balance)) for t in response.transactions] == [
+            ("RV001", 1000.0), ("CN001", 850.0), ("SV003", 1300.0)
+        ]
+        assert {(b.account_type, b.account_id): float(b.balance) for b in response.opening_balances} == {
+            ("vendor", 1): 600.0, ("customer", 1): 1500.0, ("customer", 2): 800.0
+        }
+
+        first = LedgerService.get_complete_ledger_page(db_session, 1, filters, limit=2)
+        second = LedgerService.get_complete_ledger_page(db_session, 1, filters, cursor=first.next_cursor, limit=2)
+        assert [float(t.balance) for t in first.transactions + second.transactions] == [1000.0, 850.0, 1300.0]
+        assert [(b.account_id, float(b.balance)) for b in second.opening_balances] == [(1, 1000.0)]
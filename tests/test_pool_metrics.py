@@ -0,0 +1,126 @@
+# tests/test_pool_metrics.py
+
+import asyncio
+import pytest
+from sqlalchemy import create_engine, exc as sa_exc, text
+
+from app.core.config import settings
+from app.core.pool_metrics import PoolMetrics, instrument_engine, pool_metrics_registry, render_prometheus
+from app.core.tenant_config import EnvironmentConfig
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=1, pool_timeout=0.05
+    )
+    yield engine
+    engine.dispose()
+    for name in [name for name, metrics in pool_metrics_registry.items() if metrics.engine is engine]:
+        del pool_metrics_registry[name]
+
+
+class TestPoolProfiles:
+    """Test environment pool profiles and DB_POOL_* overrides"""
+
+    def test_profile_follows_environment(self, monkeypatch):
+        for environment in ("production", "development", "staging"):
+            monkeypatch.setattr(settings, "ENVIRONMENT", environment)
+            assert EnvironmentConfig.get_database_pool_config() == {
+                "pool_size": 10, "max_overflow": 20, "pool_timeout": 30, "pool_recycle": 300
+            }
+        monkeypatch.setattr(settings, "ENVIRONMENT", "testing")
+        assert EnvironmentConfig.get_database_pool_size() == 2
+
+    def test_settings_override_profile(self, monkeypatch):
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+        monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 3)
+        config = EnvironmentConfig.get_database_pool_config()
+        assert config["pool_size"] == 10
+        assert config["max_overflow"] == 0
+        assert config["pool_timeout"] == 3
+
+    def test_async_pool_is_sized_separately(self, monkeypatch):
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 3)
+        assert EnvironmentConfig.get_async_database_pool_config() == {
+            "pool_size": 5, "max_overflow": 5, "pool_timeout": 3, "pool_recycle": 300
+        }
+        monkeypatch.setattr(settings, "DB_ASYNC_POOL_SIZE", 2)
+        assert EnvironmentConfig.get_async_database_pool_config()["pool_size"] == 2
+
+
+class TestPoolMetrics:
+    """Test pool event hooks and checkout timing"""
+
+    def test_checkout_and_overflow_are_recorded(self, pooled_engine):
+        metrics = instrument_engine(pooled_engine, "test_checkout")
+        first = pooled_engine.connect()
+        second = pooled_engine.connect()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkouts"] == 2
+        assert snapshot["checked_out"] == 2
+        assert snapshot["overflow"] == 1
+        assert snapshot["peak_overflow"] == 1
+        assert snapshot["connections_created"] == 2
+
+        first.close()
+        second.close()
+        assert metrics.snapshot()["checked_out"] == 0
+
+    def test_exhausted_pool_records_timeout(self, pooled_engine):
+        metrics = instrument_engine(pooled_engine, "test_timeout")
+        held = [pooled_engine.connect(), pooled_engine.connect()]
+        with pytest.raises(sa_exc.TimeoutError):
+            pooled_engine.connect()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkout_timeouts"] == 1
+        assert snapshot["checkout_wait_max_ms"] >= 40
+        for connection in held:
+            connection.close()
+
+    def test_invalidation_is_counted(self, pooled_engine):
+        metrics = instrument_engine(pooled_engine, "test_invalidate")
+        with pooled_engine.connect() as connection:
+            connection.invalidate()
+        assert metrics.snapshot()["invalidations"] == 1
+
+    def test_timer_survives_engine_dispose(self, pooled_engine):
+        metrics = instrument_engine(pooled_engine, "test_dispose")
+        pooled_engine.dispose()
+        with pooled_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert metrics.snapshot()["checkouts"] == 1
+
+    def test_instrumenting_twice_reuses_metrics(self, pooled_engine):
+        assert instrument_engine(pooled_engine, "test_twice") is instrument_engine(pooled_engine, "test_twice")
+
+
+class TestPrometheusExposition:
+    """Test the Prometheus text rendering"""
+
+    def test_histogram_is_cumulative(self, pooled_engine):
+        metrics = PoolMetrics("unit", pooled_engine)
+        metrics.record_checkout(0.0005)
+        metrics.record_checkout(0.2)
+        output = render_prometheus({"unit": metrics})
+
+        assert "# TYPE db_pool_checkout_wait_seconds histogram" in output
+        assert 'db_pool_checkout_wait_seconds_bucket{pool="unit",le="0.001"} 1' in output
+        assert 'db_pool_checkout_wait_seconds_bucket{pool="unit",le="0.25"} 2' in output
+        assert 'db_pool_checkout_wait_seconds_bucket{pool="unit",le="+Inf"} 2' in output
+        assert 'db_pool_checkout_wait_seconds_count{pool="unit"} 2' in output
+        assert 'db_pool_size{pool="unit"} 1' in output
+
+    def test_admin_endpoints_expose_registered_pools(self):
+        from app.api.v1.admin import get_database_pool_stats, get_database_pool_stats_prometheus
+
+        stats = asyncio.run(get_database_pool_stats(current_user=None))
+        assert "primary" in {pool["pool"] for pool in stats["pools"]}
+
+        response = asyncio.run(get_database_pool_stats_prometheus(current_user=None))
+        assert response.media_type.startswith("text/plain")
+        assert b'db_pool_checked_out{pool="primary"}' in response.body
@@ -0,0 +1,190 @@
+# tests/test_principal_cache.py
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.auth_cache import AuthenticatedPrincipal, PrincipalCache, principal_cache
+from app.core.security import create_access_token, get_current_principal, get_current_user
+from app.models.base import Base, Organization, User
+from app.schemas.user import UserUpdate
+from app.services.reset_service import ResetService
+from app.services.user_service import UserService
+
+
+def _principal(email="a@test.com", user_id=1, role="admin"):
+    return AuthenticatedPrincipal(
+        id=user_id, email=email, user_type="organization", organization_id=1, role=role,
+        is_active=True, is_super_admin=False, must_change_password=False,
+        force_password_reset=False, has_stock_access=True
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPrincipalCache:
+    """Test TTL/LRU behaviour of the principal cache"""
+
+    def test_get_put_and_stats(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        key = ("organization", "a@test.com", 100)
+        assert cache.get(key) is None
+        cache.put(key, _principal())
+        assert cache.get(key).id == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = PrincipalCache(max_entries=10, ttl_seconds=30, clock=clock)
+        key = ("organization", "a@test.com", 100)
+        cache.put(key, _principal())
+        clock.now = 29
+        assert cache.get(key) is not None
+        clock.now = 31
+        assert cache.get(key) is None
+        assert cache.stats()["size"] == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        keys = [("organization", f"u{i}@test.com", 1) for i in range(3)]
+        cache.put(keys[0], _principal(keys[0][1]))
+        cache.put(keys[1], _principal(keys[1][1]))
+        cache.get(keys[0])
+        cache.put(keys[2], _principal(keys[2][1]))
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_email_drops_all_tokens_for_user(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.put(("organization", "A@test.com", 1), _principal())
+        cache.put(("organization", "a@test.com", 2), _principal())
+        cache.put(("organization", "b@test.com", 1), _principal("b@test.com", 2))
+        assert cache.invalidate_email("a@test.com") == 2
+        assert cache.stats()["size"] == 1
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = PrincipalCache(max_entries=0, ttl_seconds=60)
+        cache.put(("organization", "a@test.com", 1), _principal())
+        assert cache.stats()["size"] == 0
+
+    def test_principal_is_immutable(self):
+        principal = _principal()
+        with pytest.raises(Exception):
+            principal.role = "super_admin"
+
+
+class TestCurrentPrincipalDependency:
+    """Test that cached principals skip the users query and are invalidated on mutation"""
+
+    @pytest.fixture
+    def db_session(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add(Organization(
+            id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+        session.add(User(
+            id=1, organization_id=1, email="cached@test.com", username="cached",
+            hashed_password="hashed", role="standard_user", is_active=True
+        ))
+        session.commit()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        session.statements = statements
+        principal_cache.clear()
+        yield session
+        principal_cache.clear()
+        session.close()
+
+    def _user_selects(self, db_session):
+        return [s for s in db_session.statements if s.lstrip().upper().startswith("SELECT") and "FROM users" in s]
+
+    def test_cache_hit_skips_user_query(self, db_session):
+        token = create_access_token("cached@test.com", organization_id=1, user_role="standard_user")
+
+        first = get_current_principal(db=db_session, token=token)
+        second = get_current_principal(db=db_session, token=token)
+
+        assert first == second
+        assert first.organization_id == 1
+        assert len(self._user_selects(db_session)) == 1
+
+    def test_get_current_user_primes_principal_cache(self, db_session):
+        token = create_access_token("cached@test.com", organization_id=1, user_role="standard_user")
+
+        user = get_current_user(db=db_session, token=token)
+        principal = get_current_principal(db=db_session, token=token)
+
+        assert principal.id == user.id
+        assert len(self._user_selects(db_session)) == 1
+
+    def test_role_change_via_user_service_invalidates(self, db_session):
+        token = create_access_token("cached@test.com", organization_id=1, user_role="standard_user")
+        assert get_current_principal(db=db_session, token=token).role == "standard_user"
+
+        UserService.update_user(db_session, 1, UserUpdate(role="admin"))
+
+        assert get_current_principal(db=db_session, token=token).role == "admin"
+
+    def test_deactivation_invalidates(self, db_session):
+        token = create_access_token("cached@test.com", organization_id=1, user_role="standard_user")
+        get_current_principal(db=db_session, token=token)
+
+        user = db_session.get(User, 1)
+        user.is_active = False
+        db_session.commit()
+
+        assert get_current_principal(db=db_session, token=token).is_active is False
+
+    def test_non_security_change_keeps_cache(self, db_session):
+        token = create_access_token("cached@test.com", organization_id=1, user_role="standard_user")
+        get_current_principal(db=db_session, token=token)
+
+        user = db_session.get(User, 1)
+        user.department = "Sales"
+        db_session.commit()
+        before = len(self._user_selects(db_session))
+
+        get_current_principal(db=db_session, token=token)
+        assert len(self._user_selects(db_session)) == before
+
+    def test_rolled_back_change_does_not_invalidate(self, db_session):
+        token = create_access_token("cached@test.com", organization_id=1, user_role="standard_user")
+        get_current_principal(db=db_session, token=token)
+
+        user = db_session.get(User, 1)
+        user.role = "admin"
+        db_session.flush()
+        db_session.rollback()
+
+        assert principal_cache.stats()["size"] == 1
+
+    def test_bulk_delete_through_reset_invalidates(self, db_session):
+        token = create_access_token("cached@test.com", organization_id=1, user_role="standard_user")
+        get_current_principal(db=db_session, token=token)
+
+        ResetService.factory_default_system(db_session)
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_principal(db=db_session, token=token)
+        assert exc_info.value.status_code == 401
+
+    def test_unknown_user_is_rejected(self, db_session):
+        token = create_access_token("missing@test.com", organization_id=1)
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_principal(db=db_session, token=token)
+        assert exc_info.value.status_code == 401
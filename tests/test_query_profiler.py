@@ -0,0 +1,159 @@
+# tests/test_query_profiler.py
+
+import asyncio
+import logging
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker, joinedload
+from sqlalchemy.pool import StaticPool
+
+from app.core.query_profiler import (
+    QueryBudgetExceeded, QueryProfilerMiddleware, fingerprint, profile_queries, query_budget
+)
+from app.models.base import Base, Organization, User, Customer
+from app.models.vouchers import SalesVoucher
+
+
+def _seed(session, vouchers=6):
+    session.add(Organization(
+        id=1, name="Test Organization", subdomain="test", primary_email="test@test.com",
+        primary_phone="1234567890", address1="Test Address", city="Test City",
+        state="Test State", pin_code="123456", plan_type="basic"
+    ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    for i in range(1, vouchers + 1):
+        session.add(Customer(
+            id=i, organization_id=1, name=f"Customer {i}", contact_number="1234567890",
+            address1="Test Address", city="Test City", state="Test State", pin_code="123456", state_code="TS"
+        ))
+        session.add(SalesVoucher(
+            id=i, organization_id=1, voucher_number=f"SV{i:03d}", date=datetime(2024, 6, 1),
+            customer_id=i, total_amount=100.0, created_by=1
+        ))
+    session.commit()
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    _seed(session)
+    session.expire_all()
+    yield session
+    session.close()
+
+
+def _customer_names(db_session, eager=False):
+    query = db_session.query(SalesVoucher)
+    if eager:
+        query = query.options(joinedload(SalesVoucher.customer))
+    return [voucher.customer.name for voucher in query.all()]
+
+
+class TestFingerprint:
+    """Test SQL normalization"""
+
+    def test_literals_and_placeholder_lists_are_normalized(self):
+        assert fingerprint("SELECT * FROM t WHERE id = 5 AND name = 'x'") == "SELECT * FROM t WHERE id = ? AND name = ?"
+        assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == fingerprint("SELECT * FROM t WHERE id IN (?)")
+        assert fingerprint("SELECT *\n   FROM t") == "SELECT * FROM t"
+
+
+class TestQueryProfile:
+    """Test query counting and N+1 detection"""
+
+    def test_lazy_loads_in_a_loop_are_flagged(self, db_session):
+        with profile_queries("loop") as profile:
+            names = _customer_names(db_session)
+
+        assert len(names) == 6
+        assert profile.query_count == 7
+        (flagged,) = profile.n_plus_one()
+        assert flagged.count == 6
+        assert "FROM customers" in flagged.fingerprint
+        assert flagged.origin.startswith("tests/test_query_profiler.py")
+
+    def test_eager_loading_is_not_flagged(self, db_session):
+        with profile_queries("eager") as profile:
+            _customer_names(db_session, eager=True)
+        assert profile.query_count == 1
+        assert profile.n_plus_one() == []
+
+    def test_no_recording_outside_a_profile(self, db_session):
+        with profile_queries("outer") as profile:
+            pass
+        _customer_names(db_session)
+        assert profile.query_count == 0
+
+    def test_async_sessions_are_profiled(self):
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            factory = async_sessionmaker(engine, expire_on_commit=False)
+            async with factory() as session:
+                await session.run_sync(_seed)
+            with profile_queries("async") as profile:
+                async with factory() as session:
+                    await session.execute(select(SalesVoucher))
+            await engine.dispose()
+            return profile.query_count
+
+        assert asyncio.run(run()) == 1
+
+
+class TestQueryBudget:
+    """Test the query budget used to guard routes in tests"""
+
+    def test_within_budget(self, db_session):
+        with query_budget(1) as profile:
+            _customer_names(db_session, eager=True)
+        assert profile.query_count == 1
+
+    def test_over_budget_raises_with_report(self, db_session):
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            with query_budget(3, allow_n_plus_one=True):
+                _customer_names(db_session)
+        assert "7 > 3" in str(exc_info.value)
+
+    def test_n_plus_one_fails_even_within_budget(self, db_session):
+        with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+            with query_budget(100):
+                _customer_names(db_session)
+
+
+class TestQueryProfilerMiddleware:
+    """Test per-request profiling headers and logging"""
+
+    def test_headers_and_n_plus_one_warning(self, db_session, caplog):
+        app = FastAPI()
+        app.add_middleware(QueryProfilerMiddleware)
+
+        @app.get("/names")
+        def names():
+            return _customer_names(db_session)
+
+        async def call():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return await client.get("/names")
+
+        with caplog.at_level(logging.INFO, logger="fastapi_migration.query_profiler"):
+            response = asyncio.run(call())
+
+        assert response.status_code == 200
+        assert response.headers["x-db-query-count"] == "7"
+        assert float(response.headers["x-db-time-ms"]) >= 0
+        (record,) = [r for r in caplog.records if hasattr(r, "query_profile")]
+        assert record.levelno == logging.WARNING
+        assert record.query_profile["n_plus_one"][0]["count"] == 6
@@ -0,0 +1,115 @@
+# tests/test_read_replica.py
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.read_replica import ReadReplicaRouter, measure_replica_lag, PRIMARY, REPLICA
+from app.models.base import Base, Organization
+
+
+def _make_database(path, organization_name):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add(Organization(
+            id=1, name=organization_name, subdomain="test", primary_email="test@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+        session.commit()
+    return engine, factory
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Two SQLite files standing in for the primary and its replica"""
+    primary_engine, primary_factory = _make_database(tmp_path / "primary.db", "Primary")
+    replica_engine, replica_factory = _make_database(tmp_path / "replica.db", "Replica")
+    yield primary_factory, replica_factory
+    primary_engine.dispose()
+    replica_engine.dispose()
+
+
+def _served_by(router):
+    with router.session() as session:
+        return session.info["database_role"], session.get(Organization, 1).name
+
+
+class TestReadReplicaRouter:
+    """Test routing between replica and primary"""
+
+    def test_without_replica_reads_go_to_primary(self, databases):
+        primary_factory, _ = databases
+        router = ReadReplicaRouter(primary_factory)
+        assert _served_by(router) == (PRIMARY, "Primary")
+        assert router.status()["fallbacks"] == 0
+
+    def test_healthy_replica_serves_reads(self, databases):
+        router = ReadReplicaRouter(*databases)
+        assert _served_by(router) == (REPLICA, "Replica")
+        assert router.status()["lag_seconds"] == 0
+
+    def test_lagging_replica_falls_back_to_primary(self, databases):
+        router = ReadReplicaRouter(*databases, max_lag_seconds=10, lag_probe=lambda connection: 45.0)
+        assert _served_by(router) == (PRIMARY, "Primary")
+        status = router.status()
+        assert status["available"] is False
+        assert status["lag_seconds"] == 45.0
+        assert status["fallbacks"] == 1
+
+    def test_unreachable_replica_falls_back_to_primary(self, databases):
+        def failing_probe(connection):
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+        router = ReadReplicaRouter(*databases, lag_probe=failing_probe)
+        assert _served_by(router) == (PRIMARY, "Primary")
+        assert "connection refused" in router.status()["last_error"]
+
+    def test_health_is_cached_between_checks(self, databases):
+        probes = []
+
+        def counting_probe(connection):
+            probes.append(1)
+            return measure_replica_lag(connection)
+
+        router = ReadReplicaRouter(*databases, check_interval=60, lag_probe=counting_probe)
+        for _ in range(5):
+            assert _served_by(router)[0] == REPLICA
+        assert len(probes) == 1
+
+    def test_replica_recovers_after_check_interval(self, databases):
+        lag = {"seconds": 120.0}
+        router = ReadReplicaRouter(*databases, max_lag_seconds=30, check_interval=0,
+                                   lag_probe=lambda connection: lag["seconds"])
+        assert _served_by(router)[0] == PRIMARY
+        lag["seconds"] = 1.0
+        assert _served_by(router)[0] == REPLICA
+
+    def test_reported_failure_takes_replica_out_of_rotation(self, databases):
+        router = ReadReplicaRouter(*databases, check_interval=60)
+        assert _served_by(router)[0] == REPLICA
+        router.report_failure(OperationalError("SELECT 1", {}, Exception("server closed the connection")))
+        assert _served_by(router)[0] == PRIMARY
+
+
+class TestGetReadDb:
+    """Test the get_read_db dependency"""
+
+    def test_yields_replica_session_and_reports_connection_errors(self, databases, monkeypatch):
+        router = ReadReplicaRouter(*databases, check_interval=60)
+        monkeypatch.setattr(database, "read_router", router)
+
+        dependency = database.get_read_db()
+        session = next(dependency)
+        assert session.info["database_role"] == REPLICA
+        with pytest.raises(OperationalError):
+            dependency.throw(OperationalError("SELECT 1", {}, Exception("replica went away")))
+
+        assert router.status()["available"] is False
+        dependency = database.get_read_db()
+        assert next(dependency).info["database_role"] == PRIMARY
+        dependency.close()
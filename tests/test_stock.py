@@ -401,7 +401,7 @@ class TestStockAPI:
                 "Product Name": test_product.name,  # Existing product
                 "Unit": "PCS",
                 "Quantity": 100,
-                "Location": "New Location"
+                "Location": "Old Location"  # Stock entries are keyed by product and location
             }
         ]
         
@@ -0,0 +1,148 @@
+# tests/test_stock_import.py
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.query_profiler import profile_queries
+from app.models.base import Base, Organization, Product, Stock, DashboardCounter
+from app.services import stock_import_service
+from app.services.excel_service import StockExcelService
+from app.services.stock_import_service import StockImportService
+
+
+def _row(name, quantity, unit="PCS", location="Main", **extra):
+    return {"product_name": name, "quantity": quantity, "unit": unit, "location": location, **extra}
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+    session.add_all([
+        Product(id=1, organization_id=1, name="Widget", part_number="W-1", unit="PCS", unit_price=10.0),
+        Product(id=2, organization_id=2, name="Gadget", unit="PCS", unit_price=10.0),
+    ])
+    session.add(Stock(organization_id=1, product_id=1, quantity=5, unit="PCS", location="Main"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _stock(session, org_id=1):
+    rows = session.query(Product.name, Stock.location, Stock.quantity).join(
+        Product, Stock.product_id == Product.id
+    ).filter(Stock.organization_id == org_id).order_by(Product.name, Stock.location)
+    return [tuple(row) for row in rows]
+
+
+class TestStockImport:
+    """Test the set-based stock import pipeline"""
+
+    def test_creates_products_and_upserts_stock(self, db_session):
+        result = StockImportService.import_rows(db_session, 1, [
+            _row("widget", 20),  # existing product, matched case-insensitively
+            _row("Widget", 3, location="Backroom"),
+            _row("Gadget", 7, hsn_code="8471", unit_price="25.5", gst_rate=12, reorder_level=4),
+        ], mode="replace")
+        db_session.commit()
+
+        assert (result.created_products, result.created_stocks, result.updated_stocks, result.skipped) == (1, 2, 1, 0)
+        assert result.warnings == ["Row 1: Updated stock for 'widget' from 5.0 to 20.0 (mode: replace)"]
+        assert _stock(db_session) == [("Gadget", "Main", 7.0), ("Widget", "Backroom", 3.0), ("Widget", "Main", 20.0)]
+
+        gadget = db_session.query(Product).filter_by(organization_id=1, name="Gadget").one()
+        assert (gadget.hsn_code, gadget.unit_price, gadget.gst_rate, gadget.reorder_level) == ("8471", 25.5, 12.0, 4)
+        # The other organization's product with the same name is untouched
+        assert _stock(db_session, 2) == []
+
+    def test_add_mode_sums_rows(self, db_session):
+        result = StockImportService.import_rows(db_session, 1, [
+            _row("Widget", 2), _row("Widget", 3), _row("Sprocket", 1), _row("sprocket", 4),
+        ], mode="add")
+        db_session.commit()
+        assert (result.created_products, result.created_stocks, result.updated_stocks) == (1, 1, 1)
+        assert _stock(db_session) == [("Sprocket", "Main", 5.0), ("Widget", "Main", 10.0)]
+
+    def test_null_location_matches_empty_cell(self, db_session):
+        db_session.add(Stock(organization_id=1, product_id=1, quantity=1, unit="PCS", location=None))
+        db_session.commit()
+        result = StockImportService.import_rows(db_session, 1, [_row("Widget", 4, location=None)], mode="add")
+        db_session.commit()
+        assert (result.created_stocks, result.updated_stocks) == (0, 1)
+        assert db_session.query(Stock).filter_by(location=None).one().quantity == 5.0
+
+    def test_row_errors(self, db_session):
+        result = StockImportService.import_rows(db_session, 1, [
+            _row("", 1),
+            _row("Bolt", 1, unit=None),
+            _row("Bolt", "lots"),
+            _row("Bolt", -2),
+            _row("Nut", 1, part_number="W-1"),  # part number already used by Widget
+            _row("Washer", 1, gst_rate=250, unit_price="free"),
+        ])
+        db_session.commit()
+
+        assert [(e.row, e.field, e.error_code) for e in result.detailed_errors] == [
+            (1, "product_name", "REQUIRED_FIELD_MISSING"),
+            (2, "unit", "REQUIRED_FIELD_MISSING"),
+            (3, "quantity", "INVALID_DATA_TYPE"),
+            (4, "quantity", "INVALID_VALUE"),
+            (5, "product_creation", "PRODUCT_CREATION_FAILED"),
+        ]
+        assert result.errors[2] == "Row 3: Invalid data format - Quantity must be a number, got 'lots'"
+        assert result.skipped == 5
+        assert result.warnings == [
+            "Row 6: Invalid data format - Unit Price must be a number, got 'free'; using 0",
+            "Row 6: GST Rate must be between 0 and 100, got 250; using 18",
+        ]
+        washer = db_session.query(Product).filter_by(name="Washer").one()
+        assert (washer.unit_price, washer.gst_rate, washer.reorder_level) == (0.0, 18.0, 10)
+        assert db_session.query(Product).filter_by(name="Bolt").count() == 0
+
+    def test_dashboard_counters_are_recomputed(self, db_session):
+        StockImportService.import_rows(db_session, 1, [_row("Sprocket", 1), _row("Bolt", 1)])
+        db_session.commit()
+        assert db_session.query(DashboardCounter).filter_by(organization_id=1).one().products == 3
+
+    def test_statements_grow_with_chunks_not_rows(self, db_session, monkeypatch):
+        monkeypatch.setattr(stock_import_service, "STOCK_IMPORT_CHUNK_SIZE", 100)
+        rows = [_row(f"Product {i}", i, location=f"Bin {i % 3}") for i in range(1000)]
+        with profile_queries() as profile:
+            result = StockImportService.import_rows(db_session, 1, rows)
+        db_session.commit()
+        assert (result.created_products, result.created_stocks) == (1000, 1000)
+        assert profile.query_count < 60
+        assert db_session.query(Stock).filter_by(organization_id=1).count() == 1001
+
+    def test_batches_are_committed_one_by_one(self, db_session, monkeypatch):
+        monkeypatch.setattr(stock_import_service, "STOCK_IMPORT_MAX_WARNINGS", 1)
+        schema = StockExcelService.IMPORT_SCHEMA
+
+        def batches():
+            yield schema.validate([_row("Widget", 1), _row("Bolt", 2), _row("Widget", 4, location="Backroom")])
+            yield schema.validate([_row("bolt", 3), _row("Nut", "x")], first_row=4)
+            # The reader fails half-way through the sheet
+            raise ValueError("Invalid Excel file format")
+
+        with pytest.raises(ValueError):
+            StockImportService.import_batches(db_session, 1, batches(), mode="add")
+        db_session.rollback()
+        assert _stock(db_session) == [("Bolt", "Main", 5.0), ("Widget", "Backroom", 4.0), ("Widget", "Main", 6.0)]
+
+        result = StockImportService.import_batches(db_session, 1, [
+            schema.validate([_row("Widget", 1), _row("Bolt", 1)]), schema.validate([_row("Widget", 1)], first_row=3)
+        ], mode="add")
+        assert (result.total_processed, result.updated_stocks, result.created_products) == (3, 3, 0)
+        assert result.warnings == ["Row 1: Updated stock for 'Widget' from 6.0 to 7.0 (mode: add)", "... and 2 more warnings"]
+
+    def test_invalid_mode(self, db_session):
+        with pytest.raises(ValueError):
+            StockImportService.import_rows(db_session, 1, [_row("Widget", 1)], mode="merge")
@@ -0,0 +1,244 @@
+# tests/test_stock_ledger.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.inventory import InventoryService
+from app.models.base import Base, Organization, Product, Stock, StockMovement, DashboardCounter, InventoryTransaction
+from app.schemas.inventory import InventoryTransactionCreate, TransactionType
+from app.services.dashboard_counter_service import DashboardCounterService
+from app.services.stock_import_service import StockImportService
+from app.services.stock_ledger_service import StockLedgerService, InsufficientStockError
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database shared by the threads of the concurrency test. SQLite locks the whole
+    # database rather than rows, so transactions start with BEGIN IMMEDIATE and wait their turn
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'ledger.db'}", connect_args={"check_same_thread": False, "timeout": 60}
+    )
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+    session.add_all([
+        Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0, reorder_level=3),
+        Product(id=2, organization_id=2, name="Gadget", unit="PCS", unit_price=10.0),
+    ])
+    session.add(Stock(organization_id=1, product_id=1, quantity=10, unit="PCS", location="Main"))
+    session.commit()
+    session.close()
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def _movements(session):
+    return [
+        (movement.movement_type, movement.location, movement.quantity_change, movement.balance_after)
+        for movement in session.query(StockMovement).order_by(StockMovement.id)
+    ]
+
+
+def _issue(quantity, location="Main"):
+    return InventoryTransactionCreate(
+        product_id=1, transaction_type=TransactionType.ISSUE, quantity=quantity, unit="PCS", location=location,
+        stock_before=0, stock_after=0, transaction_date=datetime(2025, 9, 1)
+    )
+
+
+class TestStockLedger:
+    """Test moving stock through the append-only movement ledger"""
+
+    def test_movements_update_balances_per_location(self, db_session):
+        StockLedgerService.apply_movement(db_session, 1, 1, -4, "issue", location="Main")
+        StockLedgerService.apply_movement(db_session, 1, 1, 6, "receipt", location="Backroom", user_id=None)
+        db_session.commit()
+
+        assert [(entry.location, entry.quantity) for entry in StockLedgerService.balances(db_session, 1, 1)] == [
+            ("Backroom", 6.0), ("Main", 6.0)
+        ]
+        assert _movements(db_session) == [
+            ("opening", "Main", 10.0, 10.0), ("issue", "Main", -4.0, 6.0), ("receipt", "Backroom", 6.0, 6.0)
+        ]
+        assert StockLedgerService.reconcile(db_session) == []
+
+    def test_issues_cannot_overdraw(self, db_session):
+        with pytest.raises(InsufficientStockError) as error:
+            StockLedgerService.apply_movement(db_session, 1, 1, -11, "issue", location="Main")
+        assert (error.value.available, error.value.requested) == (10.0, 11)
+        # Nothing was created for an issue from a location without stock
+        with pytest.raises(InsufficientStockError):
+            StockLedgerService.apply_movement(db_session, 1, 1, -1, "issue", location="Backroom")
+        db_session.rollback()
+        assert db_session.query(Stock.location, Stock.quantity).all() == [("Main", 10.0)]
+
+        movement = StockLedgerService.apply_movement(db_session, 1, 1, -12, "adjustment", allow_negative=True)
+        assert movement.balance_after == -2.0
+        # Products of other organizations cannot be moved
+        with pytest.raises(ValueError):
+            StockLedgerService.apply_movement(db_session, 1, 2, 5, "receipt")
+
+    def test_stale_sessions_do_not_lose_updates(self, session_factory):
+        first, second = session_factory(expire_on_commit=False), session_factory()
+        stock = first.query(Stock).one()
+        assert stock.quantity == 10.0
+        first.commit()
+
+        StockLedgerService.apply_movement(second, 1, 1, -3, "issue", location="Main")
+        second.commit()
+        # The first session still holds 10 in memory, but the change applies to the stored balance
+        movement = StockLedgerService.apply_movement(first, 1, 1, -2, "issue", location="Main")
+        first.commit()
+        assert movement.balance_after == 5.0
+        assert stock.quantity == 5.0
+        first.close()
+        second.close()
+
+    def test_set_quantity_records_the_difference(self, db_session):
+        assert StockLedgerService.set_quantity(db_session, 1, 1, 10, location="Main") is None
+        movement = StockLedgerService.set_quantity(db_session, 1, 1, 4, location="Main", notes="Counted")
+        assert (movement.movement_type, movement.quantity_change, movement.balance_after) == ("correction", -6.0, 4.0)
+        StockLedgerService.set_quantity(db_session, 1, 1, 2, location="Shelf")
+        db_session.commit()
+        assert [(entry.location, entry.quantity) for entry in StockLedgerService.balances(db_session, 1, 1)] == [
+            ("Main", 4.0), ("Shelf", 2.0)
+        ]
+        assert StockLedgerService.reconcile(db_session) == []
+
+    def test_orm_writes_are_recorded(self, db_session):
+        stock = db_session.query(Stock).one()
+        stock.quantity += 5
+        db_session.add(Stock(organization_id=1, product_id=1, quantity=0, unit="PCS", location="Empty"))
+        db_session.commit()
+        assert _movements(db_session) == [("opening", "Main", 10.0, 10.0), ("correction", "Main", 5.0, 15.0)]
+        assert StockLedgerService.reconcile(db_session) == []
+
+    def test_reconcile_reports_and_repairs_drift(self, db_session):
+        db_session.execute(Stock.__table__.update().values(quantity=12))
+        db_session.commit()
+        mismatches = StockLedgerService.reconcile(db_session, 1)
+        assert [(row["quantity"], row["ledger_quantity"], row["difference"]) for row in mismatches] == [(12.0, 10.0, 2.0)]
+        assert StockLedgerService.reconcile(db_session, 2) == []
+
+        assert StockLedgerService.repair(db_session, 1) == 1
+        db_session.commit()
+        assert _movements(db_session)[-1] == ("reconciliation", "Main", 2.0, 12.0)
+        assert StockLedgerService.reconcile(db_session) == []
+
+    def test_low_stock_counter_follows_movements(self, db_session):
+        DashboardCounterService.recompute(db_session, 1)
+        db_session.commit()
+        statements = []
+        event.listen(db_session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement.lower()))
+
+        def low_stock_items():
+            return db_session.query(DashboardCounter.low_stock_items).filter_by(organization_id=1).scalar()
+
+        StockLedgerService.apply_movement(db_session, 1, 1, -8, "issue", location="Main")
+        db_session.commit()
+        assert low_stock_items() == 1
+        # Moving within the low range, or creating an entry above it, changes nothing
+        StockLedgerService.apply_movement(db_session, 1, 1, -1, "issue", location="Main")
+        StockLedgerService.apply_movement(db_session, 1, 1, 5, "receipt", location="Backroom")
+        db_session.commit()
+        assert low_stock_items() == 1
+        StockLedgerService.apply_movement(db_session, 1, 1, 2, "receipt", location="Shelf")
+        StockLedgerService.set_quantity(db_session, 1, 1, 0, location="Bin")
+        db_session.commit()
+        assert low_stock_items() == 3
+        StockLedgerService.apply_movement(db_session, 1, 1, 9, "receipt", location="Main")
+        db_session.commit()
+        assert low_stock_items() == 2
+
+        # Movements adjust the counter without recounting the organization's stock
+        assert not [statement for statement in statements if "count(" in statement]
+        assert DashboardCounterService.verify(db_session, 1) == []
+
+    def test_stock_import_records_import_movements(self, db_session):
+        StockImportService.import_rows(db_session, 1, [
+            {"product_name": "Widget", "quantity": 4, "unit": "PCS", "location": "Main"},
+            {"product_name": "Widget", "quantity": 3, "unit": "PCS", "location": "Backroom"},
+        ], mode="add")
+        db_session.commit()
+        assert _movements(db_session)[1:] == [("import", "Main", 4.0, 14.0), ("import", "Backroom", 3.0, 3.0)]
+        assert StockLedgerService.reconcile(db_session) == []
+
+
+class TestInventoryTransactions:
+    """Test inventory transactions driven by the stock ledger"""
+
+    def test_issue_records_transaction_and_movement(self, db_session):
+        transaction = InventoryService.create_inventory_transaction(db_session, 1, None, _issue(4))
+        assert (transaction.stock_before, transaction.stock_after) == (10.0, 6.0)
+        movement = db_session.query(StockMovement).filter_by(movement_type="issue").one()
+        assert (movement.reference_type, movement.reference_id, movement.quantity_change) == (
+            "inventory_transaction", transaction.id, -4.0
+        )
+
+        with pytest.raises(InsufficientStockError):
+            InventoryService.create_inventory_transaction(db_session, 1, None, _issue(7))
+        db_session.rollback()
+        assert InventoryService.get_current_stock(db_session, 1, 1, "Main") == 6.0
+
+        stock = InventoryService.update_stock_level(db_session, 1, 1, 9, "Main")
+        assert stock.quantity == 9.0
+        assert StockLedgerService.reconcile(db_session) == []
+
+    def test_parallel_issues_against_one_product(self, session_factory):
+        issues, stock = 40, 10
+        barrier = threading.Barrier(8)
+
+        def issue_one(index):
+            if index < 8:
+                barrier.wait()
+            db = session_factory()
+            try:
+                InventoryService.create_inventory_transaction(db, 1, None, _issue(1))
+                return True
+            except InsufficientStockError:
+                db.rollback()
+                return False
+            finally:
+                db.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outcomes = list(pool.map(issue_one, range(issues)))
+
+        assert outcomes.count(True) == stock
+        db = session_factory()
+        try:
+            assert db.query(Stock.quantity).scalar() == 0.0
+            balances = sorted(value for value, in db.query(StockMovement.balance_after).filter_by(movement_type="issue"))
+            assert balances == [float(value) for value in range(stock)]
+            assert db.query(func.count(InventoryTransaction.id)).scalar() == stock
+            assert StockLedgerService.reconcile(db) == []
+        finally:
+            db.close()
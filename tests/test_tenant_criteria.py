@@ -0,0 +1,155 @@
+# tests/test_tenant_criteria.py
+
+import asyncio
+import pytest
+from sqlalchemy import create_engine, event, select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker, aliased
+
+from app.core.config import settings
+from app.core.tenant import TenantContext, TenantQueryMixin, is_tenant_scoped, SKIP_TENANT_FILTER
+from app.models.base import Base, Organization, User, Product, Stock, AuditLog
+
+
+def _seed(session):
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+        session.add(Product(
+            id=org_id, organization_id=org_id, name=f"Product {org_id}", part_number=f"P{org_id}",
+            unit="PCS", unit_price=100.0, gst_rate=18.0
+        ))
+        session.add(Stock(id=org_id, organization_id=org_id, product_id=org_id, quantity=5, unit="PCS"))
+        session.add(User(
+            id=org_id, organization_id=org_id, email=f"user{org_id}@test.com", username=f"user{org_id}",
+            hashed_password="hashed", role="admin", is_active=True
+        ))
+    session.commit()
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    _seed(session)
+    TenantContext.clear()
+    yield session
+    TenantContext.clear()
+    session.close()
+
+
+@pytest.fixture
+def org_context():
+    def set_org(org_id):
+        TenantContext.set_organization_id(org_id)
+    return set_org
+
+
+class TestTenantScopedModels:
+    """Test which models receive the automatic tenant criterion"""
+
+    def test_not_null_organization_id_is_tenant_scoped(self):
+        assert is_tenant_scoped(Product)
+        assert is_tenant_scoped(Stock)
+
+    def test_platform_and_nullable_models_are_not_scoped(self):
+        assert not is_tenant_scoped(Organization)
+        assert not is_tenant_scoped(User)
+        assert not is_tenant_scoped(AuditLog)
+        assert not is_tenant_scoped(dict)
+
+
+class TestAutomaticTenantCriteria:
+    """Test the do_orm_execute tenant criterion"""
+
+    def test_no_context_means_no_filter(self, db_session):
+        assert db_session.query(Product).count() == 2
+
+    def test_select_is_scoped_to_context(self, db_session, org_context):
+        org_context(2)
+        assert [p.id for p in db_session.query(Product).all()] == [2]
+        assert [p.id for p in db_session.execute(select(Product)).scalars()] == [2]
+
+    def test_joined_and_column_queries_are_scoped(self, db_session, org_context):
+        org_context(1)
+        rows = db_session.query(Stock, Product).join(Product).all()
+        assert [(s.id, p.id) for s, p in rows] == [(1, 1)]
+        assert db_session.query(func.count(Product.id)).scalar() == 1
+
+    def test_aliases_are_scoped(self, db_session, org_context):
+        org_context(1)
+        product_alias = aliased(Product)
+        assert [p.id for p in db_session.query(product_alias).all()] == [1]
+
+    def test_get_by_primary_key_cannot_cross_tenants(self, db_session, org_context):
+        org_context(1)
+        assert db_session.get(Product, 2) is None
+
+    def test_users_are_not_scoped(self, db_session, org_context):
+        org_context(1)
+        assert db_session.query(User).count() == 2
+
+    def test_skip_execution_option(self, db_session, org_context):
+        org_context(1)
+        query = db_session.query(Product).execution_options(**{SKIP_TENANT_FILTER: True})
+        assert query.count() == 2
+
+    def test_setting_disables_filter(self, db_session, org_context, monkeypatch):
+        monkeypatch.setattr(settings, "TENANT_QUERY_AUTO_FILTER", False)
+        org_context(1)
+        assert db_session.query(Product).count() == 2
+
+    def test_reports_stay_scoped_without_auto_filter(self, db_session, org_context, monkeypatch):
+        from app.api.reports import get_inventory_report, get_pending_orders
+
+        monkeypatch.setattr(settings, "TENANT_QUERY_AUTO_FILTER", False)
+        org_context(1)
+        user = db_session.get(User, 1)
+        report = asyncio.run(get_inventory_report(db=db_session, current_user=user))
+        assert [item["product_id"] for item in report["items"]] == [1]
+        orders = asyncio.run(get_pending_orders(db=db_session, current_user=user))
+        assert orders["summary"]["total_orders"] == 0
+
+    def test_legacy_filter_by_tenant_still_works(self, db_session, org_context):
+        org_context(1)
+        query = TenantQueryMixin.filter_by_tenant(db_session.query(Product), Product, 1)
+        assert [p.id for p in query.all()] == [1]
+
+    def test_compiled_statement_is_reused_across_tenants(self, db_session, org_context):
+        engine = db_session.get_bind()
+        statements = []
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, params, *args: statements.append((statement, params)))
+
+        org_context(1)
+        db_session.query(Product).all()
+        org_context(2)
+        db_session.query(Product).all()
+
+        (first_sql, first_params), (second_sql, second_params) = statements
+        assert first_sql == second_sql
+        assert first_params != second_params
+        assert "organization_id" in first_sql
+
+    def test_async_session_is_scoped(self, org_context):
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            async with session_factory() as session:
+                await session.run_sync(_seed)
+                org_context(2)
+                result = await session.execute(select(Product))
+                ids = [p.id for p in result.scalars()]
+            await engine.dispose()
+            return ids
+
+        try:
+            assert asyncio.run(run()) == [2]
+        finally:
+            TenantContext.clear()
@@ -0,0 +1,96 @@
+# tests/test_tenant_middleware.py
+
+import asyncio
+import pytest
+
+from app.core.security import create_access_token
+from app.core.tenant import PathPrefixTrie, TenantContext, TenantMiddleware
+
+
+def _scope(path="/api/v1/products", method="GET", headers=None, scope_type="http"):
+    return {
+        "type": scope_type,
+        "method": method,
+        "path": path,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+
+
+def _run(middleware_kwargs=None, **scope_kwargs):
+    """Send one request through TenantMiddleware and return the org id seen by the app"""
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["org_id"] = TenantContext.get_organization_id()
+
+    async def call():
+        middleware = TenantMiddleware(app, **(middleware_kwargs or {}))
+        await middleware(_scope(**scope_kwargs), None, None)
+        seen["after"] = TenantContext.get_organization_id()
+
+    asyncio.run(call())
+    return seen
+
+
+def _bearer(organization_id):
+    return {"Authorization": f"Bearer {create_access_token('user@test.com', organization_id=organization_id)}"}
+
+
+class TestPathPrefixTrie:
+    """Test excluded path matching"""
+
+    def test_prefix_matches_subpaths(self):
+        trie = PathPrefixTrie(prefixes=["/api/v1/auth"])
+        assert trie.matches("/api/v1/auth/login")
+        assert trie.matches("/api/v1/auth")
+        assert not trie.matches("/api/v1/authz")
+        assert not trie.matches("/api/v1")
+
+    def test_exact_paths_do_not_match_subpaths(self):
+        trie = PathPrefixTrie(exact_paths=["/api/users/me"])
+        assert trie.matches("/api/users/me")
+        assert trie.matches("/api/users/me/")
+        assert not trie.matches("/api/users/me/settings")
+        assert not trie.matches("/api/users")
+
+
+class TestTenantMiddleware:
+    """Test organization context extraction"""
+
+    def test_org_from_jwt_claims(self):
+        assert _run(headers=_bearer(7))["org_id"] == 7
+
+    def test_jwt_claim_takes_precedence_over_header(self):
+        headers = {**_bearer(7), "X-Organization-ID": "8"}
+        assert _run(headers=headers)["org_id"] == 7
+
+    def test_platform_token_can_select_org_by_header(self):
+        headers = {**_bearer(None), "X-Organization-ID": "8"}
+        assert _run(headers=headers)["org_id"] == 8
+
+    def test_org_from_path(self):
+        assert _run(path="/api/v1/org/456/data")["org_id"] == 456
+
+    def test_invalid_token_sets_no_context(self):
+        assert _run(headers={"Authorization": "Bearer garbage"})["org_id"] is None
+
+    def test_request_without_org_passes_through(self):
+        assert _run() == {"org_id": None, "after": None}
+
+    def test_context_is_reset_after_request(self):
+        seen = _run(headers=_bearer(7))
+        assert seen["org_id"] == 7
+        assert seen["after"] is None
+
+    def test_excluded_paths_and_options_skip_extraction(self):
+        assert _run(path="/api/v1/auth/login", headers=_bearer(7))["org_id"] is None
+        assert _run(path="/api/v1/organizations/app-statistics", headers=_bearer(7))["org_id"] is None
+        assert _run(method="OPTIONS", headers=_bearer(7))["org_id"] is None
+
+    def test_custom_exclusions(self):
+        seen = _run(middleware_kwargs={"excluded_prefixes": ["/internal"], "excluded_paths": []},
+                    path="/internal/jobs", headers=_bearer(7))
+        assert seen["org_id"] is None
+
+    def test_lifespan_passes_through(self):
+        assert _run(scope_type="lifespan", headers=_bearer(7))["org_id"] is None
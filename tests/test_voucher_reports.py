@@ -0,0 +1,189 @@
+# tests/test_voucher_reports.py
+
+import asyncio
+import io
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from openpyxl import load_workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import reports
+from app.api.v1.auth import get_current_active_user
+from app.core.database import get_read_db
+from app.core.query_profiler import profile_queries, query_budget
+from app.core.tenant import TenantContext
+from app.models.base import Base, Organization, User, Vendor, Customer, Product
+from app.models.vouchers import PurchaseVoucher, PurchaseVoucherItem, SalesVoucher, SalesVoucherItem
+from app.services.voucher_report_service import VoucherReportService, ReportFilters
+
+PARTY = dict(contact_number="1234567890", address1="Test Address", city="Test City",
+             state="Test State", pin_code="123456", state_code="TS")
+
+
+def _item(model, product_id, quantity, unit_price, gst):
+    taxable = quantity * unit_price
+    return model(product_id=product_id, quantity=quantity, unit="PCS", unit_price=unit_price,
+                 taxable_amount=taxable, cgst_amount=gst / 2, sgst_amount=gst / 2, total_amount=taxable + gst)
+
+
+def _sales(number, when, customer_id, *items, org_id=1, status="confirmed"):
+    return SalesVoucher(
+        organization_id=org_id, voucher_number=number, date=when, customer_id=customer_id, status=status,
+        total_amount=sum(i.total_amount for i in items), cgst_amount=sum(i.cgst_amount for i in items),
+        sgst_amount=sum(i.sgst_amount for i in items), created_by=1, items=list(items)
+    )
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for org_id in (1, 2):
+        session.add(Organization(
+            id=org_id, name=f"Org {org_id}", subdomain=f"org{org_id}", primary_email=f"org{org_id}@test.com",
+            primary_phone="1234567890", address1="Test Address", city="Test City",
+            state="Test State", pin_code="123456", plan_type="basic"
+        ))
+    session.add(User(
+        id=1, organization_id=1, email="test@test.com", username="testuser",
+        hashed_password="hashed", role="admin", is_active=True
+    ))
+    session.add_all([
+        Customer(id=1, organization_id=1, name="Beta Retail", **PARTY),
+        Customer(id=2, organization_id=1, name="Gamma Stores", **PARTY),
+        Customer(id=3, organization_id=2, name="Other Org Customer", **PARTY),
+        Vendor(id=1, organization_id=1, name="Acme Supplies", **PARTY),
+        Product(id=1, organization_id=1, name="Widget", unit="PCS", unit_price=10.0),
+        Product(id=2, organization_id=1, name="Gadget", unit="PCS", unit_price=50.0),
+    ])
+    session.add_all([
+        _sales("SV001", datetime(2024, 5, 30, 10), 1, _item(SalesVoucherItem, 1, 10, 10.0, 18.0)),
+        _sales("SV002", datetime(2024, 6, 1, 9), 2, _item(SalesVoucherItem, 1, 5, 10.0, 9.0),
+               _item(SalesVoucherItem, 2, 2, 50.0, 18.0)),
+        _sales("SV003", datetime(2024, 6, 1, 15), 1, _item(SalesVoucherItem, 2, 4, 50.0, 36.0)),
+        _sales("SV004", datetime(2024, 6, 20, 11), 2, _item(SalesVoucherItem, 1, 1, 10.0, 0.0), status="cancelled"),
+        _sales("SV-OTHER", datetime(2024, 6, 5), 3, _item(SalesVoucherItem, 1, 100, 10.0, 0.0), org_id=2),
+        PurchaseVoucher(
+            organization_id=1, voucher_number="PV001", date=datetime(2024, 6, 2), vendor_id=1,
+            total_amount=590.0, igst_amount=90.0, created_by=1,
+            items=[PurchaseVoucherItem(product_id=1, quantity=50, unit="PCS", unit_price=10.0,
+                                       taxable_amount=500.0, igst_amount=90.0, total_amount=590.0)]
+        ),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _filters(**kwargs):
+    return ReportFilters(organization_id=1, **kwargs)
+
+
+class TestVoucherReportService:
+    """Test report aggregates computed in SQL"""
+
+    def test_summary(self, db_session):
+        assert VoucherReportService.summary(db_session, "sales", _filters()) == {
+            "total_vouchers": 4, "total_sales": 118.0 + 177.0 + 236.0 + 10.0, "total_gst": 81.0
+        }
+        assert VoucherReportService.summary(db_session, "purchase", _filters()) == {
+            "total_vouchers": 1, "total_purchases": 590.0, "total_gst": 90.0
+        }
+        assert VoucherReportService.summary(db_session, "sales", _filters(party_id=1))["total_sales"] == 354.0
+
+    def test_vouchers_page(self, db_session):
+        page = VoucherReportService.vouchers(db_session, "sales", _filters(), skip=1, limit=2)
+        assert [(v["voucher_number"], v["customer_name"], v["gst_amount"]) for v in page] == [
+            ("SV002", "Gamma Stores", 27.0), ("SV003", "Beta Retail", 36.0)
+        ]
+        assert set(page[0]) == {"id", "voucher_number", "date", "customer_name", "total_amount", "gst_amount", "status"}
+
+    def test_group_by_period(self, db_session):
+        days = VoucherReportService.groups(db_session, "sales", _filters(), "day")
+        assert [(g["period"], g["voucher_count"], g["total_amount"]) for g in days] == [
+            ("2024-05-30", 1, 118.0), ("2024-06-01", 2, 413.0), ("2024-06-20", 1, 10.0)
+        ]
+        months = VoucherReportService.groups(db_session, "sales", _filters(), "month")
+        assert [(g["period"], g["voucher_count"], g["gst_amount"]) for g in months] == [
+            ("2024-05", 1, 18.0), ("2024-06", 3, 63.0)
+        ]
+
+    def test_group_by_party(self, db_session):
+        groups = VoucherReportService.groups(db_session, "sales", _filters(), "party")
+        assert [(g["customer_id"], g["customer_name"], g["voucher_count"], g["total_amount"]) for g in groups] == [
+            (1, "Beta Retail", 2, 354.0), (2, "Gamma Stores", 2, 187.0)
+        ]
+        (vendor,) = VoucherReportService.groups(db_session, "purchase", _filters(), "party")
+        assert (vendor["vendor_name"], vendor["gst_amount"]) == ("Acme Supplies", 90.0)
+
+    def test_group_by_product(self, db_session):
+        groups = VoucherReportService.groups(db_session, "sales", _filters(), "product")
+        assert [(g["product_name"], g["voucher_count"], g["quantity"], g["total_amount"]) for g in groups] == [
+            ("Gadget", 2, 6.0, 354.0), ("Widget", 3, 16.0, 187.0)
+        ]
+
+    def test_unknown_grouping(self, db_session):
+        with pytest.raises(ValueError):
+            VoucherReportService.groups(db_session, "sales", _filters(), "week")
+
+
+class TestVoucherReportEndpoints:
+    """Test the paginated report endpoints and exports"""
+
+    def _get(self, db_session, path, **params):
+        app = FastAPI()
+        app.include_router(reports.router, prefix="/api/v1/reports")
+        app.dependency_overrides[get_read_db] = lambda: db_session
+        user = db_session.get(User, 1)
+        app.dependency_overrides[get_current_active_user] = lambda: user
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get(f"/api/v1/reports{path}", params=params)
+
+        TenantContext.set_organization_id(1)
+        try:
+            with profile_queries() as profile:
+                response = asyncio.run(request())
+        finally:
+            TenantContext.clear()
+        return response, profile.query_count
+
+    def test_sales_report_page(self, db_session):
+        response, queries = self._get(db_session, "/sales-report", skip=0, limit=3)
+        assert response.status_code == 200
+        body = response.json()
+        assert queries == 2
+        assert [v["voucher_number"] for v in body["vouchers"]] == ["SV001", "SV002", "SV003"]
+        assert body["summary"]["total_vouchers"] == 4
+        assert body["pagination"] == {"skip": 0, "limit": 3, "total": 4, "has_more": True}
+        assert "groups" not in body
+
+    def test_purchase_report_grouped(self, db_session):
+        response, queries = self._get(db_session, "/purchase-report", group_by="month")
+        assert response.status_code == 200
+        body = response.json()
+        assert queries == 3
+        assert body["group_by"] == "month"
+        assert body["groups"] == [{"period": "2024-06", "voucher_count": 1, "total_amount": 590.0, "gst_amount": 90.0}]
+
+    def test_invalid_grouping_is_rejected(self, db_session):
+        response, _ = self._get(db_session, "/sales-report", group_by="week")
+        assert response.status_code == 422
+
+    def test_export_includes_every_voucher(self, db_session):
+        with query_budget(2):
+            response, _ = self._get(db_session, "/sales-report/export/excel")
+        assert response.status_code == 200
+        rows = list(load_workbook(io.BytesIO(response.content)).active.iter_rows(values_only=True))
+        assert [row[0] for row in rows[1:5]] == ["SV001", "SV002", "SV003", "SV004"]
+        assert ("Total Sales", 541.0) in [row[:2] for row in rows]